@@ -10,6 +10,7 @@ from .iws import (
 )
 from .intentional_token import IntentionalToken, IntentionalTrace
 from .sigma_storage import SigmaStorage, MemoryItem
+from .sigma_ann import IVFFlatIndex
 from .dual_source import DualSourceModule, DualSourceConfig
 
 __all__ = [
@@ -23,6 +24,7 @@ __all__ = [
     'IntentionalTrace',
     'SigmaStorage',
     'MemoryItem',
+    'IVFFlatIndex',
     'DualSourceModule',
     'DualSourceConfig'
 ]
@@ -49,6 +49,14 @@ class MicroscopicParameters:
     # Lattice constant
     a_lattice = 3.8e-10  # [m]
     
+    # Fermi energy and scattering time (cuprate approximations, from transport)
+    E_F = 0.3 * e  # [J] ~0.3 eV
+    τ = 1e-13      # [s] ~0.1 ps
+    
+    # Orbital coupling ∂Λ/∂Θ (from a(H) suppression in LSCO x=0.24)
+    k_B_eV = 8.617e-5  # [eV/K]
+    dΛ_dΘ = 1.62e-9    # [eV/(K·T²)]
+    
     # t-J model parameters (from ARPES + neutron scattering)
     J = 130 * 1.602e-22  # [J] = 130 meV
     t = 400 * 1.602e-22  # [J] = 400 meV
@@ -94,14 +102,9 @@ class MicroscopicParameters:
             # ∂Λ/∂Θ ≈ 1.62×10⁻⁹ eV/(K·T²) at Θ ~ 100K
             # This is EXPERIMENTALLY VERIFIED from a(H) measurements
             
-            # Convert k_B to eV/K
-            k_B_eV = 8.617e-5  # eV/K
-            
-            # Orbital coupling (from microscopic theory + experiment)
-            dΛ_dΘ = 1.62e-9  # eV/(K·T²)
-            
-            # Fundamental formula
-            β_0 = (Θ / (2 * k_B_eV)) * dΛ_dΘ
+            # Fundamental formula (k_B in eV/K, orbital coupling from
+            # microscopic theory + experiment)
+            β_0 = (Θ / (2 * cls.k_B_eV)) * cls.dΛ_dΘ
             
             return β_0
         else:
@@ -143,19 +146,18 @@ class MicroscopicParameters:
         
         N_eff = (ξ/a)³ × (E_F·τ/ℏ)
         """
+        return cls.compute_N_eff(cls.ξ_0, cls.a_lattice, cls.E_F, cls.τ)
+    
+    @classmethod
+    def compute_N_eff(cls, ξ_0, a_lattice, E_F, τ):
+        """
+        N_eff = (ξ/a)³ × (E_F·τ/ℏ) for given (broadcastable) parameters
+        """
         # Coherence volume
-        V_coh = (cls.ξ_0 / cls.a_lattice)**3
-        
-        # Fermi energy (approximation for cuprates)
-        E_F = 0.3 * cls.e  # ~0.3 eV
-        
-        # Scattering time (from transport)
-        τ = 1e-13  # ~0.1 ps
+        V_coh = (ξ_0 / a_lattice)**3
         
         # Effective states
-        N_eff = V_coh * (E_F * τ / cls.ℏ)
-        
-        return N_eff
+        return V_coh * (E_F * τ / cls.ℏ)
 
 
 # ============================================================================
@@ -210,15 +212,36 @@ class TheoreticalUncertainty:
             Uncertainty amplification factor
         """
         # Distance from boundary in units of correlation length
-        x = (T_max - T) / ξ_T
+        # (T, T_max, ξ_T broadcast, e.g. ξ_T[:, None] for one row per sample)
+        x = (T_max - np.asarray(T, dtype=float)) / ξ_T
         
-        # Exponential amplification inside boundary layer
-        amplification = np.ones_like(T)
-        boundary_mask = x < 2
-        amplification[boundary_mask] = np.exp(2 - x[boundary_mask])
+        # Exponential amplification inside boundary layer (x < 2), 1 outside
+        amplification = np.exp(np.maximum(2 - x, 0))
         
         return amplification
     
+    @staticmethod
+    def signal_to_noise(y):
+        """
+        SNR of a smooth curve: mean / std of point-to-point differences
+        """
+        return np.mean(y) / np.std(np.diff(y))
+    
+    @staticmethod
+    def correlation_length(T, y, default=5.0):
+        """
+        Information correlation length ξ_T: lag where the autocorrelation
+        of y(T) first drops below 1/e (default if it never does)
+        """
+        acf = np.correlate(y - np.mean(y), y - np.mean(y), mode='full')
+        acf = acf[len(acf)//2:] / acf[len(acf)//2]
+        
+        # Find where ACF drops to 1/e
+        idx_corr = np.where(acf < 1/np.e)[0]
+        if len(idx_corr) > 0:
+            return idx_corr[0] * (T[1] - T[0])
+        return default
+    
     @staticmethod
     def compute_total_uncertainty(β_H, N_eff, SNR, N_states, 
                                   T, T_max, ξ_T):
@@ -452,8 +475,8 @@ class AdaptonicBetaH:
         print(f"  ∂Λ/∂Θ = coupling between information & orbital DOF")
         
         print(f"\nInput parameters (from microscopic theory):")
-        k_B_eV = 8.617e-5  # eV/K
-        dΛ_dΘ = 1.62e-9  # eV/(K·T²) - from LSCO measurements
+        k_B_eV = self.params.k_B_eV  # eV/K
+        dΛ_dΘ = self.params.dΛ_dΘ  # eV/(K·T²) - from LSCO measurements
         
         print(f"  k_B = {k_B_eV} eV/K")
         print(f"  ∂Λ/∂Θ = {dΛ_dΘ:.2e} eV/(K·T²)")
@@ -512,9 +535,7 @@ class AdaptonicBetaH:
         print(f"  N_eff ≈ {N_eff:.0f}")
         
         # Estimate SNR from data
-        signal = np.mean(self.β_H_measured)
-        noise = np.std(np.diff(self.β_H_measured))
-        SNR = signal / noise
+        SNR = TheoreticalUncertainty.signal_to_noise(self.β_H_measured)
         print(f"\nSignal-to-noise ratio:")
         print(f"  SNR ≈ {SNR:.1f}")
         
@@ -537,17 +558,7 @@ class AdaptonicBetaH:
         
         # Boundary effects
         # Estimate information correlation length from autocorrelation
-        acf = np.correlate(self.β_H_measured - np.mean(self.β_H_measured),
-                          self.β_H_measured - np.mean(self.β_H_measured),
-                          mode='full')
-        acf = acf[len(acf)//2:] / acf[len(acf)//2]
-        
-        # Find where ACF drops to 1/e
-        idx_corr = np.where(acf < 1/np.e)[0]
-        if len(idx_corr) > 0:
-            ξ_T = idx_corr[0] * (self.T[1] - self.T[0])
-        else:
-            ξ_T = 5.0  # Default to 5K
+        ξ_T = TheoreticalUncertainty.correlation_length(self.T, self.β_H_measured)
         
         print(f"\nInformation correlation length:")
         print(f"  ξ_T ≈ {ξ_T:.1f} K")
@@ -583,6 +594,40 @@ class AdaptonicBetaH:
             'δβ_H_total': δβ_H_total
         }
     
+    def monte_carlo_uncertainties(self, n_samples=100_000, seed=0, n_workers=1,
+                                  sobol_samples=10_000):
+        """
+        Sampled replacement of compute_theoretical_uncertainties: β_H(T)
+        percentile bands and Sobol sensitivity indices
+        (adaptonic_beta_H_monte_carlo.BetaHMonteCarlo)
+        """
+        from adaptonic_beta_H_monte_carlo import BetaHMonteCarlo
+        
+        print("\n" + "="*70)
+        print(" MONTE CARLO UNCERTAINTY PROPAGATION")
+        print("="*70)
+        
+        engine = BetaHMonteCarlo(self.T, self.β_H_measured, self.params)
+        bands = engine.run(n_samples, seed=seed, n_workers=n_workers)
+        sobol = engine.sobol_indices(sobol_samples, seed=seed, n_workers=n_workers)
+        
+        lo, hi = bands['percentiles'][[1, 3]]
+        δβ_68 = 0.5 * (hi - lo)
+        print(f"\n{n_samples} samples, inputs: {', '.join(sobol['inputs'])}")
+        print(f"  δβ_H (68% band)     = {np.mean(δβ_68):.2e} T⁻²")
+        print(f"  δβ_H (first order)  = {np.mean(bands['first_order']['δβ_H_total']):.2e} T⁻²")
+        print(f"  β₀ (16-84%)         = {bands['β_0'][1]:.3e} - {bands['β_0'][3]:.3e} T⁻²")
+        print(f"\nSobol total indices (mean over T):")
+        for name, ST in zip(sobol['inputs'], np.mean(sobol['ST'], axis=1)):
+            print(f"  {name:<10} {ST:.3f}")
+        print("="*70)
+        
+        return {
+            'bands': bands,
+            'sobol': sobol,
+            'δβ_H_68': δβ_68
+        }
+    
     def cross_filter_coherence_test(self):
         """
         Test if β_H is physical observable (method-independent)
@@ -696,8 +741,9 @@ class AdaptonicBetaH:
         # STEP 1: Theoretical baseline
         β_0 = self.theoretical_baseline()
         
-        # STEP 2: Theoretical uncertainties
+        # STEP 2: Theoretical uncertainties (first order + Monte Carlo)
         uncertainties = self.compute_theoretical_uncertainties()
+        monte_carlo = self.monte_carlo_uncertainties()
         
         # STEP 3: Cross-filter coherence
         coherence_results = self.cross_filter_coherence_test()
@@ -729,6 +775,7 @@ class AdaptonicBetaH:
         print(f"   Statistical: ±{uncertainties['δβ_β_stat']*100:.1f}% (from N_eff, SNR)")
         print(f"   Boundary: up to {np.max(uncertainties['amplification']):.2f}× (from ξ_T)")
         print(f"   Total: ±{np.mean(uncertainties['δβ_H_total']/self.β_H_measured)*100:.1f}%")
+        print(f"   Monte Carlo (68%): ±{np.mean(monte_carlo['δβ_H_68']/self.β_H_measured)*100:.1f}%")
         
         print("\n" + "="*80)
         print(" ✓ THEORY VALIDATED - β_H is PHYSICAL, MEASURABLE, PREDICTABLE")
@@ -737,6 +784,7 @@ class AdaptonicBetaH:
         return {
             'β_0_theory': β_0,
             'uncertainties': uncertainties,
+            'monte_carlo': monte_carlo,
             'coherence': coherence_results,
             'enhancement': enhancement_results
         }
@@ -0,0 +1,248 @@
+"""
+ADAPTONIC β_H - MONTE CARLO UNCERTAINTY PROPAGATION
+===================================================
+
+Sampling replacement for the first-order quadrature in
+TheoreticalUncertainty.compute_total_uncertainty.
+
+Every uncertain input is driven by one standard-normal column:
+
+    ξ_0, a_lattice, E_F, τ, SNR, ξ_T, Θ, ∂Λ/∂Θ   lognormal, median = nominal
+    ε_Θ, ε_S                                      N(0, 1) fluctuations
+
+and a sample row maps to
+
+    N_eff   = (ξ/a)³ × (E_F·τ/ℏ)
+    β_H(T)  = β_H,meas(T) × [1 + A(T; ξ_T) × (ε_Θ/√(N_eff·SNR) + ε_S/√N_eff)]
+    β₀      = (Θ/2k_B) × ∂Λ/∂Θ
+
+With the parameters held at their nominal values the spread of β_H(T) is
+exactly the first-order δβ_H_total; the Monte Carlo adds the parameter
+uncertainties and the non-linear (N_eff, SNR, boundary) response.
+
+All samples are evaluated at once as a (samples, T) array, in blocks of
+temperatures (optionally over a process pool): percentile bands per T and
+Sobol first-order / total indices (Saltelli / Jansen estimators).
+
+Author: Paweł Kojs
+Date: November 2025
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from adaptonic_beta_H_first_principles import MicroscopicParameters, TheoreticalUncertainty
+
+
+INPUTS = ('ξ_0', 'a_lattice', 'E_F', 'τ', 'SNR', 'ξ_T', 'Θ', 'dΛ_dΘ', 'ε_Θ', 'ε_S')
+LOGNORMAL_INPUTS = INPUTS[:8]
+
+# Relative (log-space) 1σ of the lognormal inputs; the SNR default comes from
+# the length of the β_H(T) curve (standard error of the noise estimate)
+DEFAULT_REL_SIGMA = {
+    'ξ_0': 0.2,        # H_c2 coherence length
+    'a_lattice': 0.01,
+    'E_F': 0.3,
+    'τ': 0.5,          # transport scattering time
+    'ξ_T': 0.25,       # autocorrelation estimate
+    'Θ': 0.2,
+    'dΛ_dΘ': 0.1,
+}
+
+PERCENTILES = (2.5, 16.0, 50.0, 84.0, 97.5)
+
+BAND_BLOCK_ELEMENTS = 1 << 22   # samples × temperatures per percentile block
+SOBOL_BLOCK_ELEMENTS = 1 << 15  # sample rows × temperatures per Sobol chunk
+
+
+class BetaHMonteCarlo:
+    """
+    Monte Carlo propagation of the adaptonic β_H(T) uncertainties
+
+    Parameters
+    ----------
+    T, β_H : array
+        Measured β_H(T) curve
+    params : MicroscopicParameters (class or instance)
+        Nominal ξ_0, a_lattice, E_F, τ, ∂Λ/∂Θ
+    rel_sigma : dict, optional
+        Overrides of DEFAULT_REL_SIGMA (0 pins an input at its nominal value)
+    SNR, ξ_T : float, optional
+        Nominal values; estimated from the curve as in
+        AdaptonicBetaH.compute_theoretical_uncertainties if not given
+    Θ : float
+        Nominal information temperature for β₀ [K]
+    """
+
+    def __init__(self, T, β_H, params=MicroscopicParameters, rel_sigma=None,
+                 SNR=None, ξ_T=None, Θ=100.0):
+        self.T = np.asarray(T, dtype=float)
+        self.β_H = np.asarray(β_H, dtype=float)
+        self.T_max = np.max(self.T)
+        self.params = params
+
+        self.nominal = {
+            'ξ_0': params.ξ_0,
+            'a_lattice': params.a_lattice,
+            'E_F': params.E_F,
+            'τ': params.τ,
+            'SNR': TheoreticalUncertainty.signal_to_noise(self.β_H) if SNR is None else SNR,
+            'ξ_T': TheoreticalUncertainty.correlation_length(self.T, self.β_H) if ξ_T is None else ξ_T,
+            'Θ': Θ,
+            'dΛ_dΘ': params.dΛ_dΘ,
+        }
+        self.rel_sigma = dict(DEFAULT_REL_SIGMA, SNR=1/np.sqrt(2*max(len(self.T) - 2, 1)))
+        self.rel_sigma.update(rel_sigma or {})
+
+    def sample(self, n_samples, seed=None):
+        """Standard-normal driver matrix, shape (n_samples, len(INPUTS))"""
+        return np.random.default_rng(seed).standard_normal((n_samples, len(INPUTS)))
+
+    def inputs(self, z):
+        """Map driver rows to the physical inputs (dict of (n,) arrays)"""
+        z = np.atleast_2d(z)
+        x = {}
+        for i, name in enumerate(INPUTS):
+            if name in LOGNORMAL_INPUTS:
+                x[name] = self.nominal[name] * np.exp(self.rel_sigma[name] * z[:, i])
+            else:
+                x[name] = z[:, i]
+        return x
+
+    def evaluate(self, z, quantity='β_H', cols=slice(None), amplification=None):
+        """
+        quantity ('β_H', 'enhancement' = β_H/β₀, or 'β_0') for every driver
+        row, shape (samples, T[cols]) ((samples, 1) for 'β_0').
+        amplification: precomputed boundary factor of these rows (overwritten)
+        """
+        x = self.inputs(z)
+        β_0 = (x['Θ'] / (2 * self.params.k_B_eV)) * x['dΛ_dΘ']
+        if quantity == 'β_0':
+            return β_0[:, None]
+        if quantity not in ('β_H', 'enhancement'):
+            raise ValueError("quantity must be 'β_H', 'enhancement' or 'β_0'")
+
+        N_eff = self.params.compute_N_eff(x['ξ_0'], x['a_lattice'], x['E_F'], x['τ'])
+        δΘ_Θ = TheoreticalUncertainty.fundamental_information_limit(N_eff, x['SNR'])
+        δS_S = TheoreticalUncertainty.configuration_entropy_uncertainty(N_eff)
+        if amplification is None:
+            amplification = self.amplification(z, cols)
+
+        # β = β_H,meas × (1 + A × (ε_Θ·δΘ/Θ + ε_S·δS/S)), in place on A
+        β = amplification
+        β *= (x['ε_Θ']*δΘ_Θ + x['ε_S']*δS_S)[:, None]
+        β += 1
+        β *= self.β_H[cols]
+        if quantity == 'enhancement':
+            β /= β_0[:, None]
+        return β
+
+    def amplification(self, z, cols=slice(None)):
+        """Boundary amplification A(T[cols]; ξ_T) per driver row"""
+        ξ_T = self.nominal['ξ_T'] * np.exp(self.rel_sigma['ξ_T'] * np.atleast_2d(z)[:, INPUTS.index('ξ_T')])
+        return TheoreticalUncertainty.boundary_information_decay(self.T[cols], self.T_max, ξ_T[:, None])
+
+    def first_order(self):
+        """TheoreticalUncertainty.compute_total_uncertainty at the nominal inputs"""
+        N_eff = self.params.compute_N_eff(self.nominal['ξ_0'], self.nominal['a_lattice'],
+                                          self.nominal['E_F'], self.nominal['τ'])
+        δβ_total, δβ_stat, amplification = TheoreticalUncertainty.compute_total_uncertainty(
+            self.β_H, N_eff, self.nominal['SNR'], N_eff, self.T, self.T_max, self.nominal['ξ_T']
+        )
+        return {'N_eff': N_eff, 'δβ_H_stat': δβ_stat, 'δβ_H_total': δβ_total,
+                'amplification': amplification}
+
+    def _blocks(self, n_rows, quantity):
+        n_T = 1 if quantity == 'β_0' else len(self.T)
+        step = max(1, BAND_BLOCK_ELEMENTS // max(n_rows, 1))
+        return [slice(i, min(i + step, n_T)) for i in range(0, n_T, step)]
+
+    def run(self, n_samples=100_000, seed=0, quantity='β_H', percentiles=PERCENTILES,
+            n_workers=1):
+        """
+        Percentile bands of quantity(T) over n_samples draws
+
+        Returns
+        -------
+        dict with 'T', 'q', 'percentiles' (len(q), n_T), 'mean', 'std',
+        'β_0' (percentiles of β₀), 'first_order' (analytic δβ_H for comparison)
+        """
+        z = self.sample(n_samples, seed)
+        q = np.asarray(percentiles, dtype=float)
+        parts = _map_blocks(_band_block, (self, z, quantity, q),
+                            self._blocks(n_samples, quantity), n_workers)
+        bands, mean, std = (np.concatenate(p, axis=-1) for p in zip(*parts))
+        return {
+            'T': self.T,
+            'q': q,
+            'percentiles': bands,
+            'mean': mean,
+            'std': std,
+            'β_0': np.percentile(self.evaluate(z, 'β_0')[:, 0], q),
+            'n_samples': n_samples,
+            'first_order': self.first_order(),
+        }
+
+    def sobol_indices(self, n_samples=100_000, seed=0, quantity='β_H', n_workers=1):
+        """
+        First-order (S1) and total (ST) Sobol indices per input and T,
+        shape (len(INPUTS), n_T); costs n_samples × (len(INPUTS) + 2) evaluations
+        """
+        z = self.sample(2*n_samples, seed)
+        A, B = z[:n_samples], z[n_samples:]
+        n_T = 1 if quantity == 'β_0' else len(self.T)
+        step = max(1, SOBOL_BLOCK_ELEMENTS // n_T)
+        chunks = [slice(i, i + step) for i in range(0, n_samples, step)]
+        parts = _map_blocks(_sobol_sums, (self, A, B, quantity), chunks, n_workers)
+        moments, S1, ST = (sum(p) for p in zip(*parts))
+        mean = moments[0] / (2*n_samples)
+        var = moments[1] / (2*n_samples) - mean**2
+        S1, ST = S1 / (n_samples*var), ST / (n_samples*var)
+        return {'inputs': INPUTS, 'S1': S1, 'ST': ST, 'n_samples': n_samples}
+
+
+def _band_block(engine, z, quantity, q, cols):
+    f = engine.evaluate(z, quantity, cols)
+    return np.percentile(f, q, axis=0), f.mean(axis=0), f.std(axis=0)
+
+
+def _sobol_sums(engine, A, B, quantity, rows):
+    # partial sums over a chunk of sample rows (shifted by β_H,meas against
+    # cancellation); A(T; ξ_T) is the only costly factor, and every A_B^i
+    # row shares it with A except for i = ξ_T, where it comes from B
+    A, B = A[rows], B[rows]
+    shift = engine.evaluate(np.zeros((1, len(INPUTS))), quantity, amplification=np.zeros((1, len(engine.T))))[0]
+    amp_A, amp_B = engine.amplification(A), engine.amplification(B)
+    fA = engine.evaluate(A, quantity, amplification=amp_A.copy()) - shift
+    fB = engine.evaluate(B, quantity, amplification=amp_B.copy()) - shift
+    moments = np.stack((fA.sum(0) + fB.sum(0), (fA**2).sum(0) + (fB**2).sum(0)))
+    S1, ST = np.empty((2, len(INPUTS), fA.shape[1]))
+    for i in range(len(INPUTS)):
+        AB = A.copy()
+        AB[:, i] = B[:, i]
+        fAB = engine.evaluate(AB, quantity, amplification=(amp_B if INPUTS[i] == 'ξ_T' else amp_A).copy())
+        fAB -= shift
+        fAB -= fA
+        S1[i] = np.sum(fB * fAB, axis=0)      # Saltelli (2010)
+        ST[i] = 0.5 * np.sum(fAB**2, axis=0)  # Jansen (1999)
+    return moments, S1, ST
+
+
+_SHARED = None
+
+def _set_shared(args):
+    global _SHARED
+    _SHARED = args
+
+def _call_shared(fn, cols):
+    return fn(*_SHARED, cols)
+
+def _map_blocks(fn, args, blocks, n_workers):
+    # large arrays go to each worker once (initializer), blocks are just slices
+    if n_workers <= 1 or len(blocks) == 1:
+        return [fn(*args, cols) for cols in blocks]
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_set_shared,
+                             initargs=(args,)) as pool:
+        return list(pool.map(partial(_call_shared, fn), blocks))
@@ -12,6 +12,7 @@ Agents:
 - ConcreteAgent: Vector-based agent with momentum
 - LLMAgent: Wrapper for real LLMs (optional)
 - AgentEnsemble: Multi-agent system manager
+- VectorizedAgentEnsemble: Struct-of-arrays ensemble for large N
 
 Based on:
 - Original agents.py from project
@@ -54,7 +55,12 @@ class AbstractAgent(ABC):
     - Update state based on coupling
     """
     
-    def __init__(self, agent_id: int, state_dim: int):
+    def __init__(
+        self,
+        agent_id: int,
+        state_dim: int,
+        rng: Optional[np.random.Generator] = None
+    ):
         """
         Initialize agent.
         
@@ -64,9 +70,13 @@ class AbstractAgent(ABC):
             Unique agent identifier
         state_dim : int
             Dimensionality of state vector
+        rng : np.random.Generator, optional
+            Random stream for initialisation and noise. Defaults to the
+            global np.random state (same draws as np.random.randn).
         """
         self.agent_id = agent_id
         self.state_dim = state_dim
+        self.rng = rng if rng is not None else np.random
         self.state = self._initialize_state()
         
         # NEW: Velocity tracking for heavy-ball momentum
@@ -165,7 +175,12 @@ class ConcreteAgent(AbstractAgent):
     3. FDT noise: sqrt(2*Theta*gamma) instead of sqrt(2*Theta)
     """
     
-    def __init__(self, agent_id: int, state_dim: int):
+    def __init__(
+        self,
+        agent_id: int,
+        state_dim: int,
+        rng: Optional[np.random.Generator] = None
+    ):
         """
         Initialize concrete agent with momentum.
         
@@ -175,14 +190,16 @@ class ConcreteAgent(AbstractAgent):
             Agent identifier
         state_dim : int
             State dimensionality
+        rng : np.random.Generator, optional
+            Random stream (defaults to global np.random)
         """
-        super().__init__(agent_id, state_dim)
+        super().__init__(agent_id, state_dim, rng)
         
     def _initialize_state(self) -> np.ndarray:
         """
         Initialize with random normalized vector.
         """
-        state = np.random.randn(self.state_dim)
+        state = self.rng.standard_normal(self.state_dim)
         state = state / (np.linalg.norm(state) + 1e-10)
         return state
     
@@ -205,7 +222,7 @@ class ConcreteAgent(AbstractAgent):
             perturbation = 0.1 * direction
         else:
             # Random small perturbation
-            perturbation = 0.01 * np.random.randn(self.state_dim)
+            perturbation = 0.01 * self.rng.standard_normal(self.state_dim)
         
         # New response state
         response_state = self.state + perturbation
@@ -263,7 +280,7 @@ class ConcreteAgent(AbstractAgent):
         # 3. FDT-consistent thermal noise
         # Noise strength: sqrt(2*Theta*gamma)
         noise_strength = np.sqrt(2.0 * theta * gamma)
-        noise = noise_strength * np.random.randn(self.state_dim)
+        noise = noise_strength * self.rng.standard_normal(self.state_dim)
         
         # 4. Update velocity (heavy-ball momentum)
         # dv/dt = F_coupling - gamma*v + sqrt(2*Theta*gamma)*eta
@@ -281,7 +298,7 @@ class ConcreteAgent(AbstractAgent):
             self.state = new_state / norm
         else:
             # Fallback to random if collapse
-            self.state = np.random.randn(self.state_dim)
+            self.state = self.rng.standard_normal(self.state_dim)
             self.state = self.state / (np.linalg.norm(self.state) + 1e-10)
             self.velocity = np.zeros(self.state_dim)
 
@@ -301,7 +318,8 @@ class LLMAgent(AbstractAgent):
         agent_id: int,
         state_dim: int,
         model_name: str = "claude-sonnet-4",
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        rng: Optional[np.random.Generator] = None
     ):
         """
         Initialize LLM agent.
@@ -316,6 +334,8 @@ class LLMAgent(AbstractAgent):
             LLM model identifier
         api_key : str, optional
             API key for LLM service
+        rng : np.random.Generator, optional
+            Random stream (defaults to global np.random)
         """
         self.model_name = model_name
         self.api_key = api_key
@@ -325,11 +345,11 @@ class LLMAgent(AbstractAgent):
         # In real implementation, use proper embedding model
         self.embedding_dim = state_dim
         
-        super().__init__(agent_id, state_dim)
+        super().__init__(agent_id, state_dim, rng)
     
     def _initialize_state(self) -> np.ndarray:
         """Initialize with random embedding."""
-        state = np.random.randn(self.state_dim)
+        state = self.rng.standard_normal(self.state_dim)
         return state / (np.linalg.norm(state) + 1e-10)
     
     def generate_response(
@@ -352,7 +372,7 @@ class LLMAgent(AbstractAgent):
         response_text = f"[LLM Agent {self.agent_id}]: Response to '{query}'"
         
         # Create embedding (simplified - random perturbation of state)
-        embedding = self.state + 0.1 * np.random.randn(self.state_dim)
+        embedding = self.state + 0.1 * self.rng.standard_normal(self.state_dim)
         embedding = embedding / (np.linalg.norm(embedding) + 1e-10)
         
         response = AgentResponse(
@@ -394,7 +414,7 @@ class LLMAgent(AbstractAgent):
         
         # FDT noise
         noise_strength = np.sqrt(2.0 * theta * gamma)
-        noise = noise_strength * np.random.randn(self.state_dim)
+        noise = noise_strength * self.rng.standard_normal(self.state_dim)
         
         # Update velocity
         dv = (force_coupling + force_damping + noise) * step_size
@@ -423,7 +443,8 @@ class AgentEnsemble:
         self,
         n_agents: int,
         state_dim: int,
-        agent_type: str = "concrete"
+        agent_type: str = "concrete",
+        rng: Optional[np.random.Generator] = None
     ):
         """
         Create agent ensemble.
@@ -436,10 +457,15 @@ class AgentEnsemble:
             State vector dimension
         agent_type : str
             'concrete' or 'llm'
+        rng : np.random.Generator, optional
+            Random stream shared by all agents (defaults to global
+            np.random). Pass a per-run Generator to make runs independent
+            of global state, e.g. in worker processes.
         """
         self.n_agents = n_agents
         self.state_dim = state_dim
         self.agent_type = agent_type
+        self.rng = rng
         
         # Create agents
         self.agents = self._create_agents()
@@ -450,9 +476,9 @@ class AgentEnsemble:
         
         for i in range(self.n_agents):
             if self.agent_type == "concrete":
-                agent = ConcreteAgent(i, self.state_dim)
+                agent = ConcreteAgent(i, self.state_dim, rng=self.rng)
             elif self.agent_type == "llm":
-                agent = LLMAgent(i, self.state_dim)
+                agent = LLMAgent(i, self.state_dim, rng=self.rng)
             else:
                 raise ValueError(f"Unknown agent type: {self.agent_type}")
                 
@@ -530,6 +556,22 @@ class AgentEnsemble:
             
         return responses
     
+    def generate_response_states(
+        self,
+        query: str,
+        context: Optional[Dict] = None
+    ) -> np.ndarray:
+        """
+        Generate responses and return only their embeddings.
+        
+        Returns
+        -------
+        embeddings : np.ndarray
+            Shape (N, D) array of response embeddings
+        """
+        responses = self.generate_responses(query, context)
+        return np.array([r.embedding for r in responses])
+    
     def apply_coupling(
         self,
         coupling_matrix: np.ndarray,
@@ -568,6 +610,204 @@ class AgentEnsemble:
             agent.update_state(influence, theta, gamma, step_size)
 
 
+class VectorizedAgentEnsemble:
+    """
+    Struct-of-arrays ensemble of concrete agents.
+    
+    Drop-in replacement for AgentEnsemble(agent_type='concrete') that keeps
+    all states and velocities in two (N, D) arrays instead of N agent
+    objects, so every step is a handful of BLAS/NumPy calls:
+    
+        F = D @ S - rowsum(D) * S          (= Σ_j D_ij (s_j - s_i))
+        v ← v + (F - γv + sqrt(2Θγ)η) dt
+        s ← (s + v dt) / ||s + v dt||
+    
+    Random draws are taken as one (N, D) block in agent order, which is the
+    same stream the per-agent loop consumes, so both ensembles follow the
+    same trajectory (up to summation rounding) from the same seed.
+    """
+    
+    def __init__(
+        self,
+        n_agents: int,
+        state_dim: int,
+        agent_type: str = "concrete",
+        rng: Optional[np.random.Generator] = None
+    ):
+        """
+        Create vectorized ensemble.
+        
+        Parameters
+        ----------
+        n_agents : int
+            Number of agents
+        state_dim : int
+            State vector dimension
+        agent_type : str
+            Only 'concrete' is supported (LLM agents need per-agent calls)
+        rng : np.random.Generator, optional
+            Random stream (defaults to global np.random)
+        """
+        if agent_type != "concrete":
+            raise ValueError(
+                f"VectorizedAgentEnsemble supports only 'concrete' agents, got: {agent_type}"
+            )
+        
+        self.n_agents = n_agents
+        self.state_dim = state_dim
+        self.agent_type = agent_type
+        self.rng = rng if rng is not None else np.random
+        
+        # Same initialisation as ConcreteAgent, one row per agent
+        states = self.rng.standard_normal((n_agents, state_dim))
+        self.states = states / (np.linalg.norm(states, axis=1, keepdims=True) + 1e-10)
+        self.velocities = np.zeros((n_agents, state_dim))
+    
+    def get_states(self) -> np.ndarray:
+        """
+        Get all agent states.
+        
+        Returns
+        -------
+        states : np.ndarray
+            Shape (N, D) array of agent states
+        """
+        return self.states.copy()
+    
+    def get_velocities(self) -> np.ndarray:
+        """
+        Get all agent velocities.
+        
+        Returns
+        -------
+        velocities : np.ndarray
+            Shape (N, D) array of agent velocities
+        """
+        return self.velocities.copy()
+    
+    def set_states(self, states: np.ndarray):
+        """
+        Set agent states (rows normalized to unit length, as set_state).
+        
+        Parameters
+        ----------
+        states : np.ndarray
+            Shape (N, D) array of new states
+        """
+        states = np.array(states, dtype=float)
+        norms = np.linalg.norm(states, axis=1, keepdims=True)
+        ok = norms[:, 0] > 1e-10
+        states[ok] /= norms[ok]
+        self.states = states
+    
+    def generate_response_states(
+        self,
+        query: str,
+        context: Optional[Dict] = None
+    ) -> np.ndarray:
+        """
+        Generate response embeddings for all agents at once.
+        
+        Each agent moves 10% of the way toward the ensemble mean state
+        (as ConcreteAgent.generate_response with 'mean_state' in context).
+        
+        Returns
+        -------
+        embeddings : np.ndarray
+            Shape (N, D) array of response embeddings
+        """
+        if context is None:
+            context = {}
+        context['mean_state'] = np.mean(self.states, axis=0)
+        
+        response_states = self.states + 0.1 * (context['mean_state'] - self.states)
+        norms = np.linalg.norm(response_states, axis=1, keepdims=True)
+        return response_states / (norms + 1e-10)
+    
+    def generate_responses(
+        self,
+        query: str,
+        context: Optional[Dict] = None
+    ) -> List[AgentResponse]:
+        """
+        Generate responses from all agents (AgentEnsemble-compatible).
+        
+        Prefer generate_response_states() for large N; this wraps each row
+        in an AgentResponse.
+        """
+        embeddings = self.generate_response_states(query, context)
+        return [
+            AgentResponse(
+                content=f"Agent {i} abstract response",
+                embedding=embeddings[i],
+                metadata={'agent_id': i, 'query': query}
+            )
+            for i in range(self.n_agents)
+        ]
+    
+    def coupling_forces(self, coupling_matrix: np.ndarray) -> np.ndarray:
+        """
+        Coupling force on every agent: F_i = Σ_j D_ij (s_j - s_i).
+        
+        The diagonal of D cancels out, so no masking is needed.
+        
+        Parameters
+        ----------
+        coupling_matrix : np.ndarray
+            Coupling matrix D, shape (N, N)
+            
+        Returns
+        -------
+        forces : np.ndarray
+            Shape (N, D)
+        """
+        D = np.asarray(coupling_matrix, dtype=float)
+        return D @ self.states - D.sum(axis=1)[:, None] * self.states
+    
+    def apply_coupling(
+        self,
+        coupling_matrix: np.ndarray,
+        theta: float,
+        gamma: float = 0.1,
+        step_size: float = 0.1
+    ):
+        """
+        Apply coupling influence to all agents with momentum (batched).
+        
+        Parameters
+        ----------
+        coupling_matrix : np.ndarray
+            Coupling matrix D, shape (N, N)
+        theta : float
+            Information temperature
+        gamma : float
+            Viscosity parameter
+        step_size : float
+            Integration step size
+        """
+        force_coupling = self.coupling_forces(coupling_matrix)
+        force_damping = -gamma * self.velocities
+        
+        noise_strength = np.sqrt(2.0 * theta * gamma)
+        noise = noise_strength * self.rng.standard_normal((self.n_agents, self.state_dim))
+        
+        dv = (force_coupling + force_damping + noise) * step_size
+        self.velocities = self.velocities + dv
+        
+        new_states = self.states + self.velocities * step_size
+        norms = np.linalg.norm(new_states, axis=1, keepdims=True)
+        
+        collapsed = norms[:, 0] <= 1e-10
+        if np.any(collapsed):
+            # Fallback to random if collapse (as ConcreteAgent)
+            norms[collapsed] = 1.0
+            fresh = self.rng.standard_normal((int(collapsed.sum()), self.state_dim))
+            new_states[collapsed] = fresh / (np.linalg.norm(fresh, axis=1, keepdims=True) + 1e-10)
+            self.velocities[collapsed] = 0.0
+        
+        self.states = new_states / norms
+
+
 def create_mixed_ensemble(
     n_concrete: int,
     n_llm: int,
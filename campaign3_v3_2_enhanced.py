@@ -9,6 +9,9 @@ VERSION: 3.2 - ENHANCED SEMANTIC EMBEDDINGS
 - Pluggable embedding backend architecture
 - Role-based weighting (system/user/assistant)
 - Supports cache_folder for model storage (e.g., F:/models on Windows)
+- Optional streaming hashed TF-IDF backend (streaming_tfidf.py, online
+  IDF, sparse vectors, no refit per corpus); opt in with
+  set_embedding_backend(HashingTFIDFBackend(...))
 
 Improvements over v3.1:
 ✓ Real semantic vectors (not hash-based)
@@ -31,8 +34,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.preprocessing import normalize
+import scipy.sparse as sp
 import pickle
 import os
+import hashlib
+
+from embedding_cache import EmbeddingCache
+from streaming_tfidf import HashingTFIDFBackend, stack_rows, similarities, dot, row_values, vector_std
 
 # ============================================================================
 # CONFIGURATION
@@ -55,11 +63,11 @@ class EmbeddingBackend(Protocol):
         ...
     
     def encode(self, texts: List[str]) -> np.ndarray:
-        """Encode texts to embeddings"""
+        """Encode texts to embeddings (dense rows or a sparse matrix)"""
         ...
     
     def encode_single(self, text: str) -> np.ndarray:
-        """Encode single text to embedding"""
+        """Encode single text to embedding (1-D array or 1 × d sparse row)"""
         ...
     
     def save(self, path: str) -> None:
@@ -84,6 +92,9 @@ class TFIDFBackend:
     - sublinear_tf=True for better length handling
     - L2 normalization (default)
     - Role-based weighting support
+    - Optional packed embedding cache (use_cache), namespaced by a
+      fingerprint of the fitted vocabularies / IDF weights so a refit
+      never serves stale vectors
     """
     
     def __init__(
@@ -93,7 +104,8 @@ class TFIDFBackend:
         word_ngram_range: Tuple[int, int] = (1, 2),
         min_df: int = 1,  # Changed to 1 for small corpus compatibility
         max_features: Optional[int] = None,
-        cache_folder: str = CACHE_FOLDER
+        cache_folder: str = CACHE_FOLDER,
+        use_cache: bool = False
     ):
         self.dim = dim
         self.char_ngram_range = char_ngram_range
@@ -101,6 +113,8 @@ class TFIDFBackend:
         self.min_df = min_df
         self.max_features = max_features if max_features is not None else dim
         self.cache_folder = cache_folder
+        self.use_cache = use_cache
+        self.embedding_cache = None
         
         # Create cache folder if needed
         os.makedirs(cache_folder, exist_ok=True)
@@ -136,6 +150,17 @@ class TFIDFBackend:
         self.char_vectorizer.fit(corpus)
         self.word_vectorizer.fit(corpus)
         self.fitted = True
+        self._open_cache()
+    
+    def _open_cache(self) -> None:
+        """Cache namespace for the current fitted state"""
+        if not self.use_cache:
+            return
+        h = hashlib.md5()
+        for vectorizer in (self.char_vectorizer, self.word_vectorizer):
+            h.update(json.dumps(sorted((k, int(v)) for k, v in vectorizer.vocabulary_.items())).encode())
+            h.update(vectorizer.idf_.tobytes())
+        self.embedding_cache = EmbeddingCache(self.cache_folder, 'tfidf', f"dim{self.dim}-{h.hexdigest()[:16]}")
     
     def encode(self, texts: List[str]) -> np.ndarray:
         """Encode multiple texts"""
@@ -143,6 +168,11 @@ class TFIDFBackend:
             # Auto-fit on first call
             self.fit(texts)
         
+        if self.embedding_cache is not None:
+            return self.embedding_cache.embed(texts, self._transform, batch_size=256)
+        return self._transform(texts)
+    
+    def _transform(self, texts: List[str]) -> np.ndarray:
         # Get char and word embeddings
         char_embs = self.char_vectorizer.transform(texts).toarray()
         word_embs = self.word_vectorizer.transform(texts).toarray()
@@ -201,6 +231,8 @@ class TFIDFBackend:
             self.char_vectorizer = data['char_vectorizer']
             self.word_vectorizer = data['word_vectorizer']
             self.fitted = data['fitted']
+        if self.fitted:
+            self._open_cache()
 
 # ============================================================================
 # GLOBAL BACKEND (can be swapped)
@@ -208,12 +240,12 @@ class TFIDFBackend:
 
 _embedding_backend = TFIDFBackend(dim=256, cache_folder=CACHE_FOLDER)
 
-def get_embedding_backend() -> TFIDFBackend:
+def get_embedding_backend() -> EmbeddingBackend:
     """Get current embedding backend"""
     return _embedding_backend
 
 def set_embedding_backend(backend: EmbeddingBackend) -> None:
-    """Set embedding backend (for future: neural backends)"""
+    """Set embedding backend (e.g. HashingTFIDFBackend, future neural backends)"""
     global _embedding_backend
     _embedding_backend = backend
 
@@ -301,6 +333,9 @@ def semantic_embedding(text: str, role: str = "user") -> np.ndarray:
     backend = get_embedding_backend()
     return backend.encode_with_role_weights(text, role)
 
+def _l2_normalize(x):
+    return normalize(x, norm='l2') if sp.issparse(x) else normalize([x], norm='l2')[0]
+
 def track_layers(
     text: str,
     context: List[str],
@@ -317,18 +352,24 @@ def track_layers(
     # L2: With recent context influence
     if len(context) > 0:
         context_embs = [semantic_embedding(c, role) for c in context[-3:]]
-        context_emb = np.mean(context_embs, axis=0)
+        context_emb = sum(context_embs[1:], context_embs[0]) / len(context_embs)
         X2 = 0.7 * X1 + 0.3 * context_emb
     else:
         X2 = X1
     
     # L3: Semantic (add noise for diversity)
-    X3 = X2 + np.random.randn(len(X2)) * 0.1
-    X3 = normalize([X3], norm='l2')[0]
+    if sp.issparse(X2):
+        # hashed vectors: perturb the stored entries only, dense noise
+        # over the hash space would swamp the signal
+        X3 = X2.tocsr(copy=True)
+        X3.data += np.random.randn(X3.nnz) * 0.1
+    else:
+        X3 = X2 + np.random.randn(len(X2)) * 0.1
+    X3 = _l2_normalize(X3)
     
     # L4: Pragmatic (goal modulation)
     X4 = X3 * 1.05
-    X4 = normalize([X4], norm='l2')[0]
+    X4 = _l2_normalize(X4)
     
     # L5: Meta (self-monitoring)
     X5 = X4
@@ -355,6 +396,7 @@ class SigmaStorage:
     def __init__(self, max_size: int = 100):
         self.max_size = max_size
         self.memories = []
+        self._matrix = None  # stacked embeddings, rebuilt after add()
         
     def add(self, embedding: np.ndarray, text: str, turn_num: int):
         """Add memory"""
@@ -365,6 +407,7 @@ class SigmaStorage:
             'timestamp': datetime.now().isoformat()
         }
         self.memories.append(memory)
+        self._matrix = None
         
         if len(self.memories) > self.max_size:
             self.memories = self.memories[-self.max_size:]
@@ -374,17 +417,16 @@ class SigmaStorage:
         if len(self.memories) == 0:
             return []
         
-        # Compute similarities
-        similarities = []
-        for mem in self.memories:
-            sim = np.dot(query_embedding, mem['embedding'])
-            similarities.append((sim, mem))
+        # Compute similarities (one sparse / dense matrix-vector product)
+        if self._matrix is None:
+            self._matrix = stack_rows(self.get_all_embeddings())
+        sims = similarities(query_embedding, self._matrix)
         
-        # Sort by similarity
-        similarities.sort(reverse=True, key=lambda x: x[0])
+        # Sort by similarity (ties keep insertion order)
+        order = np.argsort(-sims, kind='stable')[:k]
         
         # Return top k texts
-        return [mem['text'] for _, mem in similarities[:k]]
+        return [self.memories[i]['text'] for i in order]
     
     def get_all_embeddings(self) -> List[np.ndarray]:
         """Get all embeddings for metrics"""
@@ -402,19 +444,20 @@ def compute_turn_metrics(
 ) -> Dict:
     """Compute metrics for single turn"""
     # n_eff: Approximate from layer diversity
-    layer_stds = [np.std(layers[f'X{i}']) for i in range(1, 6)]
+    layer_stds = [vector_std(layers[f'X{i}']) for i in range(1, 6)]
     weights = np.array(layer_stds) / (np.sum(layer_stds) + 1e-10)
     n_eff = np.exp(-np.sum(weights * np.log(weights + 1e-10)))
     
     # θ̂: Information temperature
-    response_entropy = -np.sum(response_emb * np.log(np.abs(response_emb) + 1e-10))
-    theta_hat = response_entropy / np.log(len(response_emb))
+    values = row_values(response_emb)  # zero entries add nothing
+    response_entropy = -np.sum(values * np.log(np.abs(values) + 1e-10))
+    theta_hat = response_entropy / np.log(response_emb.shape[-1])
     
     # I_ratio: Indirect information
     if len(context_embs) > 0:
-        I_direct = np.abs(np.dot(query_emb, response_emb))
-        context_avg = np.mean(context_embs, axis=0)
-        I_indirect = np.abs(np.dot(context_avg, response_emb))
+        I_direct = np.abs(dot(query_emb, response_emb))
+        # mean(context) · response = mean of the per-memory dot products
+        I_indirect = np.abs(np.mean(similarities(response_emb, context_embs)))
         I_ratio = I_indirect / (I_direct + I_indirect + 1e-10)
     else:
         I_ratio = 0.0
@@ -475,7 +518,7 @@ class DialogueRunner:
             print(f"\n{'='*80}")
             print(f"DIALOGUE SESSION: {session_id}")
             print(f"Template: {template['id']} ({template.get('category', 'unknown')})")
-            print(f"Embeddings: TF-IDF v3.2 Enhanced (char 3-5, word 1-2)")
+            print(f"Embeddings: {type(get_embedding_backend()).__name__} (char 3-5, word 1-2)")
             print(f"{'='*80}\n")
         
         session = DialogueSession(
@@ -501,8 +544,9 @@ class DialogueRunner:
                 query = f"Continue the discussion (turn {turn_num})"
             
             # Agent A responds
+            query_emb = semantic_embedding(query, role="user")
             context_texts = self.σ_storage.retrieve_relevant(
-                semantic_embedding(query),
+                query_emb,
                 k=5
             )
             
@@ -516,7 +560,6 @@ class DialogueRunner:
             layers = track_layers(response, context_texts)
             
             # Embeddings
-            query_emb = semantic_embedding(query, role="user")
             response_emb = layers['X3']  # Use semantic layer
             
             # Compute metrics
@@ -643,7 +686,7 @@ def run_pilot(api_key: str, n_dialogues: int = 3):
     print("\n" + "="*80)
     print("CAMPAIGN #3: LLM INTEGRATION - v3.2 ENHANCED EMBEDDINGS")
     print(f"Running {n_dialogues} dialogues")
-    print(f"Backend: TF-IDF (char 3-5, word 1-2, sublinear_tf)")
+    print(f"Backend: {type(get_embedding_backend()).__name__} (char 3-5, word 1-2, sublinear_tf)")
     print("="*80)
     
     runner = DialogueRunner(api_key)
@@ -673,7 +716,7 @@ def run_pilot(api_key: str, n_dialogues: int = 3):
     # Save results
     results_summary = {
         'version': '3.2',
-        'embedding_backend': 'TF-IDF Enhanced',
+        'embedding_backend': type(get_embedding_backend()).__name__,
         'pilot_date': datetime.now().isoformat(),
         'n_dialogues': len(results),
         'results': [
@@ -38,6 +38,12 @@ from scipy.stats.mstats import winsorize
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 
+from knn_mi import MIContext, SlidingMIWindow
+
+# Largest window (T_window * N_agents rows) handled by the incremental
+# trajectory mode; its distance buffers take 8 * rows² bytes per layer
+INCREMENTAL_MAX_ROWS = 4096
+
 
 # ---------------------------------------------------------------------------
 # Mutual Information Estimation
@@ -196,6 +202,20 @@ class EmbeddingPreprocessor:
 # Core I_ratio Computation
 # ---------------------------------------------------------------------------
 
+def _failed_I_ratio(e: Exception) -> Tuple[float, Dict[str, float]]:
+    """I_ratio = 0 with an error diagnostic for a failed MI estimation."""
+    print(f"  [ERROR] MI estimation failed: {e}")
+    return 0.0, {
+        "error": str(e),
+        "I_total": 0.0,
+        "I_4_13": 0.0,
+        "I_4_3": 0.0,
+        "I_direct": 0.0,
+        "I_indirect": 0.0,
+        "I_ratio": 0.0
+    }
+
+
 def compute_I_ratio_L1_L3_L4(
     X1: np.ndarray,
     X3: np.ndarray,
@@ -214,7 +234,8 @@ def compute_I_ratio_L1_L3_L4(
         X4: (N, d4) embeddings z L4 (reflective)
         k: liczba sąsiadów dla k-NN MI estimator
         epsilon: regularization dla dzielenia
-        method: "kraskov" lub "sklearn"
+        method: "kraskov", "sklearn" lub "ksg" (wspólne drzewa k-NN przez
+                MIContext + jednoprzebiegowy estymator Frenzel-Pompe dla I_direct)
         verbose: print intermediate results
         
     Returns:
@@ -243,6 +264,9 @@ def compute_I_ratio_L1_L3_L4(
     
     # Estimate MIs
     try:
+        if method == "ksg":
+            return _compute_I_ratio_shared(X1, X3, X4, k=k, epsilon=epsilon, verbose=verbose)
+        
         if verbose:
             print(f"\n  Estimating I(X4 : X1)...")
         I_total = estimate_mi_knn(X4, X1, k=k, method=method)
@@ -255,16 +279,7 @@ def compute_I_ratio_L1_L3_L4(
             print(f"  Estimating I(X4 : X3)...")
         I_4_3 = estimate_mi_knn(X4, X3, k=k, method=method)
     except Exception as e:
-        print(f"  [ERROR] MI estimation failed: {e}")
-        return 0.0, {
-            "error": str(e),
-            "I_total": 0.0,
-            "I_4_13": 0.0,
-            "I_4_3": 0.0,
-            "I_direct": 0.0,
-            "I_indirect": 0.0,
-            "I_ratio": 0.0
-        }
+        return _failed_I_ratio(e)
     
     # Compute components
     I_direct = I_4_13 - I_4_3
@@ -299,6 +314,66 @@ def compute_I_ratio_L1_L3_L4(
     return I_ratio, diagnostics
 
 
+def _compute_I_ratio_shared(
+    X1: np.ndarray,
+    X3: np.ndarray,
+    X4: np.ndarray,
+    k: int = 5,
+    epsilon: float = 1e-8,
+    verbose: bool = False,
+    context=None
+) -> Tuple[float, Dict[str, float]]:
+    """
+    Wariant method="ksg": wszystkie estymaty na jednym MIContext.
+    
+    KSG w normie max (jak npeet), drzewa X1/X3/X4 budowane raz na okno:
+      I_total  = I(X4 : X1)
+      I_4_3    = I(X4 : X3)
+      I_direct = I(X4 : X1 | X3)   (Frenzel-Pompe, jeden przebieg)
+      I_4_13   = I_direct + I_4_3  (chain rule, do diagnostyki)
+    
+    context: gotowy obiekt z metodami mi/cmi nad blokami "X1", "X3", "X4"
+             (np. SlidingMIWindow w trybie inkrementalnym); X1/X3/X4 są
+             wtedy używane tylko do diagnostyki.
+    """
+    if context is None:
+        context = MIContext({"X1": X1, "X3": X3, "X4": X4}, k=k, p=np.inf, strict=True)
+    
+    if verbose:
+        print(f"\n  Estimating I(X4 : X1), I(X4 : X3), I(X4 : X1 | X3) (shared trees)...")
+    
+    I_total = max(context.mi("X4", "X1"), 0.0)
+    I_4_3 = max(context.mi("X4", "X3"), 0.0)
+    I_direct = max(context.cmi("X4", "X1", "X3"), 0.0)
+    I_4_13 = I_direct + I_4_3
+    
+    I_indirect = max(I_total - I_direct, 0.0)
+    
+    I_ratio = I_indirect / (I_total + epsilon)
+    I_ratio = float(np.clip(I_ratio, 0.0, 1.0))
+    
+    diagnostics = {
+        "I_total": float(I_total),
+        "I_4_13": float(I_4_13),
+        "I_4_3": float(I_4_3),
+        "I_direct": float(I_direct),
+        "I_indirect": float(I_indirect),
+        "I_ratio": I_ratio,
+        "n_samples": X1.shape[0],
+        "k_neighbors": k,
+        "method": "ksg"
+    }
+    
+    if verbose:
+        print(f"\n  Results:")
+        print(f"    I_total    = {I_total:.4f} nats")
+        print(f"    I_direct   = {I_direct:.4f} nats  (Frenzel-Pompe)")
+        print(f"    I_indirect = {I_indirect:.4f} nats  (I_total - I_direct)")
+        print(f"    I_ratio    = {I_ratio:.4f}  [threshold: 0.30]")
+    
+    return I_ratio, diagnostics
+
+
 # ---------------------------------------------------------------------------
 # Trajectory Computation (Sliding Window)
 # ---------------------------------------------------------------------------
@@ -309,7 +384,8 @@ def compute_I_ratio_trajectory(
     stride: int = 50,
     k: int = 5,
     method: str = "kraskov",
-    verbose: bool = False
+    verbose: bool = False,
+    incremental: bool = False
 ) -> Tuple[np.ndarray, List[Dict[str, float]]]:
     """
     Oblicza I_ratio trajectory z sliding window na logach temporalnych.
@@ -320,8 +396,15 @@ def compute_I_ratio_trajectory(
         window_size: rozmiar okna czasowego
         stride: krok przesunięcia okna
         k: k dla MI estimator
-        method: "kraskov" lub "sklearn"
+        method: "kraskov", "sklearn" lub "ksg"
         verbose: print progress
+        incremental: (tylko method="ksg") zamiast liczyć każde okno od zera,
+                     utrzymuje SlidingMIWindow: przy przesunięciu dodaje
+                     stride*N nowych wierszy, usuwa najstarsze i odświeża
+                     promienie/liczniki tylko dla punktów, których sąsiedztwo
+                     się zmieniło. Wynik jak dla method="ksg" per okno.
+                     Okna większe niż INCREMENTAL_MAX_ROWS wierszy liczone
+                     są per okno.
         
     Returns:
         I_ratio_trajectory: (n_windows,) array
@@ -344,10 +427,28 @@ def compute_I_ratio_trajectory(
         print(f"    window_size = {window_size}")
         print(f"    stride = {stride}")
     
+    if incremental and method != "ksg":
+        raise ValueError(f"incremental=True requires method='ksg', got '{method}'")
+    
+    rows_per_step = int(np.prod(logs["X1"].shape[1:-1]))
+    window_rows = window_size * rows_per_step
+    if incremental and window_rows > INCREMENTAL_MAX_ROWS:
+        print(f"  [WARNING] window of {window_rows} rows exceeds INCREMENTAL_MAX_ROWS="
+              f"{INCREMENTAL_MAX_ROWS}, computing windows independently")
+        incremental = False
+    
+    sliding = None
+    if incremental:
+        sliding = SlidingMIWindow(
+            {key: logs[key].shape[-1] for key in required_keys},
+            capacity=window_rows, k=k, p=np.inf, strict=True
+        )
+    
     I_ratios = []
     diagnostics_list = []
     
     n_windows = (T - window_size) // stride + 1
+    prev_end = 0
     
     for i, t_start in enumerate(range(0, T - window_size + 1, stride)):
         t_end = t_start + window_size
@@ -361,10 +462,28 @@ def compute_I_ratio_trajectory(
         X4_window = logs["X4"][t_start:t_end].reshape(-1, logs["X4"].shape[-1])
         
         # Compute I_ratio for this window
-        I_ratio, diag = compute_I_ratio_L1_L3_L4(
-            X1_window, X3_window, X4_window,
-            k=k, method=method, verbose=False
-        )
+        if sliding is not None:
+            # Drop timesteps that left the window, append the ones that entered
+            n_evict = 0 if i == 0 else min(stride, window_size) * rows_per_step
+            t_new = max(prev_end, t_start)
+            sliding.slide(
+                {key: logs[key][t_new:t_end].reshape(-1, logs[key].shape[-1])
+                 for key in required_keys},
+                n_evict=n_evict
+            )
+            prev_end = t_end
+            try:
+                I_ratio, diag = _compute_I_ratio_shared(
+                    X1_window, X3_window, X4_window,
+                    k=k, context=sliding
+                )
+            except Exception as e:
+                I_ratio, diag = _failed_I_ratio(e)
+        else:
+            I_ratio, diag = compute_I_ratio_L1_L3_L4(
+                X1_window, X3_window, X4_window,
+                k=k, method=method, verbose=False
+            )
         
         I_ratios.append(I_ratio)
         diagnostics_list.append({
@@ -513,10 +632,16 @@ Examples:
         "--method",
         type=str,
         default="kraskov",
-        choices=["kraskov", "sklearn"],
+        choices=["kraskov", "sklearn", "ksg"],
         help="MI estimation method (default: kraskov)"
     )
     
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Incremental sliding-window trajectory (requires --method ksg)"
+    )
+    
     parser.add_argument(
         "--pca-dim",
         type=int,
@@ -596,7 +721,8 @@ Examples:
             stride=args.stride,
             k=args.k,
             method=args.method,
-            verbose=args.verbose
+            verbose=args.verbose,
+            incremental=args.incremental
         )
         
         results = {
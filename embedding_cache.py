@@ -0,0 +1,193 @@
+"""
+EMBEDDING CACHE - PACKED, CONTENT-ADDRESSED STORE
+=================================================
+
+One store per (provider, model) under cache_dir:
+
+    <cache_dir>/<provider>__<model>/
+        vectors.f32   float32 rows, appended in place (row i = i-th key)
+        keys.bin      16-byte md5(text) digests, appended after the rows
+        meta.json     provider, model, dim
+
+keys.bin is the on-disk hash index: it is read once into a dict
+{digest: row} when the store is opened. Rows are read back through a
+memory map, so a batch of hits is one fancy-indexed gather. Rows are
+written before their keys; a partial append (killed process) is cut back
+to the last complete (row, key) pair on the next open.
+
+A store assumes a single writer process.
+
+Author: Cognitive Lagoon Project
+Date: 2025-11-18
+Version: 1.0
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+KEY_BYTES = 16
+
+
+def text_key(text: str) -> bytes:
+    """Content address of a text (md5 digest, as the old <md5>.npy names)"""
+    return hashlib.md5(text.encode()).digest()
+
+
+class EmbeddingCache:
+    """
+    Append-only float32 embedding store keyed by (provider, model, text hash)
+
+    Parameters
+    ----------
+    cache_dir : str or Path
+        Root folder (one sub-folder per provider/model)
+    provider, model : str
+        Namespace of the embeddings
+    dim : int, optional
+        Embedding dimension; taken from the first stored batch if None
+    """
+
+    def __init__(self, cache_dir, provider: str, model: str, dim: Optional[int] = None):
+        self.provider = provider
+        self.model = model
+        name = re.sub(r'[^A-Za-z0-9._-]+', '_', f"{provider}__{model}")
+        self.path = Path(cache_dir) / name
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._vectors = self.path / "vectors.f32"
+        self._keys = self.path / "keys.bin"
+        self._meta = self.path / "meta.json"
+
+        self.dim = dim
+        if self._meta.exists():
+            stored = json.loads(self._meta.read_text())['dim']
+            if dim is not None and dim != stored:
+                raise ValueError(f"{self.path} holds dim={stored} embeddings, not {dim}")
+            self.dim = stored
+
+        self.index: Dict[bytes, int] = {}
+        self._mmap = None
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self._open()
+
+    # ------------------------------------------------------------------ store
+
+    def _open(self):
+        n_keys = self._keys.stat().st_size // KEY_BYTES if self._keys.exists() else 0
+        n_rows = (self._vectors.stat().st_size // (4*self.dim)
+                  if self.dim and self._vectors.exists() else 0)
+        n = min(n_keys, n_rows)
+        # drop a torn append
+        if self._keys.exists() and self._keys.stat().st_size != n*KEY_BYTES:
+            os.truncate(self._keys, n*KEY_BYTES)
+        if self._vectors.exists() and self.dim and self._vectors.stat().st_size != n*4*self.dim:
+            os.truncate(self._vectors, n*4*self.dim)
+        keys = self._keys.read_bytes() if n else b''
+        self.index = {keys[i*KEY_BYTES:(i + 1)*KEY_BYTES]: i for i in range(n)}
+
+    def _rows(self) -> np.ndarray:
+        n = len(self.index)
+        if self._mmap is None or self._mmap.shape[0] != n:
+            self._mmap = (np.memmap(self._vectors, dtype=np.float32, mode='r', shape=(n, self.dim))
+                          if n else np.empty((0, self.dim or 0), dtype=np.float32))
+        return self._mmap
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, text: str) -> bool:
+        return text_key(text) in self.index
+
+    def get_many(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (embeddings, hit mask) for texts; rows of misses are zero.
+        All hits are read with one gather from the memory map.
+        """
+        rows = np.array([self.index.get(text_key(t), -1) for t in texts], dtype=np.int64)
+        hit = rows >= 0
+        out = np.zeros((len(texts), self.dim or 0), dtype=np.float32)
+        if hit.any():
+            out[hit] = self._rows()[rows[hit]]
+            self.bytes_read += int(hit.sum()) * 4 * self.dim
+        self.hits += int(hit.sum())
+        self.misses += int((~hit).sum())
+        return out, hit
+
+    def put_many(self, texts: Sequence[str], embeddings: np.ndarray) -> None:
+        """Append embeddings of texts not yet stored (one write per file)"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or len(embeddings) != len(texts):
+            raise ValueError("embeddings must have shape (len(texts), dim)")
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+        if embeddings.shape[1] != self.dim:
+            raise ValueError(f"expected dim={self.dim}, got {embeddings.shape[1]}")
+        if not self._meta.exists():
+            self._meta.write_text(json.dumps({'provider': self.provider, 'model': self.model,
+                                              'dim': self.dim, 'dtype': 'float32'}))
+
+        new_keys, new_rows = {}, []
+        for i, text in enumerate(texts):
+            key = text_key(text)
+            if key not in self.index and key not in new_keys:
+                new_keys[key] = len(new_rows)
+                new_rows.append(i)
+        if not new_keys:
+            return
+        with open(self._vectors, 'ab') as f:
+            f.write(np.ascontiguousarray(embeddings[new_rows]).tobytes())
+        with open(self._keys, 'ab') as f:
+            f.write(b''.join(new_keys))
+        start = len(self.index)
+        self.index.update((key, start + j) for j, key in enumerate(new_keys))
+
+    # ------------------------------------------------------------------ batch
+
+    def embed(self, texts: Sequence[str], compute: Callable[[List[str]], np.ndarray],
+              batch_size: int = 32) -> np.ndarray:
+        """
+        Embeddings of texts, shape (len(texts), dim), float32. Hits come from
+        the store; the distinct missing texts go to compute() in batches of
+        batch_size and are appended.
+        """
+        texts = list(texts)
+        out, hit = self.get_many(texts)
+        missing = list(dict.fromkeys(t for t, h in zip(texts, hit) if not h))
+        if not missing:
+            return out
+
+        computed = {}
+        for i in range(0, len(missing), batch_size):
+            chunk = missing[i:i + batch_size]
+            embs = np.asarray(compute(chunk), dtype=np.float32).reshape(len(chunk), -1)
+            self.put_many(chunk, embs)
+            computed.update(zip(chunk, embs))
+        if out.shape[1] == 0:
+            out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i in np.flatnonzero(~hit):
+            out[i] = computed[texts[i]]
+        return out
+
+    # ------------------------------------------------------------------ stats
+
+    @property
+    def hit_rate(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self.index),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'bytes_read': self.bytes_read,
+            'bytes_stored': len(self.index) * 4 * (self.dim or 0),
+        }
@@ -9,11 +9,13 @@ Version: 2.0
 
 from __future__ import annotations
 import numpy as np
-from scipy import integrate, optimize, interpolate, signal
+from scipy import optimize, interpolate, signal
 from dataclasses import dataclass
 import warnings
 from typing import Dict, Tuple, Any, List, Optional
 
+from numeric_compat import trapezoid as _trapz
+
 # =============================================================================
 # CONFIGURATION & CONSTANTS
 # =============================================================================
@@ -125,7 +127,7 @@ def _hilbert_transform_estimate(x: np.ndarray, y: np.ndarray, x0: float) -> floa
     if xp.size < 5:
         return np.nan
     denom = xp - x0
-    val = integrate.trapz(yp/denom, xp)/np.pi
+    val = _trapz(yp/denom, xp)/np.pi
     return val
 
 def check_memory_function_consistency(omega: np.ndarray, M1: np.ndarray, M2: np.ndarray) -> Dict[str, Any]:
@@ -156,18 +158,18 @@ def check_memory_function_consistency(omega: np.ndarray, M1: np.ndarray, M2: np.
 def spectral_measure(omega: np.ndarray, sigma1: np.ndarray, method: str='f-sum') -> np.ndarray:
     if method not in ('f-sum','direct'):
         raise ValueError("method must be 'f-sum' or 'direct'")
-    integ = integrate.trapz(sigma1, omega)
+    integ = _trapz(sigma1, omega)
     if integ <= 0:
         raise ValueError("Non-positive spectral integral.")
     pi = np.maximum(0.0, sigma1/integ)
-    norm = integrate.trapz(pi, omega)
+    norm = _trapz(pi, omega)
     if norm <= 0:
         raise ValueError("Normalization error for π(ω).")
     return pi/norm
 
 def compute_entropy(omega: np.ndarray, pi: np.ndarray) -> Tuple[float, Dict[str, Any]]:
     pi_safe = np.where(pi>1e-16, pi, 1e-16)
-    S = -integrate.trapz(pi*np.log(pi_safe), omega)
+    S = -_trapz(pi*np.log(pi_safe), omega)
     return float(S), {
         'S_value': float(S),
         'S_per_mode': float(S/len(omega)),
@@ -186,7 +188,7 @@ def compute_energy(omega: np.ndarray, pi: np.ndarray, M1: np.ndarray, method: st
         epsilon = hbar*omega*(1 + alpha*(omega/W)**2)
     else:
         raise ValueError("Unknown energy method.")
-    E = integrate.trapz(epsilon*pi, omega)
+    E = _trapz(epsilon*pi, omega)
     return float(E)
 
 def extract_theta(omega: np.ndarray, pi: np.ndarray, M1: np.ndarray, energy_method: str='canonical'
@@ -304,7 +306,13 @@ def extract_theta_full_pipeline(material_key: str, T_array: np.ndarray,
         if verbose and ('kk_ok' in Mdiag and (Mdiag['kk_ok'] is False)):
             print(f"  [WARN] KK violation ~ {100*Mdiag['kk_violation']:.1f}% at midpoint.")
 
-    Theta_arr = np.array(Theta_vals, dtype=float)
+    return summarize_theta_curve(material_key, T_array, np.array(Theta_vals, dtype=float), diagnostics)
+
+def summarize_theta_curve(material_key: str, T_array: np.ndarray, Theta_arr: np.ndarray,
+                          diagnostics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Θ_c detection, classification and validation for a computed Θ(T) curve."""
+    mat = MATERIALS[material_key]
+    T_array = np.asarray(T_array)
     Theta_c, Thdiag = find_theta_critical(Theta_arr, T_array, mat.Tc)
 
     cname, conf, cdiag = classify_material(Theta_c, mat.Tc, verbose=False)
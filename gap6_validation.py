@@ -1,8 +1,14 @@
 # gap6_validation.py
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, Tuple, Optional, Sequence
 import numpy as np
 
+from gap7_thermo import quadrant_nodes
+from numeric_compat import trapezoid as _trapz
+
 @dataclass
 class MaterialParams:
     wp: float
@@ -18,22 +24,38 @@ class MaterialParams:
 def d_wave_gap(phi, Delta0, eta_d):
     return Delta0 * (eta_d * np.cos(2.0*phi) + (1.0 - eta_d))
 
-def dynes_DOS(E, Delta_phi, Gamma):
+@lru_cache(maxsize=64)
+def gap_table(nphi: int, Delta0: float, eta_d: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    |Delta(phi)| on the uniform nphi-angle grid, folded by the cos(2 phi)
+    symmetry onto [0, pi/2]: (values, weights), weights summing to 1, so
+    sum(weights*f(values)) is the nphi-angle mean of f(|Delta|).
+    Cached per (nphi, Delta0, eta_d); arrays are read-only.
+    """
+    phi, w = quadrant_nodes(nphi)
+    Delta = np.abs(d_wave_gap(phi, Delta0, eta_d))
+    Delta.flags.writeable = False
+    w.flags.writeable = False
+    return Delta, w
+
+def dynes_DOS(E, Delta_phi, Gamma, weights=None):
     z = E[None, :] - 1j*Gamma
     denom = np.sqrt((z**2) - (Delta_phi[:, None]**2))
     Ns_phi = np.real(z/denom)
-    return np.mean(Ns_phi, axis=0)
+    if weights is None:
+        return np.mean(Ns_phi, axis=0)
+    return weights @ Ns_phi
 
 def theta_to_gamma(Theta_val, params: MaterialParams):
     return params.c_gamma/ max(Theta_val, params.Theta_min)
 
 def optical_model_sigma(omega, Theta_val, params: MaterialParams):
+    return _optical_sigma(omega, theta_to_gamma(Theta_val, params), params.eta_d, params)
+
+def _optical_sigma(omega, Gamma, eta_d, params: MaterialParams):
     wp = params.wp
-    Gamma = theta_to_gamma(Theta_val, params)
-    nphi = 128
-    phi = np.linspace(0, 2*np.pi, nphi, endpoint=False)
-    Delta_phi = np.abs(d_wave_gap(phi, params.Delta0, params.eta_d))
-    Delta_eff = float(np.mean(Delta_phi))
+    Delta_phi, w = gap_table(128, params.Delta0, eta_d)
+    Delta_eff = float(w @ Delta_phi)
     edge = 0.5*(1.0 + np.tanh((omega - 2.0*Delta_eff)/(2.0*Gamma + 1e-9)))
     drude = Gamma / (Gamma**2 + omega**2 + 1e-16)
     sigma1 = (wp**2/(4*np.pi))*(0.6*edge*drude + 0.4*drude)
@@ -43,21 +65,21 @@ def optical_model_sigma(omega, Theta_val, params: MaterialParams):
     return sigma1, sigma2
 
 def arpes_model_A(omega, Theta_val, params: MaterialParams):
-    Gamma = theta_to_gamma(Theta_val, params)
-    nphi = 128
-    phi = np.linspace(0, 2*np.pi, nphi, endpoint=False)
-    Delta_phi = np.abs(d_wave_gap(phi, params.Delta0, params.eta_d))
+    return _arpes_A(omega, theta_to_gamma(Theta_val, params), params.eta_d, params)
+
+def _arpes_A(omega, Gamma, eta_d, params: MaterialParams):
+    Delta_phi, w = gap_table(128, params.Delta0, eta_d)
     A_plus  = (1/np.pi) * (Gamma/((omega[None,:]-Delta_phi[:,None])**2 + Gamma**2))
     A_minus = (1/np.pi) * (Gamma/((omega[None,:]+Delta_phi[:,None])**2 + Gamma**2))
     A = 0.5*(A_plus + A_minus)
-    return np.mean(A, axis=0)
+    return w @ A
 
 def dos_model_Ns(E, Theta_val, params: MaterialParams):
-    Gamma = theta_to_gamma(Theta_val, params)
-    nphi = 256
-    phi = np.linspace(0, 2*np.pi, nphi, endpoint=False)
-    Delta_phi = np.abs(d_wave_gap(phi, params.Delta0, params.eta_d))
-    Ns = dynes_DOS(E, Delta_phi, Gamma)
+    return _dos_Ns(E, theta_to_gamma(Theta_val, params), params.eta_d, params)
+
+def _dos_Ns(E, Gamma, eta_d, params: MaterialParams):
+    Delta_phi, w = gap_table(256, params.Delta0, eta_d)
+    Ns = dynes_DOS(E, Delta_phi, Gamma, weights=w)
     N0 = float(np.mean(Ns[-50:]))
     return Ns/np.maximum(N0, 1e-12)
 
@@ -90,6 +112,95 @@ def validate_gap6(exp: Dict[str, Dict[str,np.ndarray]],
     out['status'] = 'PASS' if passes >= 2 else 'FAIL'
     return out
 
+def _channel_losses(channel, exp, omega_opt, E_sts, omega_arpes, gammas, eta_ds, params):
+    # MRE of one channel for every (Gamma, eta_d) pair, plus wall time
+    t0 = time.perf_counter()
+    loss = np.empty((len(gammas), len(eta_ds)))
+    for j, eta_d in enumerate(eta_ds):
+        for i, G in enumerate(gammas):
+            if channel == 'optical':
+                s1m, s2m = _optical_sigma(omega_opt, G, eta_d, params)
+                loss[i, j] = 0.5*(mean_relative_error(exp['optical']['sigma1'], s1m) +
+                                  mean_relative_error(exp['optical']['sigma2'], s2m))
+            elif channel == 'arpes':
+                loss[i, j] = mean_relative_error(exp['arpes']['A'], _arpes_A(omega_arpes, G, eta_d, params))
+            else:
+                loss[i, j] = mean_relative_error(exp['sts']['N'], _dos_Ns(E_sts, G, eta_d, params))
+    return loss, time.perf_counter() - t0
+
+def fit_gap6_theta(exp: Dict[str, Dict[str, np.ndarray]],
+                   omega_opt, E_sts, omega_arpes,
+                   theta_grid: Sequence[float], params: MaterialParams,
+                   c_gamma_grid: Optional[Sequence[float]] = None,
+                   eta_d_grid: Optional[Sequence[float]] = None,
+                   weights: Optional[Dict[str, float]] = None,
+                   temperature: float = 0.01,
+                   n_workers: int = 3):
+    """
+    Joint grid fit of Theta (and optionally c_gamma, eta_d) across the
+    optical / ARPES / STS channels present in exp.
+
+    Loss = weighted sum of the per-channel MREs used by validate_gap6. The
+    models depend on (Theta, c_gamma) only through Gamma = c_gamma/Theta,
+    so each channel is evaluated once per distinct Gamma and eta_d (with
+    cached angular gap tables) and the channels run concurrently in a
+    thread pool. Note that Theta is only identified up to that ratio when
+    c_gamma is free.
+
+    Returns a dict with the Theta posterior p(Theta) ~ sum over nuisance
+    grid of exp(-(loss - min)/temperature) (normalised on theta_grid), the
+    loss cube (Theta, c_gamma, eta_d), per-channel losses, the best point
+    and a timing breakdown in seconds.
+    """
+    t_start = time.perf_counter()
+    theta = np.asarray(theta_grid, dtype=float)
+    c_gammas = np.asarray([params.c_gamma] if c_gamma_grid is None else c_gamma_grid, dtype=float)
+    eta_ds = np.asarray([params.eta_d] if eta_d_grid is None else eta_d_grid, dtype=float)
+    channels = [ch for ch in ('optical', 'arpes', 'sts') if ch in exp]
+    if not channels:
+        raise ValueError("exp must contain at least one of 'optical', 'arpes', 'sts'")
+    if weights is None:
+        weights = {ch: 1.0 for ch in channels}
+
+    G = c_gammas[None, :] / np.maximum(theta, params.Theta_min)[:, None]
+    gammas, inverse = np.unique(G, return_inverse=True)
+    inverse = inverse.reshape(G.shape)
+
+    t0 = time.perf_counter()
+    for eta_d in eta_ds:
+        gap_table(128, params.Delta0, float(eta_d))
+        gap_table(256, params.Delta0, float(eta_d))
+    timings = {'tables': time.perf_counter() - t0}
+
+    with ThreadPoolExecutor(max_workers=max(1, n_workers)) as pool:
+        futures = {ch: pool.submit(_channel_losses, ch, exp, omega_opt, E_sts, omega_arpes,
+                                   gammas, [float(e) for e in eta_ds], params)
+                   for ch in channels}
+        results = {ch: f.result() for ch, f in futures.items()}
+
+    channel_loss = {}
+    total = np.zeros((len(theta), len(c_gammas), len(eta_ds)))
+    for ch in channels:
+        loss, timings[ch] = results[ch]
+        channel_loss[ch] = loss[inverse]          # (Theta, c_gamma, eta_d)
+        total += weights.get(ch, 0.0) * channel_loss[ch]
+
+    like = np.exp(-(total - total.min())/temperature).sum(axis=(1, 2))
+    norm = _trapz(like, theta) if len(theta) > 1 else like.sum()
+    posterior = like / norm
+
+    i, j, k = np.unravel_index(np.argmin(total), total.shape)
+    timings['total'] = time.perf_counter() - t_start
+    return {
+        'theta_grid': theta,
+        'posterior': posterior,
+        'loss': total,
+        'channel_loss': channel_loss,
+        'best': {'Theta': float(theta[i]), 'c_gamma': float(c_gammas[j]),
+                 'eta_d': float(eta_ds[k]), 'loss': float(total[i, j, k])},
+        'timings': timings,
+    }
+
 if __name__ == '__main__':
     w  = np.linspace(0.0, 0.20, 1000) + 1e-6
     wA = np.linspace(-0.08, 0.08, 1601)
@@ -108,3 +219,5 @@ if __name__ == '__main__':
     }
     res = validate_gap6(exp, w, E, wA, Theta_demo, params)
     print('GAP 6 validation:', res)
+    fit = fit_gap6_theta(exp, w, E, wA, np.linspace(0.005, 0.03, 26), params)
+    print('GAP 6 fit:', fit['best'], {k: round(v, 3) for k, v in fit['timings'].items()})
@@ -8,9 +8,12 @@
 
 from __future__ import annotations
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Tuple
 import numpy as np
 
+COLLAPSE_BLOCK_ELEMENTS = 1 << 20   # (z, s, bin, column) cells scored per chunk
+
 @dataclass
 class QCPParams:
     d: float = 2.0
@@ -64,62 +67,118 @@ def _power_law_fit(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
     r2 = 1.0 - np.var(ly - yhat) / (np.var(ly) + 1e-15)
     return float(a), float(r2)
 
+def _collapse_design(Theta: np.ndarray, T: np.ndarray, p: np.ndarray, pc: float, params: QCPParams
+                     ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    # points entering the collapse at pc, flattened: (T, Θ, column index), and log δ per
+    # doping column; None if no column is in range
+    dp = np.abs(p - pc)
+    cols = np.where((dp <= params.delta_max) & (dp > 0))[0]
+    if cols.size == 0:
+        return None
+    mT = _mask_domain(T, np.full_like(T, pc), pc, params.delta_max, params.Tmin, params.Tmax)
+    Tm = np.repeat(T[mT], cols.size)
+    Th = Theta[mT][:, cols].ravel()
+    col = np.tile(np.arange(cols.size), int(mT.sum()))
+    return Tm, Th, col, np.log(dp[cols])
+
+def _collapse_scores(Tm: np.ndarray, Th: np.ndarray, col: np.ndarray, log_delta: np.ndarray,
+                     s_grid: np.ndarray, z_grid: np.ndarray, nbins: int = 40) -> np.ndarray:
+    """
+    _collapse_score of x = T/δ^z, y = Θ/δ^s for every (z, s) at once, shape (Nz, Ns).
+
+    In log δ both exponents are shifts: x = T·exp(-z log δ), y = Θ·exp(-s log δ).
+    The bins depend on z only; within a bin, y of doping column j is Θ scaled by
+    D[s, j] = δ_j^-s, so per-(bin, column) counts, Θ means and Θ sums of squares
+    give every s through the (Ns, Ncols) design matrix D (exact decomposition of
+    the within-bin variance, no one-pass cancellation).
+    """
+    n = Tm.size
+    scores = np.zeros((z_grid.size, s_grid.size))
+    if n < 10:
+        return scores
+    nc = log_delta.size
+    D = np.exp(-s_grid[:, None] * log_delta[None, :])                     # (Ns, Ncols)
+    Y = Th[None, :] * D[:, col]
+    tot = n * (np.var(Y, axis=1) + 1e-15)
+    ld = log_delta[col]
+    G = nbins * nc + 1                                                     # last group: outside all bins
+    bz = max(1, COLLAPSE_BLOCK_ELEMENTS // max(n, s_grid.size * G))
+    for start in range(0, z_grid.size, bz):
+        z = z_grid[start:start + bz]
+        X = Tm[None, :] * np.exp(-z[:, None] * ld[None, :])                # (Bz, n)
+        lo = X.min(axis=1, keepdims=True); hi = X.max(axis=1, keepdims=True)
+        edges = np.linspace(lo[:, 0], hi[:, 0], nbins + 1, axis=1)
+        span = np.where(hi > lo, hi - lo, 1.0)
+        idx = np.where(hi > lo, np.clip(((X - lo) / span * nbins).astype(np.int64), 0, nbins - 1), nbins)
+        # exact bin membership as in _collapse_score: edges[i] <= x < edges[i+1]
+        below = X < np.take_along_axis(edges, np.minimum(idx, nbins), axis=1)
+        idx = idx - (below & (idx < nbins))
+        above = X >= np.take_along_axis(edges, np.minimum(idx + 1, nbins), axis=1)
+        idx = np.where(above & (idx < nbins), idx + 1, idx)               # x == max falls outside
+
+        lab = (np.where(idx < nbins, idx * nc + col, G - 1) + G * np.arange(z.size)[:, None]).ravel()
+        w = np.bincount(lab, minlength=z.size * G).astype(float)
+        m = np.bincount(lab, weights=np.broadcast_to(Th, (z.size, n)).ravel(), minlength=z.size * G)
+        m /= np.maximum(w, 1.0)
+        dev = np.broadcast_to(Th, (z.size, n)).ravel() - m[lab]
+        ss = np.bincount(lab, weights=dev * dev, minlength=z.size * G)
+        w, m, ss = (a.reshape(z.size, G)[:, :-1].reshape(z.size, nbins, nc) for a in (w, m, ss))
+
+        V = m[:, None] * D[None, :, None, :]                              # (Bz, Ns, nbins, Ncols)
+        nb = w.sum(axis=2)                                                # (Bz, nbins)
+        M = (w[:, None] * V).sum(axis=3) / np.maximum(nb, 1.0)[:, None]
+        within = (w[:, None] * (V - M[..., None])**2).sum(axis=3) + np.einsum("bkj,sj->bsk", ss, D * D)
+        within = np.where((nb > 3)[:, None], within, 0.0).sum(axis=2)     # (Bz, Ns)
+        scores[start:start + bz] = np.maximum(0.0, 1.0 - within / tot[None, :])
+    return scores
+
 def _best_z_for_theta(Theta, T, p, pc, s, params: QCPParams) -> Tuple[float, float]:
     if params.z_grid is None:
         return 1.0, 0.0
-    best_R2 = -np.inf; best_z = np.nan
-    dp = np.abs(p - pc)
-    mask_p = (dp <= params.delta_max)
-    for z in params.z_grid:
-        Xs, Ys = [], []
-        for j, pj in enumerate(p[mask_p]):
-            delta = abs(pj - pc)
-            if delta <= 0:
-                continue
-            x = T / (delta**z)
-            y = Theta[:, j] / (delta**s)
-            mT = _mask_domain(T, np.full_like(T, pj), pc, params.delta_max, params.Tmin, params.Tmax)
-            Xs.append(x[mT]); Ys.append(y[mT])
-        if not Xs:
-            continue
-        xx = np.concatenate(Xs); yy = np.concatenate(Ys)
-        R2 = _collapse_score(xx, yy, nbins=40)
-        if R2 > best_R2:
-            best_R2, best_z = R2, float(z)
-    return best_z, best_R2
-
-def grid_search_qcp_theta(Theta: np.ndarray, T: np.ndarray, p: np.ndarray, params: QCPParams) -> Dict[str, object]:
+    design = _collapse_design(Theta, T, p, pc, params)
+    if design is None:
+        return np.nan, -np.inf
+    R2 = _collapse_scores(*design, np.array([s], dtype=float), np.asarray(params.z_grid, dtype=float))[:, 0]
+    k = int(np.argmax(R2))
+    return float(params.z_grid[k]), float(R2[k])
+
+def _scan_pc(Theta, T, p, pc, params: QCPParams) -> Tuple[np.ndarray, np.ndarray]:
+    # R2 and best z for every s at one pc (NaN where no doping column is in range)
+    s_grid = np.asarray(params.s_grid, dtype=float)
+    z_grid = np.array([1.0]) if params.z_grid is None else np.asarray(params.z_grid, dtype=float)
+    design = _collapse_design(Theta, T, p, pc, params)
+    if design is None:
+        return np.full(s_grid.size, np.nan), np.full(s_grid.size, np.nan)
+    R2 = _collapse_scores(*design, s_grid, z_grid)
+    k = np.argmax(R2, axis=0)                     # first best z, as the sequential scan
+    return R2[k, np.arange(s_grid.size)], z_grid[k]
+
+def grid_search_qcp_theta(Theta: np.ndarray, T: np.ndarray, p: np.ndarray, params: QCPParams,
+                          n_workers: int = 1) -> Dict[str, object]:
+    """
+    Scan pc × s (× z, best z per (pc, s)) for the Θ(δ,T) collapse maximising
+    _collapse_score. R2_map[i_pc, i_s] is the score at the best z (z_map);
+    pc values are scored in parallel threads when n_workers > 1.
+    """
     assert params.pc_grid is not None and params.s_grid is not None, "Provide pc_grid and s_grid"
     best = dict(R2=-np.inf, pc=np.nan, s=np.nan, z=np.nan, R2_map=None)
-    Rmap = np.full((params.pc_grid.size, params.s_grid.size), np.nan)
-
-    for i_pc, pc in enumerate(params.pc_grid):
-        dp = np.abs(p - pc); mask_p = (dp <= params.delta_max)
-        if not np.any(mask_p):
-            continue
-        for i_s, s in enumerate(params.s_grid):
-            if params.z_grid is None:
-                z = 1.0
-            else:
-                z, _ = _best_z_for_theta(Theta, T, p, pc, s, params)
+    Theta = np.asarray(Theta, dtype=float); T = np.asarray(T, dtype=float); p = np.asarray(p, dtype=float)
 
-            Xs, Ys = [], []
-            for j, pj in enumerate(p[mask_p]):
-                delta = abs(pj - pc)
-                if delta <= 0:
-                    continue
-                x = T / (delta**z)
-                y = Theta[:, j] / (delta**s)
-                mT = _mask_domain(T, np.full_like(T, pj), pc, params.delta_max, params.Tmin, params.Tmax)
-                Xs.append(x[mT]); Ys.append(y[mT])
-            if not Xs:
-                continue
-            xx = np.concatenate(Xs); yy = np.concatenate(Ys)
-            R2 = _collapse_score(xx, yy, nbins=40)
-            Rmap[i_pc, i_s] = R2
-            if R2 > best["R2"]:
-                best.update(R2=float(R2), pc=float(pc), s=float(s), z=float(z))
+    scan = lambda pc: _scan_pc(Theta, T, p, pc, params)
+    if n_workers > 1:
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            rows = list(pool.map(scan, params.pc_grid))
+    else:
+        rows = [scan(pc) for pc in params.pc_grid]
+    Rmap = np.array([r for r, _ in rows]).reshape(params.pc_grid.size, params.s_grid.size)
+    Zmap = np.array([z for _, z in rows]).reshape(Rmap.shape)
+
+    if np.isfinite(Rmap).any():
+        i_pc, i_s = np.unravel_index(np.nanargmax(Rmap), Rmap.shape)
+        best.update(R2=float(Rmap[i_pc, i_s]), pc=float(params.pc_grid[i_pc]),
+                    s=float(params.s_grid[i_s]), z=float(Zmap[i_pc, i_s]))
     best["R2_map"] = Rmap
+    best["z_map"] = Zmap
     return best
 
 def collapse_omega_over_T(sigma1: np.ndarray, omega: np.ndarray, T: np.ndarray,
@@ -13,6 +13,7 @@ from scipy import integrate, interpolate, optimize, special
 from dataclasses import dataclass, field
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.colors import BoundaryNorm, ListedColormap
 from typing import Dict, List, Tuple, Optional, Callable
 import warnings
 warnings.filterwarnings('ignore')
@@ -57,10 +58,22 @@ class AdaptonicParams:
     sigma_star: float = 0.01  # Present-day σ value (M_Pl units)
     alpha_M_0: float = 0.01  # Present-day Planck mass run
 
+PHASE_BOUNDARIES = np.array([0.05, 0.2, 0.8, 3.0, 10.0])
+PHASE_NAMES = np.array(["super-crystal", "crystal", "liquid", "viscous", "plasma", "hot-plasma"])
+PHASE_COLORS = ['darkblue', 'blue', 'green', 'orange', 'red', 'darkred']  # per PHASE_NAMES
+
+def _scalar_or_array(x):
+    """Python scalar for 0-d results (point-by-point callers), array otherwise"""
+    x = np.asarray(x)
+    return x.item() if x.ndim == 0 else x
+
 class InformationTemperature:
     """
     Complete implementation of information temperature θ_geo
     Maps abstract Θ to observable quantities
+    
+    All methods accept scalars or broadcastable arrays (z, δ, k, θ, ...);
+    scalar inputs return Python scalars.
     """
     
     def __init__(self, 
@@ -69,6 +82,14 @@ class InformationTemperature:
         """Initialize with cosmological and adaptonic parameters"""
         self.cosmo = cosmo or CosmologyParams()
         self.adapt = adapt or AdaptonicParams()
+    
+    # Redshift-only background quantities (tabulated in subclasses)
+    
+    def _omega_m_z(self, z):
+        return self.cosmo.Omega_m_z(np.asarray(z, dtype=float))
+    
+    def _hubble(self, z):
+        return self.cosmo.H(np.asarray(z, dtype=float))
         
     # ============= Core Temperature Components =============
     
@@ -77,9 +98,10 @@ class InformationTemperature:
         Vacuum/dark energy component of information temperature
         Dominates at low redshift in empty regions
         """
-        Om_z = self.cosmo.Omega_m_z(z)
+        z = np.asarray(z, dtype=float)
+        Om_z = self._omega_m_z(z)
         OL_z = 1 - Om_z  # In flat universe
-        return OL_z/Om_z * (1 + z)**3
+        return _scalar_or_array(OL_z/Om_z * (1 + z)**3)
     
     def theta_matter(self, delta: float, z: float, k: float = 0.1) -> float:
         """
@@ -89,24 +111,24 @@ class InformationTemperature:
         k: scale in h/Mpc
         """
         # Growth rate approximation
-        Om_z = self.cosmo.Omega_m_z(z)
+        Om_z = self._omega_m_z(z)
         f_growth = Om_z**0.55
         
         # Avoid negative temperature for underdense regions
-        delta_eff = max(delta, -0.99)
+        delta_eff = np.maximum(delta, -0.99)
         
-        return (1 + delta_eff)**2 * (1 + f_growth)**2
+        return _scalar_or_array((1 + delta_eff)**2 * (1 + f_growth)**2)
     
     def theta_radiation(self, z: float) -> float:
         """
         Radiation component
         Dominates at high redshift
         """
+        z = np.asarray(z, dtype=float)
         Or_z = self.cosmo.Omega_r * (1+z)**4
         Om_z = self.cosmo.Omega_m * (1+z)**3
-        E2 = Om_z + self.cosmo.Omega_Lambda + Or_z
         
-        return Or_z / Om_z if Om_z > 0 else 0
+        return _scalar_or_array(np.where(Om_z > 0, Or_z / np.where(Om_z > 0, Om_z, 1.0), 0.0))
     
     def theta_shear(self, grad_sigma: float, k: float, sigma_0: float = 0.01) -> float:
         """
@@ -115,30 +137,30 @@ class InformationTemperature:
         k: scale in h/Mpc
         sigma_0: normalization
         """
-        return (grad_sigma/sigma_0)**2 / (k**2 + self.adapt.k_screen**2)
+        return _scalar_or_array((np.asarray(grad_sigma)/sigma_0)**2 / (np.asarray(k)**2 + self.adapt.k_screen**2))
     
     def theta_kinetic(self, v_bulk: float) -> float:
         """
         Kinetic component from bulk flows
         v_bulk: bulk velocity in km/s
         """
-        return (v_bulk/c_km_s)**2
+        return _scalar_or_array((np.asarray(v_bulk)/c_km_s)**2)
     
     def theta_quantum(self, k: float, z: float) -> float:
         """
         Quantum fluctuation component
         Only relevant near Planck scale
         """
+        z = np.asarray(z, dtype=float)
         # Temperature scale for σ field
         T_sigma = self.cosmo.T_CMB_0 * (1+z) * 1e-30  # Extremely small
         
         # Quantum contribution (normally negligible)
-        omega_k = k * self.cosmo.H(z) / (1+z)  # Physical frequency
+        omega_k = k * self._hubble(z) / (1+z)  # Physical frequency
         
-        if T_sigma > 0:
-            return (omega_k / T_sigma) * np.exp(-k/1e10)  # Exponential cutoff
-        else:
-            return 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            quantum = (omega_k / T_sigma) * np.exp(-np.asarray(k)/1e10)  # Exponential cutoff
+        return _scalar_or_array(np.where(T_sigma > 0, quantum, 0.0))
     
     # ============= Total Temperature =============
     
@@ -171,50 +193,51 @@ class InformationTemperature:
         # Default to field value if delta not specified
         if delta is None:
             delta = 0  # Field value
+        delta = np.asarray(delta, dtype=float)
         
         # Estimate gradient if not provided
         if grad_sigma is None:
             # Empirical relation: larger gradients at boundaries
-            grad_sigma = abs(delta) * 0.1 if abs(delta) > 10 else 0.01
+            grad_sigma = np.where(np.abs(delta) > 10, np.abs(delta) * 0.1, 0.01)
+        grad_sigma = np.asarray(grad_sigma, dtype=float)
+        v_bulk = np.asarray(v_bulk, dtype=float)
         
         # Sum components
         theta = 0
         
-        # Always include these
-        theta += self.theta_vacuum(z)
-        theta += self.theta_matter(delta, z, k)
-        theta += self.theta_radiation(z)
+        # Always include these (not in place: the terms broadcast to the full shape)
+        theta = theta + self.theta_vacuum(z)
+        theta = theta + self.theta_matter(delta, z, k)
+        theta = theta + self.theta_radiation(z)
         
         # Include if significant
-        if grad_sigma > 0:
-            theta += self.theta_shear(grad_sigma, k)
-        
-        if v_bulk > 0:
-            theta += self.theta_kinetic(v_bulk)
+        theta = theta + np.where(grad_sigma > 0, self.theta_shear(grad_sigma, k), 0.0)
+        theta = theta + np.where(v_bulk > 0, self.theta_kinetic(v_bulk), 0.0)
         
         if include_quantum:
-            theta += self.theta_quantum(k, z)
+            theta = theta + self.theta_quantum(k, z)
         
-        return theta
+        return _scalar_or_array(theta)
+    
+    def theta_map(self, z: np.ndarray, delta: np.ndarray, **kwargs) -> np.ndarray:
+        """
+        θ_geo on the (z, δ) grid, shape (len(z), len(delta)); kwargs as
+        theta_total (k, grad_sigma, v_bulk, ... broadcast against the grid)
+        """
+        z = np.asarray(z, dtype=float)[:, None]
+        delta = np.asarray(delta, dtype=float)[None, :]
+        return np.asarray(self.theta_total(z=z, delta=delta, **kwargs))
     
     # ============= Physical Effects =============
     
     def phase_state(self, theta: float) -> str:
         """
         Determine geometric phase from temperature
+        (super-crystal < 0.05 < crystal < 0.2 < liquid < 0.8 < viscous
+        < 3 < plasma < 10 < hot-plasma)
         """
-        if theta < 0.05:
-            return "super-crystal"
-        elif theta < 0.2:
-            return "crystal"
-        elif theta < 0.8:
-            return "liquid"
-        elif theta < 3.0:
-            return "viscous"
-        elif theta < 10.0:
-            return "plasma"
-        else:
-            return "hot-plasma"
+        names = PHASE_NAMES[np.searchsorted(PHASE_BOUNDARIES, theta, side='right')]
+        return _scalar_or_array(names)
     
     def friction_coefficient(self, theta: float) -> float:
         """
@@ -222,16 +245,18 @@ class InformationTemperature:
         Controls damping in σ field evolution
         """
         Gamma_0 = self.adapt.Gamma_0
+        theta = np.asarray(theta, dtype=float)
         
-        if theta < 0.1:
-            # Crystal: minimal friction, linear
-            return Gamma_0 * theta
-        elif theta < 1.0:
-            # Liquid: moderate friction, peaks at θ=1
-            return Gamma_0 * theta/(1 + theta**2)
-        else:
-            # Plasma: decreasing friction
-            return Gamma_0 / np.sqrt(1 + theta)
+        with np.errstate(invalid='ignore'):
+            return _scalar_or_array(np.where(
+                theta < 0.1,
+                # Crystal: minimal friction, linear
+                Gamma_0 * theta,
+                np.where(theta < 1.0,
+                         # Liquid: moderate friction, peaks at θ=1
+                         Gamma_0 * theta/(1 + theta**2),
+                         # Plasma: decreasing friction
+                         Gamma_0 / np.sqrt(1 + theta))))
     
     def growth_modification(self, theta: float) -> float:
         """
@@ -283,13 +308,82 @@ class InformationTemperature:
         # Crystal: rigid (high sound speed)
         # Liquid: normal
         # Plasma: low sound speed
+        theta = np.asarray(theta, dtype=float)
         
-        if theta < 0.2:
-            return 0.9  # Nearly speed of light
-        elif theta < 1.0:
-            return 0.5
-        else:
-            return 0.1/theta  # Decreases with temperature
+        with np.errstate(divide='ignore'):
+            return _scalar_or_array(np.where(theta < 0.2, 0.9,            # Nearly speed of light
+                                             np.where(theta < 1.0, 0.5,
+                                                      0.1/theta)))        # Decreases with temperature
+
+class TabulatedInformationTemperature(InformationTemperature):
+    """
+    InformationTemperature with the redshift-only pieces (Ω_m(z), H(z),
+    θ_vacuum, θ_radiation) read from cubic-spline tables of ln f in ln(1+z)
+    
+    Tables cover 0 <= z <= z_max; each is refined (nodes doubled) until the
+    relative error at the interval midpoints is below rtol. Redshifts
+    outside the table use the closed forms.
+    """
+    
+    def __init__(self,
+                 cosmo: Optional[CosmologyParams] = None,
+                 adapt: Optional[AdaptonicParams] = None,
+                 z_max: float = 20.0,
+                 rtol: float = 1e-8,
+                 n_min: int = 33,
+                 n_max: int = 65537):
+        super().__init__(cosmo, adapt)
+        self.z_max = z_max
+        self.rtol = rtol
+        exact = {
+            'Omega_m': super()._omega_m_z,
+            'H': super()._hubble,
+            'vacuum': super().theta_vacuum,
+            'radiation': super().theta_radiation,
+        }
+        self._exact = exact
+        self._tables = {}
+        self.table_error = {}
+        for name, f in exact.items():
+            self._tables[name], self.table_error[name] = self._fit_table(f, n_min, n_max)
+    
+    def _fit_table(self, f: Callable, n_min: int, n_max: int):
+        u_max = np.log1p(self.z_max)
+        n = n_min
+        while True:
+            u = np.linspace(0.0, u_max, n)
+            spline = interpolate.CubicSpline(u, np.log(f(np.expm1(u))))
+            u_mid = 0.5*(u[1:] + u[:-1])
+            err = float(np.max(np.abs(np.expm1(spline(u_mid) - np.log(f(np.expm1(u_mid)))))))
+            if err <= self.rtol or n >= n_max:
+                return spline, err
+            n = 2*n - 1
+    
+    def _lookup(self, name: str, z):
+        z = np.asarray(z, dtype=float)
+        inside = (z >= 0) & (z <= self.z_max)
+        if inside.all():
+            return _scalar_or_array(np.exp(self._tables[name](np.log1p(z))))
+        out = np.array(self._exact[name](z), dtype=float)
+        out[inside] = np.exp(self._tables[name](np.log1p(z[inside])))
+        return _scalar_or_array(out)
+    
+    def _omega_m_z(self, z):
+        return self._lookup('Omega_m', z)
+    
+    def _hubble(self, z):
+        return self._lookup('H', z)
+    
+    def theta_vacuum(self, z: float) -> float:
+        return self._lookup('vacuum', z)
+    
+    def theta_radiation(self, z: float) -> float:
+        return self._lookup('radiation', z)
+
+def _records(data: Dict[str, np.ndarray]) -> List[Dict]:
+    """Column arrays -> one dict per point"""
+    columns = [np.asarray(v).tolist() for v in data.values()]
+    return [dict(zip(data.keys(), row)) for row in zip(*columns)]
 
 class EnvironmentalProfiles:
     """
@@ -303,7 +397,8 @@ class EnvironmentalProfiles:
                     r_array: np.ndarray, 
                     R_void: float = 30.0,
                     z: float = 0.5,
-                    delta_0: float = -0.8) -> List[Dict]:
+                    delta_0: float = -0.8,
+                    as_arrays: bool = False):
         """
         Temperature profile for cosmic void
         
@@ -313,183 +408,153 @@ class EnvironmentalProfiles:
         R_void : void radius in Mpc/h
         z : redshift
         delta_0 : central underdensity
+        as_arrays : return a dict of arrays instead of one dict per point
         """
-        results = []
-        
-        for r in r_array:
-            # Density profile (simple model)
-            if r < R_void:
-                delta = delta_0 * (1 - (r/R_void)**2)
-                # Outflow velocity
-                v_bulk = 50 * (r/R_void)  # km/s
-                # Small gradient except at edge
-                grad_sigma = 0.01 if r < 0.9*R_void else 0.1
-            else:
-                # Outside void
-                delta = 0
-                v_bulk = 0
-                grad_sigma = 0.01
-            
-            # Calculate temperature
-            theta = self.model.theta_total(
-                x=r, k=0.1, z=z,
-                delta=delta,
-                grad_sigma=grad_sigma,
-                v_bulk=v_bulk
-            )
-            
-            # Store results
-            results.append({
-                'r': r,
-                'delta': delta,
-                'theta': theta,
-                'phase': self.model.phase_state(theta),
-                'friction': self.model.friction_coefficient(theta),
-                'v_bulk': v_bulk
-            })
-        
-        return results
+        r = np.asarray(r_array, dtype=float)
+        inside = r < R_void
+        
+        # Density profile (simple model); zero outside the void
+        delta = np.where(inside, delta_0 * (1 - (r/R_void)**2), 0.0)
+        # Outflow velocity
+        v_bulk = np.where(inside, 50 * (r/R_void), 0.0)  # km/s
+        # Small gradient except at edge
+        grad_sigma = np.where(inside & (r >= 0.9*R_void), 0.1, 0.01)
+        
+        # Calculate temperature
+        theta = np.asarray(self.model.theta_total(
+            x=r, k=0.1, z=z,
+            delta=delta,
+            grad_sigma=grad_sigma,
+            v_bulk=v_bulk
+        ))
+        
+        data = {
+            'r': r,
+            'delta': delta,
+            'theta': theta,
+            'phase': self.model.phase_state(theta),
+            'friction': self.model.friction_coefficient(theta),
+            'v_bulk': v_bulk
+        }
+        return data if as_arrays else _records(data)
     
     def cluster_profile(self,
                        r_array: np.ndarray,
                        M_200: float = 1e15,  # Solar masses
-                       z: float = 0.3) -> List[Dict]:
+                       z: float = 0.3,
+                       as_arrays: bool = False):
         """
         Temperature profile for galaxy cluster
         """
-        results = []
+        r = np.asarray(r_array, dtype=float)
         
         # Cluster parameters
         R_200 = (M_200/1e15)**(1/3) * 2.0  # Mpc/h
         r_s = R_200/5  # Scale radius (NFW)
         
-        for r in r_array:
-            # NFW density profile
-            if r > 0.001:  # Avoid singularity
-                x = r/r_s
-                rho_NFW = 200/(x*(1+x)**2)
-                delta = min(rho_NFW, 1e4)  # Cap at reasonable value
-            else:
-                delta = 1e4
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # NFW density profile, capped at a reasonable value
+            x = r/r_s
+            rho_NFW = 200/(x*(1+x)**2)
+            delta = np.where(r > 0.001, np.minimum(rho_NFW, 1e4), 1e4)  # Avoid singularity
             
             # Velocity dispersion (decreases with radius)
-            sigma_v = 1000 * (R_200/r)**0.5 if r < R_200 else 100
-            
-            # Gradient (large at virial radius)
-            if abs(r - R_200) < 0.1*R_200:
-                grad_sigma = 5.0
-            else:
-                grad_sigma = 1.0
-            
-            # Calculate temperature
-            theta = self.model.theta_total(
-                x=r, k=0.1, z=z,
-                delta=delta,
-                grad_sigma=grad_sigma,
-                v_bulk=sigma_v
-            )
-            
-            # Check for phase transition
-            theta_crit = self.model.critical_temperature(
-                rho=2.7e-27 * (1+delta)  # kg/m³
-            )
-            
-            results.append({
-                'r': r,
-                'delta': delta,
-                'theta': theta,
-                'theta_critical': theta_crit,
-                'phase': self.model.phase_state(theta),
-                'in_transition': abs(theta - theta_crit)/theta_crit < 0.2,
-                'sigma_v': sigma_v
-            })
-        
-        return results
+            sigma_v = np.where(r < R_200, 1000 * (R_200/r)**0.5, 100.0)
+        
+        # Gradient (large at virial radius)
+        grad_sigma = np.where(np.abs(r - R_200) < 0.1*R_200, 5.0, 1.0)
+        
+        # Calculate temperature
+        theta = np.asarray(self.model.theta_total(
+            x=r, k=0.1, z=z,
+            delta=delta,
+            grad_sigma=grad_sigma,
+            v_bulk=sigma_v
+        ))
+        
+        # Check for phase transition
+        theta_crit = self.model.critical_temperature(
+            rho=2.7e-27 * (1+delta)  # kg/m³
+        )
+        
+        data = {
+            'r': r,
+            'delta': delta,
+            'theta': theta,
+            'theta_critical': theta_crit,
+            'phase': self.model.phase_state(theta),
+            'in_transition': np.abs(theta - theta_crit)/theta_crit < 0.2,
+            'sigma_v': sigma_v
+        }
+        return data if as_arrays else _records(data)
     
     def filament_profile(self,
                         x_array: np.ndarray,
                         width: float = 5.0,
-                        z: float = 0.5) -> List[Dict]:
+                        z: float = 0.5,
+                        as_arrays: bool = False):
         """
         Temperature profile across cosmic filament
         """
-        results = []
+        x = np.asarray(x_array, dtype=float)
         
-        for x in x_array:
-            # Cylindrical profile
-            r_perp = abs(x)
-            
-            if r_perp < width:
-                # Inside filament
-                delta = 5 * np.exp(-(r_perp/width)**2)
-                v_bulk = 100  # Infall
-                grad_sigma = 0.5
-            else:
-                # Outside
-                delta = 0
-                v_bulk = 20
-                grad_sigma = 0.1
-            
-            theta = self.model.theta_total(
-                x=x, k=0.1, z=z,
-                delta=delta,
-                grad_sigma=grad_sigma,
-                v_bulk=v_bulk
-            )
-            
-            results.append({
-                'x': x,
-                'delta': delta,
-                'theta': theta,
-                'phase': self.model.phase_state(theta)
-            })
+        # Cylindrical profile
+        r_perp = np.abs(x)
+        inside = r_perp < width
+        
+        # Inside filament (infall) / outside
+        delta = np.where(inside, 5 * np.exp(-(r_perp/width)**2), 0.0)
+        v_bulk = np.where(inside, 100.0, 20.0)
+        grad_sigma = np.where(inside, 0.5, 0.1)
+        
+        theta = np.asarray(self.model.theta_total(
+            x=x, k=0.1, z=z,
+            delta=delta,
+            grad_sigma=grad_sigma,
+            v_bulk=v_bulk
+        ))
         
-        return results
+        data = {
+            'x': x,
+            'delta': delta,
+            'theta': theta,
+            'phase': self.model.phase_state(theta)
+        }
+        return data if as_arrays else _records(data)
     
     def merger_shock_profile(self,
                            x_array: np.ndarray,
                            v_shock: float = 3000,
-                           z: float = 0.2) -> List[Dict]:
+                           z: float = 0.2,
+                           as_arrays: bool = False):
         """
         Temperature profile through cluster merger shock
         """
-        results = []
-        
-        for x in x_array:
-            # Shock front at x=0
-            if abs(x) < 0.5:
-                # Shock region
-                delta = 1000 * np.exp(-abs(x)/0.2)
-                v_bulk = v_shock * np.exp(-abs(x)/0.1)
-                grad_sigma = 10.0
-            elif abs(x) < 2.0:
-                # Post-shock
-                delta = 500 * np.exp(-abs(x)/1.0)
-                v_bulk = 1000
-                grad_sigma = 2.0
-            else:
-                # Pre-shock
-                delta = 200 * np.exp(-abs(x)/3.0)
-                v_bulk = 300
-                grad_sigma = 0.5
-            
-            theta = self.model.theta_total(
-                x=x, k=0.1, z=z,
-                delta=delta,
-                grad_sigma=grad_sigma,
-                v_bulk=v_bulk
-            )
-            
-            results.append({
-                'x': x,
-                'delta': delta,
-                'theta': theta,
-                'phase': self.model.phase_state(theta),
-                'v_shock': v_bulk,
-                'gw_damping': self.model.gw_damping_rate(theta)
-            })
-        
-        return results
+        x = np.asarray(x_array, dtype=float)
+        ax = np.abs(x)
+        
+        # Shock front at x=0: shock region / post-shock / pre-shock
+        region = [ax < 0.5, ax < 2.0]
+        delta = np.select(region, [1000 * np.exp(-ax/0.2), 500 * np.exp(-ax/1.0)], 200 * np.exp(-ax/3.0))
+        v_bulk = np.select(region, [v_shock * np.exp(-ax/0.1), 1000.0], 300.0)
+        grad_sigma = np.select(region, [10.0, 2.0], 0.5)
+        
+        theta = np.asarray(self.model.theta_total(
+            x=x, k=0.1, z=z,
+            delta=delta,
+            grad_sigma=grad_sigma,
+            v_bulk=v_bulk
+        ))
+        
+        data = {
+            'x': x,
+            'delta': delta,
+            'theta': theta,
+            'phase': self.model.phase_state(theta),
+            'v_shock': v_bulk,
+            'gw_damping': self.model.gw_damping_rate(theta)
+        }
+        return data if as_arrays else _records(data)
 
 class ObservationalPredictions:
     """
@@ -503,92 +568,65 @@ class ObservationalPredictions:
         """
         Predictions for Euclid weak lensing
         """
-        predictions = {
-            'z': z_bins,
-            'void_theta': [],
-            'cluster_theta': [],
-            'detection_snr': []
-        }
+        z = np.asarray(z_bins, dtype=float)
         
-        for z in z_bins:
-            # Void temperature
-            theta_void = self.model.theta_total(0, 0.1, z, delta=-0.5)
-            predictions['void_theta'].append(theta_void)
-            
-            # Cluster temperature
-            theta_cluster = self.model.theta_total(0, 0.1, z, delta=200)
-            predictions['cluster_theta'].append(theta_cluster)
-            
-            # Detection significance (simplified)
-            delta_theta = abs(theta_cluster - theta_void)
-            error_theta = 0.1  # Assumed error
-            snr = delta_theta / error_theta
-            predictions['detection_snr'].append(snr)
+        # Void and cluster temperatures
+        theta_void = np.asarray(self.model.theta_total(0, 0.1, z, delta=-0.5))
+        theta_cluster = np.asarray(self.model.theta_total(0, 0.1, z, delta=200))
+        
+        # Detection significance (simplified)
+        error_theta = 0.1  # Assumed error
+        snr = np.abs(theta_cluster - theta_void) / error_theta
         
-        return predictions
+        return {
+            'z': z_bins,
+            'void_theta': theta_void.tolist(),
+            'cluster_theta': theta_cluster.tolist(),
+            'detection_snr': snr.tolist()
+        }
     
     def desi_predictions(self, z_bins: np.ndarray) -> Dict:
         """
         Predictions for DESI RSD measurements
         """
-        predictions = {
-            'z': z_bins,
-            'growth_suppression': [],
-            'beta_modification': []
-        }
+        # Average field temperature
+        theta_field = np.asarray(self.model.theta_total(0, 0.1, np.asarray(z_bins, dtype=float), delta=0))
         
-        for z in z_bins:
-            # Average field temperature
-            theta_field = self.model.theta_total(0, 0.1, z, delta=0)
-            
-            # Growth modification
-            delta_f = self.model.growth_modification(theta_field)
-            predictions['growth_suppression'].append(delta_f)
-            
-            # RSD parameter modification
-            beta_mod = 1 + delta_f
-            predictions['beta_modification'].append(beta_mod)
+        # Growth and RSD parameter modification
+        delta_f = self.model.growth_modification(theta_field)
         
-        return predictions
+        return {
+            'z': z_bins,
+            'growth_suppression': delta_f.tolist(),
+            'beta_modification': (1 + delta_f).tolist()
+        }
     
     def lisa_predictions(self, z_sources: np.ndarray) -> Dict:
         """
         Predictions for LISA GW observations
         """
-        predictions = {
-            'z': z_sources,
-            'damping_factor': [],
-            'dl_ratio': []
-        }
+        # Path-integrated damping: left Riemann sum on 100 points per source
+        z_grid = np.linspace(0, np.asarray(z_sources, dtype=float), 100, axis=-1)
+        theta = np.asarray(self.model.theta_total(0, 0.1, z_grid[..., :-1], delta=0))
+        damping = self.model.gw_damping_rate(theta)
+        total_damping = np.sum(damping * np.diff(z_grid, axis=-1)/(1 + z_grid[..., :-1]), axis=-1)
         
-        for z in z_sources:
-            # Path-integrated damping
-            z_grid = np.linspace(0, z, 100)
-            total_damping = 0
-            
-            for i in range(len(z_grid)-1):
-                zi = z_grid[i]
-                theta_i = self.model.theta_total(0, 0.1, zi, delta=0)
-                damping_i = self.model.gw_damping_rate(theta_i)
-                dz = z_grid[i+1] - z_grid[i]
-                total_damping += damping_i * dz/(1+zi)
-            
-            # Amplitude suppression
-            A_ratio = np.exp(-total_damping/2)
-            predictions['damping_factor'].append(A_ratio)
-            
-            # Luminosity distance modification (simplified)
-            dl_ratio = 1/A_ratio  # GW appears more distant
-            predictions['dl_ratio'].append(dl_ratio)
+        # Amplitude suppression
+        A_ratio = np.exp(-total_damping/2)
         
-        return predictions
+        return {
+            'z': z_sources,
+            'damping_factor': A_ratio.tolist(),
+            # Luminosity distance modification (simplified): GW appears more distant
+            'dl_ratio': (1/A_ratio).tolist()
+        }
 
 def create_comprehensive_plots():
     """
     Generate complete visualization of information temperature framework
     """
     # Initialize models
-    model = InformationTemperature()
+    model = TabulatedInformationTemperature()
     profiles = EnvironmentalProfiles(model)
     predictions = ObservationalPredictions(model)
     
@@ -600,8 +638,8 @@ def create_comprehensive_plots():
     # Void profile
     ax1 = plt.subplot(3, 4, 1)
     r_void = np.linspace(0, 50, 200)
-    void_data = profiles.void_profile(r_void)
-    theta_void = [d['theta'] for d in void_data]
+    void_data = profiles.void_profile(r_void, as_arrays=True)
+    theta_void = void_data['theta']
     
     ax1.semilogy(r_void, theta_void, 'b-', linewidth=2.5)
     ax1.axhline(0.2, ls='--', color='gray', alpha=0.5, label='Crystal/Liquid')
@@ -618,15 +656,15 @@ def create_comprehensive_plots():
     # Cluster profile
     ax2 = plt.subplot(3, 4, 2)
     r_cluster = np.logspace(-2, 1, 200)
-    cluster_data = profiles.cluster_profile(r_cluster)
-    theta_cluster = [d['theta'] for d in cluster_data]
-    theta_crit = [d['theta_critical'] for d in cluster_data]
+    cluster_data = profiles.cluster_profile(r_cluster, as_arrays=True)
+    theta_cluster = cluster_data['theta']
+    theta_crit = cluster_data['theta_critical']
     
     ax2.loglog(r_cluster, theta_cluster, 'r-', linewidth=2.5, label='θ_geo')
     ax2.loglog(r_cluster, theta_crit, 'k--', linewidth=1.5, label='θ_critical')
-    transition_r = [d['r'] for d in cluster_data if d['in_transition']]
-    if transition_r:
-        ax2.axvspan(min(transition_r), max(transition_r), alpha=0.3, color='yellow', label='Transition zone')
+    transition_r = cluster_data['r'][cluster_data['in_transition']]
+    if transition_r.size:
+        ax2.axvspan(transition_r.min(), transition_r.max(), alpha=0.3, color='yellow', label='Transition zone')
     
     ax2.set_xlabel('r [Mpc/h]', fontsize=10)
     ax2.set_ylabel('θ_geo', fontsize=10)
@@ -637,13 +675,13 @@ def create_comprehensive_plots():
     # Filament cross-section
     ax3 = plt.subplot(3, 4, 3)
     x_fil = np.linspace(-15, 15, 200)
-    fil_data = profiles.filament_profile(x_fil)
-    theta_fil = [d['theta'] for d in fil_data]
+    fil_data = profiles.filament_profile(x_fil, as_arrays=True)
+    theta_fil = fil_data['theta']
     
     ax3.plot(x_fil, theta_fil, 'g-', linewidth=2.5)
     ax3.axhline(0.2, ls='--', color='gray', alpha=0.5)
     ax3.axhline(0.8, ls='--', color='orange', alpha=0.5)
-    ax3.fill_between(x_fil, 0, 0.8, where=np.array(theta_fil)<0.8, 
+    ax3.fill_between(x_fil, 0, 0.8, where=theta_fil<0.8, 
                      alpha=0.2, color='green', label='Liquid phase')
     
     ax3.set_xlabel('x [Mpc/h]', fontsize=10)
@@ -655,12 +693,12 @@ def create_comprehensive_plots():
     # Merger shock
     ax4 = plt.subplot(3, 4, 4)
     x_shock = np.linspace(-5, 5, 200)
-    shock_data = profiles.merger_shock_profile(x_shock)
-    theta_shock = [d['theta'] for d in shock_data]
+    shock_data = profiles.merger_shock_profile(x_shock, as_arrays=True)
+    theta_shock = shock_data['theta']
     
     ax4.semilogy(abs(x_shock), theta_shock, 'm-', linewidth=2.5)
     ax4.axvline(0.5, ls='--', color='red', linewidth=2, label='Shock front')
-    ax4.fill_between(abs(x_shock), 3, 100, where=np.array(theta_shock)>3,
+    ax4.fill_between(abs(x_shock), 3, 100, where=theta_shock>3,
                      alpha=0.2, color='red', label='Plasma phase')
     
     ax4.set_xlabel('|x| [Mpc/h]', fontsize=10)
@@ -675,9 +713,9 @@ def create_comprehensive_plots():
     ax5 = plt.subplot(3, 4, 5)
     z_evol = np.linspace(0, 5, 100)
     theta_components = {
-        'vacuum': [model.theta_vacuum(z) for z in z_evol],
-        'matter': [model.theta_matter(0, z) for z in z_evol],
-        'radiation': [model.theta_radiation(z) for z in z_evol]
+        'vacuum': model.theta_vacuum(z_evol),
+        'matter': model.theta_matter(0, z_evol),
+        'radiation': model.theta_radiation(z_evol)
     }
     
     ax5.plot(z_evol, theta_components['vacuum'], 'b-', label='Vacuum', linewidth=2)
@@ -694,21 +732,17 @@ def create_comprehensive_plots():
     # Phase diagram
     ax6 = plt.subplot(3, 4, 6)
     theta_range = np.logspace(-2, 2, 1000)
-    phase_colors = {
-        'super-crystal': 'darkblue',
-        'crystal': 'blue',
-        'liquid': 'green',
-        'viscous': 'orange',
-        'plasma': 'red',
-        'hot-plasma': 'darkred'
-    }
+    phase_colors = dict(zip(PHASE_NAMES, PHASE_COLORS))
     
-    # Create phase bands
+    # Create phase bands (one per contiguous run of a phase)
     y = np.linspace(0, 1, 10)
-    for i in range(len(theta_range)-1):
-        phase = model.phase_state(theta_range[i])
-        color = phase_colors[phase]
-        ax6.fill_betweenx(y, theta_range[i], theta_range[i+1], color=color, alpha=0.8)
+    phases = model.phase_state(theta_range[:-1])
+    edges = np.flatnonzero(phases[1:] != phases[:-1]) + 1
+    starts = np.concatenate(([0], edges))
+    stops = np.concatenate((edges, [len(phases)]))
+    for i, j in zip(starts, stops):
+        color = phase_colors[phases[i]]
+        ax6.fill_betweenx(y, theta_range[i], theta_range[j], color=color, alpha=0.8)
     
     # Add phase labels
     phase_positions = {
@@ -734,8 +768,8 @@ def create_comprehensive_plots():
     # Observable modifications
     ax7 = plt.subplot(3, 4, 7)
     theta_test = np.logspace(-2, 1.5, 100)
-    growth_mod = [model.growth_modification(t) for t in theta_test]
-    gw_damp = [model.gw_damping_rate(t) for t in theta_test]
+    growth_mod = model.growth_modification(theta_test)
+    gw_damp = model.gw_damping_rate(theta_test)
     
     ax7_twin = ax7.twinx()
     l1 = ax7.semilogx(theta_test, growth_mod, 'b-', linewidth=2, label='Growth suppression')
@@ -756,8 +790,8 @@ def create_comprehensive_plots():
     
     # Friction function
     ax8 = plt.subplot(3, 4, 8)
-    friction = [model.friction_coefficient(t) for t in theta_test]
-    sound_speed = [model.sound_speed_squared(t) for t in theta_test]
+    friction = model.friction_coefficient(theta_test)
+    sound_speed = model.sound_speed_squared(theta_test)
     
     ax8.loglog(theta_test, friction, 'g-', linewidth=2, label='Friction Γ(θ)')
     ax8.loglog(theta_test, sound_speed, 'm--', linewidth=2, label='Sound speed c_s²')
@@ -855,6 +889,49 @@ def create_comprehensive_plots():
     plt.tight_layout()
     return fig
 
+def create_phase_map_plot(model: Optional[InformationTemperature] = None,
+                          z: Optional[np.ndarray] = None,
+                          delta: Optional[np.ndarray] = None,
+                          **theta_kwargs):
+    """
+    Phase map over redshift and overdensity: θ_geo = model.theta_map(z, δ,
+    **theta_kwargs) coloured by phase_state, with θ_geo contours at the
+    phase boundaries
+    """
+    if model is None:
+        model = TabulatedInformationTemperature()
+    if z is None:
+        z = np.linspace(0, 5, 150)
+    if delta is None:
+        delta = np.logspace(-1, 3, 200) - 1   # 1 + δ from 0.1 (voids) to 1000 (clusters)
+    
+    theta = model.theta_map(z, delta, **theta_kwargs)
+    phase_index = np.searchsorted(PHASE_BOUNDARIES, theta, side='right')
+    
+    cmap = ListedColormap(PHASE_COLORS)
+    norm = BoundaryNorm(np.arange(len(PHASE_NAMES) + 1) - 0.5, cmap.N)
+    
+    fig, ax = plt.subplots(figsize=(8, 6))
+    mesh = ax.pcolormesh(1 + delta, z, phase_index, cmap=cmap, norm=norm,
+                         shading='nearest', alpha=0.8)
+    contours = ax.contour(1 + delta, z, theta, levels=PHASE_BOUNDARIES,
+                          colors='k', linewidths=0.8)
+    ax.clabel(contours, fmt='θ=%g', fontsize=8)
+    
+    cbar = fig.colorbar(mesh, ax=ax, ticks=np.arange(len(PHASE_NAMES)))
+    cbar.ax.set_yticklabels(PHASE_NAMES)
+    
+    ax.set_xscale('log')
+    ax.set_xlabel('1 + δ', fontsize=10)
+    ax.set_ylabel('Redshift z', fontsize=10)
+    title = 'Geometric Phase Map θ_geo(z, δ)'
+    if theta_kwargs:
+        title += '\n' + ', '.join(f"{k}={v}" for k, v in theta_kwargs.items())
+    ax.set_title(title, fontsize=11, fontweight='bold')
+    
+    plt.tight_layout()
+    return fig
+
 def run_complete_analysis():
     """
     Execute complete analysis and validation
@@ -867,7 +944,7 @@ def run_complete_analysis():
     # Initialize
     cosmo = CosmologyParams()
     adapt = AdaptonicParams()
-    model = InformationTemperature(cosmo, adapt)
+    model = TabulatedInformationTemperature(cosmo, adapt)
     
     # Test 1: Basic functionality
     print("\n1. BASIC FUNCTIONALITY TEST")
@@ -882,35 +959,35 @@ def run_complete_analysis():
     ]
     
     print(f"{'Environment':<15} {'δ':<8} {'θ_geo':<10} {'Phase':<15}")
-    for name, delta, grad in test_cases:
-        theta = model.theta_total(0, 0.1, 0.5, delta=delta, grad_sigma=grad)
-        phase = model.phase_state(theta)
+    names, deltas, grads = zip(*test_cases)
+    thetas = model.theta_total(0, 0.1, 0.5, delta=np.array(deltas), grad_sigma=np.array(grads))
+    phases = model.phase_state(thetas)
+    for name, delta, theta, phase in zip(names, deltas, thetas, phases):
         print(f"{name:<15} {delta:<8.1f} {theta:<10.3f} {phase:<15}")
     
     # Test 2: Redshift evolution
     print("\n2. REDSHIFT EVOLUTION TEST")
     print("-"*40)
     
-    z_test = [0, 0.5, 1.0, 2.0, 5.0, 10.0]
+    z_test = np.array([0, 0.5, 1.0, 2.0, 5.0, 10.0])
     print(f"{'z':<6} {'θ_vacuum':<12} {'θ_matter':<12} {'θ_radiation':<12}")
     
-    for z in z_test:
-        t_vac = model.theta_vacuum(z)
-        t_mat = model.theta_matter(0, z)
-        t_rad = model.theta_radiation(z)
+    components = zip(z_test, model.theta_vacuum(z_test), model.theta_matter(0, z_test),
+                     model.theta_radiation(z_test))
+    for z, t_vac, t_mat, t_rad in components:
         print(f"{z:<6.1f} {t_vac:<12.4f} {t_mat:<12.4f} {t_rad:<12.6f}")
     
     # Test 3: Observable effects
     print("\n3. OBSERVABLE EFFECTS")
     print("-"*40)
     
-    theta_values = [0.01, 0.1, 1.0, 10.0]
+    theta_values = np.array([0.01, 0.1, 1.0, 10.0])
     print(f"{'θ_geo':<8} {'Growth mod':<12} {'GW damp':<12} {'μ(k=0.1)':<12}")
     
-    for theta in theta_values:
-        growth = model.growth_modification(theta)
-        gw = model.gw_damping_rate(theta)
-        mu, _ = model.lensing_modifications(0.1, theta)
+    mus, _ = model.lensing_modifications(0.1, theta_values)
+    effects = zip(theta_values, model.growth_modification(theta_values),
+                  model.gw_damping_rate(theta_values), mus)
+    for theta, growth, gw, mu in effects:
         print(f"{theta:<8.2f} {growth:<12.4f} {gw:<12.4f} {mu:<12.4f}")
     
     # Test 4: Validation summary
@@ -938,6 +1015,12 @@ def run_complete_analysis():
     fig.savefig(output_file, dpi=150, bbox_inches='tight')
     print(f"Saved comprehensive plots to: {output_file}")
     
+    # smooth flow: at the default |∇σ| the shear term alone puts every cell in hot plasma
+    fig_map = create_phase_map_plot(model, grad_sigma=0.0)
+    map_file = '/home/claude/information_temperature_phase_map.png'
+    fig_map.savefig(map_file, dpi=150, bbox_inches='tight')
+    print(f"Saved (z, δ) phase map to: {map_file}")
+    
     # Final summary
     print("\n" + "="*70)
     print("SUMMARY: GAP 3 COMPLETE SOLUTION ACHIEVED")
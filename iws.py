@@ -5,8 +5,16 @@ Combines:
 - ChatGPT's σ-space decomposition
 - Claude's ecotone architecture
 - Unified state management
+
+With packed_sigma=True the layer σ vectors live in one SigmaBlock: a
+zero-padded (L, Dmax) float32 matrix with cached row norms and a dirty
+flag, so σ_coh is one Gram-matrix product per σ update, shared by
+compute_global_coherence, detect_phase and check_control_health.
+snapshot(as_record=True) gives a fixed-size SNAPSHOT_DTYPE record for
+high-frequency logging.
 """
 
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
 from enum import Enum
@@ -51,6 +59,124 @@ class Goal:
     deadline_steps: Optional[int] = None
 
 
+class SigmaBlock(MutableMapping):
+    """
+    Packed per-layer σ storage (mapping layer name → σ vector).
+    
+    Rows of one preallocated float32 block (rows and columns grown
+    geometrically), shorter layers zero-padded to the widest one. Reads
+    return float64 copies like the dict storage; block / norms are
+    read-only zero-copy views.
+    """
+    
+    def __init__(self, layers: Optional[Dict[str, np.ndarray]] = None, initial_rows: int = 8):
+        self._data = np.zeros((max(1, initial_rows), 0), dtype=np.float32)
+        self._norms = np.zeros(max(1, initial_rows))
+        self._dims: List[int] = []
+        self._index: Dict[str, int] = {}
+        self._dirty = True
+        self._coherence = 1.0
+        for name, sigma in dict(layers or {}).items():
+            self[name] = sigma
+    
+    def _grow(self, rows: int, cols: int):
+        shape = (max(rows, self._data.shape[0]), max(cols, self._data.shape[1]))
+        data = np.zeros(shape, dtype=np.float32)
+        data[:self._data.shape[0], :self._data.shape[1]] = self._data
+        self._data = data
+        self._norms = np.concatenate([self._norms, np.zeros(shape[0] - len(self._norms))])
+    
+    def __setitem__(self, name: str, sigma: np.ndarray):
+        sigma = np.asarray(sigma).ravel()
+        d = sigma.size
+        row = self._index.get(name)
+        if row is None:
+            row = len(self._index)
+            if row == self._data.shape[0]:
+                self._grow(2 * row, 0)
+            self._index[name] = row
+            self._dims.append(d)
+        if d > self._data.shape[1]:
+            self._grow(0, max(d, 2 * self._data.shape[1]))
+        
+        self._data[row, :d] = sigma
+        self._data[row, d:] = 0.0
+        self._dims[row] = d
+        self._norms[row] = np.linalg.norm(self._data[row, :d].astype(float))
+        self._dirty = True
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        row = self._index[name]
+        return self._data[row, :self._dims[row]].astype(float)
+    
+    def __delitem__(self, name: str):
+        row = self._index.pop(name)
+        n = len(self._dims)
+        self._data[row:n - 1] = self._data[row + 1:n]
+        self._data[n - 1] = 0.0
+        self._norms[row:n - 1] = self._norms[row + 1:n]
+        del self._dims[row]
+        self._index = {k: (i if i < row else i - 1) for k, i in self._index.items()}
+        self._dirty = True
+    
+    def __contains__(self, name) -> bool:
+        return name in self._index
+    
+    def __iter__(self):
+        return iter(self._index)
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    @property
+    def block(self) -> np.ndarray:
+        """(L, Dmax) float32 view, rows in insertion order"""
+        view = self._data[:len(self._index), :max(self._dims, default=0)]
+        view.flags.writeable = False
+        return view
+    
+    @property
+    def norms(self) -> np.ndarray:
+        view = self._norms[:len(self._index)]
+        view.flags.writeable = False
+        return view
+    
+    def coherence(self) -> float:
+        """Mean pairwise cosine similarity (cached until the next write)"""
+        if self._dirty:
+            L = len(self._index)
+            if L < 2:
+                self._coherence = 1.0
+            else:
+                X = self._data[:L]
+                gram = (X @ X.T).astype(float)
+                norms = self._norms[:L]
+                i, j = np.triu_indices(L, k=1)
+                self._coherence = float(np.mean(gram[i, j] / (norms[i] * norms[j] + 1e-8)))
+            self._dirty = False
+        return self._coherence
+
+
+SNAPSHOT_DTYPE = np.dtype([
+    ('physical_time', np.int64),
+    ('intentional_time', np.int64),
+    ('phase', 'U2'),
+    ('theta', np.float64),
+    ('gamma', np.float64),
+    ('n_eff', np.float64),
+    ('I_ratio', np.float64),
+    ('d_sem', np.float64),
+    ('I_score', np.float64),
+    ('sigma_coh', np.float64),
+    ('F_wew', np.float64),
+    ('F_zew', np.float64),
+    ('resonance', np.float64),
+    ('mode', 'U15'),
+    ('control_health', 'U11'),
+    ('timestamp', 'datetime64[us]'),
+])
+
+
 @dataclass
 class IntentionalWorldState:
     """
@@ -106,11 +232,22 @@ class IntentionalWorldState:
     timestamp: datetime = field(default_factory=datetime.now)
     last_metrics: Dict[str, Any] = field(default_factory=dict)
     
+    # === STORAGE ===
+    packed_sigma: bool = False  # store σ in a SigmaBlock
+    
     # === METHODS ===
     
+    def __post_init__(self):
+        if self.packed_sigma and not isinstance(self.sigma_state, SigmaBlock):
+            self.sigma_state = SigmaBlock(self.sigma_state)
+    
     def update_sigma(self, layer_name: str, sigma: np.ndarray):
         """Update σ for specific layer"""
-        self.sigma_state[layer_name] = sigma.astype(float).copy()
+        if isinstance(self.sigma_state, SigmaBlock):
+            # written into the block, no intermediate copy
+            self.sigma_state[layer_name] = sigma
+        else:
+            self.sigma_state[layer_name] = sigma.astype(float).copy()
     
     def get_sigma(self, layer_name: str, default_dim: int = 32) -> np.ndarray:
         """Get σ for specific layer (or zeros if not exists)"""
@@ -120,6 +257,8 @@ class IntentionalWorldState:
     
     def compute_global_coherence(self) -> float:
         """Compute σ_coh across all layers"""
+        if isinstance(self.sigma_state, SigmaBlock):
+            return self.sigma_state.coherence()
         if len(self.sigma_state) < 2:
             return 1.0
         
@@ -141,6 +280,8 @@ class IntentionalWorldState:
     
     def compute_n_eff(self, norm_threshold: float = 0.01) -> float:
         """Effective layer count"""
+        if isinstance(self.sigma_state, SigmaBlock):
+            return float(max(np.count_nonzero(self.sigma_state.norms > norm_threshold), 1))
         n = 0
         for sigma in self.sigma_state.values():
             if np.linalg.norm(sigma) > norm_threshold:
@@ -185,8 +326,23 @@ class IntentionalWorldState:
         if self.ecotone_I.active:
             self.intentional_time += 1
     
-    def snapshot(self) -> Dict[str, Any]:
-        """Create serializable snapshot"""
+    def snapshot(self, as_record: bool = False) -> Dict[str, Any]:
+        """
+        Create serializable snapshot
+        
+        as_record: return one SNAPSHOT_DTYPE record instead of a dict
+        (e.g. log[i] = iws.snapshot(as_record=True) into a preallocated
+        np.empty(n, SNAPSHOT_DTYPE) array)
+        """
+        if as_record:
+            return np.array((
+                self.physical_time, self.intentional_time, self.phase.value,
+                self.theta, self.gamma, self.n_eff, self.I_indirect_ratio,
+                self.d_sem, self.I_score, self.sigma_coh,
+                self.ecotone_I.F_local, self.ecotone_II.F_local, self.ecotone_R.F_local,
+                self.current_mode.value, self.check_control_health(),
+                np.datetime64(self.timestamp, 'us')
+            ), dtype=SNAPSHOT_DTYPE)[()]
         return {
             'physical_time': self.physical_time,
             'intentional_time': self.intentional_time,
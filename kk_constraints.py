@@ -2,21 +2,98 @@
 # kk_constraints.py (clean build)
 # Gap 1: KK Constraints as a Hard Condition
 # Implements:
-#  - HilbertTransform with methods: 'kernel', 'fft', 'odd_fft', 'pv_quad'
+#  - HilbertTransform with methods: 'kernel', 'fft', 'odd_fft', 'pv_quad', 'fast_pv'
+#  - Process-wide LRU (optionally on-disk) cache of kernel matrices by grid hash
 #  - KramersKronigRelations (forward/backward/check)
-#  - KKProjector (projection onto H_KK)
-#  - ConstrainedOptimizer (minimize F = E - Theta*S with KK constraint)
+#  - KKProjector (projection onto H_KK), batched over (n_spectra, n_omega)
+#  - ConstrainedOptimizer (minimize F = E - Theta*S with KK constraint),
+#    optional Anderson-accelerated mode and warm-started Theta sweeps
 
 from __future__ import annotations
 import numpy as np
+import hashlib
 import warnings
+from collections import OrderedDict
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+from numeric_compat import trapezoid as _trapz
+
+# ---------------------------------------------------------------------------
+# Kernel cache: KKProjector / ConstrainedOptimizer instances on the same grid
+# share one O(n^2) matrix instead of rebuilding it each time.
+# ---------------------------------------------------------------------------
+
+# batched FFT transforms work on blocks of ~this many padded samples
+FFT_BLOCK_ELEMENTS = 1 << 15
+
+KERNEL_CACHE_SIZE = 8
+_KERNEL_CACHE: "OrderedDict[tuple, object]" = OrderedDict()
+_KERNEL_CACHE_DIR: Optional[Path] = None
+
+
+def set_kernel_cache(maxsize: Optional[int] = None,
+                     directory: Optional[Union[str, Path]] = None) -> None:
+    """Configure the kernel cache size and (optional) on-disk directory."""
+    global KERNEL_CACHE_SIZE, _KERNEL_CACHE_DIR
+    if maxsize is not None:
+        KERNEL_CACHE_SIZE = int(maxsize)
+        while len(_KERNEL_CACHE) > KERNEL_CACHE_SIZE:
+            _KERNEL_CACHE.popitem(last=False)
+    if directory is not None:
+        _KERNEL_CACHE_DIR = Path(directory)
+        _KERNEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def clear_kernel_cache() -> None:
+    """Drop all in-memory cached kernels (disk files are kept)."""
+    _KERNEL_CACHE.clear()
+
+
+def grid_hash(omega: np.ndarray) -> str:
+    return hashlib.sha1(np.ascontiguousarray(omega, dtype=float).tobytes()).hexdigest()
+
+
+def _cached(kind: str, omega: np.ndarray, build: Callable[[], object],
+            to_disk: bool = False):
+    key = (kind, grid_hash(omega))
+    if key in _KERNEL_CACHE:
+        _KERNEL_CACHE.move_to_end(key)
+        return _KERNEL_CACHE[key]
+
+    path = None
+    if to_disk and _KERNEL_CACHE_DIR is not None:
+        path = _KERNEL_CACHE_DIR / f"kk_{kind}_{key[1]}.npy"
+    if path is not None and path.exists():
+        value = np.load(path)
+    else:
+        value = build()
+        if path is not None:
+            np.save(path, value)
+
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)   # shared between instances
+    _KERNEL_CACHE[key] = value
+    while len(_KERNEL_CACHE) > KERNEL_CACHE_SIZE:
+        _KERNEL_CACHE.popitem(last=False)
+    return value
 
 class HilbertTransform:
     """
     Discrete Hilbert transform operators suitable for KK relations on omega>0.
+
+    'fast_pv' evaluates the same PV integral as 'pv_quad',
+        (2/pi) P int w' f(w') / (w'^2 - w^2) dw',
+    in O(n log n): with w = e^x the kernel becomes 1/(1 - e^{2(x-y)}), a
+    convolution on a log-uniform grid, so f is resampled to log(w), convolved
+    by FFT and interpolated back. See fast_pv_accuracy_report().
     """
 
+    # log-grid oversampling relative to n for 'fast_pv'
+    FAST_PV_OVERSAMPLE = 4
+    FAST_PV_MAX_POINTS = 1 << 22
+
     def __init__(self, omega: np.ndarray, method: str = 'kernel'):
         if not np.all(omega > 0):
             raise ValueError("Omega must be strictly positive.")
@@ -27,59 +104,100 @@ class HilbertTransform:
         self.method = method
 
         if method == 'kernel':
-            self.H_matrix = self._build_kernel_matrix()
+            self.H_matrix = _cached('kernel', self.omega, self._build_kernel_matrix, to_disk=True)
         elif method == 'fft':
             self._fft_len = None  # lazy
         elif method == 'odd_fft':
             self._odd_fft_prepare()
+        elif method == 'odd_fft_uniform':
+            self._odd_fft_uniform_prepare()
         elif method == 'pv_quad':
-            self.H_matrix = self._build_kernel_matrix_pv()
+            self.H_matrix = _cached('pv_quad', self.omega, self._build_kernel_matrix_pv, to_disk=True)
+        elif method == 'fast_pv':
+            self._fast_pv = _cached('fast_pv', self.omega, self._fast_pv_prepare)
         else:
-            raise ValueError("method must be 'kernel' or 'fft' or 'odd_fft' or 'pv_quad'")
+            raise ValueError("method must be 'kernel' or 'fft' or 'odd_fft' or "
+                             "'odd_fft_uniform' or 'pv_quad' or 'fast_pv'")
 
     def _build_kernel_matrix(self) -> np.ndarray:
         # Basic kernel (no explicit weights) - kept for backward compatibility
         w = self.omega
-        n = self.n
-        H = np.zeros((n, n), dtype=float)
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    H[i, j] = 0.0
-                else:
-                    denom = (w[j]**2 - w[i]**2)
-                    if abs(denom) > 1e-12:
-                        H[i, j] = (2.0/np.pi) * w[j] / denom
-                    else:
-                        # fallback finite-difference
-                        dw = (w[j] - w[i])
-                        H[i, j] = (1.0/dw) if dw != 0 else 0.0
+        wi, wj = w[:, None], w[None, :]
+        denom = wj**2 - wi**2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            H = np.where(np.abs(denom) > 1e-12,
+                         (2.0/np.pi) * wj / denom,
+                         # fallback finite-difference (0 for coincident points)
+                         np.where(wj != wi, 1.0 / (wj - wi), 0.0))
+        np.fill_diagonal(H, 0.0)
         return H
 
-    def _build_kernel_matrix_pv(self) -> np.ndarray:
-        # PV quadrature with trapezoid weights and exclusion of nearest neighbors
+    def _trapezoid_weights(self) -> np.ndarray:
         w = self.omega
-        n = self.n
-        H = np.zeros((n, n), dtype=float)
-        dw = np.zeros(n, dtype=float)
+        dw = np.zeros(self.n, dtype=float)
         dw[1:-1] = 0.5*(w[2:] - w[:-2])
         dw[0] = w[1]-w[0]
         dw[-1] = w[-1]-w[-2]
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    H[i, j] = 0.0
-                else:
-                    denom = (w[j]**2 - w[i]**2)
-                    H[i, j] = (2.0/np.pi) * w[j] / denom * dw[j]
-        # local PV exclusion (nearest neighbors)
-        for i in range(n):
-            if i-1 >= 0:
-                H[i, i-1] = 0.0
-            if i+1 < n:
-                H[i, i+1] = 0.0
+        return dw
+
+    def _build_kernel_matrix_pv(self) -> np.ndarray:
+        # PV quadrature with trapezoid weights and exclusion of nearest neighbors
+        w = self.omega
+        dw = self._trapezoid_weights()
+        denom = w[None, :]**2 - w[:, None]**2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            H = (2.0/np.pi) * w[None, :] / denom * dw[None, :]
+        # diagonal and local PV exclusion (nearest neighbors)
+        idx = np.arange(self.n)
+        H[idx, idx] = 0.0
+        H[idx[1:], idx[:-1]] = 0.0
+        H[idx[:-1], idx[1:]] = 0.0
         return H
 
+    def _fast_pv_prepare(self) -> Dict[str, np.ndarray]:
+        # Log-uniform grid x = ln(w), fine enough to resolve the original
+        # spacing everywhere (dx <= min dw/w) and at least 4x oversampled
+        x = np.log(self.omega)
+        span = x[-1] - x[0]
+        m = max(self.FAST_PV_OVERSAMPLE * self.n,
+                int(np.ceil(span / np.min(np.diff(x)))) + 1)
+        M = 1
+        while M < m:
+            M <<= 1
+        M = min(M, self.FAST_PV_MAX_POINTS)
+        x_log = np.linspace(x[0], x[-1], M)
+        h = x_log[1] - x_log[0]
+
+        # Convolution weights c_m = h * K(m h), K(u) = 1/(1 - e^{2u});
+        # PV: the odd singular part -1/(2u) cancels symmetrically, the
+        # regular part K(u) + 1/(2u) -> 1/2 at u = 0.
+        u = h * np.arange(-(M - 1), M)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            c = h / (-np.expm1(2.0 * u))
+        c[M - 1] = 0.5 * h
+        c *= 2.0 / np.pi
+
+        L = 1
+        while L < 3*M - 2:
+            L <<= 1
+        return {
+            'x_log': x_log,
+            'kernel_fft': np.fft.rfft(c, n=L),
+            'fft_len': np.array(L),
+            'to_log': _interp_weights(x_log, x),
+            'from_log': _interp_weights(x, x_log),
+        }
+
+    def _transform_fast_pv(self, f: np.ndarray) -> np.ndarray:
+        prep = self._fast_pv
+        M = len(prep['x_log'])
+        L = int(prep['fft_len'])
+        f_log = _apply_interp(np.asarray(f, dtype=float), prep['to_log'])
+        conv = np.fft.irfft(np.fft.rfft(f_log, n=L, axis=-1) * prep['kernel_fft'], n=L, axis=-1)
+        # full linear convolution index i + (M-1) -> output sample i
+        g_log = conv[..., M - 1:2*M - 1]
+        return _apply_interp(g_log, prep['from_log'])
+
     def _odd_fft_prepare(self):
         w = self.omega
         # symmetric grid [-w_max,...,-w_min, w_min,...,w_max]
@@ -99,6 +217,24 @@ class HilbertTransform:
             N <<= 1
         self._N_fft = N
 
+    def _odd_fft_uniform_prepare(self):
+        # resample onto a 4x oversampled uniform grid, stronger taper
+        w = self.omega
+        self._w_uniform = np.linspace(float(w[0]), float(w[-1]), 4*len(w))
+        n_sym = 2*len(self._w_uniform)
+        k = max(16, n_sym//30)
+        win = np.hanning(2*k)
+        taper = np.ones(n_sym)
+        taper[:k] = win[:k]
+        taper[-k:] = win[-k:]
+        self._taper_u = taper
+        N = 1
+        while N < n_sym*2:
+            N <<= 1
+        self._N_fft_u = N
+        self._to_uniform = _interp_weights(self._w_uniform, w)
+        self._from_uniform = _interp_weights(w, self._w_uniform)
+
     def _transform_fft(self, f: np.ndarray) -> np.ndarray:
         f = np.asarray(f, dtype=float)
         n = self.n
@@ -106,41 +242,139 @@ class HilbertTransform:
         N = 1
         while N < 2*n:
             N <<= 1
-        f_ext = np.zeros(N, dtype=float)
-        f_ext[:n] = f
-        F = np.fft.fft(f_ext)
-        freqs = np.fft.fftfreq(N)
-        Fh = -1j*np.sign(freqs)*F
-        fh = np.fft.ifft(Fh).real[:n]
+        F = np.fft.rfft(f, n=N, axis=-1)
+        fh = np.fft.irfft(F * _hilbert_multiplier(N), n=N, axis=-1)[..., :n]
         return fh
 
+    def _odd_hilbert(self, f: np.ndarray, taper: np.ndarray, N: int) -> np.ndarray:
+        # odd extension along the last axis, FFT Hilbert, positive half
+        f_sym = np.concatenate([-f[..., ::-1], f], axis=-1)
+        f_sym = f_sym * taper
+        F = np.fft.rfft(f_sym, n=N, axis=-1)
+        fh_sym = np.fft.irfft(F * _hilbert_multiplier(N), n=N, axis=-1)
+        n_sym = f_sym.shape[-1]
+        return fh_sym[..., n_sym//2:n_sym]
+
     def _transform_odd_fft(self, f: np.ndarray) -> np.ndarray:
-        f = np.asarray(f, dtype=float)
-        # odd extension
-        f_sym = np.concatenate([-f[::-1], f])
-        f_sym = f_sym * self._taper
-        F = np.fft.fft(f_sym, n=self._N_fft)
-        freqs = np.fft.fftfreq(self._N_fft)
-        Fh = -1j*np.sign(freqs)*F
-        fh_sym = np.fft.ifft(Fh).real
-        fh_sym = fh_sym[:len(f_sym)]
-        # extract positive half
-        return fh_sym[len(f_sym)//2:]
+        return self._odd_hilbert(np.asarray(f, dtype=float), self._taper, self._N_fft)
+
+    def _transform_odd_fft_uniform(self, f: np.ndarray) -> np.ndarray:
+        f_u = _apply_interp(np.asarray(f, dtype=float), self._to_uniform)
+        fh_u = self._odd_hilbert(f_u, self._taper_u, self._N_fft_u)
+        return _apply_interp(fh_u, self._from_uniform)
 
     def transform(self, f: np.ndarray) -> np.ndarray:
-        if len(f) != self.n:
+        """
+        Hilbert transform along the last axis: f has shape (n,) or
+        (n_spectra, n) on the shared omega grid.
+        """
+        f = np.asarray(f)
+        if f.shape[-1] != self.n:
             raise ValueError("Input length mismatch with omega grid.")
-        if self.method == 'kernel':
-            return self.H_matrix @ f
-        elif self.method == 'fft':
+        if self.method in ('kernel', 'pv_quad'):
+            return self.H_matrix @ f if f.ndim == 1 else f @ self.H_matrix.T
+        if f.ndim > 1 and f.shape[0] > self._block_rows():
+            # FFT paths: a few rows at a time keeps the padded work arrays in cache
+            rows = self._block_rows()
+            return np.concatenate([self._transform_rows(f[i:i + rows])
+                                   for i in range(0, f.shape[0], rows)])
+        return self._transform_rows(f)
+
+    def _block_rows(self) -> int:
+        N = {'fft': 2*self.n, 'odd_fft': getattr(self, '_N_fft', 0),
+             'odd_fft_uniform': getattr(self, '_N_fft_u', 0)}.get(self.method, 4*self.n)
+        return max(1, FFT_BLOCK_ELEMENTS // max(int(N), 1))
+
+    def _transform_rows(self, f: np.ndarray) -> np.ndarray:
+        if self.method == 'fft':
             return self._transform_fft(f)
         elif self.method == 'odd_fft':
             return self._transform_odd_fft(f)
-        elif self.method == 'pv_quad':
-            return self.H_matrix @ f
+        elif self.method == 'odd_fft_uniform':
+            return self._transform_odd_fft_uniform(f)
+        elif self.method == 'fast_pv':
+            return self._transform_fast_pv(f)
         else:
             raise RuntimeError("Unknown method")
 
+
+def _hilbert_multiplier(N: int) -> np.ndarray:
+    # -i*sign(freq) on the rfft half-spectrum; the Nyquist bin only feeds the
+    # imaginary part of the full-spectrum ifft, so dropping it keeps .real
+    h = np.full(N//2 + 1, -1j)
+    h[0] = 0.0
+    if N % 2 == 0:
+        h[-1] = 0.0
+    return h
+
+
+def _interp_weights(x_new: np.ndarray, x_old: np.ndarray):
+    # linear interpolation x_old -> x_new as (index, fraction), clamped at the
+    # ends like np.interp; reusable for any number of spectra
+    idx = np.clip(np.searchsorted(x_old, x_new, side='right') - 1, 0, len(x_old) - 2)
+    t = (x_new - x_old[idx]) / (x_old[idx + 1] - x_old[idx])
+    return idx, np.clip(t, 0.0, 1.0)
+
+
+def _apply_interp(f: np.ndarray, weights) -> np.ndarray:
+    idx, t = weights
+    return f[..., idx] * (1.0 - t) + f[..., idx + 1] * t
+
+
+def fast_pv_accuracy_report(omega: Optional[np.ndarray] = None,
+                            widths=(0.1, 1.0, 10.0)) -> Dict[str, object]:
+    """
+    Measured accuracy of 'fast_pv' against 'pv_quad' and the exact transform.
+
+    Test functions f(w) = 1/(w^2 + a^2) have the closed form
+        (2/pi) P int_0^inf w' f(w') / (w'^2 - w^2) dw' = -(2/pi) ln(w/a) / (w^2 + a^2).
+    Errors are relative L2 norms on the inner 80% (in log w) of the grid, where
+    truncation of the integral at the grid ends is negligible.
+    """
+    import time
+    if omega is None:
+        omega = np.logspace(-3, 3, 2000)
+    omega = np.asarray(omega, dtype=float)
+
+    t0 = time.perf_counter()
+    H_quad = HilbertTransform(omega, method='pv_quad')
+    t1 = time.perf_counter()
+    H_fast = HilbertTransform(omega, method='fast_pv')
+    t2 = time.perf_counter()
+
+    x = np.log(omega)
+    inner = (x > x[0] + 0.1*(x[-1] - x[0])) & (x < x[-1] - 0.1*(x[-1] - x[0]))
+
+    def rel(a, b):
+        return float(np.linalg.norm((a - b)[inner]) / (np.linalg.norm(b[inner]) + 1e-300))
+
+    cases = []
+    t_quad = t_fast = 0.0
+    for a in widths:
+        f = 1.0 / (omega**2 + a**2)
+        exact = -(2.0/np.pi) * np.log(omega / a) / (omega**2 + a**2)
+        s0 = time.perf_counter()
+        g_quad = H_quad.transform(f)
+        s1 = time.perf_counter()
+        g_fast = H_fast.transform(f)
+        s2 = time.perf_counter()
+        t_quad += s1 - s0
+        t_fast += s2 - s1
+        cases.append({
+            'a': float(a),
+            'err_fast_pv_vs_exact': rel(g_fast, exact),
+            'err_pv_quad_vs_exact': rel(g_quad, exact),
+            'diff_fast_pv_vs_pv_quad': rel(g_fast, g_quad),
+        })
+
+    return {
+        'n': int(len(omega)),
+        'n_log_grid': int(len(H_fast._fast_pv['x_log'])),
+        'setup_s': {'pv_quad': t1 - t0, 'fast_pv': t2 - t1},
+        'transform_s': {'pv_quad': t_quad / len(widths), 'fast_pv': t_fast / len(widths)},
+        'cases': cases,
+    }
+
 class KramersKronigRelations:
     """
     KK relations:
@@ -167,10 +401,19 @@ class KramersKronigRelations:
         return w * Hg
 
     def check_consistency(self, sigma1: np.ndarray, sigma2: np.ndarray, tol: float = 0.1):
+        """Relative KK errors; arrays of shape (n_spectra,) for batched input."""
+        sigma1 = np.asarray(sigma1, dtype=float)
+        sigma2 = np.asarray(sigma2, dtype=float)
         s2_from_s1 = self.forward(sigma1)
         s1_from_s2 = self.backward(sigma2)
-        e_fwd = np.linalg.norm(sigma2 - s2_from_s1) / (np.linalg.norm(sigma2) + 1e-16)
-        e_bwd = np.linalg.norm(sigma1 - s1_from_s2) / (np.linalg.norm(sigma1) + 1e-16)
+        e_fwd = np.linalg.norm(sigma2 - s2_from_s1, axis=-1) / (np.linalg.norm(sigma2, axis=-1) + 1e-16)
+        e_bwd = np.linalg.norm(sigma1 - s1_from_s2, axis=-1) / (np.linalg.norm(sigma1, axis=-1) + 1e-16)
+        if np.ndim(e_fwd) > 0:
+            return {
+                'consistent': (e_fwd < tol) & (e_bwd < tol),
+                'error_forward': e_fwd,
+                'error_backward': e_bwd
+            }
         return {
             'consistent': bool((e_fwd < tol) and (e_bwd < tol)),
             'error_forward': float(e_fwd),
@@ -180,6 +423,10 @@ class KramersKronigRelations:
 class KKProjector:
     """
     Projection onto H_KK via fixed-point averaging with normalization and positivity.
+
+    Accepts a single spectrum (n,) or a stack (n_spectra, n) on the shared
+    grid; stacked spectra are iterated together and each one drops out of
+    the active set as soon as it has converged.
     """
 
     def __init__(self, omega: np.ndarray, method: str = 'odd_fft'):
@@ -188,27 +435,105 @@ class KKProjector:
 
     def _normalize(self, x: np.ndarray) -> np.ndarray:
         x = np.maximum(x, 0.0)
-        integ = np.trapz(x, self.omega)
-        if integ <= 0:
-            return np.ones_like(x) / np.trapz(np.ones_like(x), self.omega)
-        return x / integ
-
-    def project(self, pi: np.ndarray, max_iter: int = 30, tol: float = 1e-6) -> np.ndarray:
-        cur = self._normalize(np.asarray(pi, dtype=float))
+        integ = _trapz(x, self.omega, axis=-1)
+        uniform = 1.0 / _trapz(np.ones_like(self.omega), self.omega)
+        if np.ndim(integ) == 0:
+            return x / integ if integ > 0 else np.full_like(x, uniform)
+        ok = integ > 0
+        out = np.full_like(x, uniform)
+        out[ok] = x[ok] / integ[ok, None]
+        return out
+
+    def project_batch(self, pi: np.ndarray, max_iter: int = 30, tol: float = 1e-6):
+        """
+        Project a stack of spectra; returns (projected, info) with per-spectrum
+        'iterations' and 'converged' arrays.
+        """
+        cur = self._normalize(np.atleast_2d(np.asarray(pi, dtype=float)))
+        n_spectra = cur.shape[0]
+        iterations = np.zeros(n_spectra, dtype=int)
+        converged = np.zeros(n_spectra, dtype=bool)
+        active = np.arange(n_spectra)
         for _ in range(max_iter):
-            s1 = cur
+            if active.size == 0:
+                break
+            s1 = cur[active]
             s2 = self.kk.forward(s1)
             s1_rec = self.kk.backward(s2)
-            nxt = self._normalize(0.5*(cur + s1_rec))
-            rel = np.linalg.norm(nxt - cur) / (np.linalg.norm(cur) + 1e-16)
-            cur = nxt
-            if rel < tol:
-                break
-        return cur
+            nxt = self._normalize(0.5*(s1 + s1_rec))
+            rel = np.linalg.norm(nxt - s1, axis=-1) / (np.linalg.norm(s1, axis=-1) + 1e-16)
+            cur[active] = nxt
+            iterations[active] += 1
+            done = rel < tol
+            converged[active[done]] = True
+            active = active[~done]
+        return cur, {'iterations': iterations, 'converged': converged}
 
-    def violation(self, pi: np.ndarray) -> float:
+    def project(self, pi: np.ndarray, max_iter: int = 30, tol: float = 1e-6) -> np.ndarray:
+        pi = np.asarray(pi, dtype=float)
+        proj, _ = self.project_batch(pi, max_iter=max_iter, tol=tol)
+        return proj[0] if pi.ndim == 1 else proj
+
+    def _step(self, x: np.ndarray) -> np.ndarray:
+        # averaging map whose fixed points are the normalized KK-consistent spectra
+        return self._normalize(0.5*(x + self.kk.backward(self.kk.forward(x))))
+
+    def project_accelerated(self, pi: np.ndarray, x0: Optional[np.ndarray] = None,
+                            max_iter: int = 30, tol: float = 1e-6, m: int = 5):
+        """
+        Anderson-accelerated projection of a single spectrum.
+
+        Iterates the same averaging map as project(), starting from x0 (a warm
+        start, e.g. the previous solution) instead of pi when given, and
+        extrapolates over the last m residuals. Returns (projected, info) with
+        'iterations', 'converged' and 'residual': ||step(x) - x|| / ||x|| of
+        the last iterate (< tol) on convergence, otherwise the same measure
+        taken on the returned spectrum itself (one extra map step).
+        """
+        x = self._normalize(np.asarray(pi if x0 is None else x0, dtype=float))
+        dX, dR = [], []
+        g_prev = r_prev = None
+        best = (np.inf, x)
+        rel = np.inf
+        it = 0
+        for it in range(1, max_iter + 1):
+            g = self._step(x)
+            r = g - x
+            rel = float(np.linalg.norm(r) / (np.linalg.norm(x) + 1e-16))
+            if rel < best[0]:
+                best = (rel, g)
+            if rel < tol:
+                return g, {'iterations': it, 'converged': True, 'residual': rel}
+            if r_prev is not None:
+                dX.append(g - g_prev)
+                dR.append(r - r_prev)
+                if len(dR) > m:
+                    dX.pop(0)
+                    dR.pop(0)
+            g_prev, r_prev = g, r
+            if dR:
+                # least-squares mixing of the stored residual differences;
+                # restart from a plain step when it does not reduce |r|
+                gamma = np.linalg.lstsq(np.column_stack(dR), r, rcond=None)[0]
+                x_acc = self._normalize(g - np.column_stack(dX) @ gamma)
+                if np.linalg.norm(r - np.column_stack(dR) @ gamma) < np.linalg.norm(r):
+                    x = x_acc
+                    continue
+                dX.clear()
+                dR.clear()
+            x = g
+        # m=0 is the plain map: return its last iterate exactly like project()
+        x = best[1] if m > 0 else g
+        # best[0] belongs to the iterate before best[1]: re-measure the result
+        rel = float(np.linalg.norm(self._step(x) - x) / (np.linalg.norm(x) + 1e-16))
+        return x, {'iterations': it, 'converged': False, 'residual': rel}
+
+    def violation(self, pi: np.ndarray):
+        """Relative distance to the projection (array for stacked input)."""
+        pi = np.asarray(pi, dtype=float)
         proj = self.project(pi, max_iter=15, tol=1e-5)
-        return float(np.linalg.norm(proj - pi) / (np.linalg.norm(pi) + 1e-16))
+        v = np.linalg.norm(proj - pi, axis=-1) / (np.linalg.norm(pi, axis=-1) + 1e-16)
+        return float(v) if pi.ndim == 1 else v
 
 @dataclass
 class OptimizeResult:
@@ -233,26 +558,37 @@ class ConstrainedOptimizer:
 
     def _entropy(self, pi: np.ndarray) -> float:
         pi_safe = np.where(pi > 1e-16, pi, 1e-16)
-        return float(-np.trapz(pi*np.log(pi_safe), self.omega))
+        return float(-_trapz(pi*np.log(pi_safe), self.omega))
 
     def free_energy(self, pi: np.ndarray) -> float:
-        E = float(np.trapz(self.epsilon*pi, self.omega))
+        E = float(_trapz(self.epsilon*pi, self.omega))
         S = self._entropy(pi)
         return float(E - self.Theta*S)
 
-    def minimize(self, max_iter: int = 80, tol: float = 1e-6) -> OptimizeResult:
-        w = self.omega
-        pi = np.exp(-self.epsilon/self.Theta)
-        pi = pi / np.trapz(pi, w)
+    def gibbs_state(self, Theta: Optional[float] = None) -> np.ndarray:
+        """Normalized unconstrained minimizer exp(-eps/Theta)."""
+        pi = np.exp(-self.epsilon/(self.Theta if Theta is None else float(Theta)))
+        return pi / _trapz(pi, self.omega)
+
+    def minimize(self, max_iter: int = 80, tol: float = 1e-6, accelerated: bool = False,
+                 pi0: Optional[np.ndarray] = None, anderson_m: int = 5) -> OptimizeResult:
+        """
+        accelerated=True solves the projection once, warm-started from pi0
+        (default: the Gibbs state) with Anderson mixing over anderson_m
+        residuals, and reports the final fixed-point residual as the KK
+        violation instead of re-projecting. anderson_m=0 gives the plain
+        averaging map, i.e. the same pi_star as the default path.
+        """
+        # Unconstrained Gibbs step (independent of the iterate)
+        pi_u = self.gibbs_state()
+        if accelerated:
+            return self._minimize_accelerated(pi_u, max_iter, tol, pi0, anderson_m)
+        pi = pi_u.copy()
 
         F_hist = [self.free_energy(pi)]
         viol_hist = [self.projector.violation(pi)]
 
         for it in range(1, max_iter+1):
-            # Unconstrained Gibbs step
-            pi_u = np.exp(-self.epsilon/self.Theta)
-            pi_u = pi_u / np.trapz(pi_u, w)
-
             # Project to H_KK
             pi_n = self.projector.project(pi_u, max_iter=30, tol=5e-6)
 
@@ -279,3 +615,70 @@ class ConstrainedOptimizer:
                               F_history=np.array(F_hist),
                               violation_history=np.array(viol_hist),
                               final_violation=float(viol_hist[-1]))
+
+    def _minimize_accelerated(self, pi_u: np.ndarray, max_iter: int, tol: float,
+                              pi0: Optional[np.ndarray], anderson_m: int) -> OptimizeResult:
+        proj = self.projector
+        start = None if pi0 is None else proj._normalize(np.asarray(pi0, dtype=float))
+        pi = pi_u if start is None else start
+        r0 = proj._step(pi) - pi
+        F_hist = [self.free_energy(pi)]
+        viol_hist = [float(np.linalg.norm(r0)/(np.linalg.norm(pi) + 1e-16))]
+
+        solved = None
+        for it in range(1, max_iter+1):
+            # the Gibbs target does not depend on pi, so once its projection
+            # has been solved (warm-started from pi) later steps reuse it
+            if solved is None:
+                solved = proj.project_accelerated(pi_u, x0=start, max_iter=30, tol=5e-6, m=anderson_m)
+            pi_n, info = solved
+
+            F_n = self.free_energy(pi_n)
+            F_hist.append(F_n)
+            viol = info['residual']
+            viol_hist.append(viol)
+
+            dF = np.abs(F_n - F_hist[-2])/(np.abs(F_hist[-2]) + 1e-16)
+            dpi = np.linalg.norm(pi_n - pi)/(np.linalg.norm(pi) + 1e-16)
+
+            pi = pi_n
+            if (dF < tol) and (dpi < tol):
+                return OptimizeResult(pi_star=pi, F_star=F_n, iterations=it,
+                                      converged=True,
+                                      F_history=np.array(F_hist),
+                                      violation_history=np.array(viol_hist),
+                                      final_violation=float(viol))
+
+        warnings.warn("ConstrainedOptimizer: no convergence within max_iter")
+        return OptimizeResult(pi_star=pi, F_star=F_hist[-1], iterations=max_iter,
+                              converged=False,
+                              F_history=np.array(F_hist),
+                              violation_history=np.array(viol_hist),
+                              final_violation=float(viol_hist[-1]))
+
+    def sweep_theta(self, thetas, max_iter: int = 80, tol: float = 1e-6,
+                    accelerated: bool = True, anderson_m: int = 5):
+        """
+        Minimize at each Theta in turn (same grid and projector).
+
+        With accelerated=True each solve is warm-started from its neighbour:
+        the previous KK correction (pi_star - gibbs) is carried over onto the
+        new Gibbs state, so the chain only refines what changed with Theta.
+        Returns one OptimizeResult per Theta.
+        """
+        Theta_saved = self.Theta
+        results = []
+        correction = None
+        try:
+            for Theta in thetas:
+                self.Theta = float(Theta)
+                pi_u = self.gibbs_state()
+                pi0 = None if correction is None else pi_u + correction
+                res = self.minimize(max_iter=max_iter, tol=tol, accelerated=accelerated,
+                                    pi0=pi0, anderson_m=anderson_m)
+                results.append(res)
+                if accelerated:
+                    correction = res.pi_star - pi_u
+        finally:
+            self.Theta = Theta_saved
+        return results
@@ -1,26 +1,47 @@
-
 # kk_gate.py
 # Causality-first KK gate: P_+ projector (via Hilbert) + f-sum + optional subtracted KK
 from __future__ import annotations
 import numpy as np
 import warnings
+from collections import OrderedDict
 from typing import Dict, Any, Tuple
-from kk_constraints import KramersKronigRelations, KKProjector
+from kk_constraints import KramersKronigRelations, KKProjector, grid_hash
+from numeric_compat import trapezoid as _trapz
+
+# (grid hash, method) -> (KramersKronigRelations, KKProjector); a gate over
+# many spectra on one grid builds its Hilbert operators once
+_OPERATOR_CACHE: "OrderedDict[Tuple[str, str], Tuple[KramersKronigRelations, KKProjector]]" = OrderedDict()
+OPERATOR_CACHE_SIZE = 4
 
-def f_sum_integral(omega: np.ndarray, sigma1: np.ndarray) -> float:
-    return float(np.trapz(sigma1, omega))
+def _kk_operators(omega: np.ndarray, method: str) -> Tuple[KramersKronigRelations, KKProjector]:
+    key = (grid_hash(omega), method)
+    ops = _OPERATOR_CACHE.get(key)
+    if ops is None:
+        proj = KKProjector(omega, method=method)
+        ops = (proj.kk, proj)
+        _OPERATOR_CACHE[key] = ops
+        while len(_OPERATOR_CACHE) > OPERATOR_CACHE_SIZE:
+            _OPERATOR_CACHE.popitem(last=False)
+    else:
+        _OPERATOR_CACHE.move_to_end(key)
+    return ops
 
-def subtracted_kk_needed(omega: np.ndarray, sigma1: np.ndarray) -> bool:
+def f_sum_integral(omega: np.ndarray, sigma1: np.ndarray):
+    area = _trapz(sigma1, omega, axis=-1)
+    return float(area) if np.ndim(area) == 0 else area
+
+def subtracted_kk_needed(omega: np.ndarray, sigma1: np.ndarray):
     # crude heuristic: if tail over last 10% contributes > 20% of area → suggest subtraction
+    sigma1 = np.asarray(sigma1, dtype=float)
     n = len(omega)
     if n < 20: 
-        return False
+        return False if sigma1.ndim == 1 else np.zeros(sigma1.shape[0], dtype=bool)
     tail = int(0.1*n)
-    total = np.trapz(sigma1, omega)
-    if total <= 0: 
-        return True
-    tail_part = np.trapz(sigma1[-tail:], omega[-tail:])
-    return (tail_part/total) > 0.2
+    total = _trapz(sigma1, omega, axis=-1)
+    tail_part = _trapz(sigma1[..., -tail:], omega[-tail:], axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        flag = (total <= 0) | (tail_part/np.where(total > 0, total, 1.0) > 0.2)
+    return bool(flag) if sigma1.ndim == 1 else flag
 
 def causality_gate(omega: np.ndarray, sigma1: np.ndarray, sigma2: np.ndarray,
                    method: str = 'odd_fft_uniform', use_subtracted: bool = True,
@@ -31,7 +52,7 @@ def causality_gate(omega: np.ndarray, sigma1: np.ndarray, sigma2: np.ndarray,
     - Optionally project (sigma1) into H_KK via KKProjector (Hardy P+ equivalent on real axis)
     - Reconstruct sigma2 from sigma1 to guarantee KK
     """
-    kk = KramersKronigRelations(omega, method=method)
+    kk, proj = _kk_operators(omega, method)
     chk = kk.check_consistency(sigma1, sigma2, tol=0.1)
     diag = {'initial': chk}
     s1, s2 = sigma1.copy(), sigma2.copy()
@@ -50,7 +71,6 @@ def causality_gate(omega: np.ndarray, sigma1: np.ndarray, sigma2: np.ndarray,
 
 
     if enforce_projection:
-        proj = KKProjector(omega, method=method)
         s1p = proj.project(np.maximum(s1, 0.0), max_iter=30, tol=5e-6)
         s2p = kk.forward(s1p)
         chk2 = kk.check_consistency(s1p, s2p, tol=0.1)
@@ -72,3 +92,52 @@ def causality_gate(omega: np.ndarray, sigma1: np.ndarray, sigma2: np.ndarray,
     }
     diag['status'] = 'PASS' if all(diag['gates'].values()) else 'FAIL'
     return s1, s2, diag
+
+def causality_gate_batch(omega: np.ndarray, sigma1: np.ndarray, sigma2: np.ndarray,
+                         method: str = 'odd_fft_uniform', use_subtracted: bool = True,
+                         enforce_projection: bool = True) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    causality_gate for a stack of spectra (n_spectra, n_omega) on one grid.
+    Same steps as the single gate, run as array operations; every diagnostic
+    entry is an array of length n_spectra (status: 'PASS'/'FAIL' strings).
+    """
+    s1 = np.array(sigma1, dtype=float, ndmin=2)
+    s2 = np.array(sigma2, dtype=float, ndmin=2)
+    if s1.shape != s2.shape or s1.shape[-1] != len(omega):
+        raise ValueError("sigma1/sigma2 must both have shape (n_spectra, len(omega))")
+    kk, proj = _kk_operators(omega, method)
+    chk = kk.check_consistency(s1, s2, tol=0.1)
+    diag = {'initial': chk}
+
+    # optional subtracted KK, per spectrum
+    n_spectra = s1.shape[0]
+    c_tail = np.zeros(n_spectra)
+    sub_rec = np.zeros(n_spectra, dtype=bool)
+    if use_subtracted and len(omega) >= 20:
+        tail = max(2, int(0.1*len(omega)))
+        c_tail = np.mean(s1[:, -tail:], axis=1)
+        sub_rec = c_tail > 0
+        s1 = s1 - np.where(sub_rec, c_tail, 0.0)[:, None]
+
+    if enforce_projection:
+        s1p, info = proj.project_batch(np.maximum(s1, 0.0), max_iter=30, tol=5e-6)
+        s2p = kk.forward(s1p)
+        diag['after_projection'] = kk.check_consistency(s1p, s2p, tol=0.1)
+        diag['projection'] = info
+        s1 = s1p + np.where(sub_rec, c_tail, 0.0)[:, None]
+        s2 = s2p
+
+    S = f_sum_integral(omega, s1)
+    diag['f_sum'] = {
+        'area': S,
+        'subtracted_recommended': subtracted_kk_needed(omega, s1),
+        'used_subtracted': sub_rec.copy(),
+        'c_tail': c_tail,
+    }
+    diag['gates'] = {
+        'KK_consistency': np.asarray(diag.get('after_projection', chk)['consistent']),
+        'f_sum_positive': S > 0,
+    }
+    passed = diag['gates']['KK_consistency'] & diag['gates']['f_sum_positive']
+    diag['status'] = np.where(passed, 'PASS', 'FAIL')
+    return s1, s2, diag
@@ -0,0 +1,845 @@
+#!/usr/bin/env python3
+"""
+knn_mi.py - Shared batched k-NN mutual information engine
+=========================================================
+Common neighbour-counting core for the Kraskov-type MI estimators used in
+metrics.py (`knn_mutual_information`) and validation_suite.py
+(`AdaptonicEstimators.knn_mutual_information`).
+
+The per-sample estimators issue one radius query per row and per marginal.
+This module does the same work in batch:
+- the joint k-NN tree is built once and queried for all rows at once
+- marginal neighbour counts come from a single
+  `cKDTree.query_ball_point(..., return_length=True)` call over the whole
+  array, or from a sorted-projection counter for 1-D marginals
+
+Counting semantics are unchanged (inclusive radius, self excluded), so the
+callers keep their own digamma formulas and produce the same estimates.
+
+KD-trees degrade to brute force beyond ~16 dimensions, so high-dimensional
+euclidean inputs (e.g. 64-dim agent states) take a blocked path instead:
+for each block of rows the marginal squared distances come from one BLAS
+matmul each, the joint distance is their sum, and the k-th radius and both
+marginal counts are read off the same block. Because the joint distance is
+built from the marginal ones, ties (e.g. identical one-hot task labels) are
+resolved exactly as in the per-sample estimators.
+
+`MIContext` extends this to several estimates on one sample (I_ratio
+decompositions, Frenzel-Pompe CMI): KD-trees, k-th neighbour radii and
+neighbour counts are cached per column subset and shared between estimates.
+`SlidingMIWindow` keeps the same estimates up to date while rows are
+inserted into and evicted from a sliding window.
+
+References:
+- Kraskov, Stögbauer, Grassberger (2004). "Estimating mutual information."
+  Physical Review E 69(6): 066138.
+
+Author: Paweł Kojs
+Version: 1.0.0
+Date: 2025-11-24
+"""
+
+import numpy as np
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from scipy.spatial import cKDTree
+from scipy.special import digamma
+
+
+# Above this joint dimension euclidean estimates use the blocked brute path
+BRUTE_MIN_DIM = 16
+
+# Distance-matrix elements per block in the brute path (~32 MB of float64)
+BLOCK_ELEMENTS = 1 << 22
+
+
+def _as_2d(X: np.ndarray) -> np.ndarray:
+    """Returns X as a C-contiguous float64 (n_samples, n_features) array."""
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[:, np.newaxis]
+    return X
+
+
+def knn_radii(
+    points: np.ndarray,
+    k: int = 5,
+    p: float = 2.0,
+    workers: int = 1
+) -> np.ndarray:
+    """
+    Distance from every point to its k-th nearest neighbour (self excluded).
+
+    Args:
+        points: Array of shape (n_samples, n_features)
+        k: Neighbour order
+        p: Minkowski norm (2 = euclidean, np.inf = max-norm)
+        workers: Threads for the tree query (-1 = all cores)
+
+    Returns:
+        radii: Array of shape (n_samples,)
+    """
+    points = _as_2d(points)
+    tree = cKDTree(points)
+    distances, _ = tree.query(points, k=k + 1, p=p, workers=workers)
+    return distances[:, k]
+
+
+def _exact_edge(
+    x_sorted: np.ndarray,
+    x: np.ndarray,
+    radii: np.ndarray,
+    edge: np.ndarray,
+    side: int
+) -> np.ndarray:
+    """
+    Moves approximate window edges in a sorted 1-D array onto the exact ones.
+
+    side=+1: upper edge, first j with x_sorted[j] - x > r
+    side=-1: lower edge, first j with x - x_sorted[j] <= r
+
+    x ± r may round across a neighbour lying exactly on the radius; both
+    predicates are monotone in j, so stepping by one until they hold is exact
+    (and almost always takes zero or one step).
+    """
+    n = x_sorted.size
+    edge = edge.copy()
+
+    def inside(j):
+        if side > 0:
+            return x_sorted[j] - x <= radii
+        return x - x_sorted[j] <= radii
+
+    while True:
+        # Element just below the edge must be outside (lower) / inside (upper)
+        below = edge > 0
+        j = np.where(below, edge - 1, 0)
+        move_down = below & (inside(j) != (side > 0))
+        # Element at the edge must be inside (lower) / outside (upper)
+        at = edge < n
+        j = np.where(at, edge, 0)
+        move_up = at & ~move_down & (inside(j) == (side > 0))
+        if not (move_down.any() or move_up.any()):
+            return edge
+        edge[move_down] -= 1
+        edge[move_up] += 1
+
+
+def count_neighbors_within(
+    points: np.ndarray,
+    radii: np.ndarray,
+    p: float = 2.0,
+    workers: int = 1
+) -> np.ndarray:
+    """
+    Counts, for every point i, the other points j with ||x_j - x_i|| ≤ radii[i].
+
+    Multi-dimensional inputs use one batched KD-tree ball query. 1-D inputs
+    use a sorted projection and two `searchsorted` calls, O(n log n) with no
+    tree at all; the window edges are then corrected against the exact
+    |x_j - x_i| so that points lying on the radius (common with max-norm
+    joint radii) are classified exactly as by the tree.
+
+    Args:
+        points: Array of shape (n_samples, n_features)
+        radii: Array of shape (n_samples,) with per-point radii
+        p: Minkowski norm (ignored for 1-D inputs, where all norms agree)
+        workers: Threads for the tree query (-1 = all cores)
+
+    Returns:
+        counts: Integer array of shape (n_samples,), self excluded
+    """
+    points = _as_2d(points)
+    radii = np.asarray(radii, dtype=np.float64)
+
+    if points.shape[1] == 1:
+        x = points[:, 0]
+        x_sorted = np.sort(x)
+        upper = _exact_edge(x_sorted, x, radii, np.searchsorted(x_sorted, x + radii, side='right'), 1)
+        lower = _exact_edge(x_sorted, x, radii, np.searchsorted(x_sorted, x - radii, side='left'), -1)
+        # A negative radius encloses nothing, not even the point itself
+        counts = np.maximum(upper - lower, 0)
+    else:
+        tree = cKDTree(points)
+        counts = tree.query_ball_point(
+            points, r=radii, p=p, return_length=True, workers=workers
+        )
+
+    return np.asarray(counts, dtype=np.int64) - 1
+
+
+def _block_sq_distances(
+    A: np.ndarray,
+    sq_norms: np.ndarray,
+    start: int,
+    stop: int
+) -> np.ndarray:
+    """Squared euclidean distances from rows start:stop of A to all rows of A."""
+    d2 = sq_norms[start:stop, np.newaxis] + sq_norms[np.newaxis, :] - 2.0 * (A[start:stop] @ A.T)
+    np.maximum(d2, 0.0, out=d2)
+    # Self-distance is exactly zero (the expansion above may leave rounding noise)
+    rows = np.arange(stop - start)
+    d2[rows, start + rows] = 0.0
+    return d2
+
+
+def _kraskov_counts_brute(
+    X: np.ndarray,
+    Y: np.ndarray,
+    k: int,
+    radius_offset: float,
+    strict: bool
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Blocked euclidean implementation of `kraskov_counts`."""
+    n_samples = X.shape[0]
+    sq_norms_x = np.einsum('ij,ij->i', X, X)
+    sq_norms_y = np.einsum('ij,ij->i', Y, Y)
+
+    epsilon = np.empty(n_samples)
+    n_x = np.empty(n_samples, dtype=np.int64)
+    n_y = np.empty(n_samples, dtype=np.int64)
+
+    block = max(1, BLOCK_ELEMENTS // n_samples)
+    for start in range(0, n_samples, block):
+        stop = min(start + block, n_samples)
+        d2_x = _block_sq_distances(X, sq_norms_x, start, stop)
+        d2_y = _block_sq_distances(Y, sq_norms_y, start, stop)
+
+        # k-th neighbour in joint space (index k, self sits at index 0)
+        d2_joint = np.partition(d2_x + d2_y, k, axis=1)[:, k]
+        epsilon[start:stop] = np.sqrt(d2_joint)
+
+        if radius_offset == 0.0:
+            r2 = d2_joint
+        else:
+            r2 = (epsilon[start:stop] + radius_offset) ** 2
+            r2[epsilon[start:stop] + radius_offset < 0] = -1.0
+        r2 = r2[:, np.newaxis]
+
+        if strict:
+            n_x[start:stop] = np.count_nonzero(d2_x < r2, axis=1) - 1
+            n_y[start:stop] = np.count_nonzero(d2_y < r2, axis=1) - 1
+        else:
+            n_x[start:stop] = np.count_nonzero(d2_x <= r2, axis=1) - 1
+            n_y[start:stop] = np.count_nonzero(d2_y <= r2, axis=1) - 1
+
+    return epsilon, n_x, n_y
+
+
+def kraskov_counts(
+    X: np.ndarray,
+    Y: np.ndarray,
+    k: int = 5,
+    p: float = 2.0,
+    radius_offset: float = 0.0,
+    strict: bool = False,
+    workers: int = 1,
+    backend: str = 'auto'
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Joint k-NN radii and marginal neighbour counts for Kraskov MI estimation.
+
+    Args:
+        X: Array of shape (n_samples, n_features_X)
+        Y: Array of shape (n_samples, n_features_Y)
+        k: Number of nearest neighbours in the joint space
+        p: Minkowski norm used in joint and marginal spaces
+        radius_offset: Added to every radius before counting
+                       (e.g. -1e-10 as used in validation_suite.py)
+        strict: Count only points strictly inside the radius
+        workers: Threads for the tree queries (-1 = all cores)
+        backend: 'tree', 'brute' (euclidean only) or 'auto' (brute for
+                 euclidean inputs with more than BRUTE_MIN_DIM joint dims)
+
+    Returns:
+        epsilon: Joint k-th neighbour distances, shape (n_samples,)
+        n_x: Marginal neighbour counts in X, shape (n_samples,)
+        n_y: Marginal neighbour counts in Y, shape (n_samples,)
+    """
+    X = _as_2d(X)
+    Y = _as_2d(Y)
+
+    if X.shape[0] != Y.shape[0]:
+        raise ValueError(f"X and Y must have same number of samples: {X.shape[0]} vs {Y.shape[0]}")
+
+    if X.shape[0] < k + 1:
+        raise ValueError(f"Need at least {k+1} samples for k={k}, got {X.shape[0]}")
+
+    if backend == 'auto':
+        use_brute = p == 2 and X.shape[1] + Y.shape[1] > BRUTE_MIN_DIM
+    elif backend in ('tree', 'brute'):
+        use_brute = backend == 'brute'
+        if use_brute and p != 2:
+            raise ValueError(f"Brute backend supports only p=2, got p={p}")
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    if use_brute:
+        return _kraskov_counts_brute(X, Y, k, radius_offset, strict)
+
+    epsilon = knn_radii(np.hstack([X, Y]), k=k, p=p, workers=workers)
+    radii = epsilon + radius_offset
+    if strict:
+        radii = np.nextafter(radii, -np.inf)
+
+    n_x = count_neighbors_within(X, radii, p=p, workers=workers)
+    n_y = count_neighbors_within(Y, radii, p=p, workers=workers)
+
+    return epsilon, n_x, n_y
+
+
+def kraskov_mi(
+    X: np.ndarray,
+    Y: np.ndarray,
+    k: int = 5,
+    p: float = np.inf,
+    workers: int = 1
+) -> float:
+    """
+    Kraskov (KSG, algorithm 1) estimate of I(X;Y) in nats.
+
+    I(X;Y) = ψ(k) + ψ(N) - <ψ(n_x + 1) + ψ(n_y + 1)>
+
+    Args:
+        X: Array of shape (n_samples, n_features_X)
+        Y: Array of shape (n_samples, n_features_Y)
+        k: Number of nearest neighbours
+        p: Minkowski norm (default: max-norm, as in the original paper)
+        workers: Threads for the tree queries (-1 = all cores)
+
+    Returns:
+        mi: Mutual information estimate (nats, not clipped)
+    """
+    n_samples = _as_2d(X).shape[0]
+
+    # KSG-1 counts marginal neighbours strictly inside the joint radius
+    _, n_x, n_y = kraskov_counts(X, Y, k=k, p=p, strict=True, workers=workers)
+
+    mi = digamma(k) + digamma(n_samples) - np.mean(digamma(n_x + 1) + digamma(n_y + 1))
+    return float(mi)
+
+
+# ==============================================================================
+# SHARED-STRUCTURE CONTEXT (MI + Frenzel-Pompe CMI)
+# ==============================================================================
+
+class MIContext:
+    """
+    Reusable neighbour structures for several MI/CMI estimates on one sample.
+
+    The sample is given as named column blocks (e.g. 'X1', 'X3', 'X4' or the
+    halves of an agent state). Every estimate is expressed through column
+    subsets (tuples of block names), and per subset the context caches:
+    - the KD-tree over the stacked columns
+    - the k-th neighbour radii (when the subset is a joint space)
+    - the neighbour counts for a given joint radius
+
+    so I(X4;X1), I(X4;X3) and I(X4;X1|X3) share the X1/X3/X4 trees instead
+    of rebuilding them per estimate. On the blocked brute backend (high-dim
+    euclidean data) trees are replaced by one pass over row blocks per joint
+    space, in which every block's squared distances are computed once and
+    summed into the joint and marginal distances.
+
+    Example:
+        >>> ctx = MIContext({'X': X, 'Y': Y, 'Z': Z}, k=5)
+        >>> ctx.mi('X', 'Y')            # I(X;Y)
+        >>> ctx.mi('X', ('Y', 'Z'))     # I(X;YZ)
+        >>> ctx.cmi('X', 'Y', 'Z')      # I(X;Y|Z), Frenzel-Pompe
+    """
+
+    def __init__(
+        self,
+        blocks: Dict[str, np.ndarray],
+        k: int = 5,
+        p: float = 2.0,
+        strict: bool = False,
+        radius_offset: float = 0.0,
+        backend: str = 'auto',
+        workers: int = 1
+    ):
+        """
+        Args:
+            blocks: Dict name → array of shape (n_samples, d_block)
+            k: Number of nearest neighbours in joint spaces
+            p: Minkowski norm (2 = euclidean, np.inf = max-norm)
+            strict: Count only points strictly inside the joint radius
+            radius_offset: Added to every joint radius before counting
+            backend: 'tree', 'brute' (euclidean only) or 'auto' (brute when
+                     all blocks together exceed BRUTE_MIN_DIM dimensions)
+            workers: Threads for the tree queries (-1 = all cores)
+        """
+        if not blocks:
+            raise ValueError("MIContext needs at least one block")
+
+        self.blocks = {name: _as_2d(values) for name, values in blocks.items()}
+        sizes = {values.shape[0] for values in self.blocks.values()}
+        if len(sizes) != 1:
+            raise ValueError(f"All blocks must have same number of samples, got {sorted(sizes)}")
+
+        self.n_samples = sizes.pop()
+        if self.n_samples < k + 1:
+            raise ValueError(f"Need at least {k+1} samples for k={k}, got {self.n_samples}")
+
+        self.k = k
+        self.p = p
+        self.strict = strict
+        self.radius_offset = radius_offset
+        self.workers = workers
+
+        total_dim = sum(values.shape[1] for values in self.blocks.values())
+        if backend == 'auto':
+            self.use_brute = p == 2 and total_dim > BRUTE_MIN_DIM
+        elif backend in ('tree', 'brute'):
+            self.use_brute = backend == 'brute'
+            if self.use_brute and p != 2:
+                raise ValueError(f"Brute backend supports only p=2, got p={p}")
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+
+        self._trees: Dict[Tuple[str, ...], cKDTree] = {}
+        self._radii: Dict[Tuple[str, ...], np.ndarray] = {}
+        self._counts: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], np.ndarray] = {}
+        self._sq_norms: Dict[str, np.ndarray] = {}
+
+    # --------------------------------------------------------------------------
+    # Subset bookkeeping
+    # --------------------------------------------------------------------------
+
+    def _key(self, *subsets: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+        """Canonical (sorted, de-duplicated) key for a union of subsets."""
+        names = set()
+        for subset in subsets:
+            names.update((subset,) if isinstance(subset, str) else subset)
+        for name in names:
+            if name not in self.blocks:
+                raise KeyError(f"Unknown block: {name}")
+        return tuple(sorted(names))
+
+    def _stack(self, key: Tuple[str, ...]) -> np.ndarray:
+        if len(key) == 1:
+            return self.blocks[key[0]]
+        return np.hstack([self.blocks[name] for name in key])
+
+    def _tree(self, key: Tuple[str, ...]) -> cKDTree:
+        if key not in self._trees:
+            self._trees[key] = cKDTree(self._stack(key))
+        return self._trees[key]
+
+    def _count_radii(self, radii: np.ndarray) -> np.ndarray:
+        """Joint radii adjusted by the offset/strictness convention."""
+        radii = radii + self.radius_offset
+        if self.strict:
+            radii = np.nextafter(radii, -np.inf)
+        return radii
+
+    # --------------------------------------------------------------------------
+    # Neighbour structures
+    # --------------------------------------------------------------------------
+
+    def radii(self, *subsets: Union[str, Sequence[str]]) -> np.ndarray:
+        """k-th neighbour distances in the joint space of the given subsets."""
+        key = self._key(*subsets)
+        if key not in self._radii:
+            if self.use_brute:
+                self._brute_pass(key, [])
+            else:
+                distances, _ = self._tree(key).query(
+                    self._stack(key), k=self.k + 1, p=self.p, workers=self.workers
+                )
+                self._radii[key] = distances[:, self.k]
+        return self._radii[key]
+
+    def counts(
+        self,
+        subset: Union[str, Sequence[str]],
+        joint: Union[str, Sequence[str]]
+    ) -> np.ndarray:
+        """Neighbour counts in `subset` within the k-th neighbour radius of `joint`."""
+        key = self._key(subset)
+        joint_key = self._key(subset, joint)
+        self._prepare(joint_key, [key])
+        return self._counts[(key, joint_key)]
+
+    def _prepare(self, joint_key: Tuple[str, ...], count_keys: List[Tuple[str, ...]]):
+        """Fills the radius of `joint_key` and all missing marginal counts."""
+        missing = [key for key in count_keys if (key, joint_key) not in self._counts]
+        if joint_key in self._radii and not missing:
+            return
+
+        if self.use_brute:
+            self._brute_pass(joint_key, missing)
+            return
+
+        radii = self._count_radii(self.radii(joint_key))
+        for key in missing:
+            data = self._stack(key)
+            if data.shape[1] == 1:
+                counts = count_neighbors_within(data, radii)
+            else:
+                counts = self._tree(key).query_ball_point(
+                    data, r=radii, p=self.p, return_length=True, workers=self.workers
+                ) - 1
+            self._counts[(key, joint_key)] = np.asarray(counts, dtype=np.int64)
+
+    def _brute_pass(self, joint_key: Tuple[str, ...], count_keys: List[Tuple[str, ...]]):
+        """One blocked pass: joint radii plus marginal counts for `count_keys`."""
+        names = sorted(set(joint_key).union(*count_keys))
+        for name in names:
+            if name not in self._sq_norms:
+                values = self.blocks[name]
+                self._sq_norms[name] = np.einsum('ij,ij->i', values, values)
+
+        n_samples = self.n_samples
+        radii = np.empty(n_samples)
+        counts = {key: np.empty(n_samples, dtype=np.int64) for key in count_keys}
+
+        block = max(1, BLOCK_ELEMENTS // n_samples)
+        for start in range(0, n_samples, block):
+            stop = min(start + block, n_samples)
+            d2 = {
+                name: _block_sq_distances(self.blocks[name], self._sq_norms[name], start, stop)
+                for name in names
+            }
+
+            d2_joint = sum(d2[name] for name in joint_key)
+            d2_k = np.partition(d2_joint, self.k, axis=1)[:, self.k]
+            radii[start:stop] = np.sqrt(d2_k)
+
+            if not count_keys:
+                continue
+
+            if self.radius_offset == 0.0:
+                r2 = d2_k
+            else:
+                shifted = radii[start:stop] + self.radius_offset
+                r2 = shifted ** 2
+                r2[shifted < 0] = -1.0
+            r2 = r2[:, np.newaxis]
+
+            for key in count_keys:
+                d2_key = d2[key[0]] if len(key) == 1 else sum(d2[name] for name in key)
+                inside = d2_key < r2 if self.strict else d2_key <= r2
+                counts[key][start:stop] = np.count_nonzero(inside, axis=1) - 1
+
+        self._radii[joint_key] = radii
+        for key in count_keys:
+            self._counts[(key, joint_key)] = counts[key]
+
+    # --------------------------------------------------------------------------
+    # Estimators
+    # --------------------------------------------------------------------------
+
+    def mi(self, x: Union[str, Sequence[str]], y: Union[str, Sequence[str]]) -> float:
+        """
+        Kraskov estimate of I(X;Y) in nats (not clipped).
+
+        I(X;Y) = ψ(k) + ψ(N) - <ψ(n_x + 1) + ψ(n_y + 1)>
+        """
+        kx, ky = self._key(x), self._key(y)
+        joint_key = self._key(x, y)
+        self._prepare(joint_key, [kx, ky])
+
+        n_x = self._counts[(kx, joint_key)]
+        n_y = self._counts[(ky, joint_key)]
+        mi = digamma(self.k) + digamma(self.n_samples) - np.mean(digamma(n_x + 1) + digamma(n_y + 1))
+        return float(mi)
+
+    def cmi(
+        self,
+        x: Union[str, Sequence[str]],
+        y: Union[str, Sequence[str]],
+        z: Union[str, Sequence[str]]
+    ) -> float:
+        """
+        Frenzel-Pompe estimate of I(X;Y|Z) in nats (not clipped).
+
+        I(X;Y|Z) = ψ(k) - <ψ(n_xz + 1) + ψ(n_yz + 1) - ψ(n_z + 1)>
+
+        with all counts taken within the k-th neighbour radius of (X,Y,Z).
+
+        References:
+            Frenzel & Pompe (2007). "Partial mutual information for coupling
+            analysis of multivariate time series." PRL 99(20): 204101.
+        """
+        kxz, kyz, kz = self._key(x, z), self._key(y, z), self._key(z)
+        joint_key = self._key(x, y, z)
+        self._prepare(joint_key, [kxz, kyz, kz])
+
+        n_xz = self._counts[(kxz, joint_key)]
+        n_yz = self._counts[(kyz, joint_key)]
+        n_z = self._counts[(kz, joint_key)]
+        cmi = digamma(self.k) - np.mean(digamma(n_xz + 1) + digamma(n_yz + 1) - digamma(n_z + 1))
+        return float(cmi)
+
+
+# ==============================================================================
+# SLIDING-WINDOW INCREMENTAL ESTIMATION
+# ==============================================================================
+
+class SlidingMIWindow:
+    """
+    MI/CMI estimates over a sliding window of rows with incremental updates.
+
+    Keeps, per block, the pairwise distances between all rows in the window
+    (slot-indexed, so evicted rows free their slots for new ones) and, per
+    registered estimate, the k-th neighbour radii, neighbour counts and
+    digamma terms of every row. When the window slides:
+    - only distances from the inserted rows are computed (O(stride · M))
+    - a row's k-th neighbour radius is recomputed only if an evicted or
+      inserted row lies within it
+    - counts of the remaining rows are updated by the evicted/inserted rows
+      inside their radius, and their digamma terms are refreshed only where
+      a count changed
+
+    The estimates equal those of `MIContext` on the same rows (up to the
+    order of the final mean). Memory is O(capacity²) per block.
+
+    Example:
+        >>> window = SlidingMIWindow({'X': 4, 'Y': 2}, capacity=1000, k=5)
+        >>> window.slide({'X': X[:1000], 'Y': Y[:1000]})
+        >>> window.mi('X', 'Y')
+        >>> window.slide({'X': X[1000:1500], 'Y': Y[1000:1500]}, n_evict=500)
+        >>> window.mi('X', 'Y')
+    """
+
+    def __init__(
+        self,
+        block_dims: Dict[str, int],
+        capacity: int,
+        k: int = 5,
+        p: float = np.inf,
+        strict: bool = True,
+        chunk_rows: int = 256
+    ):
+        """
+        Args:
+            block_dims: Dict name → number of columns of the block
+            capacity: Maximum number of rows held in the window
+            k: Number of nearest neighbours in joint spaces
+            p: 2 (euclidean) or np.inf (max-norm)
+            strict: Count only points strictly inside the joint radius
+            chunk_rows: Rows per chunk when computing new distances
+        """
+        if p not in (2, np.inf):
+            raise ValueError(f"SlidingMIWindow supports p=2 or p=np.inf, got p={p}")
+
+        self.block_dims = dict(block_dims)
+        self.capacity = capacity
+        self.k = k
+        self.p = p
+        self.strict = strict
+        self.chunk_rows = chunk_rows
+
+        self._data = {name: np.zeros((capacity, d)) for name, d in self.block_dims.items()}
+        # Squared distances for p=2, plain distances for p=inf (both compose
+        # over blocks: by sum and by max respectively)
+        self._dist = {name: np.full((capacity, capacity), np.inf) for name in self.block_dims}
+        self._active = np.zeros(capacity, dtype=bool)
+        self._order = deque()
+
+        self._radii: Dict[Tuple[str, ...], np.ndarray] = {}
+        self._counts: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], np.ndarray] = {}
+        self._psi: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], np.ndarray] = {}
+
+    @property
+    def n_samples(self) -> int:
+        return int(self._active.sum())
+
+    # --------------------------------------------------------------------------
+    # Distance helpers
+    # --------------------------------------------------------------------------
+
+    def _key(self, *subsets: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+        names = set()
+        for subset in subsets:
+            names.update((subset,) if isinstance(subset, str) else subset)
+        for name in names:
+            if name not in self.block_dims:
+                raise KeyError(f"Unknown block: {name}")
+        return tuple(sorted(names))
+
+    def _pair_dist(self, A: np.ndarray, B: np.ndarray) -> np.ndarray:
+        """Distances (squared for p=2) between rows of A and rows of B."""
+        out = np.empty((A.shape[0], B.shape[0]))
+        for start in range(0, A.shape[0], self.chunk_rows):
+            diff = np.abs(A[start:start + self.chunk_rows, np.newaxis, :] - B[np.newaxis, :, :])
+            if self.p == 2:
+                out[start:start + self.chunk_rows] = (diff * diff).sum(axis=-1)
+            else:
+                out[start:start + self.chunk_rows] = diff.max(axis=-1, initial=0.0)
+        return out
+
+    def _combine(self, key: Tuple[str, ...], rows: np.ndarray) -> np.ndarray:
+        """Joint distances over the blocks in `key` from `rows` to all slots."""
+        combined = self._dist[key[0]][rows]
+        for name in key[1:]:
+            part = self._dist[name][rows]
+            if self.p == 2:
+                combined += part
+            else:
+                np.maximum(combined, part, out=combined)
+        return combined
+
+    def _combine_cols(self, key: Tuple[str, ...], cols: np.ndarray, cache: Dict) -> np.ndarray:
+        """Joint distances from all slots to `cols` (memoised within one slide)."""
+        if key not in cache:
+            # Distances are symmetric: gather contiguous rows, then transpose
+            cache[key] = self._combine(key, cols).T
+        return cache[key]
+
+    def _inside(self, dist: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        radii = radii[:, np.newaxis]
+        return dist < radii if self.strict else dist <= radii
+
+    # --------------------------------------------------------------------------
+    # Window updates
+    # --------------------------------------------------------------------------
+
+    def slide(self, new_blocks: Optional[Dict[str, np.ndarray]] = None, n_evict: int = 0):
+        """
+        Evicts the `n_evict` oldest rows, then appends the rows in `new_blocks`.
+
+        Args:
+            new_blocks: Dict name → array of shape (n_new, d_block), or None
+            n_evict: Number of oldest rows to drop
+        """
+        if n_evict > len(self._order):
+            raise ValueError(f"Cannot evict {n_evict} rows from a window of {len(self._order)}")
+
+        evicted = np.array([self._order.popleft() for _ in range(n_evict)], dtype=np.int64)
+        survivors = self._active.copy()
+        survivors[evicted] = False
+
+        # Effect of the evicted rows, measured on the distances before removal
+        touched = {}
+        lost = {}
+        if evicted.size:
+            evicted_dist = {}
+            for joint_key, radii in self._radii.items():
+                within = self._combine_cols(joint_key, evicted, evicted_dist) <= radii[:, np.newaxis]
+                touched[joint_key] = within.any(axis=1)
+            for (key, joint_key) in self._counts:
+                inside = self._inside(self._combine_cols(key, evicted, evicted_dist), self._radii[joint_key])
+                lost[(key, joint_key)] = np.count_nonzero(inside, axis=1)
+
+            self._active[evicted] = False
+            for dist in self._dist.values():
+                dist[evicted, :] = np.inf
+                dist[:, evicted] = np.inf
+
+        # Insert new rows into free slots
+        inserted = np.empty(0, dtype=np.int64)
+        if new_blocks is not None:
+            n_new = len(next(iter(new_blocks.values())))
+            free = np.flatnonzero(~self._active)
+            if n_new > free.size:
+                raise ValueError(f"Window capacity {self.capacity} exceeded")
+            inserted = free[:n_new]
+
+            for name, values in new_blocks.items():
+                self._data[name][inserted] = values
+            self._active[inserted] = True
+            self._order.extend(inserted.tolist())
+
+            active = np.flatnonzero(self._active)
+            for name in self.block_dims:
+                block = self._pair_dist(self._data[name][inserted], self._data[name][active])
+                self._dist[name][np.ix_(inserted, active)] = block
+                self._dist[name][np.ix_(active, inserted)] = block.T
+
+        if self.n_samples < self.k + 1:
+            raise ValueError(f"Need at least {self.k+1} samples for k={self.k}, got {self.n_samples}")
+
+        # Refresh registered estimates
+        is_new = np.zeros(self.capacity, dtype=bool)
+        is_new[inserted] = True
+        inserted_dist = {}
+        recomputed = {}
+        for joint_key, radii in self._radii.items():
+            changed = touched.get(joint_key, np.zeros(self.capacity, dtype=bool)).copy()
+            if inserted.size:
+                within = self._combine_cols(joint_key, inserted, inserted_dist) <= radii[:, np.newaxis]
+                changed |= within.any(axis=1)
+            rows = np.flatnonzero((changed & survivors) | is_new)
+            if rows.size:
+                radii[rows] = self._kth_distance(joint_key, rows)
+            radii[~self._active] = np.inf
+            recomputed[joint_key] = rows
+
+        for (key, joint_key), counts in self._counts.items():
+            radii = self._radii[joint_key]
+            rows = recomputed[joint_key]
+            changed_rows = [rows]
+            if rows.size:
+                counts[rows] = self._count_rows(key, rows, radii[rows])
+
+            # Rows with an unchanged radius: counts move by evicted/inserted rows only
+            keep = survivors.copy()
+            keep[rows] = False
+            delta = np.zeros(self.capacity, dtype=np.int64)
+            if (key, joint_key) in lost:
+                delta -= lost[(key, joint_key)]
+            if inserted.size:
+                inside = self._inside(self._combine_cols(key, inserted, inserted_dist), radii)
+                delta += np.count_nonzero(inside, axis=1)
+            delta[~keep] = 0
+            counts += delta
+            changed_rows.append(np.flatnonzero(delta))
+
+            update = np.concatenate(changed_rows)
+            self._psi[(key, joint_key)][update] = digamma(counts[update] + 1)
+
+    def _kth_distance(self, joint_key: Tuple[str, ...], rows: np.ndarray) -> np.ndarray:
+        """k-th neighbour distance (self excluded) for the given rows."""
+        return np.partition(self._combine(joint_key, rows), self.k, axis=1)[:, self.k]
+
+    def _count_rows(self, key: Tuple[str, ...], rows: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        """Full neighbour count (self excluded) for the given rows."""
+        return np.count_nonzero(self._inside(self._combine(key, rows), radii), axis=1) - 1
+
+    def _prepare(self, joint_key: Tuple[str, ...], count_keys: List[Tuple[str, ...]]):
+        """Registers and fully computes a joint radius and its marginal counts."""
+        active = np.flatnonzero(self._active)
+        if joint_key not in self._radii:
+            radii = np.full(self.capacity, np.inf)
+            radii[active] = self._kth_distance(joint_key, active)
+            self._radii[joint_key] = radii
+        for key in count_keys:
+            if (key, joint_key) in self._counts:
+                continue
+            counts = np.zeros(self.capacity, dtype=np.int64)
+            counts[active] = self._count_rows(key, active, self._radii[joint_key][active])
+            psi = np.zeros(self.capacity)
+            psi[active] = digamma(counts[active] + 1)
+            self._counts[(key, joint_key)] = counts
+            self._psi[(key, joint_key)] = psi
+
+    def _mean_psi(self, key: Tuple[str, ...], joint_key: Tuple[str, ...]) -> float:
+        return float(np.mean(self._psi[(key, joint_key)][self._active]))
+
+    # --------------------------------------------------------------------------
+    # Estimators (same conventions as MIContext)
+    # --------------------------------------------------------------------------
+
+    def mi(self, x: Union[str, Sequence[str]], y: Union[str, Sequence[str]]) -> float:
+        """Kraskov estimate of I(X;Y) over the current window (not clipped)."""
+        kx, ky = self._key(x), self._key(y)
+        joint_key = self._key(x, y)
+        self._prepare(joint_key, [kx, ky])
+        mi = (digamma(self.k) + digamma(self.n_samples)
+              - self._mean_psi(kx, joint_key) - self._mean_psi(ky, joint_key))
+        return float(mi)
+
+    def cmi(
+        self,
+        x: Union[str, Sequence[str]],
+        y: Union[str, Sequence[str]],
+        z: Union[str, Sequence[str]]
+    ) -> float:
+        """Frenzel-Pompe estimate of I(X;Y|Z) over the current window (not clipped)."""
+        kxz, kyz, kz = self._key(x, z), self._key(y, z), self._key(z)
+        joint_key = self._key(x, y, z)
+        self._prepare(joint_key, [kxz, kyz, kz])
+        cmi = (digamma(self.k) - self._mean_psi(kxz, joint_key)
+               - self._mean_psi(kyz, joint_key) + self._mean_psi(kz, joint_key))
+        return float(cmi)
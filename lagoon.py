@@ -23,7 +23,7 @@ import json
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
-from agents import AgentEnsemble
+from agents import AgentEnsemble, VectorizedAgentEnsemble
 from theory import AdaptonicCalculator, AdaptonicState
 
 
@@ -54,7 +54,8 @@ class CognitiveLagoon:
         delta_theta: float = 0.05,
         gamma: float = 0.1,
         cycle_period: int = 100,
-        agent_type: str = "concrete"
+        agent_type: str = "concrete",
+        vectorized: bool = False
     ):
         """
         Initialize cognitive lagoon.
@@ -79,13 +80,17 @@ class CognitiveLagoon:
             Circadian period (steps)
         agent_type : str
             'concrete' (toy model) or 'llm' (requires API keys)
+        vectorized : bool
+            Use the struct-of-arrays VectorizedAgentEnsemble (concrete
+            agents only); needed for N in the hundreds or thousands
         """
         self.n_agents = n_agents
         self.state_dim = state_dim
         self.gamma = gamma
         
         # Create agent ensemble
-        self.ensemble = AgentEnsemble(
+        ensemble_cls = VectorizedAgentEnsemble if vectorized else AgentEnsemble
+        self.ensemble = ensemble_cls(
             n_agents=n_agents,
             state_dim=state_dim,
             agent_type=agent_type
@@ -115,7 +120,8 @@ class CognitiveLagoon:
             'delta_theta': delta_theta,
             'gamma': gamma,
             'cycle_period': cycle_period,
-            'agent_type': agent_type
+            'agent_type': agent_type,
+            'vectorized': vectorized
         }
         
     def step(
@@ -148,10 +154,9 @@ class CognitiveLagoon:
         adaptonic_state = self.calculator.compute_full_state(states, t)
         
         # 3. Generate responses from agents
-        responses = self.ensemble.generate_responses(query)
+        new_states = self.ensemble.generate_response_states(query)
         
         # 4. Update states with response embeddings
-        new_states = np.array([r.embedding for r in responses])
         self.ensemble.set_states(new_states)
         
         # 5. Calculate coupling matrix with current parameters
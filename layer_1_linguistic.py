@@ -3,19 +3,31 @@ Layer 1: Linguistic - Task parsing and embeddings.
 
 Processes raw task descriptions into vector embeddings.
 Computes semantic dimension d_sem.
+
+Embeddings are memoized per description (LRU) and the misses of a step go
+to the LLM in one embed_batch call; d_sem is cached by a hash of the
+embedding matrix, so an unchanged task list costs a lookup per step.
 """
 
+import hashlib
+from collections import OrderedDict
+from typing import List, Sequence
+
 import numpy as np
-from typing import List
 
 
 class Layer1Linguistic:
     """L1: Parse tasks → embeddings"""
     
-    def __init__(self, llm):
+    def __init__(self, llm, cache_size: int = 4096):
         self.llm = llm
+        self.cache_size = cache_size
         self.last_embeddings = None
         self.d_sem = 1.0
+        
+        self._cache = OrderedDict()  # description → embedding (LRU order)
+        self._last_descriptions = None
+        self._d_sem_key = None
     
     def process_tasks(self, tasks: List) -> np.ndarray:
         """
@@ -27,24 +39,54 @@ class Layer1Linguistic:
         Returns:
             embeddings: (n_tasks, embedding_dim) matrix
         """
-        embeddings = []
+        descriptions = tuple(t.description for t in tasks)
+        if descriptions and descriptions == self._last_descriptions:
+            # Same task list as last step
+            return self.last_embeddings
         
-        for t in tasks:
-            # Get embedding from LLM
-            emb = self.llm.embed(t.description)
-            embeddings.append(emb)
-        
-        if embeddings:
-            mat = np.vstack(embeddings)
+        if descriptions:
+            mat = self.embed_descriptions(descriptions)
         else:
             # Empty task list → zero embedding
             mat = np.zeros((1, 128), dtype=np.float32)
+        mat.flags.writeable = False  # shared across steps
+        
+        key = hashlib.blake2b(mat.tobytes(), digest_size=16).digest() + repr(mat.shape).encode()
+        if key != self._d_sem_key:
+            self.d_sem = self._estimate_d_sem(mat)
+            self._d_sem_key = key
         
         self.last_embeddings = mat
-        self.d_sem = self._estimate_d_sem(mat)
+        self._last_descriptions = descriptions
         
         return mat
     
+    def embed_descriptions(self, descriptions: Sequence[str]) -> np.ndarray:
+        """Embeddings of descriptions; cache misses are embedded in one batch"""
+        missing = list(dict.fromkeys(d for d in descriptions if d not in self._cache))
+        fresh = dict(zip(missing, self._embed_batch(missing))) if missing else {}
+        
+        rows = []
+        for d in descriptions:
+            if d in fresh:
+                rows.append(fresh[d])
+            else:
+                self._cache.move_to_end(d)
+                rows.append(self._cache[d])
+        
+        for d, emb in fresh.items():
+            self._cache[d] = emb
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        
+        return np.vstack(rows)
+    
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        embed_batch = getattr(self.llm, 'embed_batch', None)
+        if embed_batch is not None:
+            return np.asarray(embed_batch(texts))
+        return np.vstack([self.llm.embed(t) for t in texts])
+    
     def _estimate_d_sem(self, embeddings: np.ndarray) -> float:
         """
         Estimate semantic dimension d_sem.
@@ -58,9 +100,9 @@ class Layer1Linguistic:
         # Center data
         X = embeddings - embeddings.mean(axis=0, keepdims=True)
         
-        # SVD
+        # Singular values only
         try:
-            U, S, Vt = np.linalg.svd(X, full_matrices=False)
+            S = np.linalg.svd(X, compute_uv=False)
             
             # Variance explained
             var = S**2
@@ -240,6 +240,25 @@ class BaselineRunner:
         self.experiment = experiment
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.llm_states: Optional[np.ndarray] = None
+        
+    def prepare_llm_states(self, provider, converter) -> np.ndarray:
+        """
+        Embed and convert all experiment texts once, before the run.
+        
+        Uses the batched converter.texts_to_states (llm_baseline_extended)
+        when available, else converts text by text.
+        
+        Returns
+        -------
+        states : np.ndarray, shape (n_texts, state_dim * n_layers)
+        """
+        texts = self.experiment.texts
+        if hasattr(converter, 'texts_to_states'):
+            self.llm_states = converter.texts_to_states(texts, provider)
+        else:
+            self.llm_states = np.array([converter.text_to_state(t, provider) for t in texts])
+        return self.llm_states
         
     def run_toy_baseline(self) -> Dict:
         """
@@ -17,13 +17,15 @@ Version: 2.0 - Real LLM Integration
 """
 
 import numpy as np
-from typing import List, Dict, Tuple, Optional, Callable
+from typing import List, Dict, Tuple, Optional, Callable, Iterable
 from dataclasses import dataclass
 import json
 from pathlib import Path
 import os
 import warnings
 
+from embedding_cache import EmbeddingCache, text_key
+
 # ============================================================================
 # SECTION 1: EXTENDED LLM CONFIG
 # ============================================================================
@@ -92,54 +94,67 @@ class LLMConfig:
 # ============================================================================
 
 class EmbeddingProvider:
-    """Abstract interface for LLM embeddings."""
+    """
+    Abstract interface for LLM embeddings.
+    
+    Subclasses implement _encode_batch (one backend call for a list of
+    texts). With cache_embeddings, embed_text / embed_batch go through a
+    packed EmbeddingCache in cache_dir, keyed by (provider, model, text):
+    hits are gathered from the store and only the misses are sent to the
+    backend, config.batch_size texts at a time. Cached embeddings are float32.
+    """
     
     def __init__(self, config: LLMConfig):
         self.config = config
+        self.cache = None
         
         # Setup cache if enabled
         if self.config.cache_embeddings:
             self.cache_dir = Path(self.config.cache_dir)
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-            self.cache = {}
+            self.cache = EmbeddingCache(self.cache_dir, config.provider, self._cache_model())
+    
+    def _cache_model(self) -> str:
+        """Model part of the cache namespace"""
+        return self.config.model
+    
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Backend call: embeddings of texts, shape (len(texts), dim)"""
+        raise NotImplementedError
         
     def embed_text(self, text: str) -> np.ndarray:
         """Embed single text string"""
-        raise NotImplementedError
+        return self.embed_batch([text])[0]
         
     def embed_batch(self, texts: List[str]) -> np.ndarray:
         """Embed batch of texts"""
-        return np.array([self.embed_text(t) for t in texts])
+        if self.cache is None:
+            return self._encode_batch(list(texts))
+        return self.cache.embed(texts, self._encode_batch, batch_size=self.config.batch_size)
         
     def get_embedding_dim(self) -> int:
         """Get embedding dimension"""
         return self.config.embedding_dim
     
-    def _cache_key(self, text: str) -> str:
-        """Generate cache key from text"""
-        import hashlib
-        return hashlib.md5(text.encode()).hexdigest()
+    def cache_stats(self) -> Dict:
+        """Hit rate / bytes read of the embedding cache (empty if disabled)"""
+        return self.cache.stats() if self.cache is not None else {}
     
     def _load_from_cache(self, text: str) -> Optional[np.ndarray]:
         """Load embedding from cache if available"""
-        if not self.config.cache_embeddings:
+        if self.cache is None:
             return None
-            
-        cache_key = self._cache_key(text)
-        cache_file = self.cache_dir / f"{cache_key}.npy"
-        
-        if cache_file.exists():
-            return np.load(cache_file)
-        return None
+        embedding, hit = self.cache.get_many([text])
+        return embedding[0] if hit[0] else None
     
     def _save_to_cache(self, text: str, embedding: np.ndarray):
         """Save embedding to cache"""
-        if not self.config.cache_embeddings:
-            return
-            
-        cache_key = self._cache_key(text)
-        cache_file = self.cache_dir / f"{cache_key}.npy"
-        np.save(cache_file, embedding)
+        if self.cache is not None:
+            self.cache.put_many([text], np.asarray(embedding)[None, :])
+
+
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / (norms + 1e-8)
 
 
 # ============================================================================
@@ -153,13 +168,17 @@ class MockEmbeddingProvider(EmbeddingProvider):
         super().__init__(config)
         self.rng = np.random.RandomState(seed)
         
-    def embed_text(self, text: str) -> np.ndarray:
-        """Generate deterministic random embedding based on text hash"""
-        text_hash = hash(text) % (2**31)
-        local_rng = np.random.RandomState(text_hash)
-        embedding = local_rng.randn(self.config.embedding_dim)
-        embedding = embedding / (np.linalg.norm(embedding) + 1e-8)
-        return embedding
+    def _cache_model(self) -> str:
+        # random vectors depend on the requested dimension
+        return f"{self.config.model}-{self.config.embedding_dim}"
+    
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Generate deterministic random embeddings based on text hash"""
+        # md5 (as the cache key), not hash(): str hashes are salted per process
+        embeddings = np.array([np.random.RandomState(int.from_bytes(text_key(t)[:4], 'little'))
+                               .randn(self.config.embedding_dim)
+                               for t in texts]).reshape(len(texts), self.config.embedding_dim)
+        return _normalize_rows(embeddings)
 
 
 # ============================================================================
@@ -200,29 +219,10 @@ class AnthropicEmbeddingProvider(EmbeddingProvider):
                 "Install: pip install sentence-transformers"
             )
     
-    def embed_text(self, text: str) -> np.ndarray:
-        """Embed text using sentence-transformer proxy"""
-        # Check cache
-        cached = self._load_from_cache(text)
-        if cached is not None:
-            return cached
-        
-        # Generate embedding
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        embedding = embedding / (np.linalg.norm(embedding) + 1e-8)
-        
-        # Save to cache
-        self._save_to_cache(text, embedding)
-        
-        return embedding
-    
-    def embed_batch(self, texts: List[str]) -> np.ndarray:
-        """Embed batch of texts"""
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed texts using sentence-transformer proxy"""
         embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-        # Normalize
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-        embeddings = embeddings / (norms + 1e-8)
-        return embeddings
+        return _normalize_rows(embeddings)
 
 
 # ============================================================================
@@ -246,40 +246,15 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
                 "openai package required. Install: pip install openai"
             )
     
-    def embed_text(self, text: str) -> np.ndarray:
-        """Embed text using OpenAI API"""
-        # Check cache
-        cached = self._load_from_cache(text)
-        if cached is not None:
-            return cached
-        
-        # Call API
-        response = self.client.embeddings.create(
-            model=self.config.model,
-            input=text
-        )
-        
-        embedding = np.array(response.data[0].embedding)
-        embedding = embedding / (np.linalg.norm(embedding) + 1e-8)
-        
-        # Save to cache
-        self._save_to_cache(text, embedding)
-        
-        return embedding
-    
-    def embed_batch(self, texts: List[str]) -> np.ndarray:
-        """Embed batch of texts"""
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed texts using OpenAI API (one request)"""
         response = self.client.embeddings.create(
             model=self.config.model,
             input=texts
         )
         
         embeddings = np.array([item.embedding for item in response.data])
-        # Normalize
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-        embeddings = embeddings / (norms + 1e-8)
-        
-        return embeddings
+        return _normalize_rows(embeddings)
 
 
 # ============================================================================
@@ -304,29 +279,10 @@ class SentenceTransformerProvider(EmbeddingProvider):
                 "Install: pip install sentence-transformers"
             )
     
-    def embed_text(self, text: str) -> np.ndarray:
-        """Embed text using local model"""
-        # Check cache
-        cached = self._load_from_cache(text)
-        if cached is not None:
-            return cached
-        
-        # Generate embedding
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        embedding = embedding / (np.linalg.norm(embedding) + 1e-8)
-        
-        # Save to cache
-        self._save_to_cache(text, embedding)
-        
-        return embedding
-    
-    def embed_batch(self, texts: List[str]) -> np.ndarray:
-        """Embed batch of texts"""
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed texts using local model"""
         embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-        # Normalize
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-        embeddings = embeddings / (norms + 1e-8)
-        return embeddings
+        return _normalize_rows(embeddings)
 
 
 # ============================================================================
@@ -389,6 +345,12 @@ class StateVectorConverter:
     Enhanced converter with PCA support.
     
     Converts between text, embeddings, and AGI state vectors.
+    
+    The reduction is one precomputed affine map (reduced = E @ W - b: random
+    projection, PCA or streaming IncrementalPCA), so a whole corpus
+    (n, embedding_dim) becomes (n, state_dim * n_layers) states in one
+    matmul plus one noise draw. Everything is float32; projection and layer
+    noise come from a numpy Generator seeded with `seed`.
     """
     
     def __init__(
@@ -398,7 +360,9 @@ class StateVectorConverter:
         n_layers: int = 5,
         reduction_method: str = 'random_projection',
         fit_pca: bool = False,
-        pca_data: Optional[np.ndarray] = None
+        pca_data: Optional[np.ndarray] = None,
+        seed: Optional[int] = None,
+        pca_batch_size: Optional[int] = None
     ):
         """
         Parameters
@@ -414,76 +378,120 @@ class StateVectorConverter:
         fit_pca : bool
             If True and method='pca', fit PCA on pca_data
         pca_data : np.ndarray, optional
-            Data for fitting PCA (shape: [n_samples, embedding_dim])
+            Data for fitting PCA (shape: [n_samples, embedding_dim]);
+            may be a np.memmap when pca_batch_size is set
+        seed : int, optional
+            Seed of the projection / layer-noise Generator
+        pca_batch_size : int, optional
+            Fit an IncrementalPCA on pca_data in chunks of this many rows
+            (see also fit_incremental_pca for iterables of chunks)
         """
         self.embedding_dim = embedding_dim
         self.state_dim = state_dim
         self.n_layers = n_layers
         self.reduction_method = reduction_method
+        self.rng = np.random.default_rng(seed)
+        self.pca = None
+        self.projection = None
+        self.offset = None
+        
+        # Lower layers: more direct (less noise); upper layers: more abstract
+        self.noise_levels = (0.05 + 0.10 * np.arange(n_layers) / n_layers).astype(np.float32)
         
         # Initialize reduction
         if reduction_method == 'random_projection':
-            self.projection = np.random.randn(embedding_dim, state_dim)
-            self.projection /= np.linalg.norm(self.projection, axis=0, keepdims=True)
+            self._random_projection()
             
         elif reduction_method == 'pca':
             if fit_pca and pca_data is not None:
-                from sklearn.decomposition import PCA
-                self.pca = PCA(n_components=state_dim)
-                self.pca.fit(pca_data)
+                if pca_batch_size is not None:
+                    self.fit_incremental_pca(
+                        pca_data[i:i + pca_batch_size] for i in range(0, len(pca_data), pca_batch_size)
+                    )
+                else:
+                    from sklearn.decomposition import PCA
+                    self.pca = PCA(n_components=state_dim)
+                    self.pca.fit(pca_data)
+                    self._pca_projection()
             else:
-                self.pca = None
                 warnings.warn("PCA requested but not fitted. Using random projection.")
-                self.projection = np.random.randn(embedding_dim, state_dim)
-                self.projection /= np.linalg.norm(self.projection, axis=0, keepdims=True)
+                self._random_projection()
                 
         elif reduction_method == 'truncate':
-            self.projection = None
+            pass
             
         else:
             raise ValueError(f"Unknown reduction method: {reduction_method}")
     
-    def embedding_to_state(self, embedding: np.ndarray) -> np.ndarray:
+    def _random_projection(self):
+        projection = self.rng.standard_normal((self.embedding_dim, self.state_dim), dtype=np.float32)
+        projection /= np.linalg.norm(projection, axis=0, keepdims=True)
+        self.projection = projection
+    
+    def _pca_projection(self):
+        # pca.transform(X) = (X - mean_) @ components_.T
+        self.projection = np.ascontiguousarray(self.pca.components_.T, dtype=np.float32)
+        self.offset = (self.pca.mean_ @ self.pca.components_.T).astype(np.float32)
+    
+    def fit_incremental_pca(self, batches: Iterable[np.ndarray]) -> None:
         """
-        Convert LLM embedding to AGI state vector.
+        Streaming PCA fit (sklearn IncrementalPCA.partial_fit per batch)
+        for corpora that do not fit in memory; batches need >= state_dim rows
+        """
+        from sklearn.decomposition import IncrementalPCA
+        self.pca = IncrementalPCA(n_components=self.state_dim)
+        for batch in batches:
+            self.pca.partial_fit(np.asarray(batch, dtype=np.float32))
+        self._pca_projection()
+    
+    def embeddings_to_states(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Convert a batch of LLM embeddings to AGI state vectors.
         
         Parameters
         ----------
-        embedding : np.ndarray, shape (embedding_dim,)
-            LLM embedding
+        embeddings : np.ndarray, shape (n, embedding_dim)
+            LLM embeddings
             
         Returns
         -------
-        state : np.ndarray, shape (state_dim * n_layers,)
-            AGI state vector (all layers concatenated)
+        states : np.ndarray, shape (n, state_dim * n_layers), float32
+            AGI state vectors (all layers concatenated)
         """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        
         # Reduce dimension
-        if self.reduction_method == 'pca' and self.pca is not None:
-            reduced = self.pca.transform(embedding.reshape(1, -1))[0]
-        elif self.reduction_method == 'random_projection':
-            reduced = embedding @ self.projection
+        if self.projection is not None:
+            reduced = embeddings @ self.projection
+            if self.offset is not None:
+                reduced -= self.offset
         else:  # truncate
-            reduced = embedding[:self.state_dim]
+            reduced = embeddings[:, :self.state_dim].copy()
         
         # Normalize
-        reduced = reduced / (np.linalg.norm(reduced) + 1e-8)
+        reduced /= np.linalg.norm(reduced, axis=1, keepdims=True) + np.float32(1e-8)
         
         # Distribute across layers with hierarchical variation
-        state = np.zeros(self.state_dim * self.n_layers)
+        states = self.rng.standard_normal((len(reduced), self.n_layers, self.state_dim), dtype=np.float32)
+        states *= self.noise_levels[:, None]
+        states += reduced[:, None, :]
+        return states.reshape(len(reduced), self.n_layers * self.state_dim)
+    
+    def embedding_to_state(self, embedding: np.ndarray) -> np.ndarray:
+        """
+        Convert LLM embedding to AGI state vector.
         
-        for layer_idx in range(self.n_layers):
-            start = layer_idx * self.state_dim
-            end = start + self.state_dim
-            
-            # Layer-specific transformation
-            # Lower layers: more direct (less noise)
-            # Upper layers: more abstract (more variation)
-            noise_level = 0.05 + 0.10 * (layer_idx / self.n_layers)
-            layer_noise = noise_level * np.random.randn(self.state_dim)
-            
-            state[start:end] = reduced + layer_noise
+        Parameters
+        ----------
+        embedding : np.ndarray, shape (embedding_dim,)
+            LLM embedding
             
-        return state
+        Returns
+        -------
+        state : np.ndarray, shape (state_dim * n_layers,)
+            AGI state vector (all layers concatenated)
+        """
+        return self.embeddings_to_states(np.asarray(embedding)[None, :])[0]
     
     def text_to_state(
         self,
@@ -493,6 +501,23 @@ class StateVectorConverter:
         """Convert text directly to state vector."""
         embedding = provider.embed_text(text)
         return self.embedding_to_state(embedding)
+    
+    def texts_to_states(
+        self,
+        texts: List[str],
+        provider: EmbeddingProvider,
+        batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Convert a corpus to state vectors, shape (len(texts), state_dim * n_layers);
+        batch_size bounds the embeddings held in memory at once.
+        """
+        texts = list(texts)
+        batch_size = batch_size or max(len(texts), 1)
+        states = np.empty((len(texts), self.n_layers * self.state_dim), dtype=np.float32)
+        for i in range(0, len(texts), batch_size):
+            states[i:i + batch_size] = self.embeddings_to_states(provider.embed_batch(texts[i:i + batch_size]))
+        return states
 
 
 # ============================================================================
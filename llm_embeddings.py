@@ -15,9 +15,11 @@ Version: 1.0.0
 """
 
 import numpy as np
-from typing import List, Optional
+from typing import Dict, List, Optional
 import hashlib
 
+from embedding_cache import EmbeddingCache
+
 # Try to import sentence-transformers
 try:
     from sentence_transformers import SentenceTransformer
@@ -34,7 +36,9 @@ class LLMEmbedder:
         self,
         method: str = 'sentence-transformers',
         model_name: str = 'all-mpnet-base-v2',
-        embedding_dim: int = 768
+        embedding_dim: int = 768,
+        cache_dir: Optional[str] = None,
+        batch_size: int = 32
     ):
         """
         Initialize embedder.
@@ -47,11 +51,18 @@ class LLMEmbedder:
             Model name/path
         embedding_dim : int
             Embedding dimension
+        cache_dir : str, optional
+            Packed embedding cache (embedding_cache.EmbeddingCache) shared
+            with llm_baseline_extended providers; None disables caching
+        batch_size : int
+            Texts per model call for cache misses
         """
         self.method = method
         self.model_name = model_name
         self.embedding_dim = embedding_dim
+        self.batch_size = batch_size
         self.model = None
+        self.cache = None
         
         if method == 'sentence-transformers':
             if TRANSFORMERS_AVAILABLE:
@@ -72,6 +83,11 @@ class LLMEmbedder:
         
         else:
             raise ValueError(f"Unknown method: {method}")
+        
+        if cache_dir is not None:
+            # stub vectors depend on the dimension: keep them apart
+            model = model_name if self.method != 'stub' else f"stub-{self.embedding_dim}"
+            self.cache = EmbeddingCache(cache_dir, self.method, model)
     
     def embed(self, text: str) -> np.ndarray:
         """
@@ -87,6 +103,9 @@ class LLMEmbedder:
         embedding : np.ndarray
             Embedding vector
         """
+        if self.cache is not None:
+            return self.embed_batch([text])[0]
+        
         if self.method == 'sentence-transformers' and self.model is not None:
             embedding = self.model.encode(text, convert_to_numpy=True)
             return embedding
@@ -110,8 +129,18 @@ class LLMEmbedder:
         Returns
         -------
         embeddings : np.ndarray
-            Embeddings, shape (N, dim)
+            Embeddings, shape (N, dim); float32 when cached
         """
+        if self.cache is not None:
+            return self.cache.embed(texts, self._encode_batch, batch_size=self.batch_size)
+        return self._encode_batch(texts)
+    
+    def cache_stats(self) -> Dict:
+        """Hit rate / bytes read of the embedding cache (empty if disabled)"""
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Model call for a list of texts"""
         if self.method == 'sentence-transformers' and self.model is not None:
             embeddings = self.model.encode(texts, convert_to_numpy=True)
             return embeddings
@@ -28,6 +28,8 @@ from sklearn.decomposition import PCA
 from sklearn.neighbors import NearestNeighbors
 import warnings
 
+from knn_mi import MIContext, kraskov_counts
+
 # Suppress unnecessary warnings
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 
@@ -179,25 +181,9 @@ def knn_mutual_information(
     if n_samples < k + 1:
         raise ValueError(f"Need at least {k+1} samples for k={k}, got {n_samples}")
     
-    # Concatenate X and Y
-    XY = np.concatenate([X, Y], axis=1)
-    
-    # Compute distances in joint space
-    nn_xy = NearestNeighbors(n_neighbors=k+1, metric='euclidean')
-    nn_xy.fit(XY)
-    distances_xy, _ = nn_xy.kneighbors(XY)
-    epsilon = distances_xy[:, k]  # Distance to k-th neighbor
-    
-    # Count neighbors within epsilon in X and Y spaces
-    nn_x = NearestNeighbors(metric='euclidean')
-    nn_x.fit(X)
-    n_x = np.array([len(nn_x.radius_neighbors([x], radius=eps, return_distance=False)[0]) - 1 
-                    for x, eps in zip(X, epsilon)])
-    
-    nn_y = NearestNeighbors(metric='euclidean')
-    nn_y.fit(Y)
-    n_y = np.array([len(nn_y.radius_neighbors([y], radius=eps, return_distance=False)[0]) - 1 
-                    for y, eps in zip(Y, epsilon)])
+    # Joint k-NN radius and neighbors within epsilon in X and Y spaces
+    # (one tree per space, all samples counted in a single batched query)
+    epsilon, n_x, n_y = kraskov_counts(X, Y, k=k)
     
     # Kraskov estimator
     mi = digamma(k) - np.mean(digamma(n_x + 1) + digamma(n_y + 1)) + digamma(n_samples)
@@ -223,7 +209,10 @@ def conditional_mutual_information(
     """
     Estimates conditional mutual information I(X;Y|Z) using k-NN.
     
-    I(X;Y|Z) = I(X;Y,Z) - I(X;Z)
+    Single-pass Frenzel-Pompe estimator: one k-NN radius in (X,Y,Z) space,
+    neighbour counts in the (X,Z), (Y,Z) and Z subspaces.
+    
+    I(X;Y|Z) = ψ(k) - <ψ(n_xz + 1) + ψ(n_yz + 1) - ψ(n_z + 1)>
     
     Args:
         X: Array of shape (n_samples, n_features_X)
@@ -238,13 +227,8 @@ def conditional_mutual_information(
         Frenzel & Pompe (2007). "Partial mutual information for coupling analysis."
         Physical Review Letters 99(20): 204101.
     """
-    # I(X;Y|Z) = I(X;YZ) - I(X;Z)
-    YZ = np.concatenate([Y, Z], axis=1)
-    
-    I_X_YZ = knn_mutual_information(X, YZ, k=k)
-    I_X_Z = knn_mutual_information(X, Z, k=k)
-    
-    cmi = I_X_YZ - I_X_Z
+    context = MIContext({'X': X, 'Y': Y, 'Z': Z}, k=k)
+    cmi = context.cmi('X', 'Y', 'Z')
     
     # Handle numerical errors
     cmi = max(0.0, cmi)
@@ -300,11 +284,17 @@ def estimate_I_ratio(
         direct_states = agent_states[:, :state_dim//2]
         indirect_states = agent_states[:, state_dim//2:]
         
+        # Both estimates share the task-space neighbour structures
+        context = MIContext(
+            {'direct': direct_states, 'indirect': indirect_states, 'tasks': tasks_onehot},
+            k=k
+        )
+        
         # I_total = I(states; tasks)
-        I_total = knn_mutual_information(agent_states, tasks_onehot, k=k)
+        I_total = max(0.0, context.mi(('direct', 'indirect'), 'tasks'))
         
         # I_direct ≈ I(direct_states; tasks)
-        I_direct = knn_mutual_information(direct_states, tasks_onehot, k=k)
+        I_direct = max(0.0, context.mi('direct', 'tasks'))
         
         # I_indirect = I_total - I_direct
         I_indirect = max(0.0, I_total - I_direct)
@@ -0,0 +1,10 @@
+"""
+Numerical helpers shared across NumPy / SciPy versions.
+
+trapezoid: np.trapezoid on NumPy >= 2.0, where np.trapz (and
+scipy.integrate.trapz, SciPy >= 1.14) were removed; np.trapz before.
+"""
+
+import numpy as np
+
+trapezoid = getattr(np, 'trapezoid', None) or np.trapz
@@ -33,6 +33,7 @@ class SimulationConfig:
     log_every: int = 1
     save_trace: bool = True
     output_dir: str = "results"
+    packed_sigma: bool = False
 
 
 class Orchestrator:
@@ -47,7 +48,8 @@ class Orchestrator:
         # Initialize IWS
         self.iws = IWS(
             theta=config.theta_init,
-            gamma=config.gamma_init
+            gamma=config.gamma_init,
+            packed_sigma=config.packed_sigma
         )
         
         # Initialize Dual-Source
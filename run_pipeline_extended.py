@@ -210,10 +210,11 @@ def run_llm_pipeline(config: dict) -> dict:
         embedding_dim=llm_config.embedding_dim,
         state_dim=state_dim,
         n_layers=5,
-        reduction_method='random_projection'
+        reduction_method='random_projection',
+        seed=config.get('seed', 42)
     )
     
-    states = np.array([converter.embedding_to_state(emb) for emb in embeddings])
+    states = converter.embeddings_to_states(embeddings)
     print(f"    States shape: {states.shape}")
     print(f"    Mean norm: {np.mean(np.linalg.norm(states, axis=1)):.4f}")
     
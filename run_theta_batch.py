@@ -1,36 +1,97 @@
 
-import numpy as np, pandas as pd
+"""
+Batch Θ extraction over the MATERIALS catalog.
+
+(material, T) points are fanned out over a process pool; each point loads
+its spectrum and memory function once (memoised per process, keyed by
+material, T and ω grid) and evaluates every requested energy method on it.
+Per material, the Θ(T) curve goes through the same Θ_c detection /
+validation as extract_theta_full_pipeline, and the summary and gates rows
+are streamed to CSV as soon as the material (and all before it) is done.
+"""
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 from extract_theta_from_optical import (
-    MATERIALS, generate_dummy_data, compute_memory_function,
-    spectral_measure, extract_theta, extract_theta_full_pipeline
+    MATERIALS, generate_dummy_data, load_optical_data, compute_memory_function,
+    spectral_measure, extract_theta, summarize_theta_curve
 )
 
-def temp_grid(Tc):
-    arr = np.array([0.5,0.7,0.9,1.1,1.5,2.0])*Tc
+ENERGY_METHODS = ('canonical', 'memory', 'corrected')
+PIPELINE_GRID = (5.0, 700)   # generate_dummy_data defaults (extract_theta_full_pipeline)
+DEMO_GRID = (5.0, 600)       # spectrum used for the KK and ε-sensitivity gates
+
+SUMMARY_FIELDS = ['Material', 'Structure', 'Tc_K', 'Theta_c_eV', 'Theta_c_over_Tc', 'Expected_ratio',
+                  'RelError', 'KK_violation', 'KK_pass', 'Method_agreement', 'Method_pass',
+                  'Sensitivity', 'Sensitivity_pass', 'Class_pass', 'Validation_status', 'Overall_PASS']
+GATE_FIELDS = ['Material', 'Gate: KK', 'Gate: Method', 'Gate: ε-sensitivity', 'Gate: Class', 'OVERALL']
+
+
+def temp_grid(Tc, step: Optional[float] = None):
+    """Default: six points 0.5-2.0 Tc; with step (K): every step K over 0.5-2.0 Tc."""
+    if step is None:
+        arr = np.array([0.5,0.7,0.9,1.1,1.5,2.0])*Tc
+    else:
+        arr = np.arange(0.5*Tc, 2.0*Tc + 0.5*step, step)
     return np.unique(arr.astype(int))
 
-materials = ['LSCO_x015','YBCO','Bi2212','CaCuO2']
-records = []
-matrix_rows = []
 
-for key in materials:
+@lru_cache(maxsize=4096)
+def load_spectrum(key: str, T: float, grid: Tuple[float, int] = PIPELINE_GRID,
+                  use_dummy: bool = True, data_dir: str = 'data'):
+    """σ(ω,T) for (material, T, grid); measured data falls back to synthetic."""
+    if use_dummy:
+        w, s1, s2 = generate_dummy_data(key, T, omega_max=grid[0], n_points=grid[1])
+    else:
+        try:
+            w, s1, s2 = load_optical_data(key, T, data_dir)
+        except FileNotFoundError:
+            w, s1, s2 = generate_dummy_data(key, T, omega_max=grid[0], n_points=grid[1])
+    for a in (w, s1, s2):
+        a.flags.writeable = False
+    return w, s1, s2
+
+
+@lru_cache(maxsize=4096)
+def memory_function(key: str, T: float, grid: Tuple[float, int] = PIPELINE_GRID,
+                    use_dummy: bool = True, data_dir: str = 'data'):
+    """(ω, π(ω), M1, M-diagnostics) for (material, T, grid)."""
+    w, s1, s2 = load_spectrum(key, T, grid, use_dummy, data_dir)
+    M1, _, Mdiag = compute_memory_function(w, s1, s2, MATERIALS[key].omega_p)
+    pi = spectral_measure(w, s1, method='f-sum')
+    return w, pi, M1, Mdiag
+
+
+def theta_point(key: str, T: float, grid: Tuple[float, int], energy_methods: Sequence[str],
+                use_dummy: bool = True, data_dir: str = 'data') -> Dict:
+    w, pi, M1, Mdiag = memory_function(key, T, grid, use_dummy, data_dir)
+    return {'T': float(T), 'M': Mdiag,
+            'Theta': {em: extract_theta(w, pi, M1, energy_method=em) for em in energy_methods}}
+
+
+def _run_chunk(tasks):
+    return [theta_point(*task) for task in tasks]
+
+
+def _material_rows(key: str, Ts: np.ndarray, points: Dict, T_demo: int,
+                   pipeline_method: str) -> Tuple[Dict, Dict]:
     mat = MATERIALS[key]
-    Ts = temp_grid(mat.Tc)
-    res = extract_theta_full_pipeline(key, Ts, use_dummy=True, energy_method='canonical', verbose=False)
-
-    T_demo = int(max(Ts.min(), min(int(1.1*mat.Tc), Ts.max())))
-    w, s1, s2 = generate_dummy_data(key, T_demo, omega_max=5.0, n_points=600)
-    M1, M2, Mdiag = compute_memory_function(w, s1, s2, mat.omega_p)
-    kk_vio = Mdiag.get('kk_violation', float('nan'))
-    kk_ok = bool(Mdiag.get('kk_ok', True))
-
-    thetas = []
-    for em in ['canonical','memory','corrected']:
-        th, _ = extract_theta(w, spectral_measure(w, s1, method='f-sum'), M1, energy_method=em)
-        thetas.append(th)
-    import numpy as np
-    thetas = np.array(thetas, dtype=float)
+    curve = [points[(float(T), PIPELINE_GRID)] for T in Ts]
+    res = summarize_theta_curve(
+        key, Ts, np.array([p['Theta'][pipeline_method][0] for p in curve], dtype=float),
+        [{'T': p['T'], 'M': p['M'], 'Theta': p['Theta'][pipeline_method][1]} for p in curve])
+
+    demo = points[(float(T_demo), DEMO_GRID)]
+    kk_vio = demo['M'].get('kk_violation', float('nan'))
+    kk_ok = bool(demo['M'].get('kk_ok', True))
+    thetas = np.array([demo['Theta'][em][0] for em in ENERGY_METHODS], dtype=float)
     sens = float(np.std(thetas)/np.mean(thetas)) if np.isfinite(thetas).all() and np.mean(thetas)!=0 else float('nan')
     sens_ok = bool(sens < 0.10) if np.isfinite(sens) else False
 
@@ -39,13 +100,13 @@ for key in materials:
     class_ok = bool(res['validation']['within_tolerance'])
     overall = bool(kk_ok and sens_ok and agree_ok and class_ok)
 
-    records.append({
+    record = {
         'Material': mat.name,
         'Structure': mat.structure,
         'Tc_K': float(res['Tc']),
         'Theta_c_eV': float(res['Theta_c']),
         'Theta_c_over_Tc': float(res['ratio']),
-        'Expected_ratio': float(MATERIALS[key].expected_ratio),
+        'Expected_ratio': float(mat.expected_ratio),
         'RelError': float(res['validation']['relative_error']),
         'KK_violation': kk_vio,
         'KK_pass': kk_ok,
@@ -56,20 +117,109 @@ for key in materials:
         'Class_pass': class_ok,
         'Validation_status': res['validation']['status'],
         'Overall_PASS': overall
-    })
-
-    matrix_rows.append({
+    }
+    gates = {
         'Material': mat.name,
         'Gate: KK': kk_ok,
         'Gate: Method': agree_ok,
         'Gate: ε-sensitivity': sens_ok,
         'Gate: Class': class_ok,
         'OVERALL': overall
-    })
-
-df = pd.DataFrame(records)
-mx = pd.DataFrame(matrix_rows)
-ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-df.to_csv(f"theta_batch_summary_{ts}.csv", index=False)
-mx.to_csv(f"theta_batch_gates_{ts}.csv", index=False)
-print("DONE")
+    }
+    return record, gates
+
+
+class _CsvStream:
+    def __init__(self, path: str, fields: List[str]):
+        self.f = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.f, fieldnames=fields)
+        self.writer.writeheader()
+
+    def write(self, row: Dict):
+        # empty cell for NaN, as pandas.to_csv
+        self.writer.writerow({k: ('' if isinstance(v, float) and np.isnan(v) else v) for k, v in row.items()})
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+def run_theta_batch(materials: Optional[Sequence[str]] = None,
+                    T_step: Optional[float] = None,
+                    temps: Optional[Callable[[float], np.ndarray]] = None,
+                    pipeline_method: str = 'canonical',
+                    use_dummy: bool = True, data_dir: str = 'data',
+                    n_workers: int = 1, chunk_size: Optional[int] = None,
+                    summary_path: Optional[str] = None, gates_path: Optional[str] = None):
+    """
+    Θ extraction + gates for every material; returns (records, gate_rows)
+    in catalog order. temps(Tc) overrides temp_grid(Tc, T_step). With
+    summary_path / gates_path the rows are streamed to CSV as they finish.
+    """
+    materials = list(MATERIALS) if materials is None else list(materials)
+    plan = {}
+    tasks = []
+    for key in materials:
+        Tc = MATERIALS[key].Tc
+        Ts = temps(Tc) if temps is not None else temp_grid(Tc, T_step)
+        T_demo = int(max(Ts.min(), min(int(1.1*Tc), Ts.max())))
+        plan[key] = (Ts, T_demo)
+        tasks += [(key, float(T), PIPELINE_GRID, (pipeline_method,), use_dummy, data_dir) for T in Ts]
+        tasks.append((key, float(T_demo), DEMO_GRID, ENERGY_METHODS, use_dummy, data_dir))
+
+    if chunk_size is None:
+        chunk_size = max(1, len(tasks) // (4*max(1, n_workers)))
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+    streams = [(_CsvStream(path, fields) if path else None)
+               for path, fields in ((summary_path, SUMMARY_FIELDS), (gates_path, GATE_FIELDS))]
+    pending = {key: len(plan[key][0]) + 1 for key in materials}
+    points = {key: {} for key in materials}
+    records, gate_rows = [], []
+
+    def collect(chunk, results):
+        for task, point in zip(chunk, results):
+            points[task[0]][(task[1], task[2])] = point
+            pending[task[0]] -= 1
+        # stream every material that is complete, in catalog order
+        while len(records) < len(materials) and pending[materials[len(records)]] == 0:
+            key = materials[len(records)]
+            Ts, T_demo = plan[key]
+            record, gates = _material_rows(key, Ts, points.pop(key), T_demo, pipeline_method)
+            records.append(record)
+            gate_rows.append(gates)
+            for stream, row in zip(streams, (record, gates)):
+                if stream is not None:
+                    stream.write(row)
+
+    try:
+        if n_workers <= 1:
+            for chunk in chunks:
+                collect(chunk, _run_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                for chunk, results in zip(chunks, pool.map(_run_chunk, chunks)):
+                    collect(chunk, results)
+    finally:
+        for stream in streams:
+            if stream is not None:
+                stream.close()
+    return records, gate_rows
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Batch Θ extraction over the materials catalog")
+    ap.add_argument("--materials", nargs="*", default=['LSCO_x015','YBCO','Bi2212','CaCuO2'])
+    ap.add_argument("--T-step", type=float, default=None, help="K between temperatures (default: 6-point grid)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--data-dir", default="data")
+    ap.add_argument("--measured", action="store_true", help="load CSV spectra (synthetic fallback)")
+    args = ap.parse_args()
+
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    run_theta_batch(args.materials, T_step=args.T_step, use_dummy=not args.measured,
+                    data_dir=args.data_dir, n_workers=args.workers,
+                    summary_path=f"theta_batch_summary_{ts}.csv",
+                    gates_path=f"theta_batch_gates_{ts}.csv")
+    print("DONE")
@@ -13,9 +13,12 @@ Based on ChatGPT recommendations for production experiments.
 
 import numpy as np
 import json
+import hashlib
 from typing import List, Dict, Tuple, Optional, Callable
 from dataclasses import dataclass, asdict
 from pathlib import Path
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import itertools
 
 # Import project modules
@@ -120,8 +123,9 @@ def run_single_experiment(
     result : ExperimentResult
         Experiment results
     """
-    if config.seed is not None:
-        np.random.seed(config.seed)
+    # Per-run random stream: no global state, so runs can execute in any
+    # order or process and still reproduce exactly from config.seed
+    rng = np.random.default_rng(config.seed)
     
     if verbose:
         print(f"\nRunning experiment: θ={config.theta_opt}, γ={config.gamma}, "
@@ -131,7 +135,8 @@ def run_single_experiment(
     ensemble = AgentEnsemble(
         n_agents=config.n_agents,
         state_dim=config.state_dim,
-        agent_type="concrete"
+        agent_type="concrete",
+        rng=rng
     )
     
     calculator = AdaptonicCalculator(
@@ -187,6 +192,17 @@ def run_single_experiment(
             'phase': final_state.phase
         })
     
+    return _summarize_run(config, history, verbose=verbose)
+
+
+def _summarize_run(
+    config: ExperimentConfig,
+    history: List[Dict],
+    verbose: bool = False
+) -> ExperimentResult:
+    """
+    Turn a simulation history into an ExperimentResult (R4 analysis).
+    """
     # Analyze results
     regions = extract_r4_regions(history)
     dwell_stats = compute_dwell_times(regions)
@@ -220,14 +236,304 @@ def run_single_experiment(
     return result
 
 
+def run_replicate_batch(
+    configs: List[ExperimentConfig],
+    step_size: float = 0.1,
+    verbose: bool = False
+) -> List[ExperimentResult]:
+    """
+    Run R independent experiments at once as an (R, N, D) state tensor.
+    
+    Batched equivalent of [run_single_experiment(c) for c in configs]:
+    every step is a few batched matmuls over all replicates instead of
+    R*N per-agent updates. Replicates may differ in lambda_0, sigma_floor,
+    theta_opt, delta_theta, gamma, cycle_period and seed; n_agents,
+    state_dim and n_steps must be shared.
+    
+    Each replicate keeps its own np.random.default_rng(config.seed) and
+    draws in the same order as run_single_experiment, so replicate r
+    follows the same trajectory as the single run with configs[r]
+    (up to matmul summation rounding).
+    
+    Parameters
+    ----------
+    configs : list of ExperimentConfig
+        One configuration per replicate
+    step_size : float
+        Coupling integration step size (run_single_experiment uses 0.1)
+    verbose : bool
+        Print summary per replicate
+        
+    Returns
+    -------
+    results : list of ExperimentResult
+        Per-replicate results with full histories, analysed with
+        extract_r4_regions / compute_dwell_times as single runs are
+        
+    Examples
+    --------
+    >>> configs = [ExperimentConfig(theta_opt=th, seed=i)
+    ...            for i, th in enumerate(np.repeat([0.10, 0.15, 0.20], 100))]
+    >>> results = run_replicate_batch(configs)
+    """
+    if not configs:
+        return []
+    
+    shape_keys = {(c.n_agents, c.state_dim, c.n_steps) for c in configs}
+    if len(shape_keys) != 1:
+        raise ValueError(
+            f"Replicates must share n_agents, state_dim and n_steps, got: {sorted(shape_keys)}"
+        )
+    n_agents, state_dim, n_steps = shape_keys.pop()
+    n_rep = len(configs)
+    
+    def param(name):
+        return np.array([getattr(c, name) for c in configs], dtype=float)
+    
+    calculator = AdaptonicCalculator(
+        lambda_0=param('lambda_0'),
+        sigma_floor=param('sigma_floor'),
+        theta_opt=param('theta_opt'),
+        delta_theta=param('delta_theta'),
+        cycle_period=param('cycle_period')
+    )
+    gamma = param('gamma')[:, None, None]
+    rngs = [np.random.default_rng(c.seed) for c in configs]
+    
+    def draw(shape):
+        return np.stack([rng.standard_normal(shape) for rng in rngs])
+    
+    def normalize(x, eps):
+        return x / (np.linalg.norm(x, axis=-1, keepdims=True) + eps)
+    
+    # Initial states as ConcreteAgent, velocities at rest
+    states = normalize(draw((n_agents, state_dim)), 1e-10)
+    velocities = np.zeros_like(states)
+    
+    columns = {name: np.empty((n_steps, n_rep)) for name in
+               ('sigma', 'alpha', 'theta_mean', 'free_energy', 'variance', 'lambda_eff')}
+    phases = np.empty((n_steps, n_rep), dtype=object)
+    
+    for t in range(n_steps):
+        adaptonic_state = calculator.compute_full_state_batch(states, t)
+        
+        # Responses: move 10% toward ensemble mean, then set_states
+        responses = states + 0.1 * (states.mean(axis=1, keepdims=True) - states)
+        responses = normalize(responses, 1e-10)
+        norms = np.linalg.norm(responses, axis=-1, keepdims=True)
+        states = responses / np.where(norms > 1e-10, norms, 1.0)
+        
+        # Coupling D_ij = lambda_eff * (r_i . r_j), zero diagonal
+        lambda_eff = calculator.calculate_lambda_eff(adaptonic_state['sigma'])
+        D = lambda_eff[:, None, None] * np.matmul(responses, responses.transpose(0, 2, 1))
+        D[:, np.arange(n_agents), np.arange(n_agents)] = 0.0
+        force_coupling = np.matmul(D, states) - D.sum(axis=2)[:, :, None] * states
+        
+        # Heavy-ball momentum with FDT noise sqrt(2*Theta*gamma)
+        noise_strength = np.sqrt(2.0 * adaptonic_state['theta_mean'][:, None, None] * gamma)
+        noise = noise_strength * draw((n_agents, state_dim))
+        dv = (force_coupling - gamma * velocities + noise) * step_size
+        velocities = velocities + dv
+        
+        new_states = states + velocities * step_size
+        norms = np.linalg.norm(new_states, axis=-1, keepdims=True)
+        collapsed = norms[..., 0] <= 1e-10
+        if np.any(collapsed):
+            # Fallback to random if collapse (as ConcreteAgent)
+            norms[collapsed] = 1.0
+            for r, i in zip(*np.nonzero(collapsed)):
+                new_states[r, i] = normalize(rngs[r].standard_normal(state_dim), 1e-10)
+            velocities[collapsed] = 0.0
+        states = new_states / norms
+        
+        final_state = calculator.compute_full_state_batch(states, t)
+        for name in columns:
+            columns[name][t] = final_state[name]
+        phases[t] = final_state['phase']
+    
+    results = []
+    for r, config in enumerate(configs):
+        history = [
+            {
+                't': t,
+                'sigma': columns['sigma'][t, r],
+                'alpha': columns['alpha'][t, r],
+                'theta_mean': columns['theta_mean'][t, r],
+                'free_energy': columns['free_energy'][t, r],
+                'variance': columns['variance'][t, r],
+                'lambda_eff': columns['lambda_eff'][t, r],
+                'phase': str(phases[t, r])
+            }
+            for t in range(n_steps)
+        ]
+        results.append(_summarize_run(config, history, verbose=verbose))
+    
+    return results
+
+
+def config_key(config: ExperimentConfig) -> str:
+    """
+    Stable hash of an experiment configuration (including its seed).
+    
+    Used as the key of SweepStore records, so a rerun of the same sweep
+    recognises configurations it has already completed.
+    """
+    payload = json.dumps(asdict(config), sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def result_to_dict(
+    result: ExperimentResult,
+    save_history: bool = True
+) -> Dict:
+    """
+    Convert ExperimentResult to a JSON-serialisable dict.
+    
+    Parameters
+    ----------
+    result : ExperimentResult
+        Result to convert
+    save_history : bool
+        If True, include full history
+    """
+    data = {
+        'config': asdict(result.config),
+        'r4_detected': bool(result.r4_detected),
+        't_transition': None if result.t_transition is None else int(result.t_transition),
+        'r4_fraction': float(result.r4_fraction),
+        'mean_tau_r4': float(result.mean_tau_r4),
+        'n_r4_regions': int(result.n_r4_regions),
+        'final_sigma': float(result.final_sigma),
+        'final_alpha': float(result.final_alpha)
+    }
+    
+    if save_history:
+        data['history'] = [
+            {name: (value if isinstance(value, str) else
+                    int(value) if name == 't' else float(value))
+             for name, value in entry.items()}
+            for entry in result.history
+        ]
+    
+    return data
+
+
+def result_from_dict(data: Dict) -> ExperimentResult:
+    """
+    Rebuild ExperimentResult from result_to_dict() output.
+    
+    Records saved without history get an empty history list.
+    """
+    fields = dict(data)
+    config = ExperimentConfig(**fields.pop('config'))
+    fields.setdefault('history', [])
+    return ExperimentResult(config=config, **fields)
+
+
+class SweepStore:
+    """
+    Append-only JSONL store of sweep results keyed by config_key().
+    
+    One line per finished run: {"key": ..., "result": result_to_dict(...)}.
+    Every line is flushed as soon as the run completes (parameter_sweep
+    stores each run as its worker task returns; with the default
+    chunk_size=1 that is per run), so an interrupted sweep loses at most
+    the runs in flight; a partially written last line is discarded on load.
+    
+    Usage
+    -----
+    >>> store = SweepStore('sweep.jsonl')
+    >>> results = parameter_sweep(grid, store_path='sweep.jsonl')  # resumes
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) store.
+        
+        Parameters
+        ----------
+        path : str
+            JSONL file path
+        """
+        self.path = Path(path)
+        self.records = self._load()
+    
+    def _load(self) -> Dict[str, Dict]:
+        """Read existing records, dropping an incomplete trailing line."""
+        records = {}
+        if not self.path.exists():
+            return records
+        
+        raw = self.path.read_bytes()
+        complete = raw[:raw.rfind(b'\n') + 1]
+        if len(complete) != len(raw):
+            # Interrupted mid-write: cut the partial record
+            with open(self.path, 'r+b') as f:
+                f.truncate(len(complete))
+        
+        for line in complete.decode('utf-8').splitlines():
+            if line.strip():
+                record = json.loads(line)
+                records[record['key']] = record['result']
+        return records
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.records
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def get(self, key: str) -> ExperimentResult:
+        """Load stored result for key."""
+        return result_from_dict(self.records[key])
+    
+    def append(self, key: str, data: Dict):
+        """
+        Persist one result (already converted with result_to_dict).
+        """
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'key': key, 'result': data}) + '\n')
+            f.flush()
+        self.records[key] = data
+
+
+def _run_config_chunk(
+    configs: List[ExperimentConfig],
+    save_history: bool
+) -> List[Tuple[Optional[Dict], Optional[str]]]:
+    """
+    Worker entry point: run a chunk of configs.
+    
+    Returns one (serialised result, None) or (None, traceback) per config,
+    so one failing run does not discard the rest of its chunk.
+    """
+    out = []
+    for config in configs:
+        try:
+            result = run_single_experiment(config)
+            out.append((result_to_dict(result, save_history=save_history), None))
+        except Exception:
+            out.append((None, traceback.format_exc()))
+    return out
+
+
 def parameter_sweep(
     param_grid: Dict[str, List],
     base_config: Optional[ExperimentConfig] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    n_workers: int = 1,
+    store_path: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    save_history: bool = True
 ) -> List[ExperimentResult]:
     """
     Run parameter sweep over grid.
     
+    Each combination i runs with seed=i and its own np.random.Generator,
+    so the results do not depend on n_workers, chunking or on which runs
+    were restored from the store: a parallel or resumed sweep is
+    bit-identical to a serial one.
+    
     Parameters
     ----------
     param_grid : dict
@@ -241,11 +547,29 @@ def parameter_sweep(
         Base configuration (defaults overridden by grid)
     verbose : bool
         Print progress
+    n_workers : int
+        Number of worker processes (1 = serial, in-process)
+    store_path : str, optional
+        JSONL result store (see SweepStore). Completed configurations are
+        loaded instead of rerun, and new ones are appended as they finish.
+    chunk_size : int, optional
+        Configurations per worker task (default 1: every run is stored as
+        soon as it finishes). Larger chunks save IPC for very short runs,
+        but results are then stored per chunk, and an interrupt loses up
+        to one chunk per worker.
+    save_history : bool
+        Keep full per-step history in results and store
         
     Returns
     -------
     results : list of ExperimentResult
-        Results for all parameter combinations
+        Results for all parameter combinations (grid order)
+        
+    Raises
+    ------
+    RuntimeError
+        If any run failed. All other runs are finished and stored first,
+        so rerunning with the same store_path retries only the failures.
         
     Examples
     --------
@@ -272,7 +596,7 @@ def parameter_sweep(
         print(f"Total combinations: {len(combinations)}")
         print(f"{'='*70}\n")
     
-    results = []
+    configs = []
     
     for i, combo in enumerate(combinations):
         # Create config for this combination
@@ -281,14 +605,78 @@ def parameter_sweep(
             config_dict[name] = value
         config_dict['seed'] = i  # Different seed for each run
         
-        config = ExperimentConfig(**config_dict)
-        
-        # Run experiment
-        if verbose:
-            print(f"[{i+1}/{len(combinations)}] ", end='')
+        configs.append(ExperimentConfig(**config_dict))
+    
+    keys = [config_key(config) for config in configs]
+    store = SweepStore(store_path) if store_path is not None else None
+    
+    results: List[Optional[ExperimentResult]] = [None] * len(configs)
+    pending = []
+    for i, key in enumerate(keys):
+        if store is not None and key in store:
+            results[i] = store.get(key)
+        else:
+            pending.append(i)
+    
+    if verbose and store is not None:
+        print(f"Restored from store: {len(configs) - len(pending)}, "
+              f"remaining: {len(pending)}\n")
+    
+    failures: Dict[int, str] = {}
+    
+    def finish(i: int, data: Optional[Dict], error: Optional[str] = None):
+        if error is not None:
+            failures[i] = error
+            if verbose:
+                print(f"[{i+1}/{len(configs)}] FAILED: {error.strip().splitlines()[-1]}")
+            return
+        if store is not None:
+            store.append(keys[i], data)
+        results[i] = result_from_dict(data)
+    
+    if n_workers <= 1:
+        for i in pending:
+            # Run experiment
+            if verbose:
+                print(f"[{i+1}/{len(combinations)}] ", end='')
+            
+            try:
+                result = run_single_experiment(configs[i], verbose=verbose)
+            except Exception:
+                finish(i, None, traceback.format_exc())
+                continue
+            finish(i, result_to_dict(result, save_history=save_history))
+    elif pending:
+        chunk_size = chunk_size or 1
+        chunks = [pending[c:c + chunk_size] for c in range(0, len(pending), chunk_size)]
         
-        result = run_single_experiment(config, verbose=verbose)
-        results.append(result)
+        n_done = len(configs) - len(pending)
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = {
+                pool.submit(_run_config_chunk, [configs[i] for i in chunk], save_history): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    outcomes = future.result()
+                except Exception:
+                    # worker died (e.g. BrokenProcessPool): the whole chunk failed
+                    outcomes = [(None, traceback.format_exc())] * len(chunk)
+                for i, (data, error) in zip(chunk, outcomes):
+                    finish(i, data, error)
+                n_done += len(chunk)
+                if verbose:
+                    print(f"[{n_done}/{len(configs)}] chunk of {len(chunk)} done")
+    
+    if failures:
+        first = min(failures)
+        raise RuntimeError(
+            f"{len(failures)} of {len(configs)} sweep runs failed "
+            f"(grid indices {sorted(failures)}); the others are complete"
+            + (" and stored" if store is not None else "")
+            + f". First failure (index {first}):\n{failures[first]}"
+        )
     
     # Summary
     if verbose:
@@ -401,24 +789,7 @@ def save_results(
     save_history : bool
         If True, include full history (large files)
     """
-    output = []
-    
-    for result in results:
-        data = {
-            'config': asdict(result.config),
-            'r4_detected': result.r4_detected,
-            't_transition': result.t_transition,
-            'r4_fraction': result.r4_fraction,
-            'mean_tau_r4': result.mean_tau_r4,
-            'n_r4_regions': result.n_r4_regions,
-            'final_sigma': result.final_sigma,
-            'final_alpha': result.final_alpha
-        }
-        
-        if save_history:
-            data['history'] = result.history
-        
-        output.append(data)
+    output = [result_to_dict(result, save_history=save_history) for result in results]
     
     with open(filename, 'w') as f:
         json.dump(output, f, indent=2)
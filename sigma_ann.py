@@ -0,0 +1,162 @@
+"""Approximate nearest-neighbour index for σ-Storage (IVF-flat, pure NumPy).
+
+Inverted-file index over unit-normalised embeddings: a spherical k-means
+splits the memories into n_lists cells; a query scores only the members of
+its n_probe closest cells. n_probe is the recall/latency knob (n_probe ==
+n_lists is an exact scan). The index stores slot ids only - the vectors
+stay in SigmaStorage's embedding matrix.
+"""
+
+from typing import Optional
+import numpy as np
+
+
+class IVFFlatIndex:
+    """Inverted-file (IVF-flat) cosine index over storage slots."""
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        min_train: int = 1024,
+        rebuild_factor: float = 4.0,
+        n_iter: int = 10,
+        train_sample: int = 65536,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            n_lists: Number of cells (None = ~4*sqrt(n) at build time)
+            n_probe: Cells scanned per query (higher = better recall, slower)
+            min_train: Memories required before the index is built;
+                below this the storage scans exactly
+            rebuild_factor: Retrain once the storage grows by this factor
+                since the last build (centroids follow the data)
+            n_iter: Spherical k-means iterations
+            train_sample: Maximum vectors used to fit centroids
+            seed: Seed for centroid initialisation / sampling
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train = min_train
+        self.rebuild_factor = rebuild_factor
+        self.n_iter = n_iter
+        self.train_sample = train_sample
+        self.seed = seed
+
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self._members = []
+        self._sizes = np.zeros(0, dtype=np.int64)
+        self._list_of = np.zeros(0, dtype=np.int64)   # slot -> cell (-1 = none)
+        self._pos = np.zeros(0, dtype=np.int64)       # slot -> position in cell
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def needs_build(self, n_items: int) -> bool:
+        """True when the index should be (re)built for n_items memories."""
+        if n_items < self.min_train:
+            return False
+        if not self.is_trained:
+            return True
+        return n_items >= self.rebuild_factor * self.trained_size
+
+    def build(self, vectors: np.ndarray, slots: np.ndarray) -> None:
+        """Fit centroids on vectors and assign every slot."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        slots = np.asarray(slots, dtype=np.int64)
+        n = len(vectors)
+        n_lists = self.n_lists or max(1, int(4 * np.sqrt(n)))
+        n_lists = min(n_lists, n)
+
+        rng = np.random.default_rng(self.seed)
+        sample = vectors
+        if n > self.train_sample:
+            sample = vectors[rng.choice(n, self.train_sample, replace=False)]
+        self.centroids = self._spherical_kmeans(sample, n_lists, rng)
+
+        labels = self._nearest_cells(vectors)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(n_lists + 1))
+
+        size = int(slots.max()) + 1 if n else 0
+        self._list_of = np.full(size, -1, dtype=np.int64)
+        self._pos = np.zeros(size, dtype=np.int64)
+        self._members = []
+        self._sizes = np.diff(bounds).astype(np.int64)
+        for cell in range(n_lists):
+            members = slots[order[bounds[cell]:bounds[cell + 1]]]
+            self._members.append(np.concatenate([members, np.empty(max(4, len(members)), dtype=np.int64)]))
+            self._list_of[members] = cell
+            self._pos[members] = np.arange(len(members))
+        self.trained_size = n
+
+    def add(self, slot: int, vector: np.ndarray) -> None:
+        """Insert one slot into its nearest cell."""
+        cell = int(np.argmax(self.centroids @ np.asarray(vector, dtype=np.float32)))
+        if slot >= len(self._list_of):
+            grow = max(2 * len(self._list_of), slot + 1) - len(self._list_of)
+            self._list_of = np.concatenate([self._list_of, np.full(grow, -1, dtype=np.int64)])
+            self._pos = np.concatenate([self._pos, np.zeros(grow, dtype=np.int64)])
+
+        members = self._members[cell]
+        size = self._sizes[cell]
+        if size == len(members):
+            members = np.concatenate([members, np.empty(len(members), dtype=np.int64)])
+            self._members[cell] = members
+        members[size] = slot
+        self._sizes[cell] = size + 1
+        self._list_of[slot] = cell
+        self._pos[slot] = size
+
+    def remove(self, slot: int) -> None:
+        """Drop a slot (swap-with-last inside its cell)."""
+        if slot >= len(self._list_of) or self._list_of[slot] < 0:
+            return
+        cell = self._list_of[slot]
+        pos = self._pos[slot]
+        last = self._sizes[cell] - 1
+        members = self._members[cell]
+        moved = members[last]
+        members[pos] = moved
+        self._pos[moved] = pos
+        self._sizes[cell] = last
+        self._list_of[slot] = -1
+
+    def candidates(self, query: np.ndarray, n_probe: Optional[int] = None) -> np.ndarray:
+        """Slots in the n_probe cells closest to the (unit) query."""
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        scores = self.centroids @ np.asarray(query, dtype=np.float32)
+        if n_probe < len(scores):
+            cells = np.argpartition(-scores, n_probe - 1)[:n_probe]
+        else:
+            cells = np.arange(len(scores))
+        return np.concatenate([self._members[c][:self._sizes[c]] for c in cells])
+
+    def _nearest_cells(self, vectors: np.ndarray, block: int = 65536) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), block):
+            labels[start:start + block] = np.argmax(
+                vectors[start:start + block] @ self.centroids.T, axis=1
+            )
+        return labels
+
+    def _spherical_kmeans(
+        self, X: np.ndarray, n_lists: int, rng: np.random.Generator
+    ) -> np.ndarray:
+        centroids = X[rng.choice(len(X), n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            self.centroids = centroids
+            labels = self._nearest_cells(X)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, X)
+            counts = np.bincount(labels, minlength=n_lists)
+            empty = counts == 0
+            if np.any(empty):
+                # Re-seed empty cells from random points
+                sums[empty] = X[rng.choice(len(X), int(empty.sum()), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = (sums / np.maximum(norms, 1e-12)).astype(np.float32)
+        return centroids
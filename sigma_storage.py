@@ -1,7 +1,19 @@
-"""σ-Storage - External memory with local σ-coherence."""
+"""σ-Storage - External memory with local σ-coherence.
 
+Embeddings live in one preallocated float32 matrix of unit-normalised rows
+(grown geometrically), so retrieval is a single matrix-vector product plus
+argpartition instead of a Python loop over MemoryItem objects. The rolling
+σ-window is kept as a running sum of unit vectors. Optional capacity with
+'fifo' or 'lowest_sigma' eviction; save()/open() persist to a .npy matrix
+(reopened memory-mapped) plus a JSON metadata sidecar. An optional ANN
+index (sigma_ann.IVFFlatIndex) restricts retrieval to candidate cells.
+"""
+
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, List, Dict
+from pathlib import Path
+from typing import Any, List, Dict, Optional, Union
+import json
 import time
 import numpy as np
 
@@ -15,57 +27,363 @@ class MemoryItem:
     sigma: float
 
 
+EVICTION_POLICIES = ("fifo", "lowest_sigma")
+
+
 class SigmaStorage:
     """External memory storage with σ-coherence tracking."""
 
-    def __init__(self):
-        self.memories: List[MemoryItem] = []
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        eviction: str = "fifo",
+        sigma_window: int = 10,
+        initial_slots: int = 64,
+        index: Optional[Any] = None,
+    ):
+        """
+        Args:
+            capacity: Maximum number of memories (None = unbounded)
+            eviction: 'fifo' (oldest first) or 'lowest_sigma', used when full
+            sigma_window: Number of recent memories for local σ
+            initial_slots: Initial rows of the embedding matrix
+            index: Optional ANN index, e.g. sigma_ann.IVFFlatIndex (exact
+                scan until the index has enough memories to build)
+        """
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"eviction must be one of {EVICTION_POLICIES}, got {eviction!r}")
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+
+        self.capacity = capacity
+        self.eviction = eviction
+        self.sigma_window = sigma_window
+        self.index = index
+        self._initial_slots = max(1, initial_slots)
+
+        self.dim: Optional[int] = None
+        self._emb: Optional[np.ndarray] = None    # (slots, dim) float32, unit rows
+        self._norms = np.zeros(0)                 # raw embedding norms
+        self._sigma = np.zeros(0)
+        self._seq = np.zeros(0, dtype=np.int64)   # insertion order, -1 = free
+        self._items: List[Optional[MemoryItem]] = []
+        self._meta: List[Dict[str, Any]] = []     # reopened slots only
+        self._timestamps: List[float] = []
+        self._free: List[int] = []
+        self._n_slots_used = 0
+        self._next_seq = 0
+        self._count = 0
+
+        self._order: deque = deque()              # slots, oldest first (bounded fifo only)
+        self._recent: deque = deque()             # slots in the σ-window
+        self._recent_sum: Optional[np.ndarray] = None
+        self._updates_since_refresh = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def memories(self) -> List[MemoryItem]:
+        """All memories in insertion order"""
+        slots = self._live_slots()
+        return [self._item(s) for s in slots[np.argsort(self._seq[slots], kind="stable")]]
 
     def store(self, embedding: np.ndarray, metadata: Dict[str, Any]) -> None:
         """Store new memory with computed local σ"""
-        sigma_val = self._compute_local_sigma(embedding)
-        item = MemoryItem(
-            embedding=embedding.astype(float),
+        v = np.asarray(embedding, dtype=float).ravel()
+        if self.dim is None:
+            self._allocate(v.shape[0])
+        elif v.shape[0] != self.dim:
+            raise ValueError(f"Embedding dim {v.shape[0]} != storage dim {self.dim}")
+
+        norm = float(np.linalg.norm(v))
+        unit = v / (norm + 1e-8)
+        sigma_val = self._compute_local_sigma(unit)
+
+        if self.capacity is not None and self._count >= self.capacity:
+            self._evict()
+
+        slot = self._take_slot()
+        self._emb[slot] = unit
+        self._norms[slot] = norm
+        self._sigma[slot] = sigma_val
+        self._seq[slot] = self._next_seq
+        self._next_seq += 1
+        self._items[slot] = MemoryItem(
+            embedding=v,
             metadata=metadata,
             timestamp=time.time(),
             sigma=float(sigma_val),
         )
-        self.memories.append(item)
+        self._count += 1
+        if self._tracks_order:
+            self._order.append(slot)
+        self._push_recent(slot)
+        self._index_slot(slot)
 
     def retrieve_by_embedding(
-        self, query_embedding: np.ndarray, k: int = 5
+        self, query_embedding: np.ndarray, k: int = 5, exact: bool = False
     ) -> List[MemoryItem]:
-        """Retrieve k most similar memories (cosine similarity)"""
-        if not self.memories:
+        """Retrieve k most similar memories (cosine similarity)
+
+        Uses the ANN index when one is attached and built, unless exact=True.
+        """
+        if self._count == 0 or k <= 0:
             return []
+        k = min(k, self._count)
+        q = np.asarray(query_embedding, dtype=float).ravel()
+        q = (q / (np.linalg.norm(q) + 1e-8)).astype(np.float32)
+
+        if not exact and self.index is not None and self.index.is_trained:
+            slots = self.index.candidates(q)
+            if len(slots) >= k:
+                return [self._item(s) for s in self._top_k(slots, self._emb[slots] @ q, k)]
+
+        n = self._n_slots_used
+        sims = self._emb[:n] @ q
+        if self._free:
+            sims[self._seq[:n] < 0] = -np.inf
+        return [self._item(s) for s in self._top_k(np.arange(n), sims, k)]
 
-        sims = []
-        q = query_embedding.astype(float)
-        q_norm = np.linalg.norm(q) + 1e-8
+    def benchmark_recall(
+        self, queries: np.ndarray, k: int = 5
+    ) -> Dict[str, float]:
+        """
+        Compare ANN retrieval with the exact scan on a batch of queries.
 
-        for idx, m in enumerate(self.memories):
-            denom = q_norm * (np.linalg.norm(m.embedding) + 1e-8)
-            sim = float(np.dot(q, m.embedding) / denom) if denom > 0 else 0.0
-            sims.append((sim, idx))
+        Returns:
+            recall: mean |ANN top-k ∩ exact top-k| / k
+            exact_ms, ann_ms: mean latency per query (milliseconds)
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=float))
+        hits = 0
+        exact_s = ann_s = 0.0
+        for q in queries:
+            t0 = time.perf_counter()
+            truth = self.retrieve_by_embedding(q, k, exact=True)
+            t1 = time.perf_counter()
+            approx = self.retrieve_by_embedding(q, k)
+            t2 = time.perf_counter()
+            exact_s += t1 - t0
+            ann_s += t2 - t1
+            hits += len({id(m) for m in truth} & {id(m) for m in approx})
 
-        sims.sort(key=lambda x: x[0], reverse=True)
-        return [self.memories[idx] for _, idx in sims[:k]]
+        n_queries = max(len(queries), 1)
+        return {
+            "recall": hits / (n_queries * max(min(k, self._count), 1)),
+            "exact_ms": 1e3 * exact_s / n_queries,
+            "ann_ms": 1e3 * ann_s / n_queries,
+        }
 
     def recent(self, k: int = 3) -> List[MemoryItem]:
         """Return k most recent memories"""
-        return self.memories[-k:] if k > 0 else []
+        if k <= 0:
+            return []
+        slots = self._live_slots()
+        newest = slots[np.argsort(self._seq[slots], kind="stable")][-k:]
+        return [self._item(s) for s in newest]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save to '<path>.npy' (unit embeddings, float32) and
+        '<path>.json' (metadata sidecar). Metadata must be JSON-serialisable.
+        """
+        path = Path(path)
+        slots = self._live_slots()
+        slots = slots[np.argsort(self._seq[slots], kind="stable")]
+        matrix = (self._emb[slots] if self._emb is not None
+                  else np.zeros((0, 0), dtype=np.float32))
+        np.save(path.with_suffix(".npy"), np.ascontiguousarray(matrix))
+
+        sidecar = {
+            "dim": self.dim,
+            "capacity": self.capacity,
+            "eviction": self.eviction,
+            "sigma_window": self.sigma_window,
+            "items": [
+                {
+                    "norm": float(self._norms[s]),
+                    "sigma": float(self._sigma[s]),
+                    "timestamp": self._item(s).timestamp,
+                    "metadata": self._item(s).metadata,
+                }
+                for s in slots
+            ],
+        }
+        with open(path.with_suffix(".json"), "w") as f:
+            json.dump(sidecar, f)
+
+    @classmethod
+    def open(
+        cls,
+        path: Union[str, Path],
+        mmap: bool = True,
+        index: Optional[Any] = None,
+    ) -> "SigmaStorage":
+        """
+        Reopen a saved storage. With mmap=True the embedding matrix stays
+        memory-mapped (read-only) until the first store() copies it to RAM.
+        Reopened MemoryItem embeddings are rebuilt from the float32 rows.
+        An ANN index, if given, is rebuilt from the reopened matrix.
+        """
+        path = Path(path)
+        with open(path.with_suffix(".json")) as f:
+            sidecar = json.load(f)
+        matrix = np.load(path.with_suffix(".npy"), mmap_mode="r" if mmap else None)
 
-    def _compute_local_sigma(self, embedding: np.ndarray, window: int = 10) -> float:
+        storage = cls(
+            capacity=sidecar["capacity"],
+            eviction=sidecar["eviction"],
+            sigma_window=sidecar["sigma_window"],
+            index=index,
+        )
+        records = sidecar["items"]
+        n = len(records)
+        if sidecar["dim"] is None:
+            return storage
+
+        storage.dim = sidecar["dim"]
+        storage._emb = matrix
+        storage._norms = np.array([r["norm"] for r in records], dtype=float)
+        storage._sigma = np.array([r["sigma"] for r in records], dtype=float)
+        storage._seq = np.arange(n, dtype=np.int64)
+        storage._items = [None] * n
+        storage._meta = [r["metadata"] for r in records]
+        storage._timestamps = [r["timestamp"] for r in records]
+        storage._n_slots_used = n
+        storage._next_seq = n
+        storage._count = n
+        if storage._tracks_order:
+            storage._order = deque(range(n))
+        for slot in range(max(0, n - storage.sigma_window), n):
+            storage._push_recent(slot)
+        if index is not None and index.needs_build(n):
+            index.build(matrix, np.arange(n))
+        return storage
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @property
+    def _tracks_order(self) -> bool:
+        # only fifo eviction pops _order; elsewhere it would grow without bound
+        return self.capacity is not None and self.eviction == "fifo"
+
+    def _allocate(self, dim: int) -> None:
+        self.dim = dim
+        slots = self._initial_slots
+        if self.capacity is not None:
+            slots = min(slots, self.capacity)
+        self._emb = np.zeros((slots, dim), dtype=np.float32)
+        self._norms = np.zeros(slots)
+        self._sigma = np.zeros(slots)
+        self._seq = np.full(slots, -1, dtype=np.int64)
+        self._items = [None] * slots
+        self._recent_sum = np.zeros(dim)
+
+    def _grow(self) -> None:
+        """Double the slot arrays (also detaches a memory-mapped matrix)."""
+        old = self._emb.shape[0]
+        new = max(2 * old, 1)
+        if self.capacity is not None:
+            new = min(new, self.capacity)
+
+        emb = np.zeros((new, self.dim), dtype=np.float32)
+        emb[:old] = self._emb
+        self._emb = emb
+        self._norms = np.concatenate([self._norms, np.zeros(new - old)])
+        self._sigma = np.concatenate([self._sigma, np.zeros(new - old)])
+        self._seq = np.concatenate([self._seq, np.full(new - old, -1, dtype=np.int64)])
+        self._items.extend([None] * (new - old))
+
+    def _take_slot(self) -> int:
+        if self._free:
+            self._detach_mmap()
+            return self._free.pop()
+        if self._n_slots_used >= self._emb.shape[0]:
+            self._grow()
+        self._detach_mmap()
+        slot = self._n_slots_used
+        self._n_slots_used += 1
+        return slot
+
+    def _detach_mmap(self) -> None:
+        if isinstance(self._emb, np.memmap) or not self._emb.flags.writeable:
+            self._emb = np.array(self._emb, dtype=np.float32)
+
+    def _evict(self) -> None:
+        if self.eviction == "fifo":
+            while self._seq[self._order[0]] < 0:
+                self._order.popleft()
+            slot = self._order.popleft()
+        else:
+            n = self._n_slots_used
+            sigma = np.where(self._seq[:n] >= 0, self._sigma[:n], np.inf)
+            slot = int(np.argmin(sigma))
+
+        if slot in self._recent:
+            self._recent.remove(slot)
+            self._recent_sum -= self._emb[slot]
+        if self.index is not None and self.index.is_trained:
+            self.index.remove(slot)
+        self._seq[slot] = -1
+        self._items[slot] = None
+        self._free.append(slot)
+        self._count -= 1
+
+    def _push_recent(self, slot: int) -> None:
+        if self._recent_sum is None:
+            self._recent_sum = np.zeros(self.dim)
+        self._recent.append(slot)
+        self._recent_sum += self._emb[slot]
+        if len(self._recent) > self.sigma_window:
+            self._recent_sum -= self._emb[self._recent.popleft()]
+
+        # Bound float drift of the running sum
+        self._updates_since_refresh += 1
+        if self._updates_since_refresh >= 1000:
+            self._recent_sum = self._emb[list(self._recent)].sum(axis=0, dtype=float)
+            self._updates_since_refresh = 0
+
+    def _index_slot(self, slot: int) -> None:
+        if self.index is None:
+            return
+        if self.index.needs_build(self._count):
+            live = self._live_slots()
+            self.index.build(self._emb[live], live)
+        elif self.index.is_trained:
+            self.index.add(slot, self._emb[slot])
+
+    def _top_k(self, slots: np.ndarray, sims: np.ndarray, k: int) -> np.ndarray:
+        """k best slots by similarity; ties keep insertion order"""
+        if k < len(slots):
+            part = np.argpartition(-sims, k - 1)[:k]
+            slots, sims = slots[part], sims[part]
+        return slots[np.lexsort((self._seq[slots], -sims))][:k]
+
+    def _live_slots(self) -> np.ndarray:
+        return np.flatnonzero(self._seq[:self._n_slots_used] >= 0)
+
+    def _item(self, slot: int) -> MemoryItem:
+        item = self._items[slot]
+        if item is None:
+            # Reopened from disk: rebuild lazily from the stored row
+            item = MemoryItem(
+                embedding=self._emb[slot].astype(float) * (self._norms[slot] + 1e-8),
+                metadata=self._meta[slot],
+                timestamp=self._timestamps[slot],
+                sigma=float(self._sigma[slot]),
+            )
+            self._items[slot] = item
+        return item
+
+    def _compute_local_sigma(self, unit: np.ndarray) -> float:
         """Compute local coherence (avg cosine similarity to recent)"""
-        if not self.memories:
+        if not self._recent:
             return 0.5
-
-        recent = self.memories[-window:]
-        v = embedding.astype(float)
-        v_norm = np.linalg.norm(v) + 1e-8
-        sims = []
-        for m in recent:
-            denom = v_norm * (np.linalg.norm(m.embedding) + 1e-8)
-            sim = float(np.dot(v, m.embedding) / denom) if denom > 0 else 0.0
-            sims.append(sim)
-        return float(np.mean(sims))
+        return float(np.dot(unit, self._recent_sum) / len(self._recent))
@@ -0,0 +1,220 @@
+"""
+STREAMING TF-IDF - HASHED FEATURES, ONLINE IDF, SPARSE VECTORS
+==============================================================
+
+Drop-in EmbeddingBackend for campaign3 that never refits:
+
+    features   char n-grams (3-5) and word n-grams (1-2), hashed into
+               n_features columns each (sklearn HashingVectorizer), so there
+               is no vocabulary to learn
+    IDF        document frequencies are counted online over every distinct
+               text seen (partial_fit / encode), idf = ln((1+n)/(1+df)) + 1
+    vectors    sublinear tf × idf, each block L2-normalised, concatenated
+               and normalised again (as TFIDFBackend), returned as
+               scipy.sparse CSR rows of width 2·n_features
+
+Only the document frequencies are state. save/load write them (non-zero
+entries only) with np.savez_compressed, no pickle.
+
+The helpers at the bottom (similarities, dot, vector_std, row_values) take
+dense 1-D arrays or sparse rows alike.
+
+Author: Cognitive Lagoon Project
+Date: 2025-11-18
+Version: 1.0
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from embedding_cache import text_key, KEY_BYTES
+
+
+class HashingTFIDFBackend:
+    """
+    Streaming TF-IDF embedding backend (hashed char + word n-grams)
+
+    Parameters
+    ----------
+    n_features : int
+        Hash buckets per analyzer (vectors have 2·n_features columns)
+    char_ngram_range, word_ngram_range : tuple
+        n-gram ranges of the char and word analyzers
+    cache_folder : str
+        Folder for save / load
+    online : bool
+        If True, encode() adds unseen texts to the document frequencies
+        before transforming them (no separate fit needed)
+    """
+
+    def __init__(
+        self,
+        n_features: int = 2**18,
+        char_ngram_range: Tuple[int, int] = (3, 5),
+        word_ngram_range: Tuple[int, int] = (1, 2),
+        cache_folder: str = "/tmp/agi_embeddings",
+        online: bool = True
+    ):
+        self.n_features = n_features
+        self.char_ngram_range = tuple(char_ngram_range)
+        self.word_ngram_range = tuple(word_ngram_range)
+        self.cache_folder = cache_folder
+        self.online = online
+        os.makedirs(cache_folder, exist_ok=True)
+
+        common = dict(n_features=n_features, alternate_sign=False, norm=None)
+        self.char_vectorizer = HashingVectorizer(analyzer='char', ngram_range=self.char_ngram_range, **common)
+        self.word_vectorizer = HashingVectorizer(analyzer='word', ngram_range=self.word_ngram_range,
+                                                 token_pattern=r'\b\w+\b', **common)
+        self._reset()
+
+    def _reset(self) -> None:
+        self.df = np.zeros(2 * self.n_features, dtype=np.int64)
+        self.n_docs = 0
+        self.seen = set()
+
+    @property
+    def dim(self) -> int:
+        return 2 * self.n_features
+
+    @property
+    def fitted(self) -> bool:
+        return self.n_docs > 0
+
+    # ------------------------------------------------------------------ IDF
+
+    def _counts(self, texts: Sequence[str]) -> Tuple[sp.csr_matrix, sp.csr_matrix]:
+        return self.char_vectorizer.transform(texts), self.word_vectorizer.transform(texts)
+
+    def partial_fit(self, texts: Sequence[str]) -> None:
+        """Add the distinct, not yet seen texts to the document frequencies"""
+        new = {}
+        for text in texts:
+            key = text_key(text)
+            if key not in self.seen:
+                new.setdefault(key, text)
+        if not new:
+            return
+        char, word = self._counts(list(new.values()))
+        for counts, offset in ((char, 0), (word, self.n_features)):
+            # O(nnz) update; a row holds each column at most once
+            columns, n = np.unique(counts.indices, return_counts=True)
+            self.df[offset + columns] += n
+        self.n_docs += len(new)
+        self.seen.update(new)
+
+    def fit(self, corpus: List[str]) -> None:
+        """Reset the document frequencies and count them on corpus"""
+        if len(corpus) == 0:
+            raise ValueError("Cannot fit on empty corpus")
+        self._reset()
+        self.partial_fit(corpus)
+
+    def _weight(self, counts: sp.csr_matrix, offset: int) -> sp.csr_matrix:
+        # sublinear tf × smooth idf on the stored entries, then row L2
+        X = counts.astype(np.float64)
+        df = self.df[offset + X.indices]
+        X.data = (1 + np.log(X.data)) * (np.log((1 + self.n_docs) / (1 + df)) + 1)
+        return normalize(X, norm='l2', copy=False)
+
+    # ------------------------------------------------------------------ encode
+
+    def transform(self, texts: Sequence[str]) -> sp.csr_matrix:
+        """TF-IDF rows for texts under the current IDF, shape (n, dim)"""
+        char, word = self._counts(texts)
+        combined = sp.hstack([self._weight(char, 0), self._weight(word, self.n_features)], format='csr')
+        return normalize(combined, norm='l2', copy=False)
+
+    def encode(self, texts: List[str]) -> sp.csr_matrix:
+        """Encode multiple texts (sparse CSR, one row per text)"""
+        if self.online:
+            self.partial_fit(texts)
+        return self.transform(texts)
+
+    def encode_single(self, text: str) -> sp.csr_matrix:
+        """Encode single text (1 × dim sparse row)"""
+        return self.encode([text])
+
+    def encode_with_role_weights(
+        self,
+        text: str,
+        role: str = "user",
+        weights: Optional[Dict[str, float]] = None
+    ) -> sp.csr_matrix:
+        """Encode text scaled by its role weight (system 1.5, user 1.0, assistant 0.5)"""
+        if weights is None:
+            weights = {'system': 1.5, 'user': 1.0, 'assistant': 0.5}
+        return self.encode_single(text) * weights.get(role, 1.0)
+
+    # ------------------------------------------------------------------ state
+
+    def save(self, path: str) -> None:
+        """Save configuration and document frequencies (npz, no pickle)"""
+        config = {
+            'n_features': self.n_features,
+            'char_ngram_range': self.char_ngram_range,
+            'word_ngram_range': self.word_ngram_range,
+            'n_docs': self.n_docs,
+        }
+        nz = np.flatnonzero(self.df)
+        seen = np.frombuffer(b''.join(sorted(self.seen)), dtype=np.uint8).reshape(-1, KEY_BYTES)
+        with open(os.path.join(self.cache_folder, path), 'wb') as f:
+            np.savez_compressed(f, config=np.array(json.dumps(config)),
+                                df_index=nz, df_count=self.df[nz], seen=seen)
+
+    def load(self, path: str) -> None:
+        """Load a state written by save()"""
+        with np.load(os.path.join(self.cache_folder, path), allow_pickle=False) as data:
+            config = json.loads(str(data['config']))
+            if (config['n_features'], tuple(config['char_ngram_range']), tuple(config['word_ngram_range'])) != \
+                    (self.n_features, self.char_ngram_range, self.word_ngram_range):
+                raise ValueError(f"{path} was saved with a different hashing configuration: {config}")
+            self._reset()
+            self.df[data['df_index']] = data['df_count']
+            self.n_docs = config['n_docs']
+            self.seen = {row.tobytes() for row in data['seen']}
+
+
+# ============================================================================
+# DENSE / SPARSE VECTOR HELPERS
+# ============================================================================
+
+def stack_rows(rows) -> np.ndarray:
+    """Stack 1-D arrays or 1 × d sparse rows into one (n, d) matrix"""
+    if not any(sp.issparse(r) for r in rows):
+        return np.vstack(rows)
+    return sp.vstack([r if sp.issparse(r) else sp.csr_matrix(np.atleast_2d(r)) for r in rows], format='csr')
+
+
+def similarities(query, rows) -> np.ndarray:
+    """Dot products of query with every row, shape (n,)"""
+    if isinstance(rows, (list, tuple)):
+        rows = stack_rows(rows)
+    s = rows @ (query.T if sp.issparse(query) else np.ravel(query))
+    s = s.toarray() if sp.issparse(s) else np.asarray(s)
+    return s.ravel().astype(float)
+
+
+def dot(a, b) -> float:
+    return float(similarities(a, [b])[0])
+
+
+def row_values(x) -> np.ndarray:
+    """Stored entries of a vector (all entries if dense)"""
+    return x.tocsr().data if sp.issparse(x) else np.ravel(x)
+
+
+def vector_std(x) -> float:
+    """np.std over all entries, without densifying sparse rows"""
+    if not sp.issparse(x):
+        return float(np.std(x))
+    n = np.prod(x.shape)
+    values = row_values(x)
+    mean = values.sum() / n
+    return float(np.sqrt(max((values**2).sum() / n - mean**2, 0.0)))
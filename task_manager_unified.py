@@ -20,6 +20,8 @@ class LLMClient:
         raise NotImplementedError
     def embed(self, text: str) -> np.ndarray:
         raise NotImplementedError
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        return np.vstack([self.embed(t) for t in texts])
 
 
 class DummyLLM(LLMClient):
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE β_H MONTE CARLO ENGINE (adaptonic_beta_H_monte_carlo.py)
+======================================================================
+
+1. Shared pieces (N_eff, β₀, boundary amplification, ξ_T) keep their values
+2. Parameters pinned at nominal: MC spread = first-order δβ_H_total
+3. Sobol indices of the pinned model match the analytic variance split
+4. Process pool gives the same bands / indices as the serial run
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import numpy as np
+
+import adaptonic_beta_H_monte_carlo as mc
+from adaptonic_beta_H_first_principles import MicroscopicParameters, TheoreticalUncertainty
+
+PINNED = {name: 0.0 for name in mc.LOGNORMAL_INPUTS}
+
+
+def _curve(n=200, seed=1):
+    rng = np.random.default_rng(seed)
+    T = np.linspace(2, 19, n)
+    β = 1e-3*(1 + 0.5*np.exp(-(T - 2)/5)) + 2e-6*rng.standard_normal(n)
+    return T, β
+
+
+def test_shared_pieces():
+    P = MicroscopicParameters
+    assert P.effective_N_degrees_of_freedom(10.0) == (15e-10/3.8e-10)**3 * (0.3*1.602e-19*1e-13/1.055e-34)
+    assert P.compute_β0_theoretical(Θ=100) == (100/(2*8.617e-5))*1.62e-9
+    T, β = _curve()
+    for ξ_T in (0.5, 3.0, 20.0):
+        x = (T.max() - T)/ξ_T
+        want = np.ones_like(T)
+        want[x < 2] = np.exp(2 - x[x < 2])
+        assert np.array_equal(TheoreticalUncertainty.boundary_information_decay(T, T.max(), ξ_T), want)
+    y = β - β.mean()
+    acf = np.correlate(y, y, mode='full')[len(β) - 1:]
+    acf /= acf[0]
+    assert TheoreticalUncertainty.correlation_length(T, β) == np.where(acf < 1/np.e)[0][0]*(T[1] - T[0])
+
+
+def test_pinned_matches_first_order():
+    T, β = _curve()
+    engine = mc.BetaHMonteCarlo(T, β, rel_sigma=PINNED)
+    samples = engine.evaluate(engine.sample(1000, seed=3))
+    assert samples.shape == (1000, len(T))
+    bands = engine.run(40_000, seed=3)
+    first = bands['first_order']['δβ_H_total']
+    assert np.allclose(bands['std'], first, rtol=0.02)
+    assert np.allclose(bands['percentiles'][2], β, rtol=1e-3)
+    assert np.all(np.diff(bands['percentiles'], axis=0) > 0)
+    # β₀ pinned at Θ = 100 K
+    assert np.allclose(bands['β_0'], MicroscopicParameters.compute_β0_theoretical(Θ=100), rtol=1e-12)
+    # parameter uncertainties only widen the band
+    wide = mc.BetaHMonteCarlo(T, β).run(40_000, seed=3)
+    assert np.mean(wide['std']/first) > 1.0
+
+
+def test_sobol_pinned():
+    T, β = _curve()
+    engine = mc.BetaHMonteCarlo(T, β, rel_sigma=PINNED)
+    res = engine.sobol_indices(20_000, seed=5)
+    N_eff = MicroscopicParameters.effective_N_degrees_of_freedom(None)
+    share_Θ = 1/(1 + engine.nominal['SNR'])      # δΘ²/(δΘ² + δS²)
+    i_Θ, i_S = mc.INPUTS.index('ε_Θ'), mc.INPUTS.index('ε_S')
+    assert N_eff > 0 and res['S1'].shape == (len(mc.INPUTS), len(T))
+    assert np.allclose(res['S1'][i_Θ], share_Θ, atol=0.03)
+    assert np.allclose(res['S1'][i_S], 1 - share_Θ, atol=0.03)
+    assert np.allclose(res['ST'], res['S1'], atol=0.03)
+    others = [i for i in range(len(mc.INPUTS)) if i not in (i_Θ, i_S)]
+    assert np.all(np.abs(res['ST'][others]) < 1e-12)
+
+
+def test_parallel_matches_serial():
+    T, β = _curve(60)
+    engine = mc.BetaHMonteCarlo(T, β)
+    old = mc.BAND_BLOCK_ELEMENTS, mc.SOBOL_BLOCK_ELEMENTS
+    mc.BAND_BLOCK_ELEMENTS, mc.SOBOL_BLOCK_ELEMENTS = 5000*16, 60*1000
+    try:
+        serial = engine.run(5000, seed=7, quantity='enhancement')
+        parallel = engine.run(5000, seed=7, quantity='enhancement', n_workers=2)
+        s_serial = engine.sobol_indices(3000, seed=7)
+        s_parallel = engine.sobol_indices(3000, seed=7, n_workers=2)
+    finally:
+        mc.BAND_BLOCK_ELEMENTS, mc.SOBOL_BLOCK_ELEMENTS = old
+    assert np.array_equal(serial['percentiles'], parallel['percentiles'])
+    assert np.allclose(s_serial['S1'], s_parallel['S1'], rtol=1e-9, atol=1e-12)
+    assert np.allclose(s_serial['ST'], s_parallel['ST'], rtol=1e-9, atol=1e-12)
+
+
+def run_all():
+    test_shared_pieces()
+    test_pinned_matches_first_order()
+    test_sobol_pinned()
+    test_parallel_matches_serial()
+    print("All β_H Monte Carlo tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE PACKED EMBEDDING CACHE (embedding_cache.py)
+=========================================================
+
+1. Store round trip: reopen, memory-mapped gather, float32 rows
+2. Batch lookups: only distinct misses reach the backend, in batches
+3. A torn append is cut back to the last complete row on reopen
+4. Shared by EmbeddingProvider (mock) and LLMEmbedder (stub)
+5. Mock vectors do not depend on the per-process str hash salt
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache, KEY_BYTES
+from llm_baseline_extended import LLMConfig, MockEmbeddingProvider
+from llm_embeddings import LLMEmbedder
+
+
+def _vectors(texts, dim=8):
+    return np.array([[len(t) + j for j in range(dim)] for t in texts], dtype=float)
+
+
+class _Backend:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return _vectors(texts)
+
+
+def test_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(tmp, 'mock', 'm/1')
+        texts = [f"text {i}" for i in range(50)]
+        cache.put_many(texts, _vectors(texts))
+        assert len(cache) == 50 and "text 7" in cache
+
+        again = EmbeddingCache(tmp, 'mock', 'm/1')
+        out, hit = again.get_many(["text 3", "nope", "text 49"])
+        assert out.dtype == np.float32 and list(hit) == [True, False, True]
+        assert np.array_equal(out[[0, 2]], _vectors(["text 3", "text 49"]))
+        assert not out[1].any()
+        assert again.stats()['bytes_read'] == 2 * 8 * 4
+        files = sorted(p.name for p in again.path.iterdir())
+        assert files == ['keys.bin', 'meta.json', 'vectors.f32']
+        try:
+            EmbeddingCache(tmp, 'mock', 'm/1', dim=4)
+            raise AssertionError("dim mismatch not detected")
+        except ValueError:
+            pass
+
+
+def test_batch_misses_only():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(tmp, 'mock', 'm')
+        backend = _Backend()
+        texts = ["a", "bb", "a", "ccc", "dddd", "bb", "eeeee"]
+        out = cache.embed(texts, backend, batch_size=2)
+        assert np.array_equal(out, _vectors(texts))
+        assert backend.calls == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+
+        out = cache.embed(["eeeee", "ffffff", "a"], backend, batch_size=2)
+        assert np.array_equal(out, _vectors(["eeeee", "ffffff", "a"]))
+        assert backend.calls[-1] == ["ffffff"] and len(cache) == 6
+        stats = cache.stats()
+        assert stats['hits'] == 2 and stats['misses'] == 8
+        assert abs(cache.hit_rate - 0.2) < 1e-12
+
+
+def test_torn_append():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(tmp, 'mock', 'm')
+        cache.put_many(["x", "y"], _vectors(["x", "y"]))
+        with open(cache.path / "vectors.f32", 'ab') as f:
+            f.write(b'\0' * 12)
+        with open(cache.path / "keys.bin", 'ab') as f:
+            f.write(b'\1' * KEY_BYTES)
+        reopened = EmbeddingCache(tmp, 'mock', 'm')
+        assert len(reopened) == 2
+        assert (reopened.path / "keys.bin").stat().st_size == 2 * KEY_BYTES
+        out, hit = reopened.get_many(["y"])
+        assert hit.all() and np.array_equal(out, _vectors(["y"]))
+
+
+def test_providers_share_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        config = LLMConfig(provider='mock', model='test', embedding_dim=16, cache_dir=tmp)
+        provider = MockEmbeddingProvider(config)
+        texts = [f"task {i}" for i in range(10)]
+        first = provider.embed_batch(texts)
+        assert first.shape == (10, 16) and first.dtype == np.float32
+        assert np.allclose(np.linalg.norm(first, axis=1), 1.0, atol=1e-6)
+        second = MockEmbeddingProvider(config).embed_batch(texts[::-1])
+        assert np.array_equal(second, first[::-1])
+        assert np.array_equal(provider.embed_text("task 3"), first[3])
+        assert provider.cache_stats()['hits'] == 1
+
+        uncached = LLMConfig(provider='mock', model='test', embedding_dim=16, cache_embeddings=False)
+        assert np.allclose(MockEmbeddingProvider(uncached).embed_batch(texts), first, atol=1e-7)
+        wider = LLMConfig(provider='mock', model='test', embedding_dim=32, cache_dir=tmp)
+        assert MockEmbeddingProvider(wider).embed_batch(texts).shape == (10, 32)
+
+        embedder = LLMEmbedder(method='stub', embedding_dim=16, cache_dir=tmp)
+        plain = LLMEmbedder(method='stub', embedding_dim=16)
+        assert np.allclose(embedder.embed_batch(texts), plain.embed_batch(texts), atol=1e-7)
+        assert np.array_equal(embedder.embed("task 0"), embedder.embed_batch(texts)[0])
+        assert embedder.cache_stats()['misses'] == 10
+
+
+def test_mock_vectors_stable_across_processes():
+    code = ("from llm_baseline_extended import LLMConfig, MockEmbeddingProvider; "
+            "config = LLMConfig(provider='mock', model='test', embedding_dim=8, cache_embeddings=False); "
+            "print(MockEmbeddingProvider(config).embed_text('task 0').tobytes().hex())")
+    here = str(Path(__file__).resolve().parent)
+    outputs = set()
+    for salt in ('1', '2'):
+        env = dict(os.environ, PYTHONHASHSEED=salt)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [here, env.get('PYTHONPATH')]))
+        outputs.add(subprocess.run([sys.executable, '-c', code], env=env, cwd=here,
+                                   capture_output=True, text=True, check=True).stdout)
+    assert len(outputs) == 1
+
+
+def run_all():
+    test_round_trip()
+    test_batch_misses_only()
+    test_torn_append()
+    test_providers_share_cache()
+    test_mock_vectors_stable_across_processes()
+    print("All embedding cache tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
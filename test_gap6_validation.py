@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE GAP 6 MULTI-CHANNEL Θ FITTER (gap6_validation.py)
+===============================================================
+
+1. Folded, cached gap tables reproduce the full-angle channel models
+2. fit_gap6_theta recovers Θ (and η_d) from synthetic three-channel data
+3. Posterior normalisation, Γ-degeneracy of (Θ, c_γ), timing breakdown
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import numpy as np
+
+from gap6_validation import (MaterialParams, arpes_model_A, d_wave_gap, dos_model_Ns,
+                             fit_gap6_theta, gap_table, optical_model_sigma,
+                             theta_to_gamma)
+
+
+W_OPT = np.linspace(0.0, 0.20, 400) + 1e-6
+W_ARPES = np.linspace(-0.08, 0.08, 401)
+E_STS = np.linspace(0.0, 0.08, 301)
+PARAMS = MaterialParams(wp=1.0, eps_inf=4.0, eta_d=0.9, Delta0=0.020, Tc=90.0, c_gamma=0.004)
+THETAS = np.linspace(0.005, 0.03, 26)
+
+
+def _synthetic(theta, params=PARAMS):
+    s1, s2 = optical_model_sigma(W_OPT, theta, params)
+    return {
+        'optical': {'sigma1': s1, 'sigma2': s2},
+        'arpes': {'A': arpes_model_A(W_ARPES, theta, params)},
+        'sts': {'N': dos_model_Ns(E_STS, theta, params)},
+    }
+
+
+def test_gap_tables_match_full_angle_models():
+    for nphi in (128, 256, 90):
+        Delta, w = gap_table(nphi, 0.02, 0.9)
+        full = np.abs(d_wave_gap(np.linspace(0, 2*np.pi, nphi, endpoint=False), 0.02, 0.9))
+        assert abs(w.sum() - 1.0) < 1e-12
+        for f in (np.abs, np.square, np.cos):
+            assert np.isclose(w @ f(Delta), np.mean(f(full)), rtol=1e-12)
+    assert gap_table(128, 0.02, 0.9)[0] is gap_table(128, 0.02, 0.9)[0]
+
+    G = theta_to_gamma(0.012, PARAMS)
+    full = np.abs(d_wave_gap(np.linspace(0, 2*np.pi, 128, endpoint=False), PARAMS.Delta0, PARAMS.eta_d))
+    A_ref = np.mean(0.5/np.pi*(G/((W_ARPES[None, :]-full[:, None])**2 + G**2) +
+                               G/((W_ARPES[None, :]+full[:, None])**2 + G**2)), axis=0)
+    assert np.allclose(arpes_model_A(W_ARPES, 0.012, PARAMS), A_ref, rtol=1e-12)
+
+
+def test_fit_recovers_theta():
+    rng = np.random.default_rng(7)
+    exp = _synthetic(0.015)
+    exp['arpes']['A'] = exp['arpes']['A'] * (1 + 0.01*rng.standard_normal(W_ARPES.size))
+    fit = fit_gap6_theta(exp, W_OPT, E_STS, W_ARPES, THETAS, PARAMS,
+                         eta_d_grid=[0.8, 0.9, 1.0])
+    assert abs(fit['best']['Theta'] - 0.015) < 1e-12
+    assert fit['best']['eta_d'] == 0.9
+    assert fit['loss'].shape == (len(THETAS), 1, 3)
+    assert set(fit['channel_loss']) == {'optical', 'arpes', 'sts'}
+    assert abs(np.trapezoid(fit['posterior'], THETAS) - 1.0) < 1e-12
+    assert THETAS[np.argmax(fit['posterior'])] == fit['best']['Theta']
+    assert {'tables', 'optical', 'arpes', 'sts', 'total'} <= set(fit['timings'])
+
+
+def test_threaded_matches_serial_and_gamma_ridge():
+    exp = _synthetic(0.02)
+    del exp['optical']
+    serial = fit_gap6_theta(exp, W_OPT, E_STS, W_ARPES, THETAS, PARAMS,
+                            c_gamma_grid=[0.002, 0.004, 0.006], n_workers=1)
+    threaded = fit_gap6_theta(exp, W_OPT, E_STS, W_ARPES, THETAS, PARAMS,
+                              c_gamma_grid=[0.002, 0.004, 0.006], n_workers=3)
+    assert np.array_equal(serial['loss'], threaded['loss'])
+    assert 'optical' not in serial['timings']
+
+    # Θ and c_γ enter only through Γ = c_γ/Θ: every c_γ finds the same Γ
+    best_theta = THETAS[np.argmin(serial['loss'][:, :, 0], axis=0)]
+    assert np.allclose(np.array([0.002, 0.004, 0.006]) / best_theta, 0.004/0.02)
+
+    try:
+        fit_gap6_theta({}, W_OPT, E_STS, W_ARPES, THETAS, PARAMS)
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError without channels")
+
+
+def run_all():
+    test_gap_tables_match_full_angle_models()
+    test_fit_recovers_theta()
+    test_threaded_matches_serial_and_gamma_ridge()
+    print("All gap6 fitter tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE VECTORIZED STIFFNESS ENGINE (gap7_thermo.py)
+==========================================================
+
+1. Quadrant-folded trapezoid rule equals the full-circle angle loop
+2. Gauss-Legendre mode converges and its error estimate is conservative
+3. Whole-grid lambda(T)/lambda(0) matches the per-temperature calls
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import dataclasses
+
+import numpy as np
+
+from gap7_thermo import (ThermoParams, d_wave_gap, gamma_of_theta, lambda_ratio,
+                         stiffness_curve, superfluid_stiffness, validate_gap7)
+
+
+P = ThermoParams(wp=1.0, eps_inf=4.0, eta_d=0.9, Delta0=0.020, Tc=90.0,
+                 c_gamma=1e-5, n_phi=61, n_E=800)
+
+
+def theta_T(T):
+    return max(P.Theta_min, 0.01 * max(0.0, 1.0 - (T / P.Tc) ** 2))
+
+
+def _reference_stiffness(T, theta, p):
+    """Previous per-angle loop (np.trapz -> explicit trapezoid weights)."""
+    phi = np.linspace(0.0, 2 * np.pi, p.n_phi, endpoint=False)
+    E = np.linspace(0.0, p.E_max, p.n_E)
+    w = np.full(p.n_E, E[1] - E[0])
+    w[[0, -1]] *= 0.5
+    x = E / (p.kB * T)
+    dfde = 1.0 / (4.0 * p.kB * T * np.cosh(0.5 * x) ** 2)
+    G = gamma_of_theta(theta, p)
+    integ = 0.0
+    for D in d_wave_gap(phi, p.Delta0, p.eta_d):
+        z = E - 1j * G
+        integ += np.sum(w * dfde * np.real(z / np.sqrt(z * z + D * D)))
+    integ /= p.n_phi
+    return float(max(0.0, min(1.2, 1.0 - 2.0 * integ)))
+
+
+def test_trapezoid_matches_angle_loop():
+    T = np.linspace(5.0, 85.0, 9)
+    for n_phi in (61, 64, 90):
+        p = dataclasses.replace(P, n_phi=n_phi)
+        curve = stiffness_curve(T, theta_T, p)
+        ref = [_reference_stiffness(t, theta_T(t), p) for t in T]
+        assert np.allclose(curve["rho_s"], ref, rtol=0, atol=1e-12), n_phi
+        assert np.allclose(curve["lambda_ratio"], 1.0 / np.sqrt(curve["rho_s"]))
+
+
+def test_gauss_mode_converges():
+    T = np.linspace(5.0, 85.0, 9)
+    fine = stiffness_curve(T, theta_T, P, quadrature="gauss", gl_order=(160, 24), gl_panels=48)
+    coarse = stiffness_curve(T, theta_T, P, quadrature="gauss")
+    err = np.abs(coarse["rho_s"] - fine["rho_s"])
+    assert err.max() < 0.01
+    assert err.max() <= 2.0 * coarse["error"].max()
+
+    try:
+        stiffness_curve(T, theta_T, P, quadrature="simpson")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError for unknown quadrature")
+
+
+def test_grid_matches_single_calls():
+    T = np.linspace(2.0, 0.95 * P.Tc, 12)
+    theta = np.array([theta_T(t) for t in T])
+    curve = stiffness_curve(T, theta, P)
+    assert np.allclose(curve["rho_s"], stiffness_curve(T, theta_T, P)["rho_s"])
+    singles = [lambda_ratio(t, th, P) for t, th in zip(T, theta)]
+    assert np.allclose(curve["lambda_ratio"], singles, rtol=1e-12)
+    assert np.isclose(superfluid_stiffness(T[3], theta[3], P), curve["rho_s"][3], rtol=1e-12)
+
+    res = validate_gap7(T, curve["lambda_ratio"], 1.0, theta_T, P, dC_over_C_exp=1.1)
+    assert res["lambda_mre"] < 1e-12
+
+
+def run_all():
+    test_trapezoid_matches_angle_loop()
+    test_gauss_mode_converges()
+    test_grid_matches_single_calls()
+    print("All gap7 stiffness tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
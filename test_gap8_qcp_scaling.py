@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE VECTORIZED QCP COLLAPSE SEARCH (gap8_qcp_scaling.py)
+==================================================================
+
+1. R2_map / best (pc, s, z) match the per-combination _collapse_score loop
+2. Threaded pc scan is identical to the serial one
+3. Edge cases: no doping column in range (NaN), too few points (0)
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import numpy as np
+
+from gap8_qcp_scaling import (
+    QCPParams, grid_search_qcp_theta, _best_z_for_theta, _collapse_score, _mask_domain
+)
+
+
+def _reference_search(Theta, T, p, params):
+    """Previous triple loop (one _collapse_score per pc, s, z)."""
+    Rmap = np.full((params.pc_grid.size, params.s_grid.size), np.nan)
+    best = dict(R2=-np.inf, pc=np.nan, s=np.nan, z=np.nan)
+    for i_pc, pc in enumerate(params.pc_grid):
+        cols = np.where(np.abs(p - pc) <= params.delta_max)[0]
+        if cols.size == 0:
+            continue
+        for i_s, s in enumerate(params.s_grid):
+            best_R2, best_z = -np.inf, np.nan
+            for z in ([1.0] if params.z_grid is None else params.z_grid):
+                Xs, Ys = [], []
+                for j in cols:
+                    delta = abs(p[j] - pc)
+                    if delta <= 0:
+                        continue
+                    mT = _mask_domain(T, np.full_like(T, p[j]), pc, params.delta_max, params.Tmin, params.Tmax)
+                    Xs.append((T / delta**z)[mT]); Ys.append((Theta[:, j] / delta**s)[mT])
+                if not Xs:
+                    continue
+                R2 = _collapse_score(np.concatenate(Xs), np.concatenate(Ys), nbins=40)
+                if R2 > best_R2:
+                    best_R2, best_z = R2, float(z)
+            Rmap[i_pc, i_s] = best_R2
+            if best_R2 > best["R2"]:
+                best.update(R2=best_R2, pc=float(pc), s=float(s), z=best_z)
+    best["R2_map"] = Rmap
+    return best
+
+
+def _toy(NT=40, NP=15, pc=0.20, noise=0.02, seed=1):
+    T = np.linspace(5, 200, NT)
+    p = np.linspace(0.10, 0.30, NP)
+    Theta = np.zeros((NT, NP))
+    for j, pj in enumerate(p):
+        delta = abs(pj - pc) + 1e-6
+        Theta[:, j] = delta / (1.0 + T / delta)
+    Theta *= 1.0 + noise * np.random.default_rng(seed).standard_normal(Theta.shape)
+    return Theta, T, p
+
+
+def _params(**kwargs):
+    base = dict(pc_grid=np.linspace(0.17, 0.23, 13), s_grid=np.linspace(0.5, 1.5, 11),
+                z_grid=np.linspace(0.6, 2.0, 8), delta_max=0.06, Tmin=10.0, Tmax=180.0)
+    base.update(kwargs)
+    return QCPParams(**base)
+
+
+def test_matches_reference_loop():
+    Theta, T, p = _toy()
+    for params in (_params(), _params(z_grid=None, Tmin=None)):
+        got = grid_search_qcp_theta(Theta, T, p, params)
+        want = _reference_search(Theta, T, p, params)
+        assert np.array_equal(np.isnan(got["R2_map"]), np.isnan(want["R2_map"]))
+        assert np.nanmax(np.abs(got["R2_map"] - want["R2_map"])) < 1e-12
+        for key in ("pc", "s", "z"):
+            assert got[key] == want[key], (key, got[key], want[key])
+        assert abs(got["R2"] - want["R2"]) < 1e-12
+        assert got["z_map"].shape == got["R2_map"].shape
+
+    params = _params()
+    z, R2 = _best_z_for_theta(Theta, T, p, 0.2, 1.0, params)
+    i_pc, i_s = 6, 5
+    assert abs(R2 - grid_search_qcp_theta(Theta, T, p, params)["R2_map"][i_pc, i_s]) < 1e-12
+
+
+def test_threaded_scan_identical():
+    Theta, T, p = _toy(NT=120, NP=40, noise=0.05, seed=3)
+    params = _params(pc_grid=np.linspace(0.16, 0.24, 17), s_grid=np.linspace(0.5, 1.5, 21))
+    serial = grid_search_qcp_theta(Theta, T, p, params)
+    threaded = grid_search_qcp_theta(Theta, T, p, params, n_workers=3)
+    assert np.array_equal(serial["R2_map"], threaded["R2_map"], equal_nan=True)
+    assert abs(serial["pc"] - 0.2) <= 0.01
+
+
+def test_degenerate_domains():
+    Theta, T, p = _toy()
+    out = grid_search_qcp_theta(Theta, T, p, _params(pc_grid=np.array([0.5, 0.2]), Tmin=100.0, Tmax=101.0))
+    assert np.isnan(out["R2_map"][0]).all()
+    assert np.all(out["R2_map"][1] == 0.0)            # < 10 points in the collapse
+    assert out["pc"] == 0.2
+
+    none = grid_search_qcp_theta(Theta, T, p, _params(pc_grid=np.array([0.9])))
+    assert np.isnan(none["R2_map"]).all() and none["R2"] == -np.inf and np.isnan(none["pc"])
+
+
+def run_all():
+    test_matches_reference_loop()
+    test_threaded_scan_identical()
+    test_degenerate_domains()
+    print("All GAP 8 collapse tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
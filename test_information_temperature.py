@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE ARRAY-NATIVE INFORMATION TEMPERATURE
+==================================================
+
+1. Scalar calls: unchanged values and Python scalar types
+2. Array calls broadcast and match the point-by-point values
+3. Tabulated background: error below rtol, closed forms outside the table
+4. Environmental profiles (records / arrays) and survey predictions
+5. (z, δ) phase map panel = phase_state of theta_map
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from information_temperature_implementation import (
+    InformationTemperature, TabulatedInformationTemperature,
+    EnvironmentalProfiles, ObservationalPredictions, PHASE_NAMES,
+    create_phase_map_plot
+)
+
+MODEL = InformationTemperature()
+TABLE = TabulatedInformationTemperature()
+
+
+def _scalar_theta(model, z, delta, grad_sigma=None, v_bulk=0.0):
+    return model.theta_total(0, 0.1, float(z), delta=float(delta),
+                             grad_sigma=grad_sigma, v_bulk=v_bulk)
+
+
+def test_scalar_calls():
+    theta = MODEL.theta_total(0, 0.1, 0.5, delta=200, grad_sigma=2.0)
+    assert isinstance(theta, float)
+    assert isinstance(MODEL.phase_state(theta), str)
+    assert isinstance(MODEL.friction_coefficient(theta), float)
+    # vacuum + matter + radiation + shear, by hand
+    Om = MODEL.cosmo.Omega_m_z(0.5)
+    want = ((1 - Om)/Om*1.5**3 + 201**2*(1 + Om**0.55)**2
+            + MODEL.cosmo.Omega_r/MODEL.cosmo.Omega_m*1.5
+            + (2.0/0.01)**2/(0.1**2 + MODEL.adapt.k_screen**2))
+    assert abs(theta - want) <= 1e-12*want
+    phases = [MODEL.phase_state(t) for t in (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 50.0)]
+    assert phases == ['super-crystal', 'crystal', 'crystal', 'liquid', 'viscous',
+                      'plasma', 'hot-plasma', 'hot-plasma']
+
+
+def test_array_broadcasting():
+    z = np.linspace(0, 5, 7)
+    delta = np.array([-0.99, -0.5, 0.0, 5.0, 50.0, 1000.0])
+    grid = MODEL.theta_map(z, delta)
+    assert grid.shape == (z.size, delta.size)
+    for i, zi in enumerate(z):
+        for j, dj in enumerate(delta):
+            assert abs(grid[i, j] - _scalar_theta(MODEL, zi, dj)) <= 1e-12*grid[i, j]
+    thetas = grid.ravel()
+    assert list(MODEL.phase_state(thetas)) == [MODEL.phase_state(t) for t in thetas]
+    for f in (MODEL.friction_coefficient, MODEL.sound_speed_squared):
+        assert np.allclose(f(thetas), [f(t) for t in thetas], rtol=1e-14)
+
+
+def test_tabulated_background():
+    assert all(err <= TABLE.rtol for err in TABLE.table_error.values())
+    z = np.concatenate((np.linspace(0, TABLE.z_max, 1001), [-0.5, TABLE.z_max + 5.0]))
+    for name in ('theta_vacuum', 'theta_radiation', '_omega_m_z', '_hubble'):
+        got, want = getattr(TABLE, name)(z), getattr(MODEL, name)(z)
+        assert np.all(np.abs(got/want - 1) <= 10*TABLE.rtol), name
+        # outside [0, z_max]: closed form
+        assert np.array_equal(got[-2:], want[-2:]), name
+    assert isinstance(TABLE.theta_vacuum(1.0), float)
+    grid, exact = TABLE.theta_map(z[:-2], [0.0, 200.0]), MODEL.theta_map(z[:-2], [0.0, 200.0])
+    assert np.allclose(grid, exact, rtol=10*TABLE.rtol, atol=0)
+
+
+def test_profiles_and_predictions():
+    profiles = EnvironmentalProfiles(MODEL)
+    r = np.logspace(-3.5, 1, 60)
+    records = profiles.cluster_profile(r)
+    arrays = profiles.cluster_profile(r, as_arrays=True)
+    assert len(records) == r.size and set(records[0]) == set(arrays)
+    R_200 = 2.0
+    for rec in records:
+        x = rec['r']
+        delta = min(200/((x/0.4)*(1 + x/0.4)**2), 1e4) if x > 0.001 else 1e4
+        sigma_v = 1000*(R_200/x)**0.5 if x < R_200 else 100
+        grad = 5.0 if abs(x - R_200) < 0.1*R_200 else 1.0
+        theta = MODEL.theta_total(x, 0.1, 0.3, delta=delta, grad_sigma=grad, v_bulk=sigma_v)
+        assert abs(rec['theta'] - theta) <= 1e-12*theta
+        assert rec['phase'] == MODEL.phase_state(theta)
+        assert isinstance(rec['in_transition'], bool)
+    for rec in profiles.void_profile(np.linspace(0, 50, 40)):
+        assert rec['theta'] > 0 and rec['delta'] <= 0
+    shock = profiles.merger_shock_profile(np.linspace(-5, 5, 41), as_arrays=True)
+    assert shock['v_shock'][20] == 3000 and np.all(shock['gw_damping'] > 0)
+
+    predictions = ObservationalPredictions(MODEL)
+    z = np.linspace(0.1, 2.0, 5)
+    euclid = predictions.euclid_predictions(z)
+    for zi, void, cluster in zip(z, euclid['void_theta'], euclid['cluster_theta']):
+        assert void == MODEL.theta_total(0, 0.1, zi, delta=-0.5)
+        assert cluster == MODEL.theta_total(0, 0.1, zi, delta=200)
+    lisa = predictions.lisa_predictions(np.array([0.5, 3.0]))
+    for zs, A in zip((0.5, 3.0), lisa['damping_factor']):
+        zg = np.linspace(0, zs, 100)
+        damping = sum(MODEL.gw_damping_rate(MODEL.theta_total(0, 0.1, zg[i], delta=0))
+                      * (zg[i+1] - zg[i])/(1 + zg[i]) for i in range(99))
+        assert abs(A - np.exp(-damping/2)) <= 1e-12
+
+
+def test_phase_map_plot():
+    z, delta = np.linspace(0, 5, 12), np.logspace(-1, 3, 15) - 1
+    fig = create_phase_map_plot(MODEL, z, delta, grad_sigma=0.0)
+    mesh = fig.axes[0].collections[0]
+    phases = PHASE_NAMES[np.asarray(mesh.get_array()).reshape(z.size, delta.size)]
+    assert np.array_equal(phases, MODEL.phase_state(MODEL.theta_map(z, delta, grad_sigma=0.0)))
+    assert len(set(phases.ravel())) > 1
+    plt.close(fig)
+
+
+def run_all():
+    test_scalar_calls()
+    test_array_broadcasting()
+    test_tabulated_background()
+    test_profiles_and_predictions()
+    test_phase_map_plot()
+    print("All information temperature tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
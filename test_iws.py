@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE PACKED σ STORAGE OF THE IWS (iws.py)
+==================================================
+
+1. Packed σ_coh / n_eff = pairwise loop (zero-padded for mixed dimensions)
+2. σ_coh computed once per σ update, shared by phase / health checks
+3. SigmaBlock mapping semantics, growth, zero-copy views
+4. snapshot(as_record=True) = snapshot() as a SNAPSHOT_DTYPE record
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from iws import IWS, Phase, SigmaBlock, SNAPSHOT_DTYPE
+
+
+def _padded_coherence(sigmas):
+    total, count = 0.0, 0
+    for i in range(len(sigmas)):
+        for j in range(i + 1, len(sigmas)):
+            d = max(len(sigmas[i]), len(sigmas[j]))
+            v1, v2 = np.zeros(d), np.zeros(d)
+            v1[:len(sigmas[i])], v2[:len(sigmas[j])] = sigmas[i], sigmas[j]
+            total += np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-8)
+            count += 1
+    return total / count
+
+
+def test_packed_matches_loop():
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=64)
+    same = {f"L{i}": base + 0.5 * rng.normal(size=64) for i in range(6)}
+    plain, packed = IWS(), IWS(packed_sigma=True)
+    for name, sigma in same.items():
+        plain.update_sigma(name, sigma)
+        packed.update_sigma(name, sigma)
+    assert abs(packed.compute_global_coherence() - plain.compute_global_coherence()) < 1e-6
+    packed.update_sigma('L5', np.zeros(64))
+    plain.update_sigma('L5', np.zeros(64))
+    assert packed.compute_n_eff() == plain.compute_n_eff() == 5.0
+
+    mixed = {'sigma_sensory': base, 'sigma_semantic': np.concatenate([base, base]),
+             'sigma_pragmatic': base[:32] + rng.normal(size=32)}
+    iws = IWS(sigma_state=dict(mixed), packed_sigma=True)
+    assert isinstance(iws.sigma_state, SigmaBlock)
+    assert abs(iws.compute_global_coherence() - _padded_coherence(list(mixed.values()))) < 1e-6
+    assert IWS(packed_sigma=True).compute_global_coherence() == 1.0
+
+
+def test_coherence_shared():
+    iws = IWS(packed_sigma=True, I_indirect_ratio=0.5, theta=0.3)
+    for i in range(4):
+        iws.update_sigma(f"L{i}", np.ones(16) + 0.01 * i)
+    block = iws.sigma_state
+    coh = iws.compute_global_coherence()
+    assert not block._dirty and coh > 0.99
+
+    block._data[0, 0] = -100.0      # not seen until the next update
+    assert iws.detect_phase() == Phase.R4
+    assert iws.check_control_health() == 'unknown'
+    assert iws.compute_global_coherence() == coh
+
+    iws.update_sigma('L0', -np.ones(16))
+    assert block._dirty and iws.compute_global_coherence() < 0.5
+
+
+def test_sigma_block():
+    block = SigmaBlock(initial_rows=2)
+    vectors = {f"L{i}": np.arange(1, 3 + i, dtype=float) for i in range(5)}
+    for name, v in vectors.items():
+        block[name] = v
+    assert list(block) == list(vectors) and len(block) == 5 and 'L3' in block
+    assert block.block.shape == (5, 6) and block.block.dtype == np.float32
+    assert not block.block.flags.writeable and np.shares_memory(block.block, block._data)
+    out = block['L2']
+    assert out.dtype == np.float64 and np.array_equal(out, vectors['L2'])
+    out[:] = 0
+    assert np.array_equal(block['L2'], vectors['L2'])
+    assert np.allclose(block.norms, [np.linalg.norm(v) for v in vectors.values()])
+
+    block['L1'] = np.ones(2)            # shrink: stale tail is cleared
+    assert np.array_equal(block.block[1], [1, 1, 0, 0, 0, 0])
+    del block['L0']
+    assert list(block) == ['L1', 'L2', 'L3', 'L4']
+    assert np.array_equal(block['L4'], vectors['L4']) and np.allclose(block.norms[0], np.sqrt(2))
+    assert block.get('L0') is None and dict(block).keys() == {'L1', 'L2', 'L3', 'L4'}
+
+
+def test_snapshot_record():
+    iws = IWS(packed_sigma=True, theta=0.4, n_eff=3.5, physical_time=12, timestamp=datetime(2025, 11, 24, 9, 30))
+    for i in range(3):
+        iws.update_sigma(f"L{i}", np.ones(8) * (i + 1))
+    iws.sigma_coh = iws.compute_global_coherence()
+    record = iws.snapshot(as_record=True)
+    assert record.dtype == SNAPSHOT_DTYPE
+    for key, value in iws.snapshot().items():
+        if key == 'timestamp':
+            assert record[key] == np.datetime64(value)
+        else:
+            assert record[key] == value, key
+
+    log = np.empty(100, dtype=SNAPSHOT_DTYPE)
+    for step in range(100):
+        iws.physical_time = step
+        log[step] = iws.snapshot(as_record=True)
+    assert np.array_equal(log['physical_time'], np.arange(100))
+    assert set(log['control_health']) == {iws.check_control_health()}
+
+
+def run_all():
+    test_packed_matches_loop()
+    test_coherence_shared()
+    test_sigma_block()
+    test_snapshot_record()
+    print("All IWS tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
@@ -10,8 +10,10 @@ import numpy as np
 
 from kk_constraints import (
     HilbertTransform, KramersKronigRelations,
-    KKProjector, ConstrainedOptimizer
+    KKProjector, ConstrainedOptimizer,
+    clear_kernel_cache, set_kernel_cache, fast_pv_accuracy_report
 )
+from numeric_compat import trapezoid as _trapz
 
 def test_hilbert_transform_basic():
     omega = np.linspace(0.01, 10, 800)
@@ -51,7 +53,7 @@ def test_kk_projector():
     omega = np.linspace(0.01, 5, 600)
     pi0 = np.exp(-omega) + 0.3*np.sin(2*omega)
     pi0 = np.maximum(pi0, 0)
-    pi0 = pi0 / np.trapz(pi0, omega)
+    pi0 = pi0 / _trapz(pi0, omega)
     proj = KKProjector(omega, method='odd_fft')
     viol_before = proj.violation(pi0)
     pi1 = proj.project(pi0, max_iter=20, tol=1e-5)
@@ -68,20 +70,181 @@ def test_constrained_optimization():
     opt = ConstrainedOptimizer(omega, epsilon, Theta_true)
     res = opt.minimize(max_iter=60, tol=5e-6)
     pi_star = res.pi_star
-    E = np.trapz(epsilon*pi_star, omega)
+    E = _trapz(epsilon*pi_star, omega)
     pi_safe = np.where(pi_star>1e-16, pi_star, 1e-16)
-    S = -np.trapz(pi_star*np.log(pi_safe), omega)
+    S = -_trapz(pi_star*np.log(pi_safe), omega)
     Theta_est = E/S
     rel_err = np.abs(Theta_est - Theta_true)/Theta_true
     print("Converged:", res.converged, "| Final KK viol:", res.final_violation, "| Θ rel err:", rel_err)
     return (res.converged and res.final_violation < 0.06 and rel_err < 0.12)
 
+def _reference_pv_matrix(w):
+    # previous double-loop construction of the 'pv_quad' kernel
+    n = len(w)
+    H = np.zeros((n, n))
+    dw = np.zeros(n)
+    dw[1:-1] = 0.5*(w[2:] - w[:-2])
+    dw[0] = w[1]-w[0]
+    dw[-1] = w[-1]-w[-2]
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                H[i, j] = (2.0/np.pi) * w[j] / (w[j]**2 - w[i]**2) * dw[j]
+    for i in range(n):
+        if i-1 >= 0:
+            H[i, i-1] = 0.0
+        if i+1 < n:
+            H[i, i+1] = 0.0
+    return H
+
+def test_vectorized_kernels():
+    omega = np.linspace(0.01, 5, 200)
+    clear_kernel_cache()
+    H_pv = HilbertTransform(omega, method='pv_quad').H_matrix
+    H_ref = _reference_pv_matrix(omega)
+    err_pv = np.max(np.abs(H_pv - H_ref)) / np.max(np.abs(H_ref))
+
+    H_k = HilbertTransform(omega, method='kernel').H_matrix
+    i, j = 3, 150
+    k_ref = (2.0/np.pi) * omega[j] / (omega[j]**2 - omega[i]**2)
+    ok = err_pv < 1e-12 and np.isclose(H_k[i, j], k_ref, rtol=1e-12) and np.all(np.diag(H_k) == 0)
+    print("Vectorized pv_quad kernel max rel diff:", err_pv)
+    assert ok
+    return ok
+
+def test_kernel_cache():
+    import tempfile
+    omega = np.linspace(0.01, 5, 300)
+    clear_kernel_cache()
+    a = HilbertTransform(omega, method='pv_quad').H_matrix
+    b = HilbertTransform(omega.copy(), method='pv_quad').H_matrix
+    shared = a is b and not a.flags.writeable
+
+    with tempfile.TemporaryDirectory() as tmp:
+        set_kernel_cache(directory=tmp)
+        try:
+            clear_kernel_cache()
+            c = HilbertTransform(omega, method='pv_quad').H_matrix
+            clear_kernel_cache()
+            d = HilbertTransform(omega, method='pv_quad').H_matrix
+        finally:
+            import kk_constraints
+            kk_constraints._KERNEL_CACHE_DIR = None
+    ok = shared and np.array_equal(a, c) and np.array_equal(c, d)
+    print("Kernel cache shared:", shared)
+    assert ok
+    return ok
+
+def test_fast_pv_accuracy():
+    report = fast_pv_accuracy_report(np.logspace(-3, 3, 1500))
+    worst = max(c['err_fast_pv_vs_exact'] for c in report['cases'])
+    worst_vs_quad = max(c['diff_fast_pv_vs_pv_quad'] for c in report['cases'])
+    print("fast_pv worst rel err vs exact:", worst, "| vs pv_quad:", worst_vs_quad)
+    ok = worst < 0.01 and worst_vs_quad < 0.01
+    assert ok
+    return ok
+
+def _spectra(omega, n_spectra=6):
+    gammas = np.linspace(0.05, 0.6, n_spectra)
+    s1 = gammas[:, None] / (omega**2 + gammas[:, None]**2)
+    s1 = s1 + 0.02*np.sin(3*omega)
+    return s1, gammas
+
+def test_batch_projection_matches_single():
+    omega = np.linspace(0.01, 5, 400)
+    s1, _ = _spectra(omega)
+    ok = True
+    for method in ('odd_fft', 'odd_fft_uniform', 'kernel'):
+        proj = KKProjector(omega, method=method)
+        batch, info = proj.project_batch(s1, max_iter=25, tol=1e-6)
+        for i in range(len(s1)):
+            single = proj.project(s1[i], max_iter=25, tol=1e-6)
+            ok &= bool(np.allclose(batch[i], single, rtol=1e-10, atol=1e-12))
+        ok &= bool(np.all(info['iterations'] >= 1) and np.all(info['iterations'] <= 25))
+        v = proj.violation(s1)
+        ok &= bool(np.allclose(v, [proj.violation(x) for x in s1], rtol=1e-10))
+    assert ok
+    return ok
+
+def test_batch_gate_matches_single():
+    from kk_gate import causality_gate, causality_gate_batch
+    omega = np.linspace(0.01, 5, 400)
+    s1, _ = _spectra(omega)
+    kk = KramersKronigRelations(omega, method='odd_fft_uniform')
+    s2 = kk.forward(s1)
+    s2[2] += 0.3   # break one spectrum
+    b1, b2, bdiag = causality_gate_batch(omega, s1, s2)
+    ok = True
+    for i in range(len(s1)):
+        g1, g2, diag = causality_gate(omega, s1[i], s2[i])
+        ok &= bool(np.allclose(b1[i], g1, rtol=1e-10, atol=1e-12))
+        ok &= bool(np.allclose(b2[i], g2, rtol=1e-10, atol=1e-12))
+        ok &= bool(np.isclose(bdiag['initial']['error_forward'][i], diag['initial']['error_forward']))
+        ok &= bool(np.isclose(bdiag['f_sum']['area'][i], diag['f_sum']['area']))
+        ok &= bool(bdiag['f_sum']['used_subtracted'][i] == diag['f_sum']['used_subtracted'])
+        ok &= bool(bdiag['status'][i] == diag['status'])
+    ok &= bool(not bdiag['initial']['consistent'][2])
+    assert ok
+    return ok
+
+def test_accelerated_optimizer():
+    omega = np.linspace(0.01, 5, 600)
+    epsilon = omega
+    ok = True
+    for method in ('odd_fft', 'kernel'):
+        opt = ConstrainedOptimizer(omega, epsilon, 0.3, method=method)
+        ref = opt.minimize(max_iter=60, tol=5e-6)
+        plain = opt.minimize(max_iter=60, tol=5e-6, accelerated=True, anderson_m=0)
+        ok &= bool(np.array_equal(ref.pi_star, plain.pi_star) and plain.converged)
+
+    # 'fft' has a reachable fixed point: Anderson needs fewer map steps
+    proj = KKProjector(omega, method='fft')
+    pi0 = np.exp(-omega/0.3)
+    _, info_plain = proj.project_batch(pi0, max_iter=200, tol=1e-6)
+    _, info_acc = proj.project_accelerated(pi0, max_iter=200, tol=1e-6)
+    ok &= bool(info_acc['converged'] and info_acc['iterations'] < info_plain['iterations'][0])
+    print("Plain / Anderson steps to tol:", info_plain['iterations'][0], info_acc['iterations'])
+
+    # not converged: the residual is that of the returned spectrum
+    for m in (0, 5):
+        out, info = proj.project_accelerated(pi0, max_iter=3, tol=1e-12, m=m)
+        own = np.linalg.norm(proj._step(out) - out) / np.linalg.norm(out)
+        ok &= bool(not info['converged'] and np.isclose(info['residual'], own, rtol=1e-12))
+
+    res = ConstrainedOptimizer(omega, epsilon, 0.3, method='fft').minimize(accelerated=True)
+    ok &= bool(res.converged and res.final_violation < 5e-6)
+    ok &= bool(proj.violation(res.pi_star) < 1e-4)
+    assert ok
+    return ok
+
+def test_theta_sweep_warm_chain():
+    omega = np.linspace(0.01, 5, 600)
+    opt = ConstrainedOptimizer(omega, omega, 0.3, method='fft')
+    thetas = np.linspace(0.2, 1.0, 9)
+    results = opt.sweep_theta(thetas)
+    F = np.array([r.F_star for r in results])
+    print("Theta sweep F*:", np.round(F, 4))
+    ok = (len(results) == len(thetas) and opt.Theta == 0.3
+          and all(r.converged for r in results)
+          # warm-started members of the chain reach the fixed-point tolerance
+          and all(r.final_violation < 5e-6 for r in results[1:])
+          and bool(np.all(np.diff(F) > 0)))
+    assert ok
+    return ok
+
 def run_all():
     tests = [
         ("Hilbert basic", test_hilbert_transform_basic),
         ("KK on Drude", test_kramers_kronig_drude),
         ("KK projector", test_kk_projector),
         ("Constrained opt", test_constrained_optimization),
+        ("Vectorized kernels", test_vectorized_kernels),
+        ("Kernel cache", test_kernel_cache),
+        ("fast_pv accuracy", test_fast_pv_accuracy),
+        ("Batch projection", test_batch_projection_matches_single),
+        ("Batch gate", test_batch_gate_matches_single),
+        ("Accelerated optimizer", test_accelerated_optimizer),
+        ("Theta sweep", test_theta_sweep_warm_chain),
     ]
     passed = 0
     for name, fn in tests:
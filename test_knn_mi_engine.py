@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+PARITY TESTS FOR THE BATCHED k-NN MI ENGINE (knn_mi.py)
+=======================================================
+
+Checks that the batched engine reproduces the per-sample estimators it
+replaced:
+1. metrics.py knn_mutual_information (sklearn radius_neighbors loop)
+2. validation_suite.py AdaptonicEstimators.knn_mutual_information
+   (cKDTree query_ball_point loop)
+3. Tree vs brute backends and the 1-D sorted-projection counter
+4. MIContext: shared structures and Frenzel-Pompe CMI
+5. SlidingMIWindow / incremental I_ratio trajectory
+6. A failing trajectory window is recorded and skipped on both paths
+
+Reference implementations below are verbatim copies of the old loops.
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy.spatial import cKDTree
+from scipy.special import digamma
+from sklearn.neighbors import NearestNeighbors
+
+from knn_mi import MIContext, SlidingMIWindow, kraskov_counts, count_neighbors_within, knn_radii, kraskov_mi
+
+
+def _load_metrics_v2():
+    """Loads 'metrics (1).py' (not importable by name)."""
+    path = Path(__file__).parent / "metrics (1).py"
+    spec = importlib.util.spec_from_file_location("metrics_v2", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ============================================================================
+# REFERENCE (PER-SAMPLE) ESTIMATORS
+# ============================================================================
+
+def reference_metrics_mi(X: np.ndarray, Y: np.ndarray, k: int = 5) -> float:
+    """metrics.py knn_mutual_information before batching."""
+    n_samples = X.shape[0]
+    XY = np.concatenate([X, Y], axis=1)
+
+    nn_xy = NearestNeighbors(n_neighbors=k+1, metric='euclidean')
+    nn_xy.fit(XY)
+    distances_xy, _ = nn_xy.kneighbors(XY)
+    epsilon = distances_xy[:, k]
+
+    nn_x = NearestNeighbors(metric='euclidean')
+    nn_x.fit(X)
+    n_x = np.array([len(nn_x.radius_neighbors([x], radius=eps, return_distance=False)[0]) - 1
+                    for x, eps in zip(X, epsilon)])
+
+    nn_y = NearestNeighbors(metric='euclidean')
+    nn_y.fit(Y)
+    n_y = np.array([len(nn_y.radius_neighbors([y], radius=eps, return_distance=False)[0]) - 1
+                    for y, eps in zip(Y, epsilon)])
+
+    mi = digamma(k) - np.mean(digamma(n_x + 1) + digamma(n_y + 1)) + digamma(n_samples)
+    return float(max(0.0, mi))
+
+
+def reference_validation_suite_mi(X: np.ndarray, Y: np.ndarray, k: int = 5) -> float:
+    """validation_suite.py AdaptonicEstimators.knn_mutual_information before batching."""
+    n = X.shape[0]
+
+    tree_X = cKDTree(X)
+    tree_Y = cKDTree(Y)
+    tree_XY = cKDTree(np.hstack([X, Y]))
+
+    I = 0.0
+    for i in range(n):
+        dist_XY, _ = tree_XY.query([np.hstack([X[i], Y[i]])], k=k+1)
+        epsilon = dist_XY[0, k]
+
+        n_X = len(tree_X.query_ball_point(X[i], epsilon - 1e-10)) - 1
+        n_Y = len(tree_Y.query_ball_point(Y[i], epsilon - 1e-10)) - 1
+
+        I += digamma(k) - (digamma(n_X + 1) + digamma(n_Y + 1)) / 2
+
+    I /= n
+    I += digamma(n)
+
+    return max(0.0, I)
+
+
+def reference_frenzel_pompe_cmi(X: np.ndarray, Y: np.ndarray, Z: np.ndarray, k: int = 5) -> float:
+    """validation_suite.py AdaptonicEstimators.conditional_mutual_information before batching."""
+    n = X.shape[0]
+
+    tree_XZ = cKDTree(np.hstack([X, Z]))
+    tree_YZ = cKDTree(np.hstack([Y, Z]))
+    tree_XYZ = cKDTree(np.hstack([X, Y, Z]))
+    tree_Z = cKDTree(Z)
+
+    I = 0.0
+    for i in range(n):
+        dist_XYZ, _ = tree_XYZ.query([np.hstack([X[i], Y[i], Z[i]])], k=k+1)
+        epsilon = dist_XYZ[0, k]
+
+        n_XZ = len(tree_XZ.query_ball_point(np.hstack([X[i], Z[i]]), epsilon - 1e-10)) - 1
+        n_YZ = len(tree_YZ.query_ball_point(np.hstack([Y[i], Z[i]]), epsilon - 1e-10)) - 1
+        n_Z = len(tree_Z.query_ball_point(Z[i], epsilon - 1e-10)) - 1
+
+        I += digamma(k) + digamma(n_Z + 1) - digamma(n_XZ + 1) - digamma(n_YZ + 1)
+
+    I /= n
+
+    return max(0.0, I)
+
+
+def batched_validation_suite_mi(X: np.ndarray, Y: np.ndarray, k: int = 5) -> float:
+    """validation_suite.py formula on top of the batched engine."""
+    n = X.shape[0]
+    _, n_X, n_Y = kraskov_counts(X, Y, k=k, radius_offset=-1e-10)
+    I = digamma(k) - np.mean((digamma(n_X + 1) + digamma(n_Y + 1)) / 2)
+    I += digamma(n)
+    return max(0.0, I)
+
+
+def generate_coupled(n_samples: int, d_x: int, d_y: int, seed: int):
+    """Continuous X, Y with partial linear coupling."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_samples, d_x))
+    W = rng.normal(size=(d_x, d_y)) / np.sqrt(d_x)
+    Y = X @ W + 0.5 * rng.normal(size=(n_samples, d_y))
+    return X, Y
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+def test_parity_metrics_knn_mi():
+    """metrics.py estimate is unchanged (low-dim tree and high-dim brute paths)."""
+    metrics_v2 = _load_metrics_v2()
+
+    for seed, (d_x, d_y) in enumerate([(4, 2), (8, 3), (24, 8)]):
+        X, Y = generate_coupled(400, d_x, d_y, seed)
+        expected = reference_metrics_mi(X, Y, k=5)
+        got = metrics_v2.knn_mutual_information(X, Y, k=5)
+        assert np.isclose(got, expected, rtol=1e-12, atol=1e-12), (d_x, d_y, got, expected)
+
+
+def test_parity_validation_suite_knn_mi():
+    """validation_suite.py estimate (strict radius, halved marginals) is unchanged."""
+    for seed, (d_x, d_y) in enumerate([(4, 2), (8, 3), (24, 8)]):
+        X, Y = generate_coupled(400, d_x, d_y, seed)
+        expected = reference_validation_suite_mi(X, Y, k=5)
+        got = batched_validation_suite_mi(X, Y, k=5)
+        assert np.isclose(got, expected, rtol=1e-12, atol=1e-12), (d_x, d_y, got, expected)
+
+
+def test_parity_estimate_I_ratio():
+    """estimate_I_ratio on continuous states matches the per-sample path."""
+    metrics_v2 = _load_metrics_v2()
+    rng = np.random.default_rng(7)
+    states = rng.normal(size=(300, 12))
+    targets = states[:, :3] + 0.3 * rng.normal(size=(300, 3))
+
+    half = states[:, :6]
+    expected_total = reference_metrics_mi(states, targets)
+    expected_direct = reference_metrics_mi(half, targets)
+
+    assert np.isclose(metrics_v2.knn_mutual_information(states, targets), expected_total, rtol=1e-12)
+    assert np.isclose(metrics_v2.knn_mutual_information(half, targets), expected_direct, rtol=1e-12)
+
+
+def test_tree_and_brute_backends_agree():
+    """Both backends return identical radii and counts on continuous data."""
+    X, Y = generate_coupled(500, 20, 6, seed=3)
+    for offset in (0.0, -1e-10):
+        eps_tree, nx_tree, ny_tree = kraskov_counts(X, Y, backend='tree', radius_offset=offset)
+        eps_brute, nx_brute, ny_brute = kraskov_counts(X, Y, backend='brute', radius_offset=offset)
+        assert np.allclose(eps_tree, eps_brute, rtol=1e-10)
+        assert np.array_equal(nx_tree, nx_brute)
+        assert np.array_equal(ny_tree, ny_brute)
+
+
+def test_brute_counts_label_ties_inclusively():
+    """With one-hot labels the k-th joint neighbour of the same label is counted in X."""
+    rng = np.random.default_rng(11)
+    X = rng.normal(size=(300, 30))
+    labels = np.eye(3)[rng.integers(0, 3, 300)]
+    k = 5
+
+    eps, n_x, _ = kraskov_counts(X, labels, k=k, backend='brute')
+
+    d_x = np.sqrt(((X[:, None, :] - X[None, :, :]) ** 2).sum(-1))
+    d_y = np.sqrt(((labels[:, None, :] - labels[None, :, :]) ** 2).sum(-1))
+    d_joint = np.sqrt(d_x ** 2 + d_y ** 2)
+    expected_eps = np.sort(d_joint, axis=1)[:, k]
+    # Loose tolerance absorbs the matmul-vs-difference rounding on the boundary
+    expected_n_x = (d_x <= expected_eps[:, None] * (1 + 1e-9)).sum(1) - 1
+
+    assert np.allclose(eps, expected_eps, rtol=1e-10)
+    assert np.array_equal(n_x, expected_n_x)
+
+
+def test_sorted_projection_counter_1d():
+    """1-D counts from searchsorted equal tree ball counts."""
+    rng = np.random.default_rng(5)
+    x = rng.normal(size=(1000, 1))
+    radii = knn_radii(x, k=4) * 1.5
+
+    tree_counts = cKDTree(x).query_ball_point(x, r=radii, return_length=True) - 1
+    assert np.array_equal(count_neighbors_within(x, radii), tree_counts)
+
+
+def test_kraskov_mi_gaussian():
+    """KSG-1 (max-norm) recovers the analytic MI of correlated Gaussians."""
+    rng = np.random.default_rng(0)
+    rho = 0.8
+    x = rng.normal(size=(4000, 1))
+    y = rho * x + np.sqrt(1 - rho**2) * rng.normal(size=(4000, 1))
+
+    mi = kraskov_mi(x, y, k=5)
+    mi_true = -0.5 * np.log(1 - rho**2)
+    assert abs(mi - mi_true) < 0.05, (mi, mi_true)
+
+
+def test_context_mi_matches_kraskov_counts():
+    """MIContext.mi reproduces the metrics.py estimate on both backends."""
+    metrics_v2 = _load_metrics_v2()
+    for d_x, d_y in [(4, 2), (24, 8)]:
+        X, Y = generate_coupled(400, d_x, d_y, seed=d_x)
+        context = MIContext({'X': X, 'Y': Y}, k=5)
+        expected = metrics_v2.knn_mutual_information(X, Y, k=5)
+        assert np.isclose(max(0.0, context.mi('X', 'Y')), expected, rtol=1e-12, atol=1e-12)
+
+
+def test_context_frenzel_pompe_matches_loop():
+    """Vectorized Frenzel-Pompe CMI equals the per-sample validation_suite loop."""
+    rng = np.random.default_rng(2)
+    Z = rng.normal(size=(400, 3))
+    X = Z[:, :2] + 0.5 * rng.normal(size=(400, 2))
+    Y = X[:, :1] + Z[:, 2:] + 0.5 * rng.normal(size=(400, 1))
+
+    expected = reference_frenzel_pompe_cmi(X, Y, Z, k=5)
+    context = MIContext({'X': X, 'Y': Y, 'Z': Z}, k=5, radius_offset=-1e-10)
+    assert np.isclose(max(0.0, context.cmi('X', 'Y', 'Z')), expected, rtol=1e-12)
+
+
+def test_context_backends_agree_on_cmi():
+    """Tree and brute contexts give identical CMI on continuous data."""
+    rng = np.random.default_rng(4)
+    Z = rng.normal(size=(300, 8))
+    X = Z @ rng.normal(size=(8, 6)) + rng.normal(size=(300, 6))
+    Y = X[:, :4] + rng.normal(size=(300, 4))
+    blocks = {'X': X, 'Y': Y, 'Z': Z}
+
+    tree = MIContext(blocks, k=5, backend='tree').cmi('X', 'Y', 'Z')
+    brute = MIContext(blocks, k=5, backend='brute').cmi('X', 'Y', 'Z')
+    assert np.isclose(tree, brute, rtol=1e-12)
+
+
+def test_context_reuses_structures():
+    """Overlapping decompositions build each subset tree only once."""
+    rng = np.random.default_rng(6)
+    blocks = {name: rng.normal(size=(200, 2)) for name in ('X1', 'X3', 'X4')}
+    context = MIContext(blocks, k=5, p=np.inf, strict=True)
+
+    context.mi('X4', 'X1')
+    context.mi('X4', 'X3')
+    context.cmi('X4', 'X1', 'X3')
+    n_trees = len(context._trees)
+    # Joint (X1,X4), (X3,X4), (X1,X3,X4) + marginals X1, X3, X4, (X1,X3)
+    assert n_trees == 7, sorted(context._trees)
+
+    # Repeating the decomposition is served entirely from the cache
+    first = context.cmi('X4', 'X1', 'X3')
+    assert context.cmi('X4', 'X1', 'X3') == first
+    assert len(context._trees) == n_trees
+
+
+def test_frenzel_pompe_chain_rule():
+    """FP CMI agrees with the two-run I(X;YZ) - I(X;Z) decomposition on Gaussians."""
+    rng = np.random.default_rng(9)
+    n = 3000
+    Z = rng.normal(size=(n, 1))
+    X = Z + rng.normal(size=(n, 1))
+    Y = X + Z + rng.normal(size=(n, 1))
+
+    # Analytic: I(X;Y|Z) = 0.5 log(Var(Y|Z) / Var(Y|X,Z)) = 0.5 log 2
+    cmi_true = 0.5 * np.log(2.0)
+    context = MIContext({'X': X, 'Y': Y, 'Z': Z}, k=5, p=np.inf, strict=True)
+    assert abs(context.cmi('X', 'Y', 'Z') - cmi_true) < 0.05
+
+
+def test_sliding_window_matches_context():
+    """After every slide the window reproduces a fresh MIContext on its rows."""
+    rng = np.random.default_rng(12)
+    n_total = 900
+    X = rng.normal(size=(n_total, 3))
+    Y = X[:, :2] + 0.5 * rng.normal(size=(n_total, 2))
+    Z = X[:, 2:] + Y[:, :1] + 0.5 * rng.normal(size=(n_total, 1))
+
+    for p in (np.inf, 2):
+        window = SlidingMIWindow({'X': 3, 'Y': 2, 'Z': 1}, capacity=300, k=5, p=p, strict=True)
+        window.slide({'X': X[:300], 'Y': Y[:300], 'Z': Z[:300]})
+
+        for start in range(0, 601, 40):
+            if start > 0:
+                new = slice(start + 260, start + 300)
+                window.slide({'X': X[new], 'Y': Y[new], 'Z': Z[new]}, n_evict=40)
+
+            rows = slice(start, start + 300)
+            context = MIContext({'X': X[rows], 'Y': Y[rows], 'Z': Z[rows]},
+                                k=5, p=p, strict=True, backend='tree')
+            assert np.isclose(window.mi('X', 'Y'), context.mi('X', 'Y'), rtol=1e-12, atol=1e-12)
+            assert np.isclose(window.cmi('X', 'Y', 'Z'), context.cmi('X', 'Y', 'Z'), rtol=1e-12, atol=1e-12)
+
+
+def test_incremental_trajectory_matches_full():
+    """compute_I_ratio_trajectory(incremental=True) returns the per-window ksg results."""
+    from compute_I_ratio_embeddings import compute_I_ratio_trajectory
+
+    rng = np.random.default_rng(13)
+    T, N = 120, 4
+    X1 = rng.normal(size=(T, N, 3))
+    X3 = X1 @ rng.normal(size=(3, 3)) + 0.3 * rng.normal(size=(T, N, 3))
+    X4 = X3 @ rng.normal(size=(3, 2)) + 0.3 * rng.normal(size=(T, N, 2))
+    logs = {"X1": X1, "X3": X3, "X4": X4}
+
+    for window_size, stride in [(40, 10), (40, 25), (30, 45)]:
+        full, full_diag = compute_I_ratio_trajectory(logs, window_size, stride, k=5, method="ksg")
+        inc, inc_diag = compute_I_ratio_trajectory(logs, window_size, stride, k=5, method="ksg",
+                                                   incremental=True)
+        assert full.shape == inc.shape
+        assert np.allclose(full, inc, rtol=1e-12, atol=1e-12)
+        for a, b in zip(full_diag, inc_diag):
+            assert (a["t_start"], a["t_end"], a["n_samples"]) == (b["t_start"], b["t_end"], b["n_samples"])
+            assert np.isclose(a["I_direct"], b["I_direct"], rtol=1e-12, atol=1e-12)
+
+
+def test_trajectory_records_failed_window(monkeypatch):
+    """A window whose estimate raises gets an error diagnostic on both paths; later windows still run."""
+    import compute_I_ratio_embeddings as cie
+
+    rng = np.random.default_rng(13)
+    X1 = rng.normal(size=(120, 4, 3))
+    logs = {"X1": X1, "X3": X1 + 0.3 * rng.normal(size=X1.shape), "X4": rng.normal(size=(120, 4, 2))}
+    original = cie._compute_I_ratio_shared
+    expected, _ = cie.compute_I_ratio_trajectory(logs, 40, 20, k=5, method="ksg")
+
+    for incremental in (False, True):
+        calls = []
+
+        def failing_third_window(*args, **kwargs):
+            calls.append(None)
+            if len(calls) == 3:
+                raise FloatingPointError("degenerate window")
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(cie, "_compute_I_ratio_shared", failing_third_window)
+        ratios, diags = cie.compute_I_ratio_trajectory(logs, 40, 20, k=5, method="ksg",
+                                                       incremental=incremental)
+        assert len(ratios) == len(expected) == 5 and ratios[2] == 0.0
+        assert diags[2]["error"] == "degenerate window"
+        assert all("error" not in d for i, d in enumerate(diags) if i != 2)
+        mask = np.arange(5) != 2
+        assert np.allclose(ratios[mask], expected[mask], rtol=1e-12, atol=1e-12)
+
+
+def run_all():
+    test_parity_metrics_knn_mi()
+    test_parity_validation_suite_knn_mi()
+    test_parity_estimate_I_ratio()
+    test_tree_and_brute_backends_agree()
+    test_brute_counts_label_ties_inclusively()
+    test_sorted_projection_counter_1d()
+    test_kraskov_mi_gaussian()
+    test_context_mi_matches_kraskov_counts()
+    test_context_frenzel_pompe_matches_loop()
+    test_context_backends_agree_on_cmi()
+    test_context_reuses_structures()
+    test_frenzel_pompe_chain_rule()
+    test_sliding_window_matches_context()
+    test_incremental_trajectory_matches_full()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_trajectory_records_failed_window(monkeypatch)
+    print("All knn_mi engine parity tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
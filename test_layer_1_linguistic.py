@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE BATCHED L1 LINGUISTIC LAYER (layer_1_linguistic.py)
+=================================================================
+
+1. Same embeddings and d_sem as the per-task loop with a full SVD
+2. Misses go to the LLM in one embed_batch call; stable task lists are free
+3. LRU eviction and embed()-only clients
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import numpy as np
+
+from layer_1_linguistic import Layer1Linguistic
+
+
+def _vector(text, dim=128):
+    seed = int.from_bytes(text.encode()[:8].ljust(8, b'\0'), 'little') + len(text)
+    return np.random.default_rng(seed).normal(size=dim).astype(np.float32)
+
+
+class _LLM:
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, text):
+        self.calls.append(('embed', text))
+        return _vector(text)
+
+    def embed_batch(self, texts):
+        self.calls.append(('batch', list(texts)))
+        return np.vstack([_vector(t) for t in texts])
+
+
+class _EmbedOnly:
+    def __init__(self):
+        self.llm = _LLM()
+
+    def embed(self, text):
+        return self.llm.embed(text)
+
+
+class _Task:
+    def __init__(self, description):
+        self.description = description
+
+
+def _reference(llm, tasks):
+    mat = np.vstack([llm.embed(t.description) for t in tasks])
+    X = mat - mat.mean(axis=0, keepdims=True)
+    S = np.linalg.svd(X, full_matrices=False)[1]
+    cum = np.cumsum(S**2 / ((S**2).sum() + 1e-8))
+    return mat, float(np.searchsorted(cum, 0.9) + 1)
+
+
+def test_matches_loop():
+    tasks = [_Task(f"task {i}: {'x' * i}") for i in range(20)]
+    layer = Layer1Linguistic(_LLM())
+    mat = layer.process_tasks(tasks)
+    want, d_sem = _reference(_LLM(), tasks)
+    assert np.array_equal(mat, want) and layer.d_sem == d_sem
+    assert layer.process_tasks([tasks[0]]).shape == (1, 128) and layer.d_sem == 1.0
+    empty = layer.process_tasks([])
+    assert empty.shape == (1, 128) and not empty.any() and layer.d_sem == 1.0
+
+
+def test_batch_and_stable_steps():
+    llm = _LLM()
+    layer = Layer1Linguistic(llm)
+    tasks = [_Task(d) for d in ("plan party", "buy cake", "plan party", "invite guests")]
+    first = layer.process_tasks(tasks)
+    assert llm.calls == [('batch', ["plan party", "buy cake", "invite guests"])]
+
+    d_sem = layer.d_sem
+    layer._estimate_d_sem = None  # any recomputation would fail
+    for _ in range(100):
+        assert layer.process_tasks(tasks) is first
+    assert layer.d_sem == d_sem and len(llm.calls) == 1
+    assert not first.flags.writeable
+
+    # one new description → one batch of one; reordered list → no LLM call
+    tasks.append(_Task("send invitations"))
+    del layer._estimate_d_sem
+    layer.process_tasks(tasks)
+    assert llm.calls[-1] == ('batch', ["send invitations"])
+    layer.process_tasks(tasks[::-1])
+    assert len(llm.calls) == 2
+
+
+def test_lru_and_embed_only():
+    llm = _LLM()
+    layer = Layer1Linguistic(llm, cache_size=3)
+    for d in ("a", "b", "c"):
+        layer.process_tasks([_Task(d)])
+    layer.process_tasks([_Task("a")])      # refresh "a"
+    layer.process_tasks([_Task("d")])      # evicts "b"
+    assert list(layer._cache) == ["c", "a", "d"]
+    layer.process_tasks([_Task("b"), _Task("a")])
+    assert llm.calls[-1] == ('batch', ["b"])
+
+    client = _EmbedOnly()
+    tasks = [_Task(f"t{i}") for i in range(5)]
+    mat = Layer1Linguistic(client).process_tasks(tasks)
+    assert np.array_equal(mat, _reference(_LLM(), tasks)[0])
+    assert [c[0] for c in client.llm.calls] == ['embed'] * 5
+
+
+def run_all():
+    test_matches_loop()
+    test_batch_and_stable_steps()
+    test_lru_and_embed_only()
+    print("All L1 linguistic tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
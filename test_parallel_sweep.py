@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE PARALLEL / RESUMABLE PARAMETER SWEEP (runner.py)
+==============================================================
+
+1. Same seed -> same result, independent of global np.random state
+2. Process-pool sweep is bit-identical to the serial sweep
+3. Interrupted sweep resumes from the JSONL store (partial line dropped)
+4. A failing run does not discard the other runs (serial and pool)
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import json
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+import runner
+from runner import (ExperimentConfig, SweepStore, config_key, parameter_sweep,
+                    result_from_dict, result_to_dict, run_single_experiment)
+
+
+BASE = ExperimentConfig(n_agents=4, state_dim=8, n_steps=30)
+GRID = {'theta_opt': [0.10, 0.15, 0.20], 'gamma': [0.05, 0.1]}
+
+
+def _as_json(results):
+    return [json.dumps(result_to_dict(r), sort_keys=True) for r in results]
+
+
+def test_run_is_independent_of_global_state():
+    config = ExperimentConfig(n_agents=4, state_dim=8, n_steps=30, seed=3)
+    np.random.seed(0)
+    a = run_single_experiment(config)
+    np.random.seed(999)
+    np.random.randn(17)
+    b = run_single_experiment(config)
+    assert result_to_dict(a) == result_to_dict(b)
+
+
+def test_result_dict_roundtrip():
+    result = run_single_experiment(ExperimentConfig(n_agents=4, state_dim=8, n_steps=30, seed=1))
+    data = json.loads(json.dumps(result_to_dict(result)))
+    assert json.dumps(result_to_dict(result_from_dict(data)), sort_keys=True) == \
+        json.dumps(result_to_dict(result), sort_keys=True)
+
+
+def test_parallel_sweep_bit_identical_to_serial():
+    serial = parameter_sweep(GRID, BASE, verbose=False)
+    parallel = parameter_sweep(GRID, BASE, verbose=False, n_workers=2, chunk_size=2)
+    assert _as_json(serial) == _as_json(parallel)
+    assert [r.config.seed for r in parallel] == list(range(6))
+
+
+def test_sweep_resumes_from_store():
+    serial = parameter_sweep(GRID, BASE, verbose=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sweep.jsonl"
+
+        # Interrupted sweep: first two runs stored, third cut mid-write
+        store = SweepStore(str(path))
+        for r in serial[:2]:
+            store.append(config_key(r.config), result_to_dict(r))
+        with open(path, 'a') as f:
+            f.write('{"key": "' + config_key(serial[2].config) + '", "resu')
+
+        calls = []
+        original = runner.run_single_experiment
+
+        def counting(config, verbose=False):
+            calls.append(config.seed)
+            return original(config, verbose=verbose)
+
+        runner.run_single_experiment = counting
+        try:
+            resumed = parameter_sweep(GRID, BASE, verbose=False, store_path=str(path))
+        finally:
+            runner.run_single_experiment = original
+
+        assert calls == [2, 3, 4, 5]
+        assert _as_json(resumed) == _as_json(serial)
+        assert len(SweepStore(str(path))) == 6
+
+        # Fully stored sweep reruns nothing
+        calls.clear()
+        again = parameter_sweep(GRID, BASE, verbose=False, store_path=str(path))
+        assert _as_json(again) == _as_json(serial)
+
+
+def test_failed_run_keeps_finished_runs():
+    serial = parameter_sweep(GRID, BASE, verbose=False)
+    grid = {'theta_opt': GRID['theta_opt'], 'gamma': [0.05, 'bad']}   # 'bad' raises in every other run
+
+    for kwargs in ({}, {'n_workers': 2}, {'n_workers': 2, 'chunk_size': 2}):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sweep.jsonl"
+            try:
+                parameter_sweep(grid, BASE, verbose=False, store_path=str(path), **kwargs)
+                raise AssertionError("failed runs not reported")
+            except RuntimeError as e:
+                assert "3 of 6" in str(e) and "[1, 3, 5]" in str(e), str(e)
+            stored = SweepStore(str(path))
+            assert len(stored) == 3, kwargs
+            assert _as_json(stored.get(config_key(r.config)) for r in serial[0::2]) == _as_json(serial[0::2])
+
+
+def test_config_key_depends_on_seed():
+    assert config_key(BASE) == config_key(ExperimentConfig(**asdict(BASE)))
+    assert config_key(ExperimentConfig(seed=1)) != config_key(ExperimentConfig(seed=2))
+
+
+def run_all():
+    test_run_is_independent_of_global_state()
+    test_result_dict_roundtrip()
+    test_parallel_sweep_bit_identical_to_serial()
+    test_sweep_resumes_from_store()
+    test_failed_run_keeps_finished_runs()
+    test_config_key_depends_on_seed()
+    print("All parallel sweep tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
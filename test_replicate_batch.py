@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+PARITY TESTS FOR THE BATCHED REPLICATE SIMULATOR (runner.py)
+============================================================
+
+run_replicate_batch advances R ensembles as one (R, N, D) tensor; each
+replicate must match run_single_experiment with the same config.
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import numpy as np
+
+from metrics import compute_dwell_times, extract_r4_regions
+from runner import ExperimentConfig, run_replicate_batch, run_single_experiment
+from theory import AdaptonicCalculator
+
+
+def _configs(n_steps=80):
+    thetas = [0.05, 0.10, 0.15, 0.25, 0.40, 0.60]
+    gammas = [0.05, 0.1, 0.2]
+    lambdas = [0.5, 1.5, 2.0, 3.0]
+    return [
+        ExperimentConfig(n_agents=5, state_dim=16, n_steps=n_steps, seed=i,
+                         theta_opt=thetas[i % 6], gamma=gammas[i % 3], lambda_0=lambdas[i % 4],
+                         cycle_period=50 + 10 * (i % 2))
+        for i in range(12)
+    ]
+
+
+def test_batch_state_matches_single_state():
+    rng = np.random.default_rng(0)
+    states = rng.standard_normal((4, 6, 10))
+    lambda_0 = np.array([1.0, 2.0, 2.5, 3.0])
+    theta_opt = np.array([0.1, 0.15, 0.2, 0.3])
+    batch = AdaptonicCalculator(lambda_0=lambda_0, theta_opt=theta_opt).compute_full_state_batch(states, 13)
+
+    for r in range(4):
+        single = AdaptonicCalculator(lambda_0=lambda_0[r], theta_opt=theta_opt[r]).compute_full_state(states[r], 13)
+        for name in ('sigma', 'alpha', 'theta_mean', 'free_energy', 'variance', 'lambda_eff'):
+            assert np.isclose(batch[name][r], getattr(single, name), rtol=1e-12), name
+        assert batch['phase'][r] == single.phase
+
+
+def test_replicates_match_single_runs():
+    configs = _configs()
+    batch = run_replicate_batch(configs)
+
+    for config, result in zip(configs, batch):
+        single = run_single_experiment(config)
+        assert result.r4_detected == single.r4_detected
+        assert result.t_transition == single.t_transition
+        assert result.n_r4_regions == single.n_r4_regions
+        assert [h['phase'] for h in result.history] == [h['phase'] for h in single.history]
+        for a, b in zip(result.history, single.history):
+            assert np.isclose(a['sigma'], b['sigma'], rtol=1e-9, atol=1e-12)
+            assert np.isclose(a['free_energy'], b['free_energy'], rtol=1e-9, atol=1e-9)
+
+
+def test_histories_feed_metrics():
+    result = run_replicate_batch(_configs(n_steps=40)[:3])[0]
+    regions = extract_r4_regions(result.history)
+    stats = compute_dwell_times(regions)
+    assert stats['n_regions'] == result.n_r4_regions
+    assert all(isinstance(h['phase'], str) for h in result.history)
+
+
+def test_mismatched_shapes_rejected():
+    configs = [ExperimentConfig(n_agents=4, seed=0), ExperimentConfig(n_agents=5, seed=1)]
+    try:
+        run_replicate_batch(configs)
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError for mismatched n_agents")
+
+
+def run_all():
+    test_batch_state_matches_single_state()
+    test_replicates_match_single_runs()
+    test_histories_feed_metrics()
+    test_mismatched_shapes_rejected()
+    print("All replicate batch tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE BATCH Θ ENGINE (run_theta_batch.py)
+=================================================
+
+1. Records / gates match extract_theta_full_pipeline + the per-material gate loop
+2. Process pool gives the same rows as the serial run
+3. CSV streaming (NaN as empty cell)
+4. Spectra / memory functions are computed once per (material, T, grid)
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import csv
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+import run_theta_batch as rtb
+from extract_theta_from_optical import (
+    MATERIALS, generate_dummy_data, compute_memory_function,
+    spectral_measure, extract_theta, extract_theta_full_pipeline
+)
+
+KEYS = ['LSCO_x015', 'YBCO']
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float):
+        return (np.isnan(a) and np.isnan(b)) or abs(a - b) <= 1e-12*max(1.0, abs(a))
+    return a == b
+
+
+def _reference(key):
+    """Previous per-material loop of run_theta_batch.py (verbatim logic)."""
+    mat = MATERIALS[key]
+    Ts = rtb.temp_grid(mat.Tc)
+    res = extract_theta_full_pipeline(key, Ts, use_dummy=True, energy_method='canonical', verbose=False)
+    T_demo = int(max(Ts.min(), min(int(1.1*mat.Tc), Ts.max())))
+    w, s1, s2 = generate_dummy_data(key, T_demo, omega_max=5.0, n_points=600)
+    M1, _, Mdiag = compute_memory_function(w, s1, s2, mat.omega_p)
+    thetas = np.array([extract_theta(w, spectral_measure(w, s1, method='f-sum'), M1, energy_method=em)[0]
+                       for em in ['canonical', 'memory', 'corrected']], dtype=float)
+    sens = float(np.std(thetas)/np.mean(thetas)) if np.isfinite(thetas).all() and np.mean(thetas) != 0 else float('nan')
+    return {
+        'Theta_c_eV': float(res['Theta_c']),
+        'RelError': float(res['validation']['relative_error']),
+        'KK_violation': Mdiag.get('kk_violation', float('nan')),
+        'Method_agreement': float(res['Theta_c_diagnostics']['agreement']),
+        'Sensitivity': sens,
+        'Validation_status': res['validation']['status'],
+    }
+
+
+def test_matches_pipeline():
+    records, gates = rtb.run_theta_batch(KEYS)
+    assert [r['Material'] for r in records] == [MATERIALS[k].name for k in KEYS]
+    assert [g['Material'] for g in gates] == [MATERIALS[k].name for k in KEYS]
+    for key, record, gate in zip(KEYS, records, gates):
+        for field, want in _reference(key).items():
+            assert _same(record[field], want), (key, field, record[field], want)
+        assert gate['OVERALL'] == record['Overall_PASS']
+
+
+def test_parallel_matches_serial():
+    serial = rtb.run_theta_batch(KEYS, T_step=20.0)
+    parallel = rtb.run_theta_batch(KEYS, T_step=20.0, n_workers=2, chunk_size=3)
+    for rows_s, rows_p in zip(serial, parallel):
+        for a, b in zip(rows_s, rows_p):
+            assert a.keys() == b.keys()
+            assert all(_same(a[k], b[k]) for k in a)
+
+
+def test_csv_streaming():
+    with tempfile.TemporaryDirectory() as tmp:
+        summary, gates = Path(tmp) / "summary.csv", Path(tmp) / "gates.csv"
+        records, _ = rtb.run_theta_batch(KEYS, summary_path=str(summary), gates_path=str(gates))
+        with open(summary, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        with open(gates, newline='', encoding='utf-8') as f:
+            gate_rows = list(csv.DictReader(f))
+    assert list(rows[0]) == rtb.SUMMARY_FIELDS
+    assert [r['Material'] for r in rows] == [r['Material'] for r in records]
+    assert len(gate_rows) == len(KEYS) and list(gate_rows[0]) == rtb.GATE_FIELDS
+    for row, record in zip(rows, records):
+        v = record['KK_violation']
+        assert row['KK_violation'] == ('' if np.isnan(v) else str(v))
+
+
+def test_spectra_cached_per_point():
+    rtb.load_spectrum.cache_clear()
+    rtb.memory_function.cache_clear()
+    rtb.run_theta_batch(['YBCO'], T_step=10.0)
+    n_T = len(rtb.temp_grid(MATERIALS['YBCO'].Tc, 10.0))
+    info = rtb.memory_function.cache_info()
+    assert info.misses == n_T + 1 and info.hits == 0
+    rtb.run_theta_batch(['YBCO'], T_step=10.0)
+    assert rtb.memory_function.cache_info().hits == n_T + 1
+    assert rtb.load_spectrum.cache_info().misses == n_T + 1
+
+
+def run_all():
+    test_matches_pipeline()
+    test_parallel_matches_serial()
+    test_csv_streaming()
+    test_spectra_cached_per_point()
+    print("All batch Θ tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE INDEXED SigmaStorage (sigma_storage.py)
+=====================================================
+
+1. Retrieval and local σ match the previous per-item loop
+2. Capacity with 'fifo' / 'lowest_sigma' eviction
+3. save() / open() round trip with a memory-mapped matrix
+4. IVF-flat ANN index (sigma_ann.py): exact at full probe, recall knob
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from sigma_ann import IVFFlatIndex
+from sigma_storage import SigmaStorage
+
+
+class ReferenceSigmaStorage:
+    """Previous list-based implementation (verbatim logic)."""
+
+    def __init__(self):
+        self.memories = []
+
+    def store(self, embedding, metadata):
+        sigma_val = self._compute_local_sigma(embedding)
+        self.memories.append((embedding.astype(float), metadata, float(sigma_val)))
+
+    def retrieve_by_embedding(self, query_embedding, k=5):
+        if not self.memories:
+            return []
+        sims = []
+        q = query_embedding.astype(float)
+        q_norm = np.linalg.norm(q) + 1e-8
+        for idx, m in enumerate(self.memories):
+            denom = q_norm * (np.linalg.norm(m[0]) + 1e-8)
+            sim = float(np.dot(q, m[0]) / denom) if denom > 0 else 0.0
+            sims.append((sim, idx))
+        sims.sort(key=lambda x: x[0], reverse=True)
+        return [self.memories[idx] for _, idx in sims[:k]]
+
+    def _compute_local_sigma(self, embedding, window=10):
+        if not self.memories:
+            return 0.5
+        recent = self.memories[-window:]
+        v = embedding.astype(float)
+        v_norm = np.linalg.norm(v) + 1e-8
+        sims = []
+        for m in recent:
+            denom = v_norm * (np.linalg.norm(m[0]) + 1e-8)
+            sims.append(float(np.dot(v, m[0]) / denom) if denom > 0 else 0.0)
+        return float(np.mean(sims))
+
+
+def _filled(n=400, dim=32, seed=0, **kwargs):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n, dim))
+    storage = SigmaStorage(**kwargs)
+    for i, e in enumerate(embeddings):
+        storage.store(e, {'i': i})
+    return storage, embeddings
+
+
+def test_matches_reference_loop():
+    storage, embeddings = _filled()
+    reference = ReferenceSigmaStorage()
+    for i, e in enumerate(embeddings):
+        reference.store(e, {'i': i})
+
+    for item, ref in zip(storage.memories, reference.memories):
+        assert item.metadata == ref[1]
+        assert abs(item.sigma - ref[2]) < 1e-6
+        assert np.array_equal(item.embedding, ref[0])
+
+    rng = np.random.default_rng(1)
+    for q in rng.standard_normal((30, 32)):
+        got = [m.metadata['i'] for m in storage.retrieve_by_embedding(q, k=5)]
+        want = [m[1]['i'] for m in reference.retrieve_by_embedding(q, k=5)]
+        assert got == want
+
+    assert [m.metadata['i'] for m in storage.recent(3)] == [397, 398, 399]
+    assert len(storage.retrieve_by_embedding(embeddings[0], k=1000)) == 400
+
+
+def test_fifo_eviction():
+    storage, embeddings = _filled(n=50, capacity=8)
+    assert len(storage) == 8
+    assert [m.metadata['i'] for m in storage.memories] == list(range(42, 50))
+    assert storage.retrieve_by_embedding(embeddings[45], k=1)[0].metadata['i'] == 45
+    assert storage.retrieve_by_embedding(embeddings[3], k=1)[0].metadata['i'] != 3
+    assert len(storage._order) == 8
+    assert len(_filled(n=50)[0]._order) == 0
+
+
+def test_lowest_sigma_eviction():
+    rng = np.random.default_rng(2)
+    storage = SigmaStorage(capacity=8, eviction='lowest_sigma')
+    for i, e in enumerate(rng.standard_normal((50, 32))):
+        before = {m.metadata['i']: m.sigma for m in storage.memories}
+        storage.store(e, {'i': i})
+        after = {m.metadata['i'] for m in storage.memories}
+        evicted = set(before) - after
+        if len(before) == 8:
+            assert len(evicted) == 1
+            assert before[evicted.pop()] == min(before.values())
+        assert i in after
+    assert len(storage) == 8 and len(storage._order) == 0
+
+
+def test_save_and_open_memory_mapped():
+    storage, embeddings = _filled(n=120)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "memory"
+        storage.save(path)
+        assert path.with_suffix(".npy").exists() and path.with_suffix(".json").exists()
+
+        reopened = SigmaStorage.open(path)
+        assert isinstance(reopened._emb, np.memmap)
+        assert len(reopened) == 120
+
+        q = embeddings[17] + 0.01
+        assert [m.metadata for m in reopened.retrieve_by_embedding(q, k=4)] == \
+            [m.metadata for m in storage.retrieve_by_embedding(q, k=4)]
+        assert np.allclose(reopened.memories[5].embedding, embeddings[5], atol=1e-5)
+
+        extra = np.random.default_rng(9).standard_normal(32)
+        storage.store(extra, {'i': 'extra'})
+        reopened.store(extra, {'i': 'extra'})
+        assert len(reopened) == 121
+        assert abs(reopened.recent(1)[0].sigma - storage.recent(1)[0].sigma) < 1e-6
+
+
+def test_invalid_arguments():
+    for kwargs in ({'eviction': 'random'}, {'capacity': 0}):
+        try:
+            SigmaStorage(**kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {kwargs}")
+
+    storage, _ = _filled(n=3)
+    try:
+        storage.store(np.zeros(5), {})
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError for wrong embedding dim")
+
+
+def _clustered(n=3000, dim=24, n_centers=60, seed=3):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_centers, dim))
+    X = centers[rng.integers(0, n_centers, n)] + 0.4 * rng.standard_normal((n, dim))
+    Q = centers[rng.integers(0, n_centers, 40)] + 0.4 * rng.standard_normal((40, dim))
+    return X, Q
+
+
+def test_ann_index_full_probe_is_exact():
+    X, Q = _clustered()
+    index = IVFFlatIndex(n_lists=32, min_train=500)
+    storage = SigmaStorage(index=index)
+    for i, x in enumerate(X):
+        storage.store(x, {'i': i})
+    assert index.is_trained and index.trained_size >= 500
+
+    index.n_probe = 32
+    for q in Q:
+        got = [m.metadata['i'] for m in storage.retrieve_by_embedding(q, k=5)]
+        want = [m.metadata['i'] for m in storage.retrieve_by_embedding(q, k=5, exact=True)]
+        assert got == want
+
+
+def test_ann_recall_knob_and_benchmark():
+    X, Q = _clustered()
+    storage = SigmaStorage(index=IVFFlatIndex(n_lists=64, min_train=500))
+    for i, x in enumerate(X):
+        storage.store(x, {'i': i})
+
+    recalls = []
+    for n_probe in (1, 4, 64):
+        storage.index.n_probe = n_probe
+        report = storage.benchmark_recall(Q, k=5)
+        assert set(report) == {'recall', 'exact_ms', 'ann_ms'}
+        recalls.append(report['recall'])
+    assert recalls == sorted(recalls)
+    assert recalls[-1] == 1.0
+    assert recalls[1] >= 0.8
+
+
+def test_ann_index_tracks_eviction():
+    X, Q = _clustered(n=1200)
+    index = IVFFlatIndex(n_lists=16, n_probe=16, min_train=200)
+    storage = SigmaStorage(capacity=300, index=index)
+    for i, x in enumerate(X):
+        storage.store(x, {'i': i})
+
+    assert int(index._sizes.sum()) == len(storage) == 300
+    live = {m.metadata['i'] for m in storage.memories}
+    for q in Q:
+        got = storage.retrieve_by_embedding(q, k=5)
+        assert {m.metadata['i'] for m in got} <= live
+        assert [m.metadata['i'] for m in got] == \
+            [m.metadata['i'] for m in storage.retrieve_by_embedding(q, k=5, exact=True)]
+
+
+def test_small_storage_scans_exactly():
+    storage, embeddings = _filled(n=50, index=IVFFlatIndex(min_train=1024))
+    assert not storage.index.is_trained
+    assert storage.retrieve_by_embedding(embeddings[7], k=1)[0].metadata['i'] == 7
+
+
+def run_all():
+    test_matches_reference_loop()
+    test_fifo_eviction()
+    test_lowest_sigma_eviction()
+    test_save_and_open_memory_mapped()
+    test_invalid_arguments()
+    test_ann_index_full_probe_is_exact()
+    test_ann_recall_knob_and_benchmark()
+    test_ann_index_tracks_eviction()
+    test_small_storage_scans_exactly()
+    print("All SigmaStorage tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
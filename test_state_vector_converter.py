@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE BATCHED STATE VECTOR CONVERTER (llm_baseline_extended.py)
+=======================================================================
+
+1. Batch conversion = row-by-row conversion on the same seeded stream
+2. float32 output, reproducible per seed, per-layer noise levels
+3. PCA reduction = sklearn transform; IncrementalPCA spans the same subspace
+4. BaselineRunner preconverts all texts once
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import tempfile
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+from llm_baseline import BaselineExperiment, BaselineRunner
+from llm_baseline_extended import LLMConfig, MockEmbeddingProvider, StateVectorConverter
+
+
+def _embeddings(n=300, dim=64, rank=8, seed=0):
+    rng = np.random.default_rng(seed)
+    E = rng.standard_normal((n, rank)) @ rng.standard_normal((rank, dim)) * 3
+    return E + 0.05 * rng.standard_normal((n, dim)) + 1.0
+
+
+def test_batch_matches_loop():
+    E = _embeddings(40)
+    for method in ('random_projection', 'truncate'):
+        batch = StateVectorConverter(64, 8, reduction_method=method, seed=3).embeddings_to_states(E)
+        loop = StateVectorConverter(64, 8, reduction_method=method, seed=3)
+        # one row at a time consumes the noise stream in the same order
+        rows = np.array([loop.embedding_to_state(e) for e in E])
+        assert batch.shape == (40, 8 * 5)
+        assert np.allclose(batch, rows, atol=1e-6)
+
+
+def test_dtype_seed_and_noise():
+    E = _embeddings(2000)
+    conv = StateVectorConverter(64, 8, n_layers=4, seed=11)
+    states = conv.embeddings_to_states(E)
+    assert states.dtype == np.float32 and conv.projection.dtype == np.float32
+    assert np.array_equal(states, StateVectorConverter(64, 8, n_layers=4, seed=11).embeddings_to_states(E))
+    assert not np.array_equal(states, StateVectorConverter(64, 8, n_layers=4, seed=12).embeddings_to_states(E))
+
+    layers = states.reshape(len(E), 4, 8)
+    reduced = (E @ conv.projection).astype(np.float32)
+    reduced /= np.linalg.norm(reduced, axis=1, keepdims=True)
+    noise_std = (layers - reduced[:, None, :]).std(axis=(0, 2))
+    assert np.allclose(noise_std, 0.05 + 0.10 * np.arange(4) / 4, rtol=0.03)
+
+
+def test_pca_and_incremental_pca():
+    E = _embeddings()
+    conv = StateVectorConverter(64, 8, reduction_method='pca', fit_pca=True, pca_data=E, seed=0)
+    reduced = conv.pca.transform(E)
+    reduced /= np.linalg.norm(reduced, axis=1, keepdims=True)
+    noise = conv.embeddings_to_states(E).reshape(len(E), 5, 8) - reduced[:, None, :]
+    assert np.all(np.abs(noise[:, 0]).max(axis=1) < 0.05 * 6)
+
+    streamed = StateVectorConverter(64, 8, reduction_method='pca', fit_pca=True, pca_data=E,
+                                    pca_batch_size=50)
+    assert type(streamed.pca).__name__ == 'IncrementalPCA'
+    # same principal subspace: singular values of U_pca^T U_ipca are all ~1
+    overlap = np.linalg.svd(conv.projection.T @ streamed.projection, compute_uv=False)
+    assert np.all(overlap > 1 - 1e-3)
+    assert np.allclose(streamed.offset, PCA(8).fit(E).mean_ @ streamed.projection, rtol=1e-3, atol=1e-3)
+
+
+def test_runner_preconverts():
+    texts = [f"text number {i}" for i in range(12)]
+    provider = MockEmbeddingProvider(LLMConfig(provider='mock', model='test', embedding_dim=32,
+                                               cache_embeddings=False))
+    conv = StateVectorConverter(32, 6, seed=5)
+    states = StateVectorConverter(32, 6, seed=5).texts_to_states(texts, provider, batch_size=5)
+    assert states.shape == (12, 30) and states.dtype == np.float32
+    assert np.allclose(states, conv.embeddings_to_states(provider.embed_batch(texts)), atol=1e-6)
+
+    experiment = BaselineExperiment(name='t', description='', texts=texts, tasks=[])
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = BaselineRunner(experiment, tmp)
+        out = runner.prepare_llm_states(provider, StateVectorConverter(32, 6, seed=5))
+    assert out is runner.llm_states and np.allclose(out, states, atol=1e-6)
+
+
+def run_all():
+    test_batch_matches_loop()
+    test_dtype_seed_and_noise()
+    test_pca_and_incremental_pca()
+    test_runner_preconverts()
+    print("All state vector converter tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
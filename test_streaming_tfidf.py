@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE STREAMING TF-IDF BACKEND (streaming_tfidf.py)
+===========================================================
+
+1. fit = sklearn TfidfTransformer (smooth idf, sublinear tf) on hashed counts
+2. Online IDF: chunked partial_fit = fit, distinct texts counted once
+3. save / load round trip without pickle
+4. Sparse helpers match the dense computations
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import tempfile
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfTransformer
+from sklearn.preprocessing import normalize
+
+from streaming_tfidf import HashingTFIDFBackend, similarities, dot, row_values, vector_std
+
+CORPUS = [
+    "Let's plan a surprise birthday party for Alice.",
+    "What about the budget for the party?",
+    "Who should we invite to the party?",
+    "What kind of cake does Alice like?",
+    "I love hiking in the mountains",
+    "My favorite color is blue",
+    "I work as a data scientist",
+    "Can you recommend a birthday gift for me?",
+]
+
+
+def test_matches_sklearn():
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = HashingTFIDFBackend(n_features=2**12, cache_folder=tmp)
+        backend.fit(CORPUS)
+        got = backend.transform(CORPUS)
+        assert sp.isspmatrix_csr(got) and got.shape == (len(CORPUS), 2**13)
+
+        blocks = []
+        for vectorizer in (backend.char_vectorizer, backend.word_vectorizer):
+            counts = vectorizer.transform(CORPUS)
+            blocks.append(TfidfTransformer(sublinear_tf=True).fit(counts).transform(counts))
+        want = normalize(sp.hstack(blocks), norm='l2')
+        assert np.allclose(got.toarray(), want.toarray(), atol=1e-12)
+        assert np.allclose(sp.linalg.norm(got, axis=1), 1.0)
+
+
+def test_online_idf():
+    with tempfile.TemporaryDirectory() as tmp:
+        full = HashingTFIDFBackend(n_features=2**12, cache_folder=tmp)
+        full.fit(CORPUS)
+        streamed = HashingTFIDFBackend(n_features=2**12, cache_folder=tmp)
+        for i in range(0, len(CORPUS), 3):
+            streamed.partial_fit(CORPUS[i:i + 3])
+        streamed.partial_fit(CORPUS[:4] + CORPUS[:2])   # already seen
+        assert streamed.n_docs == len(CORPUS) and np.array_equal(streamed.df, full.df)
+
+        online = HashingTFIDFBackend(n_features=2**12, cache_folder=tmp)
+        for text in CORPUS:
+            row = online.encode_single(text)
+            assert row.shape == (1, 2**13)
+        assert np.array_equal(online.df, full.df)
+        assert (online.transform(CORPUS) != full.transform(CORPUS)).nnz == 0
+        weighted = online.encode_with_role_weights(CORPUS[0], role='assistant')
+        assert np.allclose(weighted.toarray(), 0.5 * online.encode_single(CORPUS[0]).toarray())
+
+        frozen = HashingTFIDFBackend(n_features=2**12, cache_folder=tmp, online=False)
+        frozen.encode(CORPUS)
+        assert frozen.n_docs == 0
+
+
+def test_save_load():
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = HashingTFIDFBackend(n_features=2**10, cache_folder=tmp)
+        backend.fit(CORPUS)
+        backend.save('state.npz')
+        with np.load(f"{tmp}/state.npz", allow_pickle=False) as data:
+            assert data['df_index'].size == np.count_nonzero(backend.df)
+
+        restored = HashingTFIDFBackend(n_features=2**10, cache_folder=tmp)
+        restored.load('state.npz')
+        assert restored.n_docs == backend.n_docs and restored.seen == backend.seen
+        assert np.array_equal(restored.df, backend.df)
+        restored.encode(["Who should we invite to the party?"])
+        assert restored.n_docs == backend.n_docs
+        try:
+            HashingTFIDFBackend(n_features=2**11, cache_folder=tmp).load('state.npz')
+            raise AssertionError("configuration mismatch not detected")
+        except ValueError:
+            pass
+
+
+def test_sparse_helpers():
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = HashingTFIDFBackend(n_features=2**10, cache_folder=tmp)
+        rows = [backend.encode_single(t) for t in CORPUS]
+        dense = [r.toarray()[0] for r in rows]
+        query = backend.encode_single("birthday party for Alice")
+        q = query.toarray()[0]
+        want = np.array([np.dot(q, d) for d in dense])
+        assert np.allclose(similarities(query, rows), want)
+        assert np.allclose(similarities(q, dense), want)
+        assert np.allclose(similarities(query, dense), want)
+        assert abs(dot(query, rows[0]) - want[0]) < 1e-12
+        for r, d in zip(rows, dense):
+            assert abs(vector_std(r) - np.std(d)) < 1e-12
+            v = row_values(r)
+            assert np.isclose(-np.sum(v*np.log(np.abs(v) + 1e-10)), -np.sum(d*np.log(np.abs(d) + 1e-10)))
+        order = np.argsort(-similarities(query, rows), kind='stable')
+        assert order[0] == 0
+
+
+def run_all():
+    test_matches_sklearn()
+    test_online_idf()
+    test_save_load()
+    test_sparse_helpers()
+    print("All streaming TF-IDF tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
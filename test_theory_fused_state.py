@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+PARITY TESTS FOR THE FUSED AdaptonicCalculator.compute_full_state
+=================================================================
+
+The fused path (theory.py) must return the same AdaptonicState as the
+step-by-step composition of calculate_coherence, calculate_entropy,
+calculate_coupling_matrix, calculate_alpha and calculate_free_energy.
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import numpy as np
+
+from theory import AdaptonicCalculator, AdaptonicState
+
+
+def reference_full_state(calc, states, t):
+    """Unfused composition (the previous compute_full_state body)."""
+    sigma, variance = calc.calculate_coherence(states)
+    theta = calc.calculate_theta(t)
+    lambda_eff = calc.calculate_lambda_eff(sigma)
+    D = calc.calculate_coupling_matrix(states, lambda_eff)
+    entropies = calc.calculate_entropy(states)
+    alpha = calc.calculate_alpha(D, entropies, theta)
+    F = calc.calculate_free_energy(states, D, theta, entropies)
+    return AdaptonicState(sigma=sigma, alpha=alpha, theta_mean=theta,
+                          free_energy=F, variance=variance, lambda_eff=lambda_eff)
+
+
+def _assert_states_close(a, b):
+    for field in ('sigma', 'alpha', 'theta_mean', 'free_energy', 'variance', 'lambda_eff'):
+        assert np.isclose(getattr(a, field), getattr(b, field), rtol=1e-10, atol=1e-10), field
+    assert a.phase == b.phase
+
+
+def test_fused_matches_reference():
+    rng = np.random.default_rng(0)
+    calc = AdaptonicCalculator()
+    for n_agents, state_dim in [(2, 3), (5, 64), (40, 16)]:
+        states = rng.standard_normal((n_agents, state_dim))
+        states /= np.linalg.norm(states, axis=1, keepdims=True)
+        for t in (0, 17, 63):
+            _assert_states_close(calc.compute_full_state(states, t),
+                                 reference_full_state(calc, states, t))
+
+
+def test_fused_matches_reference_coherent_ensemble():
+    rng = np.random.default_rng(1)
+    calc = AdaptonicCalculator()
+    base = rng.standard_normal(32)
+    states = base + 0.01 * rng.standard_normal((20, 32))
+    states /= np.linalg.norm(states, axis=1, keepdims=True)
+
+    fused = calc.compute_full_state(states, 5)
+    _assert_states_close(fused, reference_full_state(calc, states, 5))
+    assert fused.phase == "R4_INTENTIONAL"
+
+
+def test_fused_identical_states_guard():
+    calc = AdaptonicCalculator()
+    states = np.tile(np.eye(8)[0], (4, 1))
+    _assert_states_close(calc.compute_full_state(states, 0),
+                         reference_full_state(calc, states, 0))
+
+
+def run_all():
+    test_fused_matches_reference()
+    test_fused_matches_reference_coherent_ensemble()
+    test_fused_identical_states_guard()
+    print("All fused adaptonic state tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE Θ FIELD INTEGRATORS (theta_field_solver.py)
+=========================================================
+
+1. Spectral/banded operators are the explicit stencil in diagonal form
+2. "euler" matches the previous allocation-per-step loop exactly
+3. "imex" / "etd" converge to the explicit solution and stay stable
+   far beyond the explicit dt limit
+4. Snapshots land in a memory-mapped .npy file
+5. "etd" rejects steps over tolerance: on a stiff reaction the error
+   tracks rtol
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import os
+import tempfile
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from gap9_theta_control import PIConfig, make_pi_control
+from theta_field_solver import (MemmapSnapshots, SolverParams, _SpectralLaplacian,
+                                _banded_operator, _laplacian, solve_theta)
+
+
+def dEdTheta(th):
+    return 0.5*th + 0.25*th*th
+
+
+def _field_1d(n=128, L=10.0):
+    x = np.linspace(0, L, n, endpoint=False)
+    return 0.1*np.cos(2*np.pi*x/L) + 0.05*(x > 5)
+
+
+def _field_2d(n=48, L=10.0):
+    X, Y = np.meshgrid(np.linspace(0, L, n, endpoint=False), np.linspace(0, L, n, endpoint=False))
+    return 0.1*np.cos(2*np.pi*X/L)*np.sin(4*np.pi*Y/L) + 0.1*(X > 5), X, Y
+
+
+def _reference_euler(params, theta0, dx, dy, control=None):
+    """Previous loop: fresh laplacian / update arrays on every step."""
+    u = theta0.copy()
+    for k in range(params.steps):
+        lap = _laplacian(u, dx, dy, params.bc)
+        forc = control(u, k*params.dt) if control is not None else 0.0
+        du = params.D*lap - params.g*dEdTheta(u) + params.c*0.0 + forc
+        u = u + params.dt*du
+    return u
+
+
+def test_spectral_operator_is_stencil():
+    rng = np.random.default_rng(0)
+    for shape in ((64,), (24, 40)):
+        u = rng.standard_normal(shape)
+        for bc in ("periodic", "dirichlet"):
+            spec = _SpectralLaplacian(shape, 0.1, 0.3, bc)
+            assert np.allclose(spec.inverse(spec.eigenvalues*spec.forward(u)),
+                               _laplacian(u, 0.1, 0.3, bc), atol=1e-9)
+
+    u = rng.standard_normal(50)
+    ab = _banded_operator(50, 0.1, 0.02, 0.5)
+    dense = np.diag(ab[1]) + np.diag(ab[0, 1:], 1) + np.diag(ab[2, :-1], -1)
+    assert np.allclose(dense @ u, u - 0.5*0.02*_laplacian(u, 0.1, None, "dirichlet"))
+
+
+def test_euler_matches_reference_loop():
+    pi = make_pi_control(PIConfig(kp=2.0, ki=0.5), lambda XY, t: np.zeros_like(XY[0]))
+    for bc in ("periodic", "dirichlet"):
+        p = SolverParams(nx=128, dt=1e-3, steps=300, bc=bc)
+        theta0 = _field_1d()
+        got = solve_theta(p, dEdTheta, theta0, save_callback=lambda j, t, u: None)
+        assert np.array_equal(got, _reference_euler(p, theta0, p.Lx/p.nx, None))
+
+    theta0, X, Y = _field_2d()
+    p = SolverParams(nx=48, ny=48, dt=1e-3, steps=200)
+    pi_ref = make_pi_control(PIConfig(kp=2.0, ki=0.5), lambda XY, t: np.zeros_like(XY[0]))
+    got = solve_theta(p, dEdTheta, theta0, control=lambda th, t: pi((X, Y), th, t, p.dt),
+                      save_callback=lambda j, t, u: None)
+    ref = _reference_euler(p, theta0, p.Lx/48, p.Ly/48, control=lambda th, t: pi_ref((X, Y), th, t, p.dt))
+    assert np.array_equal(got, ref)
+
+
+def test_implicit_and_exponential_modes():
+    theta0, X, Y = _field_2d()
+    amp = np.abs(theta0).max()
+    cb = lambda j, t, u: None
+    for bc in ("periodic", "dirichlet"):
+        fine = solve_theta(SolverParams(nx=48, ny=48, dt=2e-3, steps=2500, bc=bc), dEdTheta, theta0,
+                           save_callback=cb)
+        errors = []
+        for dt in (0.2, 0.1):
+            p = SolverParams(nx=48, ny=48, dt=dt, steps=int(round(5/dt)), save_every=5, bc=bc, method="imex")
+            errors.append(np.abs(solve_theta(p, dEdTheta, theta0, save_callback=cb) - fine).max())
+        assert errors[1] < 0.01*amp and 1.6 < errors[0]/errors[1] < 2.4     # first order
+        p = SolverParams(nx=48, ny=48, dt=0.1, steps=50, save_every=10, bc=bc, method="etd")
+        assert np.abs(solve_theta(p, dEdTheta, theta0, save_callback=cb) - fine).max() < 0.01*amp
+
+        # explicit limit here is dx^2/(4D) ~ 0.54; run at dt = 1
+        for method in ("imex", "etd"):
+            p = SolverParams(nx=48, ny=48, dt=1.0, steps=20, save_every=5, bc=bc, method=method)
+            got = solve_theta(p, dEdTheta, theta0, save_callback=cb)
+            assert np.all(np.isfinite(got)) and np.abs(got).max() < amp, (bc, method)
+        blown = solve_theta(SolverParams(nx=48, ny=48, dt=1.0, steps=20, save_every=100, bc=bc),
+                            dEdTheta, theta0, save_callback=cb)
+        assert np.abs(blown).max() > 10*amp
+
+    theta1 = _field_1d()
+    fine = solve_theta(SolverParams(nx=128, dt=1e-3, steps=2000, bc="dirichlet"), dEdTheta, theta1,
+                       save_callback=cb)
+    imex = solve_theta(SolverParams(nx=128, dt=0.1, steps=20, bc="dirichlet", method="imex", save_every=5),
+                       dEdTheta, theta1, save_callback=cb)
+    assert np.abs(imex - fine).max() < 0.01*np.abs(theta1).max()
+
+
+def test_memmap_snapshots():
+    theta0, _, _ = _field_2d()
+    for method in ("imex", "etd"):
+        p = SolverParams(nx=48, ny=48, dt=0.05, steps=40, save_every=10, method=method)
+        seen = []
+        final = solve_theta(p, dEdTheta, theta0, save_callback=lambda j, t, u: seen.append((j, t, u.copy())))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "theta.npy")
+            snaps = MemmapSnapshots.for_params(path, p, theta0.shape, dtype=np.float64)
+            solve_theta(p, dEdTheta, theta0, save_callback=snaps)
+            snaps.flush()
+            assert snaps.count == 4
+            assert np.allclose(snaps.times, [0.5, 1.0, 1.5, 2.0])
+            stored = np.load(path, mmap_mode="r")
+            assert stored.shape == (4,) + theta0.shape
+            assert np.array_equal(stored[-1], final)
+            assert [j for j, _, _ in seen] == [0, 1, 2, 3]
+            assert all(np.array_equal(stored[j], u) for j, _, u in seen)
+            del stored, snaps
+
+    try:
+        solve_theta(SolverParams(method="rk4"), dEdTheta, _field_1d(256))
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError for unknown method")
+
+
+def test_etd_error_tracks_rtol():
+    # stiff double well: g*|f'| = 80 >> 1/dt, the first dt = 0.1 step must be rejected
+    g, n, L = 40.0, 64, 10.0
+    f = lambda th: th**3 - th
+    x = np.linspace(0, L, n, endpoint=False)
+    theta0 = 0.3*np.cos(2*np.pi*x/L) + 0.05
+    ref = solve_ivp(lambda t, u: 0.02*_laplacian(u, L/n, None, "periodic") - g*f(u), (0, 2.0), theta0,
+                    method="Radau", rtol=1e-11, atol=1e-12).y[:, -1]
+    errors = []
+    for rtol in (1e-3, 1e-4, 1e-5):
+        p = SolverParams(nx=n, dt=0.1, steps=20, save_every=20, g=g, method="etd", rtol=rtol, atol=1e-9)
+        errors.append(np.abs(solve_theta(p, f, theta0, save_callback=lambda j, t, u: None) - ref).max())
+    assert errors[0] < 1e-3 and errors[2] < 1e-5
+    assert errors[2] < errors[1] < errors[0]
+
+
+def run_all():
+    test_spectral_operator_is_stencil()
+    test_euler_matches_reference_loop()
+    test_implicit_and_exponential_modes()
+    test_memmap_snapshots()
+    test_etd_error_tracks_rtol()
+    print("All theta field solver tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
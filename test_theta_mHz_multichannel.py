@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+TESTS FOR THE BATCHED RG FLOW (theta_mHz_multichannel.py)
+=========================================================
+
+1. Closed-form flow matches the per-model odeint integration of beta_function
+2. MultiChannelThetaBatch rows equal single-model flows / checks / forecasts
+3. theta_at_frequency: dense interpolant, array input, clipping
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import numpy as np
+from scipy.integrate import odeint
+
+from theta_mHz_multichannel import (
+    MultiChannelParams, MultiChannelTheta, MultiChannelThetaBatch, AdaptonicValidator,
+    lisa_detectability_forecast, solve_rg_flow_batch, _bernoulli_flow
+)
+
+
+def _reference_flow(params, omega):
+    """Previous solve_rg_flow: odeint with a per-call list-returning callback."""
+    def derivatives(y, ln_w):
+        return [params.geometric.beta_function(y[0]), params.kinetic.beta_function(y[1])]
+    sol = odeint(derivatives, [params.theta_init_geo, params.theta_init_kin], np.log(omega))
+    return sol[:, 0], sol[:, 1]
+
+
+def _scan(n=6):
+    return [MultiChannelParams.from_physical_calibration(w) for w in np.logspace(-1, 2, n)]
+
+
+def test_closed_form_matches_odeint():
+    omega = np.logspace(-4, 14, 1000)
+    params = _scan(3)
+    params[1].kinetic.alpha1 = 0.5          # strong self-interaction
+    params[2].theta_init_geo = 2.0
+    geo, kin = solve_rg_flow_batch(params, omega)
+    geo_ode, kin_ode = solve_rg_flow_batch(params, omega, method='odeint')
+    for i, mp in enumerate(params):
+        ref_geo, ref_kin = _reference_flow(mp, omega)
+        # one vector ODE shares its adaptive steps across all sets
+        assert np.max(np.abs(geo_ode[i] - ref_geo)) < 1e-6
+        assert np.max(np.abs(kin_ode[i] - ref_kin)) < 1e-6
+        assert np.max(np.abs(geo[i] - ref_geo)) < 1e-6
+        assert np.max(np.abs(kin[i] - ref_kin)) < 1e-6
+
+    single = solve_rg_flow_batch(params[:1], omega, method='odeint')
+    assert np.max(np.abs(single[0][0] - _reference_flow(params[0], omega)[0])) < 1e-12
+
+    # blow-up past the Landau pole is reported as NaN, not garbage
+    theta = _bernoulli_flow(np.array(1.0), np.array(-1.0), np.array(1.0), np.linspace(0, 2, 5))
+    assert np.isfinite(theta[:2]).all() and np.isnan(theta[-1])
+
+    try:
+        solve_rg_flow_batch(params, omega, method='rk4')
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError for unknown method")
+
+
+def test_batch_matches_single_models():
+    params = _scan()
+    batch = MultiChannelThetaBatch(params)
+    batch.compute_full_flow(n_points=800)
+    checks = AdaptonicValidator(batch).run_all_checks()
+    forecast = lisa_detectability_forecast(batch)
+    peaks = batch.find_ecotone_peak()
+
+    for i, mp in enumerate(params):
+        model = MultiChannelTheta(mp)
+        model.compute_full_flow(n_points=800)
+        for name in ('theta_geo', 'theta_kin', 'w', 'theta_total', 'beta_total', 'kappa_ec'):
+            assert np.allclose(getattr(batch, name)[i], getattr(model, name), rtol=1e-12, atol=0)
+        for key, value in AdaptonicValidator(model).run_all_checks().items():
+            assert checks[key][i] == value
+        for key, value in lisa_detectability_forecast(model).items():
+            assert forecast[key][i] == value or np.isclose(forecast[key][i], value, rtol=1e-12)
+        assert all(np.isclose(a[i], b) for a, b in zip(peaks, model.find_ecotone_peak()))
+
+
+def test_theta_at_frequency_interpolates():
+    mp = MultiChannelParams.from_physical_calibration(3.0)
+    model = MultiChannelTheta(mp)
+    model.compute_full_flow()
+
+    node = model.theta_at_frequency(model.omega[123])
+    assert node['omega'] == model.omega[123]
+    assert node['theta_geo'] == model.theta_geo[123] and node['weight'] == model.w[123]
+
+    omega = np.logspace(-4, 2, 517)           # between the grid nodes
+    values = model.theta_at_frequency(omega)
+    t = np.log(omega) - np.log(model.omega[0])
+    for key, channel, theta0 in (('theta_geo', mp.geometric, mp.theta_init_geo),
+                                 ('theta_kin', mp.kinetic, mp.theta_init_kin)):
+        exact = _bernoulli_flow(theta0, *channel.beta_coefficients(), t)
+        assert np.max(np.abs(values[key] / exact - 1)) < 1e-6
+    assert values['theta_total'].shape == omega.shape
+
+    # β from the dense flow agrees with the grid gradient between nodes
+    i = np.searchsorted(model.omega, 3e-3)
+    beta = model.theta_at_frequency(model.omega[i])['beta']
+    assert abs(beta - model.beta_total[i]) < 1e-2 * abs(beta)
+
+    assert model.theta_at_frequency(1e20)['omega'] == model.omega[-1]
+    batch = MultiChannelThetaBatch(_scan(4))
+    batch.compute_full_flow()
+    assert batch.theta_at_frequency(np.array([1e-3, 1e-2]))['kappa_ec'].shape == (4, 2)
+
+
+def run_all():
+    test_closed_form_matches_odeint()
+    test_batch_matches_single_models()
+    test_theta_at_frequency_interpolates()
+    print("All multi-channel RG flow tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
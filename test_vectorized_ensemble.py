@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+PARITY TESTS FOR THE STRUCT-OF-ARRAYS AGENT ENSEMBLE
+====================================================
+
+Checks that VectorizedAgentEnsemble (agents.py) follows the same
+trajectory as the per-agent AgentEnsemble loop it replaces, and that
+CognitiveLagoon runs unchanged on top of it.
+
+Author: Paweł Kojs
+Date: 2025-11-24
+Version: 1.0
+"""
+
+import numpy as np
+
+from agents import AgentEnsemble, VectorizedAgentEnsemble
+from lagoon import CognitiveLagoon
+from theory import AdaptonicCalculator
+
+
+def test_initial_states_match_agent_loop():
+    np.random.seed(7)
+    loop = AgentEnsemble(n_agents=12, state_dim=9)
+    np.random.seed(7)
+    vec = VectorizedAgentEnsemble(n_agents=12, state_dim=9)
+
+    assert np.allclose(loop.get_states(), vec.get_states(), rtol=0, atol=1e-15)
+    assert np.array_equal(vec.get_velocities(), np.zeros((12, 9)))
+
+
+def test_coupling_forces_match_pairwise_sum():
+    np.random.seed(1)
+    vec = VectorizedAgentEnsemble(n_agents=15, state_dim=6)
+    S = vec.get_states()
+    D = AdaptonicCalculator().calculate_coupling_matrix(S, lambda_eff=1.3)
+
+    expected = np.zeros_like(S)
+    for i in range(len(S)):
+        for j in range(len(S)):
+            if i != j:
+                expected[i] += D[i, j] * (S[j] - S[i])
+
+    assert np.allclose(vec.coupling_forces(D), expected, rtol=1e-12, atol=1e-12)
+
+
+def test_step_sequence_matches_agent_loop():
+    n_agents, state_dim, n_steps = 10, 8, 25
+    calc = AdaptonicCalculator()
+
+    def run(ensemble_cls):
+        np.random.seed(3)
+        ensemble = ensemble_cls(n_agents=n_agents, state_dim=state_dim)
+        for t in range(n_steps):
+            new_states = ensemble.generate_response_states("q")
+            ensemble.set_states(new_states)
+            sigma, _ = calc.calculate_coherence(new_states)
+            D = calc.calculate_coupling_matrix(new_states, calc.calculate_lambda_eff(sigma))
+            ensemble.apply_coupling(D, calc.calculate_theta(t), gamma=0.1, step_size=0.1)
+        return ensemble.get_states(), ensemble.get_velocities()
+
+    loop_s, loop_v = run(AgentEnsemble)
+    vec_s, vec_v = run(VectorizedAgentEnsemble)
+
+    assert np.allclose(loop_s, vec_s, rtol=1e-9, atol=1e-9)
+    assert np.allclose(loop_v, vec_v, rtol=1e-9, atol=1e-9)
+
+
+def test_lagoon_vectorized_backend():
+    np.random.seed(11)
+    lagoon = CognitiveLagoon(n_agents=6, state_dim=16, vectorized=True)
+    lagoon.run(queries=["q"], n_steps=10, verbose=False)
+    vec_hist = lagoon.history
+
+    np.random.seed(11)
+    lagoon = CognitiveLagoon(n_agents=6, state_dim=16)
+    lagoon.run(queries=["q"], n_steps=10, verbose=False)
+
+    for a, b in zip(lagoon.history, vec_hist):
+        assert a['phase'] == b['phase']
+        assert np.isclose(a['sigma'], b['sigma'], rtol=1e-9)
+        assert np.isclose(a['mean_velocity'], b['mean_velocity'], rtol=1e-9)
+
+    norms = np.linalg.norm(CognitiveLagoon(n_agents=1000, state_dim=8, vectorized=True)
+                           .ensemble.get_states(), axis=1)
+    assert np.allclose(norms, 1.0)
+
+
+def test_vectorized_rejects_llm_agents():
+    try:
+        VectorizedAgentEnsemble(n_agents=2, state_dim=4, agent_type="llm")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError for agent_type='llm'")
+
+
+def run_all():
+    test_initial_states_match_agent_loop()
+    test_coupling_forces_match_pairwise_sum()
+    test_step_sequence_matches_agent_loop()
+    test_lagoon_vectorized_backend()
+    test_vectorized_rejects_llm_agents()
+    print("All vectorized ensemble parity tests passed.")
+
+
+if __name__ == "__main__":
+    run_all()
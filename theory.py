@@ -374,6 +374,12 @@ class AdaptonicCalculator:
         """
         Compute complete adaptonic state from agent states.
         
+        Fused equivalent of calculate_coherence / calculate_entropy /
+        calculate_coupling_matrix / calculate_alpha / calculate_free_energy:
+        one pass over the states, and the coupling sum is taken from
+        ||sum_i s_i||^2 - sum_i ||s_i||^2 instead of a dense N x N matrix,
+        so the cost is O(N*D) rather than O(N^2*D).
+        
         Parameters
         ----------
         states : np.ndarray
@@ -386,8 +392,13 @@ class AdaptonicCalculator:
         state : AdaptonicState
             Complete adaptonic state
         """
-        # Calculate coherence
-        sigma, variance = self.calculate_coherence(states)
+        # Single pass over states: mean, deviations, per-agent entropies
+        states = np.asarray(states, dtype=float)
+        total = states.sum(axis=0)
+        deviations = states - total / len(states)
+        entropies = np.einsum('ij,ij->i', deviations, deviations)
+        variance = np.mean(entropies)
+        sigma = 1.0 / (1.0 + variance)
         
         # Calculate theta with circadian modulation
         theta = self.calculate_theta(t)
@@ -395,15 +406,19 @@ class AdaptonicCalculator:
         # Calculate effective coupling
         lambda_eff = self.calculate_lambda_eff(sigma)
         
-        # Calculate coupling matrix and entropies
-        D = self.calculate_coupling_matrix(states, lambda_eff)
-        entropies = self.calculate_entropy(states)
+        # Sum of D_ij without the N x N matrix:
+        # sum_{i != j} s_i.s_j = ||sum_i s_i||^2 - sum_i ||s_i||^2
+        coupling_sum = lambda_eff * (
+            np.dot(total, total) - np.einsum('ij,ij->', states, states)
+        )
+        entropy_sum = np.sum(entropies)
         
-        # Calculate phase indicator
-        alpha = self.calculate_alpha(D, entropies, theta)
+        # Phase indicator (as calculate_alpha, same division-by-zero guard)
+        thermal = theta * entropy_sum
+        alpha = coupling_sum / (thermal if thermal >= 1e-10 else 1e-10)
         
-        # Calculate free energy
-        F = self.calculate_free_energy(states, D, theta, entropies)
+        # Free energy F = E - Theta*S + sum D_ij (as calculate_free_energy)
+        F = -variance - theta * entropy_sum + coupling_sum
         
         return AdaptonicState(
             sigma=sigma,
@@ -413,6 +428,70 @@ class AdaptonicCalculator:
             variance=variance,
             lambda_eff=lambda_eff
         )
+    
+    def compute_full_state_batch(
+        self,
+        states: np.ndarray,
+        t: int
+    ) -> Dict[str, np.ndarray]:
+        """
+        Fused compute_full_state for R independent ensembles at once.
+        
+        Calculator parameters (lambda_0, sigma_floor, theta_opt,
+        delta_theta, cycle_period) may be scalars or arrays of shape (R,),
+        one value per replicate.
+        
+        Parameters
+        ----------
+        states : np.ndarray
+            Agent states, shape (R, N, D)
+        t : int
+            Current timestep
+            
+        Returns
+        -------
+        quantities : dict
+            Arrays of shape (R,) for 'sigma', 'alpha', 'theta_mean',
+            'free_energy', 'variance', 'lambda_eff', and 'phase' labels
+            (same rules as AdaptonicState.phase)
+        """
+        states = np.asarray(states, dtype=float)
+        n_agents = states.shape[1]
+        total = states.sum(axis=1)
+        deviations = states - total[:, None, :] / n_agents
+        entropies = np.einsum('rij,rij->ri', deviations, deviations)
+        variance = np.mean(entropies, axis=1)
+        sigma = 1.0 / (1.0 + variance)
+        
+        # Circadian theta as calculate_theta (without the scalar phase label)
+        theta = (self.theta_opt + self.delta_theta
+                 * np.sin(2 * np.pi * t / np.asarray(self.cycle_period))) * np.ones_like(sigma)
+        lambda_eff = self.calculate_lambda_eff(sigma)
+        
+        coupling_sum = lambda_eff * (
+            np.einsum('rd,rd->r', total, total) - np.einsum('rij,rij->r', states, states)
+        )
+        entropy_sum = np.sum(entropies, axis=1)
+        
+        thermal = theta * entropy_sum
+        alpha = coupling_sum / np.where(thermal >= 1e-10, thermal, 1e-10)
+        F = -variance - theta * entropy_sum + coupling_sum
+        
+        phase = np.select(
+            [(sigma > 0.9) & (alpha > 1.5), (sigma > 0.7) & (alpha > 1.0), sigma > 0.4],
+            ["R4_INTENTIONAL", "R3_COHERENT", "R3_TRANSITIONAL"],
+            default="R3_INCOHERENT"
+        )
+        
+        return {
+            'sigma': sigma,
+            'alpha': alpha,
+            'theta_mean': theta,
+            'free_energy': F,
+            'variance': variance,
+            'lambda_eff': lambda_eff,
+            'phase': phase
+        }
 
 
 def validate_adaptonic_state(state: AdaptonicState) -> Dict[str, bool]:
@@ -3,6 +3,8 @@
 from dataclasses import dataclass
 from typing import Callable, Optional, Tuple
 import numpy as np
+import scipy.fft as sfft
+from scipy.linalg import solve_banded
 
 @dataclass
 class SolverParams:
@@ -17,40 +19,229 @@ class SolverParams:
     c: float = 0.0
     bc: str = "periodic"  # "periodic" or "dirichlet"
     save_every: int = 200
+    method: str = "euler"  # "euler", "imex" or "etd" (adaptive exponential)
+    rtol: float = 1e-3     # "etd": local error tolerance (relative to max|theta|)
+    atol: float = 1e-6
+    dt_max: float = 0.0    # "etd": step cap, 0 = save interval
 
-def _laplacian(u, dx, dy, bc):
+def _laplacian(u, dx, dy, bc, out=None):
+    # 3-point stencil per axis; "dirichlet" boundaries use mirror ghost cells
+    # (u[-1] = u[0]), i.e. the end rows (u[1]-u[0])/dx**2
+    du = np.zeros_like(u) if out is None else out
     if u.ndim==1:
-        du = np.zeros_like(u)
-        du[1:-1] = (u[2:]-2*u[1:-1]+u[:-1])/dx**2
+        du[1:-1] = (u[2:]-2*u[1:-1]+u[:-2])/dx**2
         du[0]     = (u[1]-2*u[0]+u[-1])/dx**2 if bc=="periodic" else (u[1]-u[0])/dx**2
         du[-1]    = (u[0]-2*u[-1]+u[-2])/dx**2 if bc=="periodic" else (u[-2]-u[-1])/dx**2
         return du
     else:
-        du = np.zeros_like(u)
         # x second derivative
-        du += (np.roll(u,-1,axis=1)-2*u+np.roll(u,1,axis=1))/dx**2
+        du[:, 1:-1] = (u[:, 2:]-2*u[:, 1:-1]+u[:, :-2])/dx**2
+        if bc=="periodic":
+            du[:, 0]  = (u[:, 1]-2*u[:, 0]+u[:, -1])/dx**2
+            du[:, -1] = (u[:, 0]-2*u[:, -1]+u[:, -2])/dx**2
+        else:
+            du[:, 0]  = (u[:, 1]-u[:, 0])/dx**2
+            du[:, -1] = (u[:, -2]-u[:, -1])/dx**2
         # y second derivative
-        du += (np.roll(u,-1,axis=0)-2*u+np.roll(u,1,axis=0))/dy**2
+        du[1:-1] += (u[2:]-2*u[1:-1]+u[:-2])/dy**2
+        if bc=="periodic":
+            du[0]  += (u[1]-2*u[0]+u[-1])/dy**2
+            du[-1] += (u[0]-2*u[-1]+u[-2])/dy**2
+        else:
+            du[0]  += (u[1]-u[0])/dy**2
+            du[-1] += (u[-2]-u[-1])/dy**2
         return du
 
-def solve_theta(params: SolverPermalink to filethrenoue, dEdTheta: Callable, theta0: np.ndarray,
-                S_field: Optional[Callable]=None, control: Optional[Callable]=None):
+class _SpectralLaplacian:
+    """
+    Diagonal form of the _laplacian stencil: real FFT for periodic
+    boundaries, orthonormal DCT-II for the mirror ("dirichlet") boundaries.
+    """
+
+    def __init__(self, shape, dx, dy, bc):
+        self.shape = shape
+        self.periodic = bc == "periodic"
+        spacings = (dx,) if len(shape) == 1 else (dy, dx)
+        lam = 0.0
+        for axis, (n, h) in enumerate(zip(shape, spacings)):
+            if self.periodic:
+                k = np.arange(n//2 + 1) if axis == len(shape) - 1 else np.arange(n)
+                ev = -(4.0/h**2)*np.sin(np.pi*k/n)**2
+            else:
+                ev = -(4.0/h**2)*np.sin(np.pi*np.arange(n)/(2*n))**2
+            lam = np.add.outer(lam, ev) if axis else ev
+        self.eigenvalues = lam
+
+    def forward(self, u):
+        return np.fft.rfftn(u) if self.periodic else sfft.dctn(u, type=2, norm="ortho")
+
+    def inverse(self, U):
+        if self.periodic:
+            return np.fft.irfftn(U, s=self.shape, axes=tuple(range(len(self.shape))))
+        return sfft.idctn(U, type=2, norm="ortho")
+
+def _banded_operator(n, dx, D, dt):
+    # (I - dt*D*L) for the 1D mirror stencil, in solve_banded layout
+    r = dt*D/dx**2
+    ab = np.zeros((3, n))
+    ab[0, 1:] = -r
+    ab[1, :] = 1.0 + 2.0*r
+    ab[1, [0, -1]] = 1.0 + r
+    ab[2, :-1] = -r
+    return ab
+
+class MemmapSnapshots:
+    """
+    save_callback writing snapshot j to row j of a .npy memory map of shape
+    (n_snapshots, *field_shape); times[j] holds its simulation time.
+    """
+
+    def __init__(self, path, shape, n_snapshots, dtype=np.float32):
+        self.data = np.lib.format.open_memmap(path, mode="w+", dtype=dtype,
+                                              shape=(n_snapshots,) + tuple(shape))
+        self.times = np.full(n_snapshots, np.nan)
+        self.count = 0
+
+    @classmethod
+    def for_params(cls, path, params: SolverParams, shape, dtype=np.float32):
+        return cls(path, shape, params.steps // params.save_every, dtype)
+
+    def __call__(self, j, t, u):
+        self.data[j] = u
+        self.times[j] = t
+        self.count = j + 1
+
+    def flush(self):
+        self.data.flush()
+
+def solve_theta(params: SolverParams, dEdTheta: Callable, theta0: np.ndarray,
+                S_field: Optional[Callable]=None, control: Optional[Callable]=None,
+                save_callback: Optional[Callable[[int, float, np.ndarray], None]]=None):
+    """
+    Integrate dtheta/dt = D*lap(theta) - g*dE/dtheta + c*S + control up to
+    t = steps*dt.
+
+    params.method:
+      "euler" explicit Euler (dt limited by dx**2/D)
+      "imex"  semi-implicit Euler: diffusion implicit (FFT for periodic,
+              banded solve in 1D / DCT in 2D for "dirichlet"), reaction,
+              source and control explicit
+      "etd"   exponential Euler with adaptive dt (error estimate from the
+              change of the explicit terms over the step; steps with
+              err > 1 are rejected and retried with a smaller dt);
+              output times are hit exactly
+
+    save_callback(j, t, theta) is called at t = (j+1)*save_every*dt
+    (e.g. a MemmapSnapshots); without it progress is printed every
+    save_every steps. control is called once per step; in "etd" mode the
+    step varies, so controllers that integrate with a fixed dt (e.g. the
+    gap9_theta_control PI) should run with "euler" or "imex".
+    """
     assert theta0.ndim in (1,2), "Only 1D/2D supported in this minimal solver."
-    u = theta0.copy()
-    if u.ndim==1:
-        dx = params.Lx/params.nx
-    else:
-        dx = params.Lx/params.nx; dy = params.Ly/max(1, params.ny)
+    if params.method not in ("euler", "imex", "etd"):
+        raise ValueError("method must be 'euler', 'imex' or 'etd'")
+    u = np.array(theta0, dtype=float)
+    dx = params.Lx/params.nx
+    dy = params.Ly/(params.ny or u.shape[0]) if u.ndim==2 else None
+
+    def rhs(theta, t, out):
+        # adds the explicit (non-diffusive) terms to out
+        out -= params.g*dEdTheta(theta)
+        if S_field is not None:
+            out += params.c*S_field(theta, t)
+        if control is not None:
+            out += control(theta, t)
+        return out
+
+    if params.method == "etd":
+        return _solve_etd(params, u, dx, dy, rhs, save_callback)
+
+    work = np.empty_like(u)
+    lap = np.empty_like(u)
+    if params.method == "imex":
+        if params.bc == "periodic" or u.ndim == 2:
+            spec = _SpectralLaplacian(u.shape, dx, dy, params.bc)
+            denom = 1.0 - params.dt*params.D*spec.eigenvalues
+        else:
+            ab = _banded_operator(u.size, dx, params.D, params.dt)
 
     for k in range(params.steps):
-        if u.ndim==1: lap = _laplacian(u, dx, None, params.bc)
-        else:         lap = _laplacian(u, dx, dy, params.bc)
-        theta = u
-        dE = dEdTheta(theta)
-        S = S_field(theta,k*params.dt) if S_field is not None else 0.0
-        forc = control(theta,k*params.dt) if control is not None else 0.0
-        du = params.D*lap - params.g*dE + params.c*S + forc
-        u = u + params.dt * du
-        if (k % params.save_every)==0:
+        t = k*params.dt
+        if params.method == "euler":
+            _laplacian(u, dx, dy, params.bc, out=lap)
+            np.multiply(lap, params.D, out=work)
+            rhs(u, t, work)
+            work *= params.dt
+            u += work
+        else:
+            work.fill(0.0)
+            rhs(u, t, work)
+            work *= params.dt
+            work += u
+            if params.bc == "periodic" or u.ndim == 2:
+                u[...] = spec.inverse(spec.forward(work)/denom)
+            else:
+                u[...] = solve_banded((1, 1), ab, work, check_finite=False)
+        if save_callback is not None:
+            if (k + 1) % params.save_every == 0:
+                save_callback((k + 1)//params.save_every - 1, (k + 1)*params.dt, u)
+        elif (k % params.save_every)==0:
             print(f"[solver] step {k}/{params.steps}, mean|theta|={np.mean(np.abs(u)):.3e}")
     return u
+
+def _solve_etd(params: SolverParams, u, dx, dy, rhs, save_callback):
+    spec = _SpectralLaplacian(u.shape, dx, dy, params.bc)
+    L = params.D*spec.eigenvalues
+    save_dt = params.save_every*params.dt
+    t_end = params.steps*params.dt
+    dt_max = params.dt_max or save_dt
+    cache = {}
+
+    def propagators(h):
+        # e^{hL} and h*phi1(hL), reused while the step size is unchanged
+        if cache.get("h") != h:
+            z = h*L
+            small = np.abs(z) < 1e-8
+            z_safe = np.where(small, 1.0, z)
+            cache.update(h=h, E=np.exp(z),
+                         P=np.where(small, h*(1.0 + 0.5*z), h*np.expm1(z_safe)/z_safe))
+        return cache["E"], cache["P"]
+
+    N = rhs(u, 0.0, np.zeros_like(u))
+    N_next = np.empty_like(u)
+    u_next = np.empty_like(u)
+    t, h, j, n_steps, n_rejected = 0.0, params.dt, 0, 0, 0
+    while t < t_end - 1e-12*t_end:
+        t_save = min((j + 1)*save_dt, t_end)
+        h_step = min(h, t_save - t)
+        E, P = propagators(h_step)
+        # candidate step into scratch buffers; u, t, N change only on accept
+        u_next[...] = spec.inverse(E*spec.forward(u) + P*spec.forward(N))
+        t_next = t_save if h_step == t_save - t else t + h_step
+        N_next.fill(0.0)
+        rhs(u_next, t_next, N_next)
+        # local error of exponential Euler ~ h/2 * (N(t+h) - N(t))
+        err = 0.5*h_step*np.max(np.abs(N_next - N)) / (params.atol + params.rtol*np.max(np.abs(u_next)))
+        factor = 2.0 if err == 0 else min(2.0, max(0.2, 0.9/np.sqrt(err)))
+        if not err <= 1.0:
+            # reject: retry from the same state with a smaller step
+            h = h_step*factor
+            n_rejected += 1
+            if h < 1e-14*max(t_end, 1.0):
+                raise RuntimeError(f"etd step size underflow at t={t:.6g} (err={err:.3g})")
+            continue
+        u, u_next = u_next, u
+        N, N_next = N_next, N
+        t = t_next
+        n_steps += 1
+        if h_step == h or factor < 1.0:
+            h = min(dt_max, h_step*factor)
+        if t >= t_save - 1e-12*max(t_save, 1.0):
+            if save_callback is not None:
+                if j < params.steps//params.save_every:
+                    save_callback(j, t, u)
+            else:
+                print(f"[solver] t {t:.4g}/{t_end:.4g} ({n_steps} steps, {n_rejected} rejected, dt={h:.3g}), "
+                      f"mean|theta|={np.mean(np.abs(u)):.3e}")
+            j += 1
+    return u
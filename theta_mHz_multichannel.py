@@ -15,7 +15,7 @@ import matplotlib.pyplot as plt
 from scipy.integrate import odeint
 from scipy.optimize import brentq
 from dataclasses import dataclass
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Sequence, Union
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -42,6 +42,13 @@ class ChannelParams:
         dissipation = -self.alpha2 * self.g * theta
         return canonical + self_interaction + dissipation
     
+    def beta_coefficients(self) -> Tuple[float, float]:
+        """
+        Coefficients of the quadratic beta function β_Θ = -aΘ + bΘ²:
+        a = 2 + α₂g, b = α₁λ/(1+λ)
+        """
+        return 2.0 + self.alpha2 * self.g, self.alpha1 * self.lambda_ / (1 + self.lambda_)
+    
     def fixed_point_IR(self) -> float:
         """Infrared fixed point (always 0)"""
         return 0.0
@@ -142,6 +149,118 @@ class MultiChannelParams:
 # MULTI-CHANNEL RG FLOW SOLVER
 # ============================================================================
 
+def _stack_params(params: Sequence[MultiChannelParams]) -> Dict[str, np.ndarray]:
+    """β coefficients, initial Θ and selector parameters of B models as arrays
+    (channel axis last: 0 = geometric, 1 = kinetic)."""
+    coef = np.array([[m.geometric.beta_coefficients(), m.kinetic.beta_coefficients()]
+                     for m in params], dtype=float)                     # (B, 2, 2)
+    return {
+        'a': coef[..., 0],
+        'b': coef[..., 1],
+        'theta0': np.array([[m.theta_init_geo, m.theta_init_kin] for m in params], dtype=float),
+        'omega_c': np.array([m.omega_c for m in params], dtype=float),
+        'p': np.array([m.p for m in params], dtype=float),
+    }
+
+
+def _bernoulli_flow(theta0: np.ndarray, a: np.ndarray, b: np.ndarray,
+                    t: np.ndarray) -> np.ndarray:
+    """
+    Closed-form solution of dΘ/dt = -aΘ + bΘ², Θ(0) = Θ₀:
+    Θ(t) = Θ₀e^{-at} / (1 - bΘ₀(1 - e^{-at})/a)
+    NaN past a finite-t blow-up.
+    """
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        at = a * t
+        phi = np.where(a != 0, -np.expm1(-at) / np.where(a != 0, a, 1.0), t)
+        denom = 1.0 - b * theta0 * phi
+        return np.where(denom > 0, theta0 * np.exp(-at) / denom, np.nan)
+
+
+def solve_rg_flow_batch(params: Sequence[MultiChannelParams], omega_range: np.ndarray,
+                        method: str = 'exact') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solve the two-channel RG flow for B parameter sets on one frequency grid.
+
+    Θ(omega_range[0]) = (theta_init_geo, theta_init_kin) for every set.
+
+    Parameters
+    ----------
+    method : str
+        'exact'  - closed-form Bernoulli solution of the quadratic β (default)
+        'odeint' - all 2B channels integrated as one vector ODE with the
+                   vectorised β (a single callback per step)
+
+    Returns
+    -------
+    theta_geo, theta_kin : arrays (B, len(omega_range))
+    """
+    c = _stack_params(params)
+    ln_omega = np.log(omega_range)
+    if method == 'exact':
+        t = ln_omega - ln_omega[0]
+        theta = _bernoulli_flow(c['theta0'][..., None], c['a'][..., None],
+                                c['b'][..., None], t)               # (B, 2, N)
+    elif method == 'odeint':
+        a, b = c['a'].ravel(), c['b'].ravel()
+        solution = odeint(lambda y, ln_w: -a * y + b * y * y, c['theta0'].ravel(), ln_omega)
+        theta = solution.T.reshape(len(params), 2, ln_omega.size)
+    else:
+        raise ValueError("method must be 'exact' or 'odeint'")
+    return theta[:, 0], theta[:, 1]
+
+
+def _dense_flow(theta_geo: np.ndarray, theta_kin: np.ndarray,
+                a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Nodes of the dense flow: (Θ_geo, Θ_kin) and their exact slopes β(Θ), (..., 2, N)."""
+    y = np.stack([theta_geo, theta_kin], axis=-2)
+    return y, -a[..., None] * y + b[..., None] * y**2
+
+
+def _hermite(ln_omega: np.ndarray, y: np.ndarray, dy: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Cubic Hermite interpolation in ln ω on the bracketing interval, (..., *shape(x))."""
+    i = np.clip(np.searchsorted(ln_omega, x, side='right') - 1, 0, ln_omega.size - 2)
+    h = ln_omega[i + 1] - ln_omega[i]
+    s = (x - ln_omega[i]) / h
+    return ((1 + 2*s) * (1 - s)**2 * y[..., i] + s * (1 - s)**2 * h * dy[..., i]
+            + s**2 * (3 - 2*s) * y[..., i + 1] + s**2 * (s - 1) * h * dy[..., i + 1])
+
+
+def _flow_at(model, omega_hz) -> Dict[str, np.ndarray]:
+    """
+    Θ, w, β_Θ and κ_ec at arbitrary frequencies (clipped to the flow grid)
+    from the model's cached dense interpolant; leading axes follow the
+    model's batch shape, trailing axes the shape of omega_hz.
+    """
+    if model._dense is None:
+        model._dense = _dense_flow(model.theta_geo, model.theta_kin,
+                                   model._coef['a'], model._coef['b'])
+    ln_omega = np.log(model.omega)
+    ln_w = np.clip(np.log(omega_hz), ln_omega[0], ln_omega[-1])
+    expand = (Ellipsis,) + (None,) * np.ndim(ln_w)
+    y = _hermite(ln_omega, *model._dense, ln_w)                        # (..., 2, *freq)
+    geo, kin = np.moveaxis(y, np.ndim(model._coef['omega_c']), 0)
+    a_geo, a_kin = (model._coef['a'][..., i][expand] for i in (0, 1))
+    b_geo, b_kin = (model._coef['b'][..., i][expand] for i in (0, 1))
+    omega = np.clip(omega_hz, model.omega[0], model.omega[-1])
+
+    x = (omega / model._coef['omega_c'][expand]) ** model._coef['p'][expand]
+    w = 1.0 / (1.0 + x)
+    total = w * geo + (1 - w) * kin
+    # dΘ_tot/d ln ω = w β_geo + (1-w) β_kin + (dw/d ln ω)(Θ_geo - Θ_kin)
+    beta = (w * (-a_geo * geo + b_geo * geo**2) + (1 - w) * (-a_kin * kin + b_kin * kin**2)
+            - model._coef['p'][expand] * x * w**2 * (geo - kin))
+    return {
+        'omega': omega,
+        'theta_geo': geo,
+        'theta_kin': kin,
+        'theta_total': total,
+        'weight': w,
+        'beta': beta,
+        'kappa_ec': np.abs(beta) / np.maximum(total, 1e-6)
+    }
+
+
 class MultiChannelTheta:
     """
     Two-channel adaptonic RG flow model.
@@ -155,6 +274,8 @@ class MultiChannelTheta:
     
     def __init__(self, params: MultiChannelParams):
         self.params = params
+        self._coef = {k: v[0] for k, v in _stack_params([params]).items()}
+        self._dense = None
         self._flow_computed = False
         
     def channel_weight(self, omega: np.ndarray) -> np.ndarray:
@@ -166,43 +287,24 @@ class MultiChannelTheta:
         """
         return 1.0 / (1.0 + (omega / self.params.omega_c)**self.params.p)
     
-    def solve_rg_flow(self, omega_range: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def solve_rg_flow(self, omega_range: np.ndarray,
+                      method: str = 'exact') -> Tuple[np.ndarray, np.ndarray]:
         """
-        Solve coupled RG flow for both channels.
+        Solve coupled RG flow for both channels:
+        dΘ_geo/d(ln ω) = β_geo(Θ_geo), dΘ_kin/d(ln ω) = β_kin(Θ_kin),
+        starting from the initial Θ at omega_range[0].
+        
+        method: 'exact' (closed form) or 'odeint', see solve_rg_flow_batch.
         
         Returns
         -------
         theta_geo, theta_kin : arrays
             Information temperature for each channel vs frequency
         """
-        # Convert frequency to logarithmic scale for integration
-        ln_omega = np.log(omega_range)
-        
-        def derivatives(y, ln_w):
-            """
-            RG flow equations:
-            dΘ_geo/d(ln ω) = β_geo(Θ_geo)
-            dΘ_kin/d(ln ω) = β_kin(Θ_kin)
-            """
-            theta_geo, theta_kin = y
-            
-            beta_geo = self.params.geometric.beta_function(theta_geo)
-            beta_kin = self.params.kinetic.beta_function(theta_kin)
-            
-            return [beta_geo, beta_kin]
-        
-        # Initial conditions
-        y0 = [self.params.theta_init_geo, self.params.theta_init_kin]
-        
-        # Integrate from UV (high ω) to IR (low ω)
-        solution = odeint(derivatives, y0, ln_omega)
-        
-        theta_geo = solution[:, 0]
-        theta_kin = solution[:, 1]
-        
-        return theta_geo, theta_kin
-    
-    def compute_full_flow(self, n_points: int = 1000):
+        theta_geo, theta_kin = solve_rg_flow_batch([self.params], omega_range, method)
+        return theta_geo[0], theta_kin[0]
+    
+    def compute_full_flow(self, n_points: int = 1000, method: str = 'exact'):
         """
         Compute complete RG flow from optical to mHz.
         
@@ -212,7 +314,8 @@ class MultiChannelTheta:
         self.omega = np.logspace(-4, 14, n_points)
         
         # Solve for individual channels
-        self.theta_geo, self.theta_kin = self.solve_rg_flow(self.omega)
+        self._coef = {k: v[0] for k, v in _stack_params([self.params]).items()}
+        self.theta_geo, self.theta_kin = self.solve_rg_flow(self.omega, method)
         
         # Compute channel weights
         self.w = self.channel_weight(self.omega)
@@ -226,6 +329,7 @@ class MultiChannelTheta:
         # Compute ecotone index
         self._compute_ecotone_index()
         
+        self._dense = None
         self._flow_computed = True
     
     def _compute_beta_total(self):
@@ -266,27 +370,72 @@ class MultiChannelTheta:
         
         return omega_peak, kappa_peak, theta_peak
     
-    def theta_at_frequency(self, omega_hz: float) -> Dict[str, float]:
+    def theta_at_frequency(self, omega_hz: Union[float, np.ndarray]) -> Dict[str, Union[float, np.ndarray]]:
         """
-        Get Θ values at specific frequency.
+        Get Θ values at specific frequency (scalar or array).
+        
+        Interpolated from the flow (cubic Hermite in ln ω with exact
+        slopes, cached per flow); β and κ_ec use the analytic derivative
+        of Θ_total. Frequencies outside the grid are clipped to its ends.
         
         Returns dict with geometric, kinetic, total, and weight.
         """
         if not self._flow_computed:
             raise RuntimeError("Must call compute_full_flow() first")
         
-        # Find closest point
-        idx = np.argmin(np.abs(self.omega - omega_hz))
-        
-        return {
-            'omega': self.omega[idx],
-            'theta_geo': self.theta_geo[idx],
-            'theta_kin': self.theta_kin[idx],
-            'theta_total': self.theta_total[idx],
-            'weight': self.w[idx],
-            'beta': self.beta_total[idx],
-            'kappa_ec': self.kappa_ec[idx]
-        }
+        return _flow_at(self, omega_hz)
+
+
+class MultiChannelThetaBatch:
+    """
+    B parameter sets solved together on one frequency grid.
+    
+    Attributes mirror MultiChannelTheta with a leading batch axis
+    (theta_geo, theta_kin, w, theta_total, beta_total, kappa_ec: (B, N)),
+    so AdaptonicValidator and lisa_detectability_forecast return one
+    value per set.
+    """
+    
+    def __init__(self, params: Sequence[MultiChannelParams]):
+        self.params = list(params)
+        self._coef = _stack_params(self.params)
+        self._dense = None
+        self._flow_computed = False
+    
+    def __len__(self) -> int:
+        return len(self.params)
+    
+    def channel_weight(self, omega: np.ndarray) -> np.ndarray:
+        """Adaptonic selector w(ω) per set, (B, len(omega))."""
+        return 1.0 / (1.0 + (omega / self._coef['omega_c'][:, None])**self._coef['p'][:, None])
+    
+    def compute_full_flow(self, n_points: int = 1000, method: str = 'exact'):
+        """Batched MultiChannelTheta.compute_full_flow."""
+        self.omega = np.logspace(-4, 14, n_points)
+        self._coef = _stack_params(self.params)
+        self.theta_geo, self.theta_kin = solve_rg_flow_batch(self.params, self.omega, method)
+        self.w = self.channel_weight(self.omega)
+        self.theta_total = self.w * self.theta_geo + (1 - self.w) * self.theta_kin
+        self.beta_total = np.gradient(self.theta_total, np.log(self.omega), axis=-1)
+        self.kappa_ec = np.abs(self.beta_total) / np.maximum(self.theta_total, 1e-6)
+        self._dense = None
+        self._flow_computed = True
+    
+    def find_ecotone_peak(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(omega_peak, kappa_peak, theta_peak) per set."""
+        if not self._flow_computed:
+            raise RuntimeError("Must call compute_full_flow() first")
+        
+        idx_peak = np.argmax(self.kappa_ec, axis=-1)
+        rows = np.arange(len(self.params))
+        return self.omega[idx_peak], self.kappa_ec[rows, idx_peak], self.theta_total[rows, idx_peak]
+    
+    def theta_at_frequency(self, omega_hz: Union[float, np.ndarray]) -> Dict[str, np.ndarray]:
+        """MultiChannelTheta.theta_at_frequency per set, arrays (B, *shape(omega_hz))."""
+        if not self._flow_computed:
+            raise RuntimeError("Must call compute_full_flow() first")
+        
+        return _flow_at(self, omega_hz)
 
 
 # ============================================================================
@@ -312,10 +461,10 @@ class AdaptonicValidator:
         Check: Θ(ω > 1e12 Hz) should be stable/small.
         """
         high_freq_mask = self.model.omega > 1e12
-        theta_high = self.model.theta_total[high_freq_mask]
+        theta_high = self.model.theta_total[..., high_freq_mask]
         
         # Should not have runaway growth
-        max_theta = np.max(theta_high)
+        max_theta = np.max(theta_high, axis=-1)
         
         return max_theta < 5.0  # eV (reasonable scale)
     
@@ -326,9 +475,9 @@ class AdaptonicValidator:
         In mHz band, require β_Θ/Θ < 1e-3 (negligible α_M).
         """
         mhz_mask = (self.model.omega >= 1e-4) & (self.model.omega <= 1e-2)
-        kappa_mhz = self.model.kappa_ec[mhz_mask]
+        kappa_mhz = self.model.kappa_ec[..., mhz_mask]
         
-        max_kappa_mhz = np.max(kappa_mhz)
+        max_kappa_mhz = np.max(kappa_mhz, axis=-1)
         
         return max_kappa_mhz < 1e-2  # Conservative (1%)
     
@@ -339,10 +488,10 @@ class AdaptonicValidator:
         Check that kinetic channel gives reasonable behavior.
         """
         optical_mask = (self.model.omega >= 1e13) & (self.model.omega <= 1e15)
-        theta_opt = self.model.theta_kin[optical_mask]
+        theta_opt = self.model.theta_kin[..., optical_mask]
         
         # Should be order 0.1-1 eV
-        return (np.min(theta_opt) > 0.01) and (np.max(theta_opt) < 10.0)
+        return (np.min(theta_opt, axis=-1) > 0.01) & (np.max(theta_opt, axis=-1) < 10.0)
     
     def check_alpha_m_consistency(self) -> bool:
         """
@@ -351,14 +500,14 @@ class AdaptonicValidator:
         Rough check: geometric channel should give frozen IR.
         """
         ir_mask = self.model.omega < 1e-3
-        beta_geo_ir = np.gradient(self.model.theta_geo[ir_mask], 
-                                   np.log(self.model.omega[ir_mask]))
+        beta_geo_ir = np.gradient(self.model.theta_geo[..., ir_mask], 
+                                   np.log(self.model.omega[ir_mask]), axis=-1)
         
         # Geometric channel should be nearly frozen in deep IR
-        return np.abs(np.mean(beta_geo_ir)) < 0.1
+        return np.abs(np.mean(beta_geo_ir, axis=-1)) < 0.1
     
     def run_all_checks(self) -> Dict[str, bool]:
-        """Run complete validation suite"""
+        """Run complete validation suite (per set for a MultiChannelThetaBatch)"""
         results = {
             'BBN_CMB_safe': self.check_bbn_cmb_safety(),
             'c_T_constraint': self.check_c_T_constraint(),
@@ -366,7 +515,7 @@ class AdaptonicValidator:
             'alpha_M_consistent': self.check_alpha_m_consistency()
         }
         
-        results['ALL_PASS'] = all(results.values())
+        results['ALL_PASS'] = np.logical_and.reduce(list(results.values()))
         
         return results
 
@@ -377,7 +526,8 @@ class AdaptonicValidator:
 
 def lisa_detectability_forecast(model: MultiChannelTheta) -> Dict[str, float]:
     """
-    Estimate if LISA can detect ecotone signature.
+    Estimate if LISA can detect ecotone signature (per set for a
+    MultiChannelThetaBatch).
     
     LISA specifications:
     - Frequency: 0.1 mHz - 1 Hz  
@@ -388,26 +538,27 @@ def lisa_detectability_forecast(model: MultiChannelTheta) -> Dict[str, float]:
     lisa_mask = (model.omega >= 1e-4) & (model.omega <= 1.0)
     
     # Spectral variation in LISA band
-    theta_lisa = model.theta_total[lisa_mask]
-    delta_theta_lisa = (np.max(theta_lisa) - np.min(theta_lisa)) / np.mean(theta_lisa)
+    theta_lisa = model.theta_total[..., lisa_mask]
+    delta_theta_lisa = (np.max(theta_lisa, axis=-1) - np.min(theta_lisa, axis=-1)) / np.mean(theta_lisa, axis=-1)
     
     # Beta variation (slope changes)
-    beta_lisa = model.beta_total[lisa_mask]
-    delta_beta = np.ptp(beta_lisa)  # Peak-to-peak
+    beta_lisa = model.beta_total[..., lisa_mask]
+    delta_beta = np.ptp(beta_lisa, axis=-1)  # Peak-to-peak
     
     # Ecotone index variation
-    kappa_lisa = model.kappa_ec[lisa_mask]
-    max_kappa_lisa = np.max(kappa_lisa)
+    kappa_lisa = model.kappa_ec[..., lisa_mask]
+    max_kappa_lisa = np.max(kappa_lisa, axis=-1)
     
     # Detection threshold: LISA needs ~1% spectral change
-    detectable = (delta_theta_lisa > 0.01) or (max_kappa_lisa > 0.05)
+    detectable = (delta_theta_lisa > 0.01) | (max_kappa_lisa > 0.05)
+    confidence = np.where(detectable, 'medium', 'low')
     
     return {
         'delta_theta_percent': delta_theta_lisa * 100,
         'max_kappa': max_kappa_lisa,
         'delta_beta': delta_beta,
         'detectable': detectable,
-        'confidence': 'medium' if detectable else 'low'
+        'confidence': confidence.item() if confidence.ndim == 0 else confidence
     }
 
 
@@ -18,6 +18,7 @@ import matplotlib.pyplot as plt
 from scipy.spatial import cKDTree
 from scipy.special import digamma
 from scipy.linalg import eigh
+from knn_mi import MIContext, kraskov_counts
 from sklearn.decomposition import PCA
 from dataclasses import dataclass
 from typing import List, Dict, Tuple
@@ -107,24 +108,10 @@ class AdaptonicEstimators:
         """
         n = X.shape[0]
         
-        # Build KD-trees
-        tree_X = cKDTree(X)
-        tree_Y = cKDTree(Y)
-        tree_XY = cKDTree(np.hstack([X, Y]))
+        # Joint k-th neighbor distance and marginal counts (batched)
+        _, n_X, n_Y = kraskov_counts(X, Y, k=k, radius_offset=-1e-10)
         
-        I = 0.0
-        for i in range(n):
-            # Distance to k-th neighbor in joint space
-            dist_XY, _ = tree_XY.query([np.hstack([X[i], Y[i]])], k=k+1)
-            epsilon = dist_XY[0, k]
-            
-            # Count neighbors within epsilon in marginals
-            n_X = len(tree_X.query_ball_point(X[i], epsilon - 1e-10)) - 1
-            n_Y = len(tree_Y.query_ball_point(Y[i], epsilon - 1e-10)) - 1
-            
-            I += digamma(k) - (digamma(n_X + 1) + digamma(n_Y + 1)) / 2
-        
-        I /= n
+        I = digamma(k) - np.mean((digamma(n_X + 1) + digamma(n_Y + 1)) / 2)
         I += digamma(n)
         
         return max(0.0, I)
@@ -152,28 +139,9 @@ class AdaptonicEstimators:
         I_XY_Z : float
             Conditional mutual information (nat units)
         """
-        n = X.shape[0]
-        
-        # Build trees
-        tree_XZ = cKDTree(np.hstack([X, Z]))
-        tree_YZ = cKDTree(np.hstack([Y, Z]))
-        tree_XYZ = cKDTree(np.hstack([X, Y, Z]))
-        tree_Z = cKDTree(Z)
-        
-        I = 0.0
-        for i in range(n):
-            # Distance to k-th neighbor in (X,Y,Z)
-            dist_XYZ, _ = tree_XYZ.query([np.hstack([X[i], Y[i], Z[i]])], k=k+1)
-            epsilon = dist_XYZ[0, k]
-            
-            # Count neighbors within epsilon
-            n_XZ = len(tree_XZ.query_ball_point(np.hstack([X[i], Z[i]]), epsilon - 1e-10)) - 1
-            n_YZ = len(tree_YZ.query_ball_point(np.hstack([Y[i], Z[i]]), epsilon - 1e-10)) - 1
-            n_Z = len(tree_Z.query_ball_point(Z[i], epsilon - 1e-10)) - 1
-            
-            I += digamma(k) + digamma(n_Z + 1) - digamma(n_XZ + 1) - digamma(n_YZ + 1)
-        
-        I /= n
+        # k-th neighbor in (X,Y,Z), counts in (X,Z), (Y,Z), Z (batched)
+        context = MIContext({'X': X, 'Y': Y, 'Z': Z}, k=k, radius_offset=-1e-10)
+        I = context.cmi('X', 'Y', 'Z')
         
         return max(0.0, I)
     